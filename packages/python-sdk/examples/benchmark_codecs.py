@@ -0,0 +1,125 @@
+"""
+Benchmark JSON codecs on typical SVG API payloads.
+
+Compares the previous decode path (stdlib ``json.loads`` followed by
+``Model(**data)``) with ``JsonCodec.decode`` for a 50-icon batch response and a
+100-result search page, plus request encoding of a 50-icon batch request.
+Typed decoding is the same single pass for every codec; the
+``loads + model_validate`` rows show why the codec is not used for it. The
+codec choice shows up in untyped ``loads`` (error bodies, hints) and in
+``dumps``.
+
+Run with optional codecs installed to include them:
+    pip install orjson msgspec
+    python examples/benchmark_codecs.py
+"""
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from svg_api.codec import JsonCodec, get_codec
+from svg_api.types import BatchIconRequest, BatchRequestOptions, BatchResponse, SearchResponse
+
+SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" '
+    'fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" '
+    'stroke-linejoin="round"><path d="m3 9 9-7 9 7v11a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2z"/>'
+    '<polyline points="9 22 9 12 15 12 15 22"/></svg>'
+)
+
+
+def batch_payload() -> bytes:
+    data = {
+        f"lucide:icon-{i}": {
+            "success": True,
+            "name": f"icon-{i}",
+            "source": "lucide",
+            "category": "buildings",
+            "svg": SVG,
+        }
+        for i in range(50)
+    }
+    meta = {"requested": 50, "successful": 50, "failed": 0}
+    return json.dumps({"data": data, "errors": {}, "meta": meta}).encode()
+
+
+def search_payload() -> bytes:
+    data = [
+        {
+            "name": f"arrow-{i}",
+            "source": "lucide",
+            "category": "arrows",
+            "score": 0.9,
+            "preview_url": f"https://cdn.svg-api.org/lucide/arrow-{i}.svg",
+            "matches": {"name": True},
+        }
+        for i in range(100)
+    ]
+    meta = {"query": "arrow", "total": 1000, "limit": 100, "offset": 0, "has_more": True}
+    return json.dumps({"data": data, "meta": meta}).encode()
+
+
+def timeit(func: Callable[[], Any], iterations: int = 2000) -> float:
+    """Return the mean time per call in microseconds."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def installed_codec(name: str) -> JsonCodec | None:
+    try:
+        return get_codec(name)
+    except ImportError:
+        print(f"({name} not installed, skipped)")
+        return None
+
+
+def available_codecs() -> list[JsonCodec]:
+    codecs = [installed_codec(name) for name in ("json", "orjson", "msgspec")]
+    return [codec for codec in codecs if codec is not None]
+
+
+def main() -> None:
+    codecs = available_codecs()
+    print()
+
+    for label, raw, model in (
+        ("batch response, 50 icons", batch_payload(), BatchResponse),
+        ("search page, 100 results", search_payload(), SearchResponse),
+    ):
+        print(f"{label} ({len(raw):,} bytes)")
+        baseline = timeit(lambda raw=raw, model=model: model(**json.loads(raw)))
+        print(f"  {'json.loads + Model(**data)':32} {baseline:8.1f} us")
+        for codec in codecs:
+            elapsed = timeit(lambda codec=codec, raw=raw, model=model: codec.decode(raw, model))
+            print(f"  {codec.name + '.decode':32} {elapsed:8.1f} us  {baseline / elapsed:4.2f}x")
+        for codec in codecs:
+            elapsed = timeit(
+                lambda codec=codec, raw=raw, model=model: model.model_validate(codec.loads(raw))
+            )
+            label = codec.name + ".loads + model_validate"
+            print(f"  {label:32} {elapsed:8.1f} us  {baseline / elapsed:4.2f}x")
+        for codec in codecs:
+            elapsed = timeit(lambda codec=codec, raw=raw: codec.loads(raw))
+            print(f"  {codec.name + '.loads (untyped)':32} {elapsed:8.1f} us")
+        print()
+
+    request = BatchRequestOptions(
+        icons=[BatchIconRequest(name=f"icon-{i}", source="lucide") for i in range(50)]
+    )
+    print("batch request encode, 50 icons")
+    baseline = timeit(
+        lambda: json.dumps(request.model_dump(by_alias=True, exclude_none=True)).encode()
+    )
+    print(f"  {'model_dump + json.dumps':32} {baseline:8.1f} us")
+    for codec in codecs:
+        elapsed = timeit(lambda codec=codec: codec.encode(request))
+        print(f"  {codec.name + '.encode':32} {elapsed:8.1f} us  {baseline / elapsed:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
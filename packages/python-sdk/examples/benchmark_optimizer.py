@@ -0,0 +1,80 @@
+"""
+Benchmark SvgOptimizer throughput on typical icons.
+
+The optimizer runs on every cache fill, so it should keep up with batch
+responses: the target is more than 10,000 typical icons per second on one
+core. Two typical icons are checked against the target: a hand-written
+stroke icon (little to remove) and an icon exported from an editor
+(comments, metadata, long decimals). A large illustration-style icon with
+hundreds of decimals is shown for comparison; its cost grows with the
+number of decimals rounded.
+
+    python examples/benchmark_optimizer.py
+"""
+
+import timeit
+
+from svg_api.optimize import SvgOptimizer
+
+TARGET = 10_000
+
+STROKE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" '
+    'fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" '
+    'stroke-linejoin="round"><path d="m3 9 9-7 9 7v11a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2z"/>'
+    '<polyline points="9 22 9 12 15 12 15 22"/></svg>'
+)
+
+EXPORTED = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n<!-- Generator: Editor 27.0 -->\n'
+    '<svg xmlns="http://www.w3.org/2000/svg" xmlns:inkscape="http://www.inkscape.org" '
+    'inkscape:version="1.3" viewBox="0 0 24.000001 24.000001" data-name="Layer 1">\n'
+    "  <metadata><rdf:RDF><cc:Work/></rdf:RDF></metadata>\n"
+    "  <g>\n"
+    '    <path d="M12.000001,2.2500003C6.6152344,2.2500003 2.2500003,6.6152344 '
+    "2.2500003,12.000001S6.6152344,21.750002 12.000001,21.750002 21.750002,17.384766 "
+    '21.750002,12.000001 17.384766,2.2500003 12.000001,2.2500003Z"/>\n'
+    '    <path d="M11.250001.75000006h1.5000001v6.7500005h-1.5000001z" id="path-1"/>\n'
+    "  </g>\n"
+    "</svg>\n"
+)
+
+LARGE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 64 64">'
+    + "".join(
+        f'<path d="M{i}.123456 {i}.654321c.123456-.654321 1.23456 2.34567 3.45678-4.56789'
+        f's5.67891.2345 6.78912-7.89123L{i + 1}.987654 {i + 2}.876543z" '
+        f'transform="rotate({i * 7}.5 32.00001 32.00001)"/>'
+        for i in range(20)
+    )
+    + "</svg>"
+)
+
+
+def icons_per_second(optimizer: SvgOptimizer, svg: str, repeat: int = 5) -> float:
+    """Best of ``repeat`` runs, as timeit does, to keep other load out of the figure."""
+    number = 500
+    best = min(timeit.repeat(lambda: optimizer.optimize(svg), number=number, repeat=repeat))
+    return number / best
+
+
+def main() -> None:
+    optimizer = SvgOptimizer()
+    print(f"target: {TARGET:,} icons/s")
+    print()
+    for label, svg, typical in (
+        ("stroke icon", STROKE, True),
+        ("editor export", EXPORTED, True),
+        ("illustration", LARGE, False),
+    ):
+        rate = icons_per_second(optimizer, svg)
+        saved = 1 - len(optimizer.optimize(svg)) / len(svg)
+        status = ("ok" if rate >= TARGET else "BELOW TARGET") if typical else ""
+        print(
+            f"  {label:14} {len(svg):6,} bytes  {rate:10,.0f} icons/s  "
+            f"{saved:4.0%} smaller  {status}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,71 +7,180 @@ Provides both synchronous and asynchronous clients.
 Example:
     # Synchronous usage
     from svg_api import SvgApi
-    
+
     client = SvgApi()
     icon = client.get_icon("home", source="heroicons")
     print(icon.svg)
-    
+
     # Asynchronous usage
     from svg_api import AsyncSvgApi
-    
+
     async with AsyncSvgApi() as client:
         icon = await client.get_icon("home", source="heroicons")
         print(icon.svg)
+
+Clients and models are imported lazily on first attribute access, so
+``import svg_api`` stays cheap and aiohttp is only loaded when
+``AsyncSvgApi`` is used.
 """
 
-from svg_api.client import SvgApi, SvgApiConfig
-from svg_api.async_client import AsyncSvgApi, AsyncSvgApiConfig
-from svg_api.types import (
-    Icon,
-    IconLicense,
-    Source,
-    Category,
-    SearchResult,
-    BatchIconResult,
-    BatchResponse,
-    SearchResponse,
-    SourcesResponse,
-    CategoriesResponse,
-    IconResponse,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from svg_api.errors import ApiError as ServerError
 from svg_api.errors import (
-    SvgApiError,
-    NotFoundError,
+    AuthenticationError,
+    DeadlineExceededError,
     InvalidRequestError,
-    RateLimitError,
-    ServerError,
     NetworkError,
+    NotFoundError,
+    RateLimitError,
+    SvgApiError,
     TimeoutError,
-    AuthenticationError,
 )
 
+if TYPE_CHECKING:
+    from svg_api.async_client import AsyncSvgApi, AsyncSvgApiConfig
+    from svg_api.balancer import EndpointPool
+    from svg_api.client import SvgApi, SvgApiConfig
+    from svg_api.codec import JsonCodec
+    from svg_api.deadlines import deadline
+    from svg_api.export import ExportJob
+    from svg_api.lanes import Lane, priority
+    from svg_api.limiter import AdaptiveLimiter
+    from svg_api.metadata import MetadataSnapshot
+    from svg_api.names import NameIndex
+    from svg_api.optimize import SvgOptimizer
+    from svg_api.render import IconRenderer
+    from svg_api.search import SearchSession
+    from svg_api.sprite import Sprite, SpriteBuilder
+    from svg_api.streaming import AsyncBatchStream, BatchStream
+    from svg_api.sync import CatalogueSync, SyncResult
+    from svg_api.types import (
+        BatchIconResult,
+        BatchResponse,
+        CategoriesResponse,
+        Category,
+        Icon,
+        IconResponse,
+        SearchResponse,
+        SearchResult,
+        Source,
+        SourcesResponse,
+    )
+    from svg_api.types import License as IconLicense
+    from svg_api.usage import AsyncUsageReporter, UsageReporter
+
+# Public name -> (module, attribute) for lazily imported objects
+_LAZY_IMPORTS: dict[str, tuple[str, str]] = {
+    # Clients (client, async_client)
+    "AsyncSvgApi": ("svg_api.async_client", "AsyncSvgApi"),
+    "AsyncSvgApiConfig": ("svg_api.async_client", "AsyncSvgApiConfig"),
+    "SvgApi": ("svg_api.client", "SvgApi"),
+    "SvgApiConfig": ("svg_api.client", "SvgApiConfig"),
+    # Request control (deadlines, lanes, limiter, balancer, codec)
+    "AdaptiveLimiter": ("svg_api.limiter", "AdaptiveLimiter"),
+    "EndpointPool": ("svg_api.balancer", "EndpointPool"),
+    "JsonCodec": ("svg_api.codec", "JsonCodec"),
+    "Lane": ("svg_api.lanes", "Lane"),
+    "deadline": ("svg_api.deadlines", "deadline"),
+    "priority": ("svg_api.lanes", "priority"),
+    # Catalogue metadata (metadata, names)
+    "MetadataSnapshot": ("svg_api.metadata", "MetadataSnapshot"),
+    "NameIndex": ("svg_api.names", "NameIndex"),
+    # Streaming batches (streaming)
+    "AsyncBatchStream": ("svg_api.streaming", "AsyncBatchStream"),
+    "BatchStream": ("svg_api.streaming", "BatchStream"),
+    # Catalogue sync and export (sync, export)
+    "CatalogueSync": ("svg_api.sync", "CatalogueSync"),
+    "ExportJob": ("svg_api.export", "ExportJob"),
+    "SyncResult": ("svg_api.sync", "SyncResult"),
+    # Rendering, sprites and optimization (render, sprite, optimize)
+    "IconRenderer": ("svg_api.render", "IconRenderer"),
+    "Sprite": ("svg_api.sprite", "Sprite"),
+    "SpriteBuilder": ("svg_api.sprite", "SpriteBuilder"),
+    "SvgOptimizer": ("svg_api.optimize", "SvgOptimizer"),
+    # Search-as-you-type (search)
+    "SearchSession": ("svg_api.search", "SearchSession"),
+    # Usage reporting (usage)
+    "AsyncUsageReporter": ("svg_api.usage", "AsyncUsageReporter"),
+    "UsageReporter": ("svg_api.usage", "UsageReporter"),
+    # Models (types)
+    "BatchIconResult": ("svg_api.types", "BatchIconResult"),
+    "BatchResponse": ("svg_api.types", "BatchResponse"),
+    "CategoriesResponse": ("svg_api.types", "CategoriesResponse"),
+    "Category": ("svg_api.types", "Category"),
+    "Icon": ("svg_api.types", "Icon"),
+    "IconLicense": ("svg_api.types", "License"),
+    "IconResponse": ("svg_api.types", "IconResponse"),
+    "SearchResponse": ("svg_api.types", "SearchResponse"),
+    "SearchResult": ("svg_api.types", "SearchResult"),
+    "Source": ("svg_api.types", "Source"),
+    "SourcesResponse": ("svg_api.types", "SourcesResponse"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import clients and models on first access."""
+    try:
+        module_name, attribute = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 __version__ = "1.0.0"
 __all__ = [
-    # Clients
-    "SvgApi",
-    "SvgApiConfig",
+    "AdaptiveLimiter",
+    "AsyncBatchStream",
     "AsyncSvgApi",
     "AsyncSvgApiConfig",
-    # Types
-    "Icon",
-    "IconLicense",
-    "Source",
-    "Category",
-    "SearchResult",
+    "AsyncUsageReporter",
+    "AuthenticationError",
     "BatchIconResult",
     "BatchResponse",
-    "SearchResponse",
-    "SourcesResponse",
+    "BatchStream",
+    "CatalogueSync",
     "CategoriesResponse",
+    "Category",
+    "DeadlineExceededError",
+    "EndpointPool",
+    "ExportJob",
+    "Icon",
+    "IconLicense",
+    "IconRenderer",
     "IconResponse",
-    # Errors
-    "SvgApiError",
-    "NotFoundError",
     "InvalidRequestError",
+    "JsonCodec",
+    "Lane",
+    "MetadataSnapshot",
+    "NameIndex",
+    "NetworkError",
+    "NotFoundError",
     "RateLimitError",
+    "SearchResponse",
+    "SearchResult",
+    "SearchSession",
     "ServerError",
-    "NetworkError",
+    "Source",
+    "SourcesResponse",
+    "Sprite",
+    "SpriteBuilder",
+    "SvgApi",
+    "SvgApiConfig",
+    "SvgApiError",
+    "SvgOptimizer",
+    "SyncResult",
     "TimeoutError",
-    "AuthenticationError",
+    "UsageReporter",
+    "deadline",
+    "priority",
 ]
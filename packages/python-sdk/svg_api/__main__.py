@@ -0,0 +1,7 @@
+"""Run the ``svg-api`` command line: ``python -m svg_api``."""
+
+import sys
+
+from svg_api.cli import main
+
+sys.exit(main())
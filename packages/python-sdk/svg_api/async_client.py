@@ -5,19 +5,29 @@ Async client implementation using aiohttp with connection pooling.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import contextvars
+import pathlib
+import time
+from contextlib import asynccontextmanager, contextmanager
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
 
 from svg_api.errors import (
     ApiError,
+    DeadlineExceededError,
     NetworkError,
     NotFoundError,
+    ServiceUnavailableError,
+    SvgApiError,
     raise_for_status,
     TimeoutError,
 )
 from svg_api.types import (
+    BatchDefaults,
     BatchIconRequest,
+    BatchIconResult,
     BatchRequestOptions,
     BatchResponse,
     CategoriesResponse,
@@ -26,20 +36,97 @@ from svg_api.types import (
     RandomIconOptions,
     SearchOptions,
     SearchResponse,
+    SearchResult,
     SourcesResponse,
 )
-from svg_api.utils import build_query_params, validate_color, validate_size, validate_stroke
+from svg_api.cache import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_TTL,
+    AccessTracker,
+    IconCache,
+    batch_icon,
+    batch_specs,
+    cache_batch_item,
+    cache_batch_response,
+    dump_hot_set,
+    icon_spec,
+    load_hot_set,
+    merge_specs,
+    parse_freshness,
+    spec_key,
+)
+from svg_api.batch import batch_chunks, batch_retry_entries, merge_batch_retry
+from svg_api.balancer import PROBE_TIMEOUT, Endpoint, EndpointPool
+from svg_api.codec import M, JsonCodec, get_codec
+from svg_api.deadlines import (
+    attempt_timeout,
+    check_backoff,
+    deadline_at,
+    expires_at,
+    gather_within_deadline,
+    remaining,
+    with_deadline,
+)
+from svg_api.compression import StreamingDecoder, accept_encoding, compress_body
+from svg_api.lanes import BULK, Lane, LaneScheduler, current_lane, priority
+from svg_api.limiter import OVERLOAD_ERRORS, AdaptiveLimiter
+from svg_api.metadata import (
+    DEFAULT_METADATA_TTL,
+    VERSION_PATH,
+    MetadataCache,
+    MetadataSnapshot,
+    catalogue_version,
+)
+from svg_api.names import DEFAULT_NEGATIVE_CACHE_TTL, NameFilter, NameIndex
+from svg_api.optimize import SvgOptimizer, optimize_batch, optimize_icon
+from svg_api.resolve import SourceResolver
+from svg_api.sample import (
+    SAMPLE_ROUNDS,
+    IconSampler,
+    Weight,
+    empty_selection,
+    filter_index,
+    listing_queries,
+    selected,
+)
+from svg_api.stats import ClientStats, endpoint_label
+from svg_api.streaming import AsyncBatchStream, BatchStreamParser
+from svg_api.usage import DEFAULT_CAPACITY, DEFAULT_INTERVAL, AsyncUsageReporter
+from svg_api.utils import (
+    build_query_params,
+    calculate_retry_delay,
+    validate_color,
+    validate_size,
+    validate_stroke,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import AsyncIterator, Iterable, Iterator, Mapping, Sequence
 
+ICON_ENDPOINT = "GET /icons/{name}"
+BATCH_ENDPOINT = "POST /icons/batch"
 DEFAULT_BASE_URL = "https://api.svg-api.org/v1"
 DEFAULT_TIMEOUT = 30.0
 USER_AGENT = "svg-api-python-async/1.0.0"
+# Connections kept per base URL; also sizes the priority lanes' slots.
+CONNECTIONS_PER_HOST = 10
 
 
 class AsyncSvgApiConfig:
-    """Configuration for the async SVG API client."""
+    """
+    Configuration for the async SVG API client.
+
+    See SvgApiConfig for the shared options; ``base_urls`` lists mirrors to
+    balance and fail over across, each with its own connection pool.
+
+    ``lanes`` are the priority classes requests are scheduled in (see
+    ``svg_api.lanes``; default: interactive and bulk), and ``max_in_flight``
+    the requests admitted at once across them (default: connections per
+    host times base URLs, capped by ``max_connections``).
+
+    ``usage_interval`` and ``usage_buffer_size`` configure the background
+    task reporting track_usage() events (see ``svg_api.usage``).
+    """
 
     def __init__(
         self,
@@ -51,8 +138,24 @@ class AsyncSvgApiConfig:
         max_connections: int = 100,
         max_keepalive: int = 20,
         ttl_dns_cache: int = 300,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        refresh_concurrency: int = 4,
+        optimizer: SvgOptimizer | None = None,
+        compress_requests: bool = False,
+        json_codec: JsonCodec | str | None = None,
+        max_concurrency: int = 16,
+        base_urls: Sequence[str] | None = None,
+        negative_cache_ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+        name_index: NameIndex | None = None,
+        lanes: Sequence[Lane] | None = None,
+        max_in_flight: int | None = None,
+        metadata_ttl: float = DEFAULT_METADATA_TTL,
+        usage_interval: float = DEFAULT_INTERVAL,
+        usage_buffer_size: int = DEFAULT_CAPACITY,
     ) -> None:
-        self.base_url = base_url.rstrip("/")
+        self.base_urls = [url.rstrip("/") for url in base_urls or [base_url]]
+        self.base_url = self.base_urls[0]
         self.api_key = api_key
         self.timeout = timeout
         self.max_retries = max_retries
@@ -60,17 +163,35 @@ class AsyncSvgApiConfig:
         self.max_connections = max_connections
         self.max_keepalive = max_keepalive
         self.ttl_dns_cache = ttl_dns_cache
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.refresh_concurrency = refresh_concurrency
+        self.optimizer = optimizer
+        self.compress_requests = compress_requests
+        self.json_codec = get_codec(json_codec)
+        self.max_concurrency = max_concurrency
+        self.negative_cache_ttl = negative_cache_ttl
+        self.name_index = name_index
+        self.metadata_ttl = metadata_ttl
+        self.usage_interval = usage_interval
+        self.usage_buffer_size = usage_buffer_size
+        self.lanes = lanes
+        self.max_in_flight = max_in_flight or min(
+            max_connections, CONNECTIONS_PER_HOST * len(self.base_urls)
+        )
 
 
 class AsyncSvgApi:
     """
     Asynchronous client for the SVG API using aiohttp.
-    
+
     Features:
     - Connection pooling for efficient HTTP reuse
     - Configurable retry logic with exponential backoff
+    - In-memory icon cache with frequency-based warm-up
+    - Priority lanes keeping interactive calls ahead of bulk jobs
     - Full async/await support
-    
+
     Example:
         async with AsyncSvgApi() as client:
             icon = await client.get_icon("home", source="heroicons")
@@ -85,6 +206,20 @@ class AsyncSvgApi:
         max_retries: int = 3,
         retry_delay: float = 0.5,
         max_connections: int = 100,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        refresh_concurrency: int = 4,
+        optimizer: SvgOptimizer | None = None,
+        compress_requests: bool = False,
+        json_codec: JsonCodec | str | None = None,
+        max_concurrency: int = 16,
+        base_urls: Sequence[str] | None = None,
+        negative_cache_ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+        name_index: NameIndex | None = None,
+        lanes: Sequence[Lane] | None = None,
+        metadata_ttl: float = DEFAULT_METADATA_TTL,
+        usage_interval: float = DEFAULT_INTERVAL,
+        usage_buffer_size: int = DEFAULT_CAPACITY,
         config: AsyncSvgApiConfig | None = None,
     ) -> None:
         if config is None:
@@ -95,40 +230,126 @@ class AsyncSvgApi:
                 max_retries=max_retries,
                 retry_delay=retry_delay,
                 max_connections=max_connections,
+                cache_size=cache_size,
+                cache_ttl=cache_ttl,
+                refresh_concurrency=refresh_concurrency,
+                optimizer=optimizer,
+                compress_requests=compress_requests,
+                json_codec=json_codec,
+                max_concurrency=max_concurrency,
+                base_urls=base_urls,
+                negative_cache_ttl=negative_cache_ttl,
+                name_index=name_index,
+                lanes=lanes,
+                metadata_ttl=metadata_ttl,
+                usage_interval=usage_interval,
+                usage_buffer_size=usage_buffer_size,
             )
 
         self._config = config
         self._session: aiohttp.ClientSession | None = None
         self._connector: aiohttp.TCPConnector | None = None
+        self._stats = ClientStats()
+        self._cache: IconCache[Icon] = IconCache(config.cache_size, config.cache_ttl)
+        self._access = AccessTracker()
+        self._refresh_tasks: dict[str, asyncio.Task[None]] = {}
+        self._refresh_semaphore = asyncio.Semaphore(max(1, config.refresh_concurrency))
+        self._pool = EndpointPool(config.base_urls)
+        self._lanes = LaneScheduler(config.max_in_flight, config.lanes)
+        self._names = NameFilter(config.name_index, config.negative_cache_ttl)
+        self._resolver = SourceResolver(
+            config.cache_size, config.cache_ttl, config.negative_cache_ttl
+        )
+        self._metadata = MetadataCache(config.metadata_ttl)
+        self._metadata_lock = asyncio.Lock()
+        self._mirror_sessions: dict[str, aiohttp.ClientSession] = {}
+        self._probe_tasks: set[asyncio.Task[None]] = set()
+        self._usage: AsyncUsageReporter | None = None
+        # Errors retried by _send; with mirrors, a 503 is worth retrying elsewhere.
+        self._retryable: tuple[type[Exception], ...] = (NetworkError, TimeoutError)
+        if len(self._pool) > 1:
+            self._retryable += (ServiceUnavailableError,)
+        # The limiter only retries what _send does not.
+        self._limiter = AdaptiveLimiter(
+            max_limit=config.max_concurrency,
+            retry_errors=[e for e in OVERLOAD_ERRORS if not issubclass(e, self._retryable)],
+        )
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        """Adaptive concurrency limiter shared by this client's bulk operations."""
+        return self._limiter
+
+    @property
+    def names(self) -> NameFilter:
+        """Filter rejecting icon names known not to exist (see NameIndex)."""
+        return self._names
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get a snapshot of per-endpoint request statistics.
+
+        Returns:
+            Dictionary with request, error, byte and retry counters plus
+            latency percentiles (in milliseconds) per endpoint and in total,
+            the adaptive concurrency limiter state under "concurrency",
+            health and EWMA latency per base URL under "base_urls", and
+            occupancy and queue-time percentiles per priority lane under "lanes"
+        """
+        return {
+            **self._stats.snapshot(),
+            "concurrency": self._limiter.snapshot(),
+            "base_urls": self._pool.snapshot(),
+            "lanes": self._lanes.snapshot(),
+        }
+
+    def reset_stats(self) -> None:
+        """Discard all recorded request statistics."""
+        self._stats.reset()
+
+    async def _get_session(self, endpoint: Endpoint | None = None) -> aiohttp.ClientSession:
+        """Get or create the aiohttp session (connection pool) for an endpoint."""
+        if endpoint is not None and endpoint is not self._pool.primary:
+            session = self._mirror_sessions.get(endpoint.url)
+            if session is None or session.closed:
+                session = self._mirror_sessions[endpoint.url] = self._new_session(
+                    self._new_connector()
+                )
+            return session
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session with connection pool."""
         if self._session is None or self._session.closed:
-            self._connector = aiohttp.TCPConnector(
-                limit=self._config.max_connections,
-                limit_per_host=10,
-                ttl_dns_cache=self._config.ttl_dns_cache,
-                use_dns_cache=True,
-            )
-            
-            headers = {
-                "User-Agent": USER_AGENT,
-                "Accept": "application/json",
-            }
-            if self._config.api_key:
-                headers["Authorization"] = f"Bearer {self._config.api_key}"
-
-            timeout = aiohttp.ClientTimeout(total=self._config.timeout)
-            
-            self._session = aiohttp.ClientSession(
-                base_url=self._config.base_url,
-                connector=self._connector,
-                headers=headers,
-                timeout=timeout,
-            )
-        
+            self._connector = self._new_connector()
+            self._session = self._new_session(self._connector)
+
         return self._session
 
+    def _new_connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self._config.max_connections,
+            limit_per_host=CONNECTIONS_PER_HOST,
+            ttl_dns_cache=self._config.ttl_dns_cache,
+            use_dns_cache=True,
+        )
+
+    def _new_session(self, connector: aiohttp.TCPConnector) -> aiohttp.ClientSession:
+        headers = {
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+            "Accept-Encoding": accept_encoding(),
+        }
+        if self._config.api_key:
+            headers["Authorization"] = f"Bearer {self._config.api_key}"
+
+        timeout = aiohttp.ClientTimeout(total=self._config.timeout)
+
+        # Bodies are decoded in _read_body() so compressed sizes can be counted.
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            timeout=timeout,
+            auto_decompress=False,
+        )
+
     async def __aenter__(self) -> AsyncSvgApi:
         """Support async context manager protocol."""
         await self._get_session()
@@ -139,78 +360,223 @@ class AsyncSvgApi:
         await self.close()
 
     async def close(self) -> None:
-        """Close the HTTP session and connector."""
+        """
+        Close the HTTP session and connector, after a final flush of reported
+        usage, cancelling background refreshes.
+        """
+        if self._usage is not None:
+            await self._usage.close()
+        for task in [*self._refresh_tasks.values(), *self._probe_tasks]:
+            task.cancel()
         if self._session and not self._session.closed:
             await self._session.close()
         if self._connector:
             await self._connector.close()
+        for session in self._mirror_sessions.values():
+            if not session.closed:
+                await session.close()
+
+    @contextmanager
+    def _endpoint(self, attempted: list[Endpoint]) -> Iterator[Endpoint]:
+        """
+        Pick the endpoint for one attempt and report the outcome to the pool.
+
+        The endpoint of the previous attempt is avoided when another one is
+        available, so retries fail over.
+        """
+        for ejected in self._pool.due_for_probe():
+            task = asyncio.get_running_loop().create_task(self._probe(ejected))
+            self._probe_tasks.add(task)
+            task.add_done_callback(self._probe_tasks.discard)
+        endpoint = self._pool.acquire(exclude=attempted[-1:])
+        attempted.append(endpoint)
+        start = time.perf_counter()
+        try:
+            yield endpoint
+        except BaseException as e:
+            self._pool.release(endpoint, time.perf_counter() - start, e)
+            raise
+        self._pool.release(endpoint, time.perf_counter() - start)
+
+    @asynccontextmanager
+    async def _attempt(self, attempted: list[Endpoint]) -> AsyncIterator[Endpoint]:
+        """Wait for a slot in the current priority lane, then pick the attempt's endpoint."""
+        async with self._lanes.slot():
+            with self._endpoint(attempted) as base:
+                yield base
+
+    async def _probe(self, endpoint: Endpoint) -> None:
+        """Check /health/ready on an ejected endpoint and re-admit it if ready."""
+        ready = False
+        try:
+            session = await self._get_session(endpoint)
+            async with session.get(
+                endpoint.health_url, timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT)
+            ) as response:
+                ready = response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        finally:
+            self._pool.probe_result(endpoint, ready)
 
     async def _request(
         self,
         method: str,
         path: str,
         params: Mapping[str, Any] | None = None,
-        json: Mapping[str, Any] | None = None,
+        json: Any = None,
         headers: Mapping[str, str] | None = None,
     ) -> dict[str, Any]:
         """
         Make an async HTTP request with retry logic.
         """
-        session = await self._get_session()
-        
+        raw = (await self._send(method, path, params=params, json=json, headers=headers))[0]
+        return self._config.json_codec.loads(raw) if raw else {}
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Mapping[str, Any] | None = None,
+        json: Any = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> tuple[bytes, Mapping[str, str]]:
+        """Make an async HTTP request with retry logic, returning the raw body and headers."""
+        endpoint = endpoint_label(method, path)
+        request_headers = dict(headers or {})
+        body, bytes_out = self._encode_body(json, request_headers)
+
+        start = time.perf_counter()
+        try:
+            result = await self._request_with_retries(
+                method, path, endpoint, params, body, bytes_out, request_headers
+            )
+        except Exception as e:
+            self._stats.record_request(endpoint, time.perf_counter() - start, e)
+            raise
+        self._stats.record_request(endpoint, time.perf_counter() - start)
+        return result
+
+    def _encode_body(self, json: Any, headers: dict[str, str]) -> tuple[bytes | None, int]:
+        """Serialize (and optionally compress) a request body; returns (body, raw size)."""
+        if json is None:
+            return None, 0
+        body = self._config.json_codec.encode(json)
+        headers["Content-Type"] = "application/json"
+        size = len(body)
+        if self._config.compress_requests:
+            body, encoding = compress_body(body)
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+        return body, size
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        body: bytes | None,
+        bytes_out: int,
+        headers: Mapping[str, str],
+    ) -> tuple[bytes, Mapping[str, str]]:
+        """Run the request attempts with exponential backoff between them."""
         last_error: Exception | None = None
         max_attempts = self._config.max_retries + 1
+        attempted: list[Endpoint] = []
 
         for attempt in range(max_attempts):
             try:
-                async with session.request(
-                    method=method,
-                    url=path,
-                    params=params,
-                    json=json,
-                    headers=headers,
-                ) as response:
-                    return await self._handle_response(response)
-                    
-            except aiohttp.ClientResponseError as e:
+                async with self._attempt(attempted) as base:
+                    session = await self._get_session(base)
+                    try:
+                        async with session.request(
+                            method=method,
+                            url=f"{base.url}{path}",
+                            params=params,
+                            data=body,
+                            headers=headers,
+                            timeout=self._attempt_timeout(),
+                        ) as response:
+                            payload, wire_bytes_in = await self._read_body(response)
+                            self._stats.record_transfer(
+                                endpoint,
+                                bytes_out=bytes_out,
+                                bytes_in=len(payload),
+                                wire_bytes_out=len(body or b""),
+                                wire_bytes_in=wire_bytes_in,
+                            )
+                            return self._handle_response(response, payload), response.headers
+
+                    except aiohttp.ClientResponseError as e:
+                        raise raise_for_status(e.status, {}, None) from e
+
+                    except aiohttp.ClientConnectionError as e:
+                        raise NetworkError(f"Connection error: {e}") from e
+
+                    except asyncio.TimeoutError as e:
+                        raise self._timeout_error() from e
+
+            except DeadlineExceededError:
+                raise
+
+            except self._retryable as e:
                 last_error = e
-                if e.status < 500 or attempt == self._config.max_retries:
-                    raise raise_for_status(e.status, {}, None)
-                    
-            except aiohttp.ClientConnectorError as e:
-                last_error = NetworkError(f"Connection error: {e}")
-                if attempt == self._config.max_retries:
-                    raise last_error
-                    
-            except asyncio.TimeoutError as e:
-                last_error = TimeoutError(
-                    message="Request timed out",
-                    timeout=self._config.timeout,
-                )
                 if attempt == self._config.max_retries:
-                    raise last_error
+                    raise
+                check_backoff(self._config.retry_delay * (2 ** attempt), e)
 
             # Exponential backoff
             if attempt < self._config.max_retries:
+                self._stats.record_retry(endpoint)
                 delay = self._config.retry_delay * (2 ** attempt)
                 await asyncio.sleep(delay)
 
         raise last_error or ApiError("Request failed after retries")
 
-    async def _handle_response(self, response: aiohttp.ClientResponse) -> dict[str, Any]:
-        """Handle API response, raising appropriate exceptions."""
-        request_id = response.headers.get("X-Request-Id")
-        
-        try:
-            data = await response.json()
-        except Exception:
-            data = {}
+    def _attempt_timeout(self) -> aiohttp.ClientTimeout:
+        """Per-attempt timeout, clipped to the current deadline."""
+        return aiohttp.ClientTimeout(total=attempt_timeout(self._config.timeout))
+
+    def _timeout_error(self) -> TimeoutError:
+        """Error for a timed-out attempt: DeadlineExceededError once the deadline has passed."""
+        left = remaining()
+        if left is not None and left <= 0:
+            return DeadlineExceededError()
+        return TimeoutError(message="Request timed out", timeout=self._config.timeout)
 
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse) -> tuple[bytes, int]:
+        """Read and incrementally decode a response body, returning (body, wire size)."""
+        decoder = StreamingDecoder(response.headers.get("Content-Encoding"))
+        parts: list[bytes] = []
+        wire_bytes = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            wire_bytes += len(chunk)
+            parts.append(decoder.decompress(chunk))
+        parts.append(decoder.flush())
+        return b"".join(parts), wire_bytes
+
+    def _handle_response(
+        self,
+        response: aiohttp.ClientResponse,
+        payload: bytes,
+    ) -> bytes:
+        """Raise the matching SvgApiError for error responses, else return the body."""
         if response.status >= 400:
-            raise raise_for_status(response.status, data, request_id)
+            try:
+                data = self._config.json_codec.loads(payload)
+            except Exception:
+                data = {}
+            raise raise_for_status(response.status, data, response.headers.get("X-Request-Id"))
 
-        return data
+        return payload
 
+    def _decode(self, model: type[M], raw: bytes) -> M:
+        """Parse a response body into an SDK model (pydantic parses the raw bytes)."""
+        return self._config.json_codec.decode(raw, model)
+
+    @with_deadline
     async def get_icon(
         self,
         name: str,
@@ -218,6 +584,8 @@ class AsyncSvgApi:
         size: int | None = None,
         stroke: float | None = None,
         color: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> Icon:
         """Get a single icon by name (async)."""
         if size is not None and not validate_size(size):
@@ -239,15 +607,55 @@ class AsyncSvgApi:
                 code="INVALID_COLOR",
             )
 
+        spec = icon_spec(name, source, size, stroke, color)
+        key = spec_key(spec)
+        self._access.record(spec)
+        cached = self._cache.lookup(key)
+        if cached is not None:
+            icon, stale = cached
+            self._stats.record_cache_hit(ICON_ENDPOINT)
+            if stale:
+                self._schedule_refresh(key, spec)
+            return icon
+        self._names.raise_if_unknown(spec["source"], name)
+        return await self._fetch_icon(key, spec)
+
+    async def _fetch_icon(self, key: str, spec: dict[str, Any]) -> Icon:
+        """Fetch an icon from the API and cache it per its Cache-Control headers."""
         params = build_query_params({
-            "source": source,
-            "size": size,
-            "stroke": stroke,
-            "color": color,
+            "source": spec["source"],
+            "size": spec.get("size"),
+            "stroke": spec.get("stroke"),
+            "color": spec.get("color"),
         })
-        data = await self._request("GET", f"/icons/{name}", params=params)
-        return IconResponse(**data).data
+        try:
+            raw, headers = await self._send("GET", f"/icons/{spec['name']}", params=params)
+        except NotFoundError as e:
+            self._names.remember(spec["source"], spec["name"], e)
+            raise
+        icon = optimize_icon(self._config.optimizer, self._decode(IconResponse, raw).data)
+        freshness = parse_freshness(headers, self._config.cache_ttl)
+        if freshness is not None:
+            self._cache.set(key, icon, ttl=freshness[0], stale_ttl=freshness[1])
+        return icon
+
+    def _schedule_refresh(self, key: str, spec: dict[str, Any]) -> None:
+        """Refresh a stale cache entry in a background task, once per key."""
+        if key in self._refresh_tasks:
+            return
+        # Start from an empty context: the refresh outlives the caller, so it
+        # must not inherit the caller's deadline or priority lane.
+        task = contextvars.Context().run(asyncio.ensure_future, self._refresh(key, spec))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+
+    async def _refresh(self, key: str, spec: dict[str, Any]) -> None:
+        # On failure, keep serving the stale entry until it expires.
+        async with self._refresh_semaphore:
+            with priority(BULK), contextlib.suppress(SvgApiError):
+                await self._fetch_icon(key, spec)
 
+    @with_deadline
     async def get_icon_svg(
         self,
         name: str,
@@ -255,11 +663,14 @@ class AsyncSvgApi:
         size: int | None = None,
         stroke: float | None = None,
         color: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> str:
         """Get raw SVG content for an icon (async)."""
         icon = await self.get_icon(name, source, size, stroke, color)
         return icon.svg
 
+    @with_deadline
     async def download_icon(
         self,
         name: str,
@@ -268,10 +679,11 @@ class AsyncSvgApi:
         size: int | None = None,
         stroke: float | None = None,
         color: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> str:
         """Download an icon to a file (async)."""
         import aiofiles
-        import pathlib
 
         svg = await self.get_icon_svg(name, source, size, stroke, color)
         path_obj = pathlib.Path(path)
@@ -280,6 +692,7 @@ class AsyncSvgApi:
             await f.write(svg)
         return str(path_obj.absolute())
 
+    @with_deadline
     async def search(
         self,
         query: str,
@@ -287,6 +700,8 @@ class AsyncSvgApi:
         category: str | None = None,
         limit: int = 20,
         offset: int = 0,
+        *,
+        deadline: float | None = None,
     ) -> SearchResponse:
         """Search for icons (async)."""
         params = build_query_params({
@@ -296,91 +711,564 @@ class AsyncSvgApi:
             "limit": min(limit, 100),
             "offset": offset,
         })
-        data = await self._request("GET", "/search", params=params)
-        return SearchResponse(**data)
+        raw, _ = await self._send("GET", "/search", params=params)
+        return self._decode(SearchResponse, raw)
+
+    def iter_search(
+        self,
+        query: str,
+        source: str | None = None,
+        category: str | None = None,
+        page_size: int = 100,
+        max_results: int | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> AsyncIterator[SearchResult]:
+        """
+        Iterate over all search results, fetching pages as needed (async).
 
+        See SvgApi.iter_search().
+
+        Example:
+            >>> async for result in client.iter_search("arrow", deadline=2.0):
+            ...     print(result.name)
+        """
+        return self._iter_search(
+            query, source, category, page_size, max_results, expires_at(deadline)
+        )
+
+    async def _iter_search(
+        self,
+        query: str,
+        source: str | None,
+        category: str | None,
+        page_size: int,
+        max_results: int | None,
+        expiry: float | None,
+    ) -> AsyncIterator[SearchResult]:
+        offset = 0
+        yielded = 0
+        while max_results is None or yielded < max_results:
+            limit = page_size if max_results is None else min(page_size, max_results - yielded)
+            with deadline_at(expiry):
+                page = await self.search(query, source, category, limit=limit, offset=offset)
+            for result in page.data:
+                yield result
+            yielded += len(page.data)
+            offset += len(page.data)
+            if not page.meta.has_more or not page.data:
+                break
+
+    @with_deadline
     async def get_batch(
         self,
         icons: list[dict[str, Any]],
         defaults: dict[str, Any] | None = None,
+        *,
+        deadline: float | None = None,
     ) -> BatchResponse:
-        """Fetch multiple icons in a single request (async)."""
+        """Fetch multiple icons in a single request (async); see SvgApi.get_batch."""
+        icons, rejected = self._names.split_batch(icons, defaults)
+        if not icons:
+            return self._names.complete_batch(None, rejected)
+        response = await self._post_batch(icons, defaults)
+        for attempt in range(self._config.max_retries):
+            retry = batch_retry_entries(icons, defaults, response)
+            delay = calculate_retry_delay(attempt, self._config.retry_delay)
+            left = remaining()
+            if not retry or (left is not None and left <= delay):
+                break
+            self._stats.record_retry(BATCH_ENDPOINT)
+            await asyncio.sleep(delay)
+            try:
+                response = merge_batch_retry(response, await self._post_batch(retry, defaults))
+            except SvgApiError:
+                break  # keep the results already received
+        return self._names.complete_batch(response, rejected)
+
+    async def _post_batch(
+        self,
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None,
+    ) -> BatchResponse:
+        """Send one batch request and cache its successful results."""
+        body = self._batch_request(icons, defaults)
+        raw, headers = await self._send("POST", "/icons/batch", json=body)
+        response = optimize_batch(self._config.optimizer, self._decode(BatchResponse, raw))
+        cache_batch_response(
+            self._cache, icons, defaults, response, parse_freshness(headers, self._config.cache_ttl)
+        )
+        return response
+
+    @with_deadline
+    async def resolve_icon(
+        self,
+        name: str,
+        sources: Sequence[str],
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> Icon:
+        """
+        Get an icon from the first of several sources that has it (async).
+
+        See SvgApi.resolve_icon.
+        """
+        candidates = self._resolver.candidates(name, sources, size, stroke, color)
+        source = self._resolver.cached(candidates)
+        if source is not None:
+            return await self.get_icon(name, source, size, stroke, color)
+        # Served from cache when the most preferred source not known to lack it is cached
+        for spec in candidates:
+            if self._names.check(spec["source"], name) is None:
+                icon = self._cache.get(spec_key(spec))
+                if icon is not None:
+                    self._stats.record_cache_hit(ICON_ENDPOINT)
+                    self._resolver.remember(candidates, spec["source"])
+                    return icon
+                break
+        return self._resolver.pick(candidates, await self.get_batch(candidates))
+
+    @with_deadline
+    async def sample_icons(
+        self,
+        n: int,
+        source: str | None = None,
+        category: str | None = None,
+        seed: int | str | None = None,
+        weight: Weight | None = None,
+        index: Iterable[str] | None = None,
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> list[Icon]:
+        """Draw ``n`` distinct random icons with batch requests (async); see SvgApi.sample_icons."""
+        sampler = IconSampler(await self._sample_population(source, category, index), seed, weight)
+        if not len(sampler):
+            raise empty_selection(source, category)
+        icons: list[Icon] = []
+        for _ in range(SAMPLE_ROUNDS):
+            specs = sampler.take(n - len(icons), size, stroke, color)
+            if not specs:
+                break
+            icons.extend(await self._fetch_sample(specs))
+        return icons
+
+    async def _sample_population(
+        self,
+        source: str | None,
+        category: str | None,
+        index: Iterable[str] | None,
+    ) -> list[str]:
+        """Return the "source:name" keys sample_icons() draws from."""
+        if index is not None and category is None:
+            return filter_index(index, source)
+        snapshot = await self.metadata()
+        keys = snapshot.listings.get((source, category))
+        if keys is None:
+            keys = []
+            for query in listing_queries(snapshot, source, category):
+                async for result in self.iter_search(*query):
+                    if selected(result, source, category):
+                        keys.append(f"{result.source}:{result.name}")
+            snapshot.listings[(source, category)] = keys
+        return keys
+
+    async def _fetch_sample(self, specs: list[dict[str, Any]]) -> list[Icon]:
+        """Fetch drawn specs, from the cache where possible; icons that failed are left out."""
+        icons: dict[str, Icon] = {}
+        missing: list[dict[str, Any]] = []
+        for spec in specs:
+            icon = self._cache.get(spec_key(spec))
+            if icon is not None:
+                icons[spec_key(spec)] = icon
+            else:
+                missing.append(spec)
+        chunks = batch_chunks(missing)
+        responses = await gather_within_deadline(
+            *[self._limiter.acall(self.get_batch, chunk) for chunk in chunks]
+        )
+        for chunk, response in zip(chunks, responses, strict=True):
+            for spec in chunk:
+                item = response.data.get(f"{spec['source']}:{spec['name']}")
+                icon = batch_icon(spec, item) if item is not None else None
+                if icon is not None:
+                    icons[spec_key(spec)] = icon
+        return [icons[spec_key(spec)] for spec in specs if spec_key(spec) in icons]
+
+    @staticmethod
+    def _batch_request(
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None,
+    ) -> BatchRequestOptions:
+        """Build the batch request body from icon dicts."""
         icon_requests = [BatchIconRequest(**icon) for icon in icons]
         defaults_obj = BatchIconRequest(**defaults) if defaults else BatchIconRequest(name="")
-        batch_request = BatchRequestOptions(
+        return BatchRequestOptions(
             icons=icon_requests,
-            defaults=BatchIconRequest(
-                name="",
+            defaults=BatchDefaults(
                 size=defaults_obj.size or 24,
                 stroke=defaults_obj.stroke or 2,
             ),
         )
 
-        data = await self._request(
-            "POST",
-            "/icons/batch",
-            json=batch_request.model_dump(by_alias=True, exclude_none=True),
+    def stream_batch(
+        self,
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> AsyncBatchStream[tuple[str, BatchIconResult]]:
+        """
+        Fetch multiple icons, yielding each result as soon as it is parsed (async).
+
+        See SvgApi.stream_batch().
+
+        Example:
+            >>> async with client.stream_batch(icons) as stream:
+            ...     async for key, result in stream:
+            ...         print(key, result.success)
+        """
+        parser = BatchStreamParser()
+        return AsyncBatchStream(
+            parser, self._stream_batch(icons, defaults, parser, expires_at(deadline))
         )
-        return BatchResponse(**data)
 
-    async def get_sources(self) -> SourcesResponse:
-        """List all available icon sources (async)."""
-        data = await self._request("GET", "/sources")
-        return SourcesResponse(**data)
+    async def _open_stream(
+        self,
+        body: bytes | None,
+        bytes_out: int,
+        headers: dict[str, str],
+    ) -> aiohttp.ClientResponse:
+        """Send the batch request and return the response once its status is OK."""
+        last_error: Exception | None = None
+        attempted: list[Endpoint] = []
+        for attempt in range(self._config.max_retries + 1):
+            try:
+                with self._endpoint(attempted) as base:
+                    session = await self._get_session(base)
+                    try:
+                        response = await session.request(
+                            "POST",
+                            f"{base.url}/icons/batch",
+                            data=body,
+                            headers=headers,
+                            timeout=self._attempt_timeout(),
+                        )
+                    except aiohttp.ClientConnectionError as e:
+                        raise NetworkError(f"Connection error: {e}") from e
+                    except asyncio.TimeoutError as e:
+                        raise self._timeout_error() from e
+                    if response.status < 400:
+                        return response
+                    try:
+                        payload, wire_bytes_in = await self._read_body(response)
+                    finally:
+                        response.release()
+                    self._stats.record_transfer(
+                        BATCH_ENDPOINT, bytes_out, len(payload), len(body or b""), wire_bytes_in
+                    )
+                    self._handle_response(response, payload)
+            except DeadlineExceededError:
+                raise
+            except self._retryable as e:
+                last_error = e
+                if attempt == self._config.max_retries:
+                    raise
+                check_backoff(self._config.retry_delay * (2 ** attempt), e)
+            if attempt < self._config.max_retries:
+                self._stats.record_retry(BATCH_ENDPOINT)
+                await asyncio.sleep(self._config.retry_delay * (2 ** attempt))
+        raise last_error or ApiError("Request failed after retries")
+
+    async def _stream_batch(
+        self,
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None,
+        parser: BatchStreamParser,
+        expiry: float | None,
+    ) -> AsyncIterator[tuple[str, BatchIconResult]]:
+        headers: dict[str, str] = {}
+        body, bytes_out = self._encode_body(self._batch_request(icons, defaults), headers)
+        specs = batch_specs(icons, defaults)
+
+        start = time.perf_counter()
+        # The deadline scope must not stay set across yields, so it only wraps the open.
+        # The stream holds its lane slot (and connection) until it is closed.
+        with deadline_at(expiry):
+            lane = await self._lanes.acquire(current_lane(BULK))
+        try:
+            with deadline_at(expiry):
+                response = await self._open_stream(body, bytes_out, headers)
+        except Exception as e:
+            self._lanes.release(lane)
+            self._stats.record_request(BATCH_ENDPOINT, time.perf_counter() - start, e)
+            raise
+
+        freshness = parse_freshness(response.headers, self._config.cache_ttl)
+        decoder = StreamingDecoder(response.headers.get("Content-Encoding"))
+        wire_bytes_in = 0
+        error: Exception | None = None
+        try:
+            try:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    if expiry is not None and time.monotonic() >= expiry:
+                        raise DeadlineExceededError()
+                    wire_bytes_in += len(chunk)
+                    for key, item in parser.feed(decoder.decompress(chunk)):
+                        yield key, self._stream_item(key, item, specs, freshness)
+                for key, item in parser.feed(decoder.flush()) + parser.close():
+                    yield key, self._stream_item(key, item, specs, freshness)
+            except asyncio.TimeoutError as e:
+                with deadline_at(expiry):
+                    raise self._timeout_error() from e
+            except aiohttp.ClientError as e:
+                raise NetworkError(f"Batch stream interrupted: {e}") from e
+            except ValueError as e:
+                raise ApiError(f"Malformed batch response: {e}", code="INVALID_RESPONSE") from e
+        except SvgApiError as e:
+            error = e
+            raise
+        finally:
+            response.release()
+            self._lanes.release(lane)
+            self._stats.record_transfer(
+                BATCH_ENDPOINT, bytes_out, parser.bytes_fed, len(body or b""), wire_bytes_in
+            )
+            self._stats.record_request(BATCH_ENDPOINT, time.perf_counter() - start, error)
+
+    def _stream_item(
+        self,
+        key: str,
+        item: BatchIconResult,
+        specs: dict[str, list[dict[str, Any]]],
+        freshness: tuple[float, float] | None,
+    ) -> BatchIconResult:
+        """Optimize and cache one streamed batch result."""
+        if item.svg is not None and self._config.optimizer is not None:
+            item.svg = self._config.optimizer(item.svg)
+        for spec in specs.get(key, ()):
+            cache_batch_item(self._cache, spec, item, freshness)
+        return item
 
-    async def get_categories(self, source: str | None = None) -> CategoriesResponse:
-        """List all icon categories (async)."""
+    @with_deadline
+    async def get_sources(self, *, deadline: float | None = None) -> SourcesResponse:
+        """List all available icon sources (async), from the metadata snapshot."""
+        if self._metadata.ttl > 0:
+            return (await self.metadata()).sources
+        return await self._fetch_sources()
+
+    async def _fetch_sources(self) -> SourcesResponse:
+        raw, _ = await self._send("GET", "/sources")
+        return self._decode(SourcesResponse, raw)
+
+    @with_deadline
+    async def get_categories(
+        self,
+        source: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> CategoriesResponse:
+        """List all icon categories (async), from the metadata snapshot."""
+        if self._metadata.ttl <= 0:
+            return await self._fetch_categories(source)
+        snapshot = await self.metadata()
+        if source is None:
+            return snapshot.categories
+        categories = snapshot.filtered_categories.get(source)
+        if categories is None:
+            categories = await self._fetch_categories(source)
+            snapshot.filtered_categories[source] = categories
+        return categories
+
+    async def _fetch_categories(self, source: str | None = None) -> CategoriesResponse:
         params = build_query_params({"source": source})
-        data = await self._request("GET", "/categories", params=params)
-        return CategoriesResponse(**data)
+        raw, _ = await self._send("GET", "/categories", params=params)
+        return self._decode(CategoriesResponse, raw)
+
+    @with_deadline
+    async def metadata(
+        self,
+        refresh: bool = False,
+        *,
+        deadline: float | None = None,
+    ) -> MetadataSnapshot:
+        """
+        Get the snapshot of sources and categories, revalidating it when due (async).
+
+        See SvgApi.metadata(). Tasks calling while another one revalidates
+        get the current snapshot without waiting.
+        """
+        snapshot = self._metadata.fresh()
+        if snapshot is not None and not refresh:
+            return snapshot
+        stale = self._metadata.snapshot
+        if stale is not None and not refresh and self._metadata_lock.locked():
+            return stale
+        async with self._metadata_lock:
+            snapshot = self._metadata.fresh()
+            if snapshot is not None and not refresh:
+                return snapshot
+            try:
+                try:
+                    version: str | None = catalogue_version(
+                        await self._request("GET", VERSION_PATH)
+                    )
+                except NotFoundError:
+                    version = None
+                snapshot = None if refresh else self._metadata.current(version)
+                if snapshot is None:
+                    sources = await self._fetch_sources()
+                    categories = await self._fetch_categories()
+                    snapshot = self._metadata.install(version, sources, categories)
+                return snapshot
+            except SvgApiError:
+                stale = self._metadata.snapshot
+                if stale is None or refresh:
+                    raise
+                self._metadata.revalidated()
+                return stale
 
+    @with_deadline
     async def get_random(
         self,
         source: str | None = None,
         category: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> Icon:
         """Get a random icon (async)."""
         params = build_query_params({"source": source, "category": category})
-        data = await self._request("GET", "/random", params=params)
-        return IconResponse(**data).data
+        raw, _ = await self._send("GET", "/random", params=params)
+        return optimize_icon(self._config.optimizer, self._decode(IconResponse, raw).data)
 
+    @with_deadline
     async def get_batch_optimized(
         self,
         icons: list[dict[str, Any]],
         chunk_size: int = 50,
+        *,
+        deadline: float | None = None,
     ) -> list[Icon]:
         """
         Optimized batch fetching with concurrent requests.
-        
+
         Args:
             icons: List of icon request dictionaries
             chunk_size: Number of icons per batch request
-            
+            deadline: Time budget in seconds for the whole call, including retries
+
         Returns:
-            List of Icon objects
+            List of Icon objects for the icons that were found
         """
         if not icons:
             return []
-        
+
         # Split into chunks
-        chunks = [
-            icons[i:i + chunk_size] 
-            for i in range(0, len(icons), chunk_size)
-        ]
-        
-        # Process chunks concurrently
-        results = await asyncio.gather(
-            *[self.get_batch(chunk) for chunk in chunks],
-            return_exceptions=True
-        )
-        
+        chunks = [icons[i : i + chunk_size] for i in range(0, len(icons), chunk_size)]
+
+        # Process chunks concurrently in the bulk lane, as far as the adaptive
+        # limit allows; the first failure cancels the remaining chunks
+        with priority(BULK, override=False):
+            results = await gather_within_deadline(
+                *[self._limiter.acall(self.get_batch, chunk) for chunk in chunks]
+            )
+
         # Merge results
         all_icons: list[Icon] = []
         for result in results:
-            if isinstance(result, Exception):
-                raise result
-            for item in result.data:
-                if hasattr(item, 'svg'):
-                    all_icons.append(item)
-                    
+            for key, item in result.data.items():
+                source, _, name = key.partition(":")
+                icon = batch_icon({"name": name, "source": source}, item)
+                if icon is not None:
+                    all_icons.append(icon)
         return all_icons
+
+    @with_deadline
+    async def warm(
+        self,
+        top_k: int = 100,
+        hot_set: str | pathlib.Path | None = None,
+        related: int = 0,
+        *,
+        deadline: float | None = None,
+    ) -> int:
+        """
+        Prefetch the most frequently requested icons into the cache (async).
+
+        Batches of up to 50 icons are fetched concurrently, up to the
+        client's adaptive concurrency limit. See
+        SvgApi.warm() for the meaning of the arguments.
+
+        Returns:
+            Number of icons added to the cache
+        """
+        specs = merge_specs(load_hot_set(hot_set) if hot_set else [], self._access.top(top_k))
+        with priority(BULK, override=False):
+            if related > 0:
+                specs = merge_specs(specs, await self._related_specs(specs[:top_k], related))
+
+            missing = [spec for spec in specs if self._cache.get(spec_key(spec)) is None]
+            chunks = batch_chunks(missing)
+            responses = await gather_within_deadline(
+                *[self._limiter.acall(self.get_batch, chunk) for chunk in chunks]
+            )
+        return sum(
+            1
+            for chunk, response in zip(chunks, responses, strict=True)
+            for spec in chunk
+            if (item := response.data.get(f"{spec['source']}:{spec['name']}")) and item.success
+        )
+
+    def save_hot_set(self, path: str | pathlib.Path, top_k: int = 100) -> None:
+        """Persist the most frequently requested icon variants for a later warm()."""
+        dump_hot_set(path, self._access.top(top_k))
+
+    @property
+    def usage(self) -> AsyncUsageReporter:
+        """Background reporter of track_usage() events (created on first use)."""
+        if self._usage is None:
+            self._usage = AsyncUsageReporter(
+                self,
+                interval=self._config.usage_interval,
+                capacity=self._config.usage_buffer_size,
+            )
+        return self._usage
+
+    def track_usage(self, name: str, source: str, context: str | None = None) -> bool:
+        """
+        Report that an icon was used, without waiting for the network.
+
+        Call it on the client's event loop; a background task sends the
+        buffered events (see track_usage() of SvgApi).
+        """
+        return self.usage.record(name, source, context)
+
+    async def _related_specs(
+        self,
+        specs: list[dict[str, Any]],
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Collect related-icon hints; failures are ignored since hints are optional."""
+
+        async def _similar(spec: dict[str, Any]) -> list[dict[str, Any]]:
+            try:
+                data = await self._limiter.acall(
+                    self._request,
+                    "GET",
+                    f"/recommendations/similar/{spec['name']}",
+                    params=build_query_params({"source": spec["source"], "limit": limit}),
+                )
+            except SvgApiError:
+                return []
+            return [
+                {**spec, "name": item["name"], "source": item.get("source", spec["source"])}
+                for item in data.get("data", [])[:limit]
+            ]
+
+        hints = await asyncio.gather(*[_similar(spec) for spec in specs])
+        return [spec for group in hints for spec in group]
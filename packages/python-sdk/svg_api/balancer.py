@@ -0,0 +1,273 @@
+"""
+Load balancing and failover across several API base URLs.
+
+``EndpointPool`` tracks one ``Endpoint`` per base URL (for example regional
+mirrors). Requests go to the better of two randomly sampled healthy
+endpoints, scored by EWMA latency times requests in flight. An endpoint
+that fails ``eject_after`` times in a row is ejected; once its cool-down
+has passed, the client probes ``/health/ready`` on it in the background
+and re-admits it when the probe succeeds.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit, urlunsplit
+
+from svg_api.errors import (
+    DeadlineExceededError,
+    NetworkError,
+    ServiceUnavailableError,
+    SvgApiError,
+    TimeoutError,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+HEALTH_PATH = "/health/ready"
+# Timeout for a single health probe, in seconds.
+PROBE_TIMEOUT = 5.0
+
+
+def health_url(base_url: str) -> str:
+    """
+    Return the readiness URL for a base URL.
+
+    Health checks are served from the origin root, outside the versioned
+    API path.
+
+    Example:
+        >>> health_url("https://eu.svg-api.org/v1")
+        'https://eu.svg-api.org/health/ready'
+    """
+    parts = urlsplit(base_url)
+    return urlunsplit((parts.scheme, parts.netloc, HEALTH_PATH, "", ""))
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """Whether an error says something about the endpoint rather than the request."""
+    if isinstance(error, DeadlineExceededError):
+        return False
+    if isinstance(error, NetworkError | TimeoutError | ServiceUnavailableError):
+        return True
+    return (
+        isinstance(error, SvgApiError)
+        and error.status_code is not None
+        and error.status_code >= 500
+    )
+
+
+class Endpoint:
+    """Health and latency state for one base URL."""
+
+    __slots__ = (
+        "ejected_until",
+        "ejections",
+        "errors",
+        "failures",
+        "health_url",
+        "in_flight",
+        "latency",
+        "probing",
+        "requests",
+        "url",
+    )
+
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip("/")
+        self.health_url = health_url(self.url)
+        self.latency = 0.0
+        self.in_flight = 0
+        self.failures = 0
+        self.ejected_until: float | None = None
+        self.ejections = 0
+        self.probing = False
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def available(self) -> bool:
+        return self.ejected_until is None
+
+    def score(self, default_latency: float) -> float:
+        """Expected cost of sending one more request here (lower is better)."""
+        return (self.latency or default_latency) * (self.in_flight + 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "available": self.available,
+            "latency_ms": self.latency * 1000.0,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections,
+        }
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r}, available={self.available})"
+
+
+class EndpointPool:
+    """
+    Power-of-two-choices balancer with ejection and health-checked re-admission.
+
+    A pool with a single URL always returns it, so single-endpoint clients
+    behave exactly as before. Thread-safe.
+
+    Example:
+        >>> pool = EndpointPool(["https://eu.svg-api.org/v1", "https://us.svg-api.org/v1"])
+        >>> endpoint = pool.acquire()
+        >>> try:
+        ...     ...  # send the request to endpoint.url
+        ... finally:
+        ...     pool.release(endpoint, latency, error)
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        eject_after: int = 3,
+        eject_for: float = 10.0,
+        max_eject_for: float = 300.0,
+        smoothing: float = 0.3,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            urls: Base URLs; the first is the primary endpoint
+            eject_after: Consecutive failures that eject an endpoint
+            eject_for: Initial cool-down before an ejected endpoint is probed
+            max_eject_for: Upper bound for the cool-down, which doubles each
+                time a probe fails
+            smoothing: Weight of the newest latency sample in the EWMA
+        """
+        self.endpoints = [Endpoint(url) for url in dict.fromkeys(u.rstrip("/") for u in urls)]
+        if not self.endpoints:
+            raise ValueError("EndpointPool needs at least one base URL")
+        self.eject_after = max(1, eject_after)
+        self.eject_for = eject_for
+        self.max_eject_for = max_eject_for
+        self.smoothing = smoothing
+        self._cooldowns: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    @property
+    def primary(self) -> Endpoint:
+        return self.endpoints[0]
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def acquire(self, exclude: Sequence[Endpoint] = ()) -> Endpoint:
+        """
+        Pick an endpoint for one request attempt and count it as in flight.
+
+        Args:
+            exclude: Endpoints to avoid if any other is available (e.g. the
+                one the previous attempt failed on)
+
+        Returns:
+            The chosen endpoint. If every endpoint is ejected, the one whose
+            cool-down ends first is used rather than failing outright.
+        """
+        with self._lock:
+            endpoint = self._choose(exclude)
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _choose(self, exclude: Sequence[Endpoint]) -> Endpoint:
+        if len(self.endpoints) == 1:
+            return self.endpoints[0]
+        candidates = [e for e in self.endpoints if e.available and e not in exclude]
+        if not candidates:
+            candidates = [e for e in self.endpoints if e.available]
+        if not candidates:
+            return min(self.endpoints, key=lambda e: e.ejected_until or 0.0)
+        if len(candidates) == 1:
+            return candidates[0]
+        measured = [e.latency for e in candidates if e.latency]
+        # Unmeasured endpoints are assumed to be as fast as the fastest one, so they get tried.
+        default = min(measured) if measured else 1.0
+        first, second = self._random.sample(candidates, 2)
+        return first if first.score(default) <= second.score(default) else second
+
+    def release(
+        self,
+        endpoint: Endpoint,
+        latency: float,
+        error: BaseException | None = None,
+    ) -> None:
+        """
+        Record the outcome of an attempt started with acquire().
+
+        Only endpoint failures (network errors, timeouts, 5xx) count
+        towards ejection; a 404 or 429 says nothing about endpoint health.
+        """
+        with self._lock:
+            endpoint.in_flight -= 1
+            if error is not None and is_endpoint_failure(error):
+                endpoint.errors += 1
+                endpoint.failures += 1
+                if endpoint.available and endpoint.failures >= self.eject_after:
+                    self._eject(endpoint, self.eject_for)
+                return
+            endpoint.failures = 0
+            if error is None:
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency == 0.0
+                    else endpoint.latency + self.smoothing * (latency - endpoint.latency)
+                )
+
+    def _eject(self, endpoint: Endpoint, cooldown: float) -> None:
+        if len(self.endpoints) == 1:
+            return
+        endpoint.ejected_until = time.monotonic() + cooldown
+        endpoint.ejections += 1
+        self._cooldowns[endpoint.url] = cooldown
+
+    def due_for_probe(self) -> list[Endpoint]:
+        """
+        Return ejected endpoints whose cool-down has passed, marking them as probing.
+
+        The caller must report each probe with probe_result().
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                e
+                for e in self.endpoints
+                if e.ejected_until is not None and e.ejected_until <= now and not e.probing
+            ]
+            for endpoint in due:
+                endpoint.probing = True
+            return due
+
+    def probe_result(self, endpoint: Endpoint, ready: bool) -> None:
+        """Re-admit an endpoint after a successful probe, or extend its ejection."""
+        with self._lock:
+            endpoint.probing = False
+            if ready:
+                endpoint.ejected_until = None
+                endpoint.failures = 0
+                # Forget the old latency; the endpoint must earn its traffic again.
+                endpoint.latency = 0.0
+                self._cooldowns.pop(endpoint.url, None)
+            else:
+                previous = self._cooldowns.get(endpoint.url, self.eject_for)
+                cooldown = min(previous * 2, self.max_eject_for)
+                endpoint.ejected_until = time.monotonic() + cooldown
+                self._cooldowns[endpoint.url] = cooldown
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Return per-endpoint health and latency, in configuration order."""
+        with self._lock:
+            return [endpoint.to_dict() for endpoint in self.endpoints]
@@ -0,0 +1,84 @@
+"""
+Splitting batch requests and retrying their transient per-icon failures.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from svg_api.cache import batch_spec
+from svg_api.types import BatchResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Maximum icons per batch request.
+BATCH_LIMIT = 50
+# Per-icon batch error codes worth requesting again.
+TRANSIENT_BATCH_CODES = frozenset(
+    {"RATE_LIMITED", "INTERNAL_ERROR", "SERVICE_UNAVAILABLE", "TIMEOUT"}
+)
+
+
+def batch_chunks(
+    specs: Iterable[dict[str, Any]],
+    size: int = BATCH_LIMIT,
+) -> list[list[dict[str, Any]]]:
+    """
+    Split specs into batch requests.
+
+    Batch results are keyed by "source:name", so two variants of the same
+    icon never share a batch: the n-th variant of each icon goes into the
+    n-th group of batches.
+    """
+    groups: list[list[dict[str, Any]]] = []
+    variants: dict[str, int] = {}
+    for spec in specs:
+        name = f"{spec['source']}:{spec['name']}"
+        index = variants.get(name, 0)
+        variants[name] = index + 1
+        if index == len(groups):
+            groups.append([])
+        groups[index].append(spec)
+    return [group[i : i + size] for group in groups for i in range(0, len(group), size)]
+
+
+def batch_retry_entries(
+    icons: list[dict[str, Any]],
+    defaults: dict[str, Any] | None,
+    response: BatchResponse,
+) -> list[dict[str, Any]]:
+    """
+    Return the entries of a batch request worth sending again.
+
+    Those are entries that failed with a transient error code or got no
+    answer at all (neither a result nor an error). Entries that failed for
+    good, e.g. ICON_NOT_FOUND, are not. Entries without an explicit source
+    cannot be matched to a result and are never retried.
+    """
+    retry: list[dict[str, Any]] = []
+    for icon in icons:
+        spec = batch_spec(icon, defaults)
+        if spec is None:
+            continue
+        key = f"{spec['source']}:{spec['name']}"
+        error = response.errors.get(key)
+        unanswered = error is None and key not in response.data
+        if unanswered or (error is not None and error.code in TRANSIENT_BATCH_CODES):
+            retry.append(icon)
+    return retry
+
+
+def merge_batch_retry(response: BatchResponse, retry: BatchResponse) -> BatchResponse:
+    """Return ``response`` with the results of a retry request taking precedence."""
+    data = {**response.data, **retry.data}
+    errors = {key: error for key, error in response.errors.items() if key not in retry.data}
+    errors.update(retry.errors)
+    successful = sum(1 for item in data.values() if item.success)
+    return BatchResponse(
+        data=data,
+        errors=errors,
+        meta=response.meta.model_copy(
+            update={"successful": successful, "failed": response.meta.requested - successful}
+        ),
+    )
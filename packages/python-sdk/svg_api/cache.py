@@ -0,0 +1,405 @@
+"""
+In-memory icon cache and access-frequency tracking for the SVG API SDK.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from svg_api.types import Icon
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from svg_api.types import BatchIconResult, BatchResponse
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_SIZE = 500
+DEFAULT_CACHE_TTL = 3600.0
+
+
+def icon_spec(
+    name: str,
+    source: str,
+    size: int | None = None,
+    stroke: float | None = None,
+    color: str | None = None,
+) -> dict[str, Any]:
+    """Build a batch-style icon spec, omitting unset options."""
+    spec: dict[str, Any] = {"name": name, "source": source}
+    if size is not None:
+        spec["size"] = size
+    if stroke is not None:
+        spec["stroke"] = stroke
+    if color is not None:
+        spec["color"] = color
+    return spec
+
+
+def spec_key(spec: dict[str, Any]) -> str:
+    """
+    Return the cache key for an icon spec.
+
+    Example:
+        >>> spec_key({"name": "home", "source": "lucide", "size": 32})
+        'lucide:home?size=32'
+    """
+    key = f"{spec['source']}:{spec['name']}"
+    options = "&".join(
+        f"{option}={spec[option]}"
+        for option in ("size", "stroke", "color")
+        if spec.get(option) is not None
+    )
+    return f"{key}?{options}" if options else key
+
+
+def parse_freshness(
+    headers: Mapping[str, str],
+    default_ttl: float,
+) -> tuple[float, float] | None:
+    """
+    Derive cache lifetimes from ``Cache-Control`` and ``Age`` response headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+        default_ttl: Freshness lifetime when the response has no max-age
+
+    Returns:
+        (fresh_for, stale_for) in seconds, or None if the response must not
+        be cached. ``stale_for`` is the stale-while-revalidate window that
+        follows the fresh period.
+    """
+    directives: dict[str, str] = {}
+    for part in (headers.get("Cache-Control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip().strip('"')
+
+    if "no-store" in directives:
+        return None
+
+    def _seconds(value: str | None) -> float | None:
+        try:
+            return max(float(value), 0.0) if value is not None else None
+        except ValueError:
+            return None
+
+    max_age = _seconds(directives.get("s-maxage", directives.get("max-age")))
+    fresh_for = default_ttl if max_age is None else max_age
+    if "no-cache" in directives:
+        fresh_for = 0.0
+    age = _seconds(headers.get("Age")) or 0.0
+    stale_for = _seconds(directives.get("stale-while-revalidate")) or 0.0
+
+    fresh_for -= age
+    if fresh_for < 0:
+        stale_for = max(stale_for + fresh_for, 0.0)
+        fresh_for = 0.0
+    return fresh_for, stale_for
+
+
+class IconCache(Generic[T]):
+    """
+    Thread-safe LRU cache with per-entry freshness and a stale window.
+
+    An entry is fresh for ``ttl`` seconds and may then be served stale for
+    ``stale_ttl`` more seconds while the caller refreshes it in the
+    background (stale-while-revalidate).
+
+    Args:
+        max_entries: Maximum number of entries (0 disables the cache)
+        ttl: Default freshness lifetime in seconds
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> T | None:
+        """Return a fresh entry, or None if missing or no longer fresh."""
+        found = self.lookup(key)
+        if found is None or found[1]:
+            return None
+        return found[0]
+
+    def lookup(self, key: str) -> tuple[T, bool] | None:
+        """
+        Return ``(value, is_stale)`` for a usable entry, or None.
+
+        Entries past their stale window are removed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            fresh_until, stale_until, value = entry
+            now = time.monotonic()
+            if now >= stale_until:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value, now >= fresh_until
+
+    def set(
+        self,
+        key: str,
+        value: T,
+        ttl: float | None = None,
+        stale_ttl: float = 0.0,
+    ) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Freshness lifetime in seconds (default: the cache ttl)
+            stale_ttl: Seconds the entry may be served stale after that
+        """
+        if self.max_entries <= 0:
+            return
+        fresh_until = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (fresh_until, fresh_until + stale_ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class FrequencySketch:
+    """
+    Count-min sketch with conservative update and periodic aging.
+
+    Memory is fixed at ``width * depth`` 32-bit counters regardless of how
+    many distinct keys are seen. Every ``sample_size`` additions all counters
+    are halved, so the sketch tracks recent popularity rather than all-time
+    totals.
+    """
+
+    def __init__(self, width: int = 4096, depth: int = 4, sample_size: int | None = None) -> None:
+        self._width = width
+        self._rows = [array("I", [0]) * width for _ in range(depth)]
+        self._sample_size = sample_size or width * 10
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        return [hash((row, key)) % self._width for row in range(len(self._rows))]
+
+    def add(self, key: str) -> int:
+        """Count one occurrence of ``key`` and return its new estimate."""
+        indexes = self._indexes(key)
+        estimate = min(row[i] for row, i in zip(self._rows, indexes, strict=True)) + 1
+        for row, i in zip(self._rows, indexes, strict=True):
+            if row[i] < estimate:
+                row[i] = estimate
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """Return the estimated count for ``key``."""
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key), strict=True))
+
+    def _age(self) -> None:
+        for row in self._rows:
+            for i in range(self._width):
+                row[i] >>= 1
+        self._additions //= 2
+
+
+class AccessTracker:
+    """
+    Bounded record of which icon specs are requested most often.
+
+    Combines a FrequencySketch with a small candidate table that keeps the
+    ``capacity`` keys with the highest estimates, so ``top()`` never needs
+    to scan every key ever seen.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = capacity
+        self._sketch = FrequencySketch()
+        self._candidates: dict[str, tuple[int, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, spec: dict[str, Any]) -> None:
+        """Count one access to an icon spec."""
+        key = spec_key(spec)
+        with self._lock:
+            estimate = self._sketch.add(key)
+            if key in self._candidates or len(self._candidates) < self.capacity:
+                self._candidates[key] = (estimate, spec)
+                return
+            coldest = min(self._candidates, key=lambda k: self._candidates[k][0])
+            if self._candidates[coldest][0] < estimate:
+                del self._candidates[coldest]
+                self._candidates[key] = (estimate, spec)
+
+    def top(self, k: int) -> list[dict[str, Any]]:
+        """Return the ``k`` most frequently requested specs, hottest first."""
+        with self._lock:
+            ranked = sorted(
+                self._candidates.items(),
+                key=lambda item: self._sketch.estimate(item[0]),
+                reverse=True,
+            )
+        return [spec for _, (_, spec) in ranked[:k]]
+
+    def clear(self) -> None:
+        """Forget all recorded accesses."""
+        with self._lock:
+            self._sketch = FrequencySketch()
+            self._candidates.clear()
+
+
+def batch_spec(spec: dict[str, Any], defaults: dict[str, Any] | None) -> dict[str, Any] | None:
+    """
+    Return the effective spec of a batch entry, or None if it cannot be keyed.
+
+    Entries without an explicit source are skipped because the server picks
+    the default source for them.
+    """
+    if not spec.get("source"):
+        return None
+    defaults = defaults or {}
+    return icon_spec(
+        spec["name"],
+        spec["source"],
+        spec.get("size") if spec.get("size") is not None else defaults.get("size"),
+        spec.get("stroke") if spec.get("stroke") is not None else defaults.get("stroke"),
+        spec.get("color"),
+    )
+
+
+def batch_specs(
+    icons: Iterable[dict[str, Any]],
+    defaults: dict[str, Any] | None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Group the effective specs of a batch request by result key ("source:name")."""
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for spec in icons:
+        effective = batch_spec(spec, defaults)
+        if effective is not None:
+            grouped.setdefault(f"{effective['source']}:{effective['name']}", []).append(effective)
+    return grouped
+
+
+def batch_icon(spec: dict[str, Any], item: BatchIconResult) -> Icon | None:
+    """
+    Build an Icon from a successful batch result, or return None.
+
+    Batch results carry no tags or license, so only name, source, category
+    and svg are set.
+    """
+    if not item.success or item.svg is None:
+        return None
+    return Icon(
+        name=item.name or spec["name"],
+        source=item.source or spec["source"],
+        category=item.category,
+        svg=item.svg,
+    )
+
+
+def cache_batch_item(
+    cache: IconCache[Icon],
+    spec: dict[str, Any],
+    item: BatchIconResult,
+    freshness: tuple[float, float] | None,
+) -> bool:
+    """
+    Store one successful batch result under the cache key of ``spec``.
+
+    Returns:
+        True if the result was cached
+    """
+    icon = batch_icon(spec, item) if freshness is not None else None
+    if icon is None or freshness is None:
+        return False
+    cache.set(spec_key(spec), icon, ttl=freshness[0], stale_ttl=freshness[1])
+    return True
+
+
+def cache_batch_response(
+    cache: IconCache[Icon],
+    icons: Iterable[dict[str, Any]],
+    defaults: dict[str, Any] | None,
+    response: BatchResponse,
+    freshness: tuple[float, float] | None = (DEFAULT_CACHE_TTL, 0.0),
+) -> int:
+    """
+    Store the successful results of a batch response in ``cache``.
+
+    Batch results carry no tags or license, so the cached Icon objects only
+    have name, source, category and svg set.
+
+    Args:
+        cache: Destination cache
+        icons: Icon specs as sent in the batch request
+        defaults: Batch defaults as sent in the request
+        response: Parsed batch response
+        freshness: (fresh_for, stale_for) from parse_freshness(); None
+            skips caching
+
+    Returns:
+        Number of icons cached
+    """
+    if freshness is None:
+        return 0
+    cached = 0
+    for key, specs in batch_specs(icons, defaults).items():
+        item = response.data.get(key)
+        if item is None:
+            continue
+        cached += sum(cache_batch_item(cache, spec, item, freshness) for spec in specs)
+    return cached
+
+
+def load_hot_set(path: str | pathlib.Path) -> list[dict[str, Any]]:
+    """Load icon specs saved by dump_hot_set(); returns [] if the file is missing."""
+    path_obj = pathlib.Path(path)
+    if not path_obj.exists():
+        return []
+    data = json.loads(path_obj.read_text(encoding="utf-8"))
+    return [spec for spec in data.get("icons", []) if spec.get("name") and spec.get("source")]
+
+
+def dump_hot_set(path: str | pathlib.Path, specs: Iterable[dict[str, Any]]) -> None:
+    """Persist icon specs so a later process can warm its cache from them."""
+    path_obj = pathlib.Path(path)
+    path_obj.parent.mkdir(parents=True, exist_ok=True)
+    path_obj.write_text(json.dumps({"icons": list(specs)}, indent=2), encoding="utf-8")
+
+
+def merge_specs(*groups: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Concatenate spec lists, dropping duplicates while keeping order."""
+    merged: dict[str, dict[str, Any]] = {}
+    for group in groups:
+        for spec in group:
+            merged.setdefault(spec_key(spec), spec)
+    return list(merged.values())
@@ -0,0 +1,710 @@
+"""
+Command-line interface for bulk icon operations.
+
+Installed as the ``svg-api`` console script (also ``python -m svg_api``)::
+
+    svg-api fetch lucide:home heroicons:star -o icons/
+    svg-api search arrow --limit 50 --json
+    svg-api export manifest.json icons.zip
+    svg-api sync mirror/ --source lucide
+
+Icons are fetched in batches of 50, as many in flight as the client's
+adaptive limiter allows, and fetched SVGs are kept in an on-disk cache so
+repeated runs only download what changed. Progress goes to stderr; with
+``--json`` a summary of throughput and failures is printed to stdout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import contextvars
+import hashlib
+import io
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, TextIO
+
+from svg_api.batch import batch_chunks
+from svg_api.cache import icon_spec, spec_key
+from svg_api.deadlines import deadline
+from svg_api.errors import SvgApiError
+from svg_api.export import ExportJob, ExportProgress, icon_path
+from svg_api.sync import BATCH_CHUNK_SIZE, write_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from svg_api.client import SvgApi
+
+DEFAULT_SOURCE = "heroicons"
+# Icons change rarely, so the disk cache keeps them longer than the in-memory one.
+DEFAULT_DISK_CACHE_TTL = 86400.0
+EXPORT_FORMATS = ("dir", "zip", "sprite")
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def default_cache_dir() -> pathlib.Path:
+    """Return ``$SVG_API_CACHE_DIR``, else ``$XDG_CACHE_HOME/svg-api`` or ``~/.cache/svg-api``."""
+    if os.environ.get("SVG_API_CACHE_DIR"):
+        return pathlib.Path(os.environ["SVG_API_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "svg-api"
+
+
+class DiskCache:
+    """
+    SVG bodies stored as files, keyed by cache.spec_key().
+
+    Entries older than ``ttl`` seconds (by file modification time) are
+    treated as missing and overwritten on the next fetch.
+    """
+
+    def __init__(self, directory: str | pathlib.Path, ttl: float = DEFAULT_DISK_CACHE_TTL) -> None:
+        self.directory = pathlib.Path(directory)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> pathlib.Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / "icons" / digest[:2] / f"{digest}.svg"
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def set(self, key: str, svg: str) -> None:
+        # A read-only or full cache directory must not fail the command.
+        with contextlib.suppress(OSError):
+            write_atomic(self._path(key), svg)
+
+
+class Progress:
+    """Single-line progress report on stderr, redrawn in place on a terminal."""
+
+    def __init__(self, label: str, total: int | None = None, stream: TextIO | None = None) -> None:
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._stream = stream
+        self._tty = stream is not None and stream.isatty()
+        self.eta: float | None = None
+        self._started = time.perf_counter()
+        self._last_draw = 0.0
+        self._lock = threading.Lock()
+
+    def advance(self, done: int, failed: int = 0) -> None:
+        with self._lock:
+            self.done += done
+            self.failed += failed
+            self._draw()
+
+    def update(self, done: int, failed: int, eta: float | None = None) -> None:
+        """Set absolute counts, with an ETA in seconds if the caller measures one."""
+        with self._lock:
+            self.done = done
+            self.failed = failed
+            self.eta = eta
+            self._draw()
+
+    def note(self, text: str) -> None:
+        """Show free-form progress (for operations without an icon count)."""
+        with self._lock:
+            self._write(f"{self.label}: {text}")
+
+    def _draw(self, final: bool = False) -> None:
+        now = time.perf_counter()
+        # Redraw at most every 100ms on a terminal; elsewhere only the final line.
+        if not final and (not self._tty or now - self._last_draw < 0.1):
+            return
+        self._last_draw = now
+        rate = self.done / max(now - self._started, 1e-9)
+        total = f"/{self.total}" if self.total is not None else ""
+        failed = f", {self.failed} failed" if self.failed else ""
+        eta = f", ETA {_duration(self.eta)}" if self.eta is not None and not final else ""
+        self._write(f"{self.label}: {self.done}{total} icons{failed} ({rate:.0f}/s{eta})")
+
+    def _write(self, line: str) -> None:
+        if self._stream is None:
+            return
+        if self._tty:
+            self._stream.write(f"\r\033[K{line}")
+        else:
+            self._stream.write(f"{line}\n")
+        self._stream.flush()
+
+    def finish(self) -> None:
+        with self._lock:
+            if self.total is not None or self.done:
+                self._draw(final=True)
+            if self._tty and self._stream is not None:
+                self._stream.write("\n")
+                self._stream.flush()
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class FetchResult:
+    """
+    SVG bodies and failures for a set of icon specs.
+
+    Attributes:
+        svgs: SVG bodies keyed by cache.spec_key()
+        failed: Error messages keyed by cache.spec_key()
+        cached: Icons served from the disk cache
+        fetched: Icons downloaded from the API
+    """
+
+    def __init__(self) -> None:
+        self.svgs: dict[str, str] = {}
+        self.failed: dict[str, str] = {}
+        self.cached = 0
+        self.fetched = 0
+
+
+def fetch_svgs(
+    client: SvgApi,
+    specs: Sequence[dict[str, Any]],
+    cache: DiskCache | None = None,
+    progress: Progress | None = None,
+) -> FetchResult:
+    """
+    Fetch SVG bodies for icon specs with concurrent batch requests.
+
+    Batches run on ``client.limiter.max_limit`` threads and go through the
+    client's adaptive limiter, so overloaded batches are retried with
+    backoff. Failures are collected rather than raised.
+    """
+    result = FetchResult()
+    missing: dict[str, dict[str, Any]] = {}
+    for spec in specs:
+        key = spec_key(spec)
+        if key in result.svgs or key in missing:
+            continue
+        svg = cache.get(key) if cache is not None else None
+        if svg is not None:
+            result.svgs[key] = svg
+            result.cached += 1
+        else:
+            missing[key] = {k: v for k, v in spec.items() if k != "id"}
+    if progress is not None:
+        progress.total = len(result.svgs) + len(missing)
+        progress.advance(result.cached)
+
+    def _fetch(chunk: list[dict[str, Any]]) -> dict[str, str | SvgApiError]:
+        try:
+            response = client.limiter.call(client.get_batch, chunk)
+        except SvgApiError as e:
+            return {spec_key(spec): e for spec in chunk}
+        bodies: dict[str, str | SvgApiError] = {}
+        for spec in chunk:
+            name = f"{spec['source']}:{spec['name']}"
+            item = response.data.get(name)
+            if item is not None and item.success and item.svg is not None:
+                bodies[spec_key(spec)] = item.svg
+            else:
+                error = response.errors.get(name)
+                bodies[spec_key(spec)] = SvgApiError(
+                    error.message if error else "Missing from batch response",
+                    code=error.code if error else None,
+                )
+        return bodies
+
+    chunks = batch_chunks(missing.values())
+    with ThreadPoolExecutor(max_workers=max(1, client.limiter.max_limit)) as executor:
+        # Run each batch in a copy of this context so a --deadline applies in the workers.
+        futures = [
+            executor.submit(contextvars.copy_context().run, _fetch, chunk) for chunk in chunks
+        ]
+        for future in futures:
+            bodies = future.result()
+            failed = 0
+            for key, body in bodies.items():
+                if isinstance(body, SvgApiError):
+                    result.failed[key] = body.message
+                    failed += 1
+                    continue
+                result.svgs[key] = body
+                result.fetched += 1
+                if cache is not None:
+                    cache.set(key, body)
+            if progress is not None:
+                progress.advance(len(bodies) - failed, failed)
+    return result
+
+
+# -- manifests and output paths ---------------------------------------------
+
+
+def parse_icon(text: str, source: str, options: dict[str, Any]) -> dict[str, Any]:
+    """Parse ``name`` or ``source:name`` into an icon spec."""
+    prefix, sep, name = text.strip().rpartition(":")
+    if not name:
+        raise ValueError(f"Invalid icon {text!r}; expected 'name' or 'source:name'")
+    return icon_spec(name, prefix if sep else source, **options)
+
+
+def load_manifest(path: str, source: str, options: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Read icon specs from a manifest file ("-" for stdin).
+
+    Accepted formats: a JSON list of specs, a JSON object with an "icons"
+    list (as written by ``save_hot_set()``), or plain text with one
+    ``name`` or ``source:name`` per line (``#`` starts a comment).
+    Options given on the command line fill in what a spec leaves unset.
+    """
+    text = sys.stdin.read() if path == "-" else pathlib.Path(path).read_text(encoding="utf-8")
+    stripped = text.lstrip()
+    if stripped.startswith(("[", "{")):
+        data = json.loads(text)
+        entries = data.get("icons", []) if isinstance(data, dict) else data
+        specs = []
+        for entry in entries:
+            if isinstance(entry, str):
+                specs.append(parse_icon(entry, source, options))
+            elif isinstance(entry, dict) and entry.get("name"):
+                specs.append({"source": source, **options, **entry})
+            else:
+                raise ValueError(f"Invalid manifest entry: {entry!r}")
+        return specs
+    return [
+        parse_icon(line, source, options)
+        for line in (raw.split("#", 1)[0].strip() for raw in text.splitlines())
+        if line
+    ]
+
+
+# -- summary ------------------------------------------------------------------
+
+
+def summarize(
+    command: str,
+    client: SvgApi,
+    elapsed: float,
+    **fields: Any,
+) -> dict[str, Any]:
+    """Build the machine-readable summary printed with ``--json``."""
+    totals = client.stats()["totals"]
+    icons = fields.get("fetched", 0) + fields.get("cached", 0)
+    return {
+        "command": command,
+        **fields,
+        "elapsed": round(elapsed, 3),
+        "icons_per_second": round(icons / elapsed, 1) if elapsed > 0 else None,
+        "requests": totals["requests"],
+        "retries": totals["retries"],
+        "errors": totals["error_count"],
+        "bytes_in": totals["bytes_in"],
+        "wire_bytes_in": totals["wire_bytes_in"],
+        "latency_ms": totals["latency_ms"],
+        "concurrency_limit": client.limiter.limit,
+    }
+
+
+def _report(args: argparse.Namespace, summary: dict[str, Any], line: str) -> int:
+    failed: dict[str, str] = summary.get("failed", {})
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    if not args.quiet:
+        print(line, file=sys.stderr)
+        for key, message in list(failed.items())[:20]:
+            print(f"  failed {key}: {message}", file=sys.stderr)
+        if len(failed) > 20:
+            print(f"  ... and {len(failed) - 20} more", file=sys.stderr)
+    return EXIT_FAILURES if failed else EXIT_OK
+
+
+# -- commands -------------------------------------------------------------------
+
+
+def _variant_options(args: argparse.Namespace) -> dict[str, Any]:
+    return {"size": args.size, "stroke": args.stroke, "color": args.color}
+
+
+def _disk_cache(args: argparse.Namespace) -> DiskCache | None:
+    if args.no_cache:
+        return None
+    return DiskCache(args.cache_dir or default_cache_dir(), args.cache_ttl)
+
+
+def _progress(args: argparse.Namespace, label: str) -> Progress:
+    return Progress(label, stream=None if args.quiet else sys.stderr)
+
+
+def cmd_fetch(client: SvgApi, args: argparse.Namespace) -> int:
+    options = _variant_options(args)
+    specs = [parse_icon(icon, args.source, options) for icon in args.icons]
+    if args.input:
+        specs += load_manifest(args.input, args.source, options)
+    if not specs:
+        raise ValueError("No icons given; pass names or --input FILE")
+
+    started = time.perf_counter()
+    progress = _progress(args, "fetch")
+    result = fetch_svgs(client, specs, _disk_cache(args), progress)
+    progress.finish()
+
+    output = pathlib.Path(args.output)
+    written = 0
+    for spec in specs:
+        svg = result.svgs.get(spec_key(spec))
+        if svg is not None:
+            write_atomic(output / icon_path(spec, args.flat), svg)
+            written += 1
+    elapsed = time.perf_counter() - started
+    summary = summarize(
+        "fetch",
+        client,
+        elapsed,
+        icons=len(specs),
+        fetched=result.fetched,
+        cached=result.cached,
+        written=written,
+        failed=result.failed,
+    )
+    return _report(
+        args,
+        summary,
+        f"Wrote {written} icons to {output} in {elapsed:.1f}s "
+        f"({result.fetched} fetched, {result.cached} from cache, {len(result.failed)} failed)",
+    )
+
+
+def cmd_search(client: SvgApi, args: argparse.Namespace) -> int:
+    results = list(
+        client.iter_search(
+            args.query,
+            source=args.source,
+            category=args.category,
+            page_size=min(args.limit, 100),
+            max_results=args.limit,
+        )
+    )
+    if args.json:
+        print(json.dumps([result.model_dump(mode="json") for result in results], indent=2))
+    else:
+        for result in results:
+            category = f"  [{result.category}]" if result.category else ""
+            print(f"{result.source}:{result.name}  {result.score:.2f}{category}")
+    if not args.quiet:
+        print(f"{len(results)} results", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_export(client: SvgApi, args: argparse.Namespace) -> int:
+    specs = load_manifest(args.manifest, args.source, _variant_options(args))
+    output = pathlib.Path(args.output)
+    fmt = args.format or {".zip": "zip", ".svg": "sprite"}.get(output.suffix.lower(), "dir")
+    if fmt == "dir":
+        return _export_dir(client, args, specs, output)
+
+    started = time.perf_counter()
+    progress = _progress(args, "export")
+    result = fetch_svgs(client, specs, _disk_cache(args), progress)
+    progress.finish()
+
+    if fmt == "sprite":
+        from svg_api.sprite import SpriteBuilder
+
+        sprite = SpriteBuilder(client).assemble(specs, result.svgs)
+        sprite.write(output, args.json_sprite)
+        written = len(sprite.symbols)
+    elif fmt == "zip":
+        buffer = io.BytesIO()
+        written = 0
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for path, svg in _export_files(specs, result.svgs, args.flat):
+                archive.writestr(path, svg)
+                written += 1
+        write_atomic(output, buffer.getvalue())
+
+    elapsed = time.perf_counter() - started
+    summary = summarize(
+        "export",
+        client,
+        elapsed,
+        format=fmt,
+        output=str(output),
+        icons=len(specs),
+        fetched=result.fetched,
+        cached=result.cached,
+        written=written,
+        failed=result.failed,
+    )
+    return _report(
+        args,
+        summary,
+        f"Exported {written} icons to {output} ({fmt}) in {elapsed:.1f}s "
+        f"({result.fetched} fetched, {result.cached} from cache, {len(result.failed)} failed)",
+    )
+
+
+def _export_dir(
+    client: SvgApi,
+    args: argparse.Namespace,
+    specs: list[dict[str, Any]],
+    output: pathlib.Path,
+) -> int:
+    """Export into a directory with a resumable ExportJob (journal in the directory)."""
+    started = time.perf_counter()
+    progress = _progress(args, "export")
+    progress.total = len(specs)
+
+    def _update(state: ExportProgress) -> None:
+        progress.total = state.total
+        progress.update(state.done, state.failed, state.eta)
+
+    result = ExportJob(client, specs, output, flat=args.flat).run(_update)
+    progress.finish()
+
+    elapsed = time.perf_counter() - started
+    summary = summarize(
+        "export",
+        client,
+        elapsed,
+        format="dir",
+        output=str(output),
+        icons=result.total,
+        fetched=result.fetched,
+        verified=result.verified,
+        written=result.fetched,
+        failed=result.failed,
+    )
+    return _report(
+        args,
+        summary,
+        f"Exported {result.fetched} icons to {output} (dir) in {elapsed:.1f}s "
+        f"({result.verified} already up to date, {len(result.failed)} failed)",
+    )
+
+
+def _export_files(
+    specs: Iterable[dict[str, Any]],
+    svgs: dict[str, str],
+    flat: bool,
+) -> Iterable[tuple[str, str]]:
+    seen: set[str] = set()
+    for spec in specs:
+        path = icon_path(spec, flat)
+        svg = svgs.get(spec_key(spec))
+        if svg is not None and path not in seen:
+            seen.add(path)
+            yield path, svg
+
+
+def cmd_sync(client: SvgApi, args: argparse.Namespace) -> int:
+    from svg_api.sync import CatalogueSync
+
+    engine = CatalogueSync(
+        client,
+        args.directory,
+        sources=args.sources or None,
+        chunk_size=args.chunk_size,
+    )
+    progress = _progress(args, "sync")
+    stop = threading.Event()
+
+    def _tick() -> None:
+        # CatalogueSync has no progress hook, so report request counts instead.
+        while not stop.wait(1.0):
+            totals = client.stats()["totals"]
+            progress.note(f"{totals['requests']} requests, {totals['error_count']} errors")
+
+    ticker = threading.Thread(target=_tick, daemon=True)
+    ticker.start()
+    try:
+        result = engine.run(force=args.force)
+    finally:
+        stop.set()
+        ticker.join()
+        progress.finish()
+
+    summary = summarize("sync", client, result.elapsed, **result.to_dict())
+    return _report(
+        args,
+        summary,
+        f"Synced {args.directory} in {result.elapsed:.1f}s ({result.fetched} fetched, "
+        f"{result.updated} updated, {result.deleted} deleted, {len(result.failed)} failed, "
+        f"{result.sources_skipped}/{result.sources_checked} sources unchanged)",
+    )
+
+
+# -- argument parsing -----------------------------------------------------------
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the ``svg-api`` argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="svg-api",
+        description="Fetch, search, export and mirror icons from the SVG API.",
+    )
+    parser.add_argument(
+        "-k",
+        "--api-key",
+        default=os.environ.get("SVG_API_KEY"),
+        help="API key (default: $SVG_API_KEY)",
+    )
+    parser.add_argument(
+        "-b",
+        "--base-url",
+        action="append",
+        dest="base_urls",
+        metavar="URL",
+        help="API base URL; repeat for mirrors (default: $SVG_API_BASE_URL)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Per-request timeout in seconds (default: 30)"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Upper bound for concurrent batch requests (default: 16)",
+    )
+    parser.add_argument(
+        "--deadline", type=float, help="Time budget in seconds for the whole command"
+    )
+    parser.add_argument(
+        "--cache-dir", type=pathlib.Path, help="Disk cache directory (default: ~/.cache/svg-api)"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_DISK_CACHE_TTL,
+        help="Seconds a cached icon stays valid (default: 86400)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the disk cache")
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="No progress or summary on stderr"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print machine-readable output on stdout"
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    def variant_options(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument(
+            "-s",
+            "--source",
+            default=DEFAULT_SOURCE,
+            help=f"Source for icons given without one (default: {DEFAULT_SOURCE})",
+        )
+        sub.add_argument("--size", type=int, help="Icon size in pixels")
+        sub.add_argument("--stroke", type=float, help="Stroke width")
+        sub.add_argument("--color", help="Icon color")
+        sub.add_argument(
+            "--flat", action="store_true", help="Do not create a subdirectory per source"
+        )
+
+    fetch = commands.add_parser("fetch", help="Download icons into a directory")
+    fetch.add_argument("icons", nargs="*", metavar="ICON", help="'name' or 'source:name'")
+    fetch.add_argument(
+        "-i", "--input", metavar="FILE", help="Read more icons from a manifest ('-' for stdin)"
+    )
+    fetch.add_argument("-o", "--output", default="icons", help="Output directory (default: icons)")
+    variant_options(fetch)
+    fetch.set_defaults(handler=cmd_fetch)
+
+    search = commands.add_parser("search", help="Search for icons")
+    search.add_argument("query")
+    search.add_argument("-s", "--source", help="Filter by source")
+    search.add_argument("-c", "--category", help="Filter by category")
+    search.add_argument(
+        "-l",
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum results, fetched page by page (default: 20)",
+    )
+    search.set_defaults(handler=cmd_search)
+
+    export = commands.add_parser(
+        "export",
+        help="Export a manifest of icons to a directory, zip archive or sprite sheet",
+    )
+    export.add_argument("manifest", help="JSON or text manifest ('-' for stdin)")
+    export.add_argument("output", help="Directory, .zip file or .svg sprite sheet")
+    export.add_argument(
+        "-f",
+        "--format",
+        choices=EXPORT_FORMATS,
+        help="Output format (default: from the output's extension)",
+    )
+    export.add_argument(
+        "--json-sprite", metavar="FILE", help="Also write the JSON sprite (sprite format only)"
+    )
+    variant_options(export)
+    export.set_defaults(handler=cmd_export)
+
+    sync = commands.add_parser("sync", help="Mirror the catalogue into a directory")
+    sync.add_argument("directory")
+    sync.add_argument(
+        "-s",
+        "--source",
+        action="append",
+        dest="sources",
+        metavar="SOURCE",
+        help="Only sync this source; repeatable (default: all)",
+    )
+    sync.add_argument(
+        "--force", action="store_true", help="Re-fetch sources whose version is unchanged"
+    )
+    sync.add_argument(
+        "--chunk-size",
+        type=int,
+        default=BATCH_CHUNK_SIZE,
+        help=f"Icons per batch request (default: {BATCH_CHUNK_SIZE})",
+    )
+    sync.set_defaults(handler=cmd_sync)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the ``svg-api`` console script."""
+    from svg_api.client import SvgApi
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    base_urls = args.base_urls or [
+        url for url in os.environ.get("SVG_API_BASE_URL", "").split(",") if url
+    ]
+
+    try:
+        with (
+            SvgApi(
+                api_key=args.api_key,
+                timeout=args.timeout,
+                max_concurrency=args.max_concurrency,
+                base_urls=base_urls or None,
+            ) as client,
+            deadline(args.deadline),
+        ):
+            return int(args.handler(client, args))
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except (ValueError, OSError) as e:
+        parser.exit(EXIT_USAGE, f"svg-api: error: {e}\n")
+    except SvgApiError as e:
+        parser.exit(EXIT_FAILURES, f"svg-api: error: {e}\n")
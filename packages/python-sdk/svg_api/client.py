@@ -6,19 +6,29 @@ Provides both synchronous and asynchronous clients for accessing the SVG API.
 
 from __future__ import annotations
 
+import contextvars
 import pathlib
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any, Literal
 
 import httpx
 
 from svg_api.errors import (
     ApiError,
+    DeadlineExceededError,
     NetworkError,
     NotFoundError,
+    ServiceUnavailableError,
+    SvgApiError,
     raise_for_status,
     TimeoutError,
 )
 from svg_api.types import (
+    BatchDefaults,
     BatchIconRequest,
     BatchIconResult,
     BatchRequestOptions,
@@ -35,9 +45,55 @@ from svg_api.types import (
     Source,
     SourcesResponse,
 )
+from svg_api.cache import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_TTL,
+    AccessTracker,
+    IconCache,
+    batch_icon,
+    batch_specs,
+    cache_batch_item,
+    cache_batch_response,
+    dump_hot_set,
+    icon_spec,
+    load_hot_set,
+    merge_specs,
+    parse_freshness,
+    spec_key,
+)
+from svg_api.batch import batch_chunks, batch_retry_entries, merge_batch_retry
+from svg_api.balancer import PROBE_TIMEOUT, Endpoint, EndpointPool
+from svg_api.codec import M, JsonCodec, get_codec
+from svg_api.deadlines import attempt_timeout, deadline_at, expires_at, remaining, with_deadline
+from svg_api.engine import ENGINES, AsyncEngine
+from svg_api.compression import accept_encoding, compress_body
+from svg_api.lanes import BULK, priority
+from svg_api.limiter import OVERLOAD_ERRORS, AdaptiveLimiter
+from svg_api.metadata import (
+    DEFAULT_METADATA_TTL,
+    VERSION_PATH,
+    MetadataCache,
+    MetadataSnapshot,
+    catalogue_version,
+)
+from svg_api.names import DEFAULT_NEGATIVE_CACHE_TTL, NameFilter, NameIndex
+from svg_api.optimize import SvgOptimizer, optimize_batch, optimize_icon
+from svg_api.resolve import SourceResolver
+from svg_api.sample import (
+    SAMPLE_ROUNDS,
+    IconSampler,
+    Weight,
+    empty_selection,
+    filter_index,
+    listing_queries,
+    selected,
+)
+from svg_api.stats import ClientStats, endpoint_label
+from svg_api.usage import DEFAULT_CAPACITY, DEFAULT_INTERVAL, UsageReporter
+from svg_api.streaming import BatchStream, BatchStreamParser
 from svg_api.utils import (
-    async_retry_with_backoff,
     build_query_params,
+    calculate_retry_delay,
     retry_with_backoff,
     validate_color,
     validate_size,
@@ -45,9 +101,11 @@ from svg_api.utils import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
 
 
+ICON_ENDPOINT = "GET /icons/{name}"
+BATCH_ENDPOINT = "POST /icons/batch"
 DEFAULT_BASE_URL = "https://api.svg-api.org/v1"
 DEFAULT_TIMEOUT = 30.0
 USER_AGENT = "svg-api-python/1.0.0"
@@ -58,11 +116,41 @@ class SvgApiConfig:
     Configuration for the SVG API client.
 
     Attributes:
-        base_url: API base URL
+        base_url: API base URL (the primary endpoint)
+        base_urls: Optional list of equivalent base URLs, e.g. regional
+            mirrors; requests are balanced across them by latency and fail
+            over when one is unhealthy. The first one replaces base_url.
         api_key: Optional API key for authentication
         timeout: Request timeout in seconds
-        max_retries: Maximum number of retry attempts
+        max_retries: Maximum number of retry attempts (per request, and rounds
+            of re-requesting the failed entries of a batch)
         retry_delay: Base delay for retry exponential backoff
+        cache_size: Maximum icons kept in the in-memory cache (0 disables it)
+        cache_ttl: Freshness lifetime for responses without Cache-Control max-age
+        refresh_concurrency: Maximum concurrent background refreshes of stale
+            cache entries
+        optimizer: Optional SvgOptimizer applied to icons before caching
+        compress_requests: Gzip request bodies of 1 KiB or more (the server or
+            a proxy in front of it must accept Content-Encoding: gzip)
+        json_codec: Codec for untyped bodies such as error payloads and hints,
+            as an instance or name ("orjson", "msgspec", "json"); default is
+            the fastest installed. Typed responses are parsed by pydantic.
+        max_concurrency: Upper bound for the adaptive concurrency limit used
+            by bulk operations (batch chunks of warm-ups, syncs and sprites)
+        negative_cache_ttl: Seconds an icon the API answered 404 for is
+            rejected locally (0 disables the negative cache)
+        name_index: Optional NameIndex of known icon names; names it does
+            not contain are rejected without a request
+        metadata_ttl: Seconds get_sources() and get_categories() are served
+            from the metadata snapshot before /version is checked for a new
+            catalogue (0 fetches them on every call)
+        engine: "threads" sends each request on the calling thread;
+            "asyncio" hands requests to an AsyncSvgApi on a background event
+            loop shared by all threads (requires aiohttp, see AsyncEngine)
+        usage_interval: Seconds between background flushes of usage
+            reported with track_usage()
+        usage_buffer_size: Usage events held between flushes; further
+            events are dropped rather than block the caller
     """
 
     def __init__(
@@ -72,12 +160,42 @@ class SvgApiConfig:
         timeout: float = DEFAULT_TIMEOUT,
         max_retries: int = 3,
         retry_delay: float = 0.5,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        refresh_concurrency: int = 4,
+        optimizer: SvgOptimizer | None = None,
+        compress_requests: bool = False,
+        json_codec: JsonCodec | str | None = None,
+        max_concurrency: int = 16,
+        base_urls: Sequence[str] | None = None,
+        negative_cache_ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+        name_index: NameIndex | None = None,
+        metadata_ttl: float = DEFAULT_METADATA_TTL,
+        engine: Literal["threads", "asyncio"] = "threads",
+        usage_interval: float = DEFAULT_INTERVAL,
+        usage_buffer_size: int = DEFAULT_CAPACITY,
     ) -> None:
-        self.base_url = base_url.rstrip("/")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {list(ENGINES)}")
+        self.base_urls = [url.rstrip("/") for url in base_urls or [base_url]]
+        self.base_url = self.base_urls[0]
         self.api_key = api_key
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.refresh_concurrency = refresh_concurrency
+        self.optimizer = optimizer
+        self.compress_requests = compress_requests
+        self.json_codec = get_codec(json_codec)
+        self.max_concurrency = max_concurrency
+        self.negative_cache_ttl = negative_cache_ttl
+        self.name_index = name_index
+        self.metadata_ttl = metadata_ttl
+        self.engine = engine
+        self.usage_interval = usage_interval
+        self.usage_buffer_size = usage_buffer_size
 
 
 class _SvgApiBase:
@@ -88,24 +206,132 @@ class _SvgApiBase:
     def __init__(
         self,
         config: SvgApiConfig,
-        client: httpx.Client | httpx.AsyncClient,
+        client: httpx.Client,
     ) -> None:
         self._config = config
         self._client = client
+        self._stats = ClientStats()
+        self._cache: IconCache[Icon] = IconCache(config.cache_size, config.cache_ttl)
+        self._access = AccessTracker()
+        self._pool = EndpointPool(config.base_urls)
+        self._names = NameFilter(config.name_index, config.negative_cache_ttl)
+        self._resolver = SourceResolver(
+            config.cache_size, config.cache_ttl, config.negative_cache_ttl
+        )
+        self._metadata = MetadataCache(config.metadata_ttl)
+        # Errors retried by _send; with mirrors, a 503 is worth retrying elsewhere.
+        self._retryable: tuple[type[Exception], ...] = (NetworkError, TimeoutError)
+        if len(self._pool) > 1:
+            self._retryable += (ServiceUnavailableError,)
+        # The limiter only retries what _send does not.
+        self._limiter = AdaptiveLimiter(
+            max_limit=config.max_concurrency,
+            retry_errors=[e for e in OVERLOAD_ERRORS if not issubclass(e, self._retryable)],
+        )
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        """Adaptive concurrency limiter shared by this client's bulk operations."""
+        return self._limiter
+
+    @property
+    def names(self) -> NameFilter:
+        """Filter rejecting icon names known not to exist (see NameIndex)."""
+        return self._names
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get a snapshot of per-endpoint request statistics.
+
+        Returns:
+            Dictionary with request, error, byte and retry counters plus
+            latency percentiles (in milliseconds) per endpoint and in total,
+            the adaptive concurrency limiter state under "concurrency", and
+            health and EWMA latency per base URL under "base_urls"
+
+        Example:
+            >>> p99 = client.stats()["totals"]["latency_ms"]["p99"]
+            >>> client.stats()["concurrency"]["limit"]
+        """
+        return {
+            **self._stats.snapshot(),
+            "concurrency": self._limiter.snapshot(),
+            "base_urls": self._pool.snapshot(),
+        }
+
+    def reset_stats(self) -> None:
+        """Discard all recorded request statistics."""
+        self._stats.reset()
+
+    def _record_transfer(
+        self,
+        endpoint: str,
+        response: httpx.Response,
+        bytes_out: int | None = None,
+    ) -> None:
+        """
+        Record request and response body sizes for one attempt.
+
+        Args:
+            endpoint: Endpoint label
+            response: Completed response
+            bytes_out: Request body size before compression (default: as sent)
+        """
+        wire_bytes_out = len(response.request.content)
+        self._stats.record_transfer(
+            endpoint,
+            bytes_out=wire_bytes_out if bytes_out is None else bytes_out,
+            bytes_in=len(response.content),
+            wire_bytes_out=wire_bytes_out,
+            wire_bytes_in=response.num_bytes_downloaded,
+        )
+
+    def _encode_body(self, body: Any, headers: dict[str, str]) -> tuple[bytes | None, int]:
+        """
+        Serialize (and optionally compress) a request body, updating ``headers``.
+
+        Returns:
+            (content to send, uncompressed size)
+        """
+        if body is None:
+            return None, 0
+        content = self._config.json_codec.encode(body)
+        headers["Content-Type"] = "application/json"
+        size = len(content)
+        if self._config.compress_requests:
+            content, encoding = compress_body(content)
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+        return content, size
+
+    def _transport_error(self, error: httpx.TransportError) -> SvgApiError:
+        """Translate an httpx transport failure into the SDK's retryable errors."""
+        if isinstance(error, httpx.TimeoutException):
+            left = remaining()
+            if left is not None and left <= 0:
+                return DeadlineExceededError()
+            return TimeoutError(message="Request timed out", timeout=self._config.timeout)
+        return NetworkError(message=f"Network error: {error}")
+
+    def _decode(self, model: type[M], raw: bytes) -> M:
+        """Parse a response body into an SDK model (pydantic parses the raw bytes)."""
+        return self._config.json_codec.decode(raw, model)
 
     def _build_headers(self) -> dict[str, str]:
         """Build request headers."""
         headers = {
             "User-Agent": USER_AGENT,
             "Accept": "application/json",
+            "Accept-Encoding": accept_encoding(),
         }
         if self._config.api_key:
             headers["Authorization"] = f"Bearer {self._config.api_key}"
         return headers
 
-    def _build_url(self, path: str) -> str:
-        """Build full URL for API endpoint."""
-        return f"{self._config.base_url}{path}"
+    def _build_url(self, path: str, endpoint: Endpoint | None = None) -> str:
+        """Build full URL for API endpoint on the given (default: primary) base URL."""
+        base_url = endpoint.url if endpoint is not None else self._config.base_url
+        return f"{base_url}{path}"
 
     def _get_request_id(self, response: httpx.Response) -> str | None:
         """Extract request ID from response headers."""
@@ -142,6 +368,20 @@ class SvgApi(_SvgApiBase):
         timeout: float = DEFAULT_TIMEOUT,
         max_retries: int = 3,
         retry_delay: float = 0.5,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        refresh_concurrency: int = 4,
+        optimizer: SvgOptimizer | None = None,
+        compress_requests: bool = False,
+        json_codec: JsonCodec | str | None = None,
+        max_concurrency: int = 16,
+        base_urls: Sequence[str] | None = None,
+        negative_cache_ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+        name_index: NameIndex | None = None,
+        metadata_ttl: float = DEFAULT_METADATA_TTL,
+        engine: Literal["threads", "asyncio"] = "threads",
+        usage_interval: float = DEFAULT_INTERVAL,
+        usage_buffer_size: int = DEFAULT_CAPACITY,
         config: SvgApiConfig | None = None,
     ) -> None:
         """
@@ -153,6 +393,29 @@ class SvgApi(_SvgApiBase):
             timeout: Request timeout in seconds (default: 30)
             max_retries: Maximum retry attempts for transient errors (default: 3)
             retry_delay: Base delay for exponential backoff (default: 0.5)
+            cache_size: Maximum icons kept in memory, 0 disables caching (default: 500)
+            cache_ttl: Freshness lifetime when the API sends no max-age (default: 3600)
+            refresh_concurrency: Maximum concurrent background refreshes of
+                stale icons (default: 4)
+            optimizer: Optional SvgOptimizer applied once to each fetched icon
+            compress_requests: Gzip large request bodies such as batches (default: False)
+            json_codec: Codec for untyped bodies (error payloads, hints) or
+                its name (default: fastest installed)
+            max_concurrency: Upper bound for the adaptive limit on concurrent
+                requests in bulk operations (default: 16)
+            base_urls: Mirror base URLs to balance and fail over across
+                (default: just base_url)
+            negative_cache_ttl: Seconds a 404 for an icon is answered locally,
+                0 disables it (default: 300)
+            name_index: Optional NameIndex; unknown names fail without a request
+            metadata_ttl: Seconds between /version checks revalidating the
+                sources and categories snapshot, 0 disables it (default: 300)
+            engine: "asyncio" multiplexes requests from all threads over an
+                async client on a background event loop (default: "threads")
+            usage_interval: Seconds between background flushes of
+                track_usage() events (default: 10)
+            usage_buffer_size: Usage events buffered before new ones are
+                dropped (default: 10000)
             config: Optional SvgApiConfig object (overrides other params)
         """
         if config is None:
@@ -162,10 +425,58 @@ class SvgApi(_SvgApiBase):
                 timeout=timeout,
                 max_retries=max_retries,
                 retry_delay=retry_delay,
+                cache_size=cache_size,
+                cache_ttl=cache_ttl,
+                refresh_concurrency=refresh_concurrency,
+                optimizer=optimizer,
+                compress_requests=compress_requests,
+                json_codec=json_codec,
+                max_concurrency=max_concurrency,
+                base_urls=base_urls,
+                negative_cache_ttl=negative_cache_ttl,
+                name_index=name_index,
+                metadata_ttl=metadata_ttl,
+                engine=engine,
+                usage_interval=usage_interval,
+                usage_buffer_size=usage_buffer_size,
             )
 
-        self._client = httpx.Client(
-            base_url=config.base_url,
+        self._client = self._new_http_client(config, config.base_url)
+        super().__init__(config, self._client)
+        self._engine: AsyncEngine | None = None
+        if config.engine == "asyncio":
+            self._engine = AsyncEngine(config)
+            # Requests are counted and balanced by the engine's client.
+            self._stats = self._engine.client._stats
+            self._pool = self._engine.client._pool
+        self._refresher: ThreadPoolExecutor | None = None
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+        # One connection pool per base URL; the primary one is self._client.
+        self._mirror_clients: dict[str, httpx.Client] = {}
+        self._mirror_lock = threading.Lock()
+        self._metadata_lock = threading.Lock()
+        self._usage: UsageReporter | None = None
+        self._usage_lock = threading.Lock()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get a snapshot of per-endpoint request statistics.
+
+        See _SvgApiBase.stats(). With ``engine="asyncio"`` the snapshot also
+        has the engine's priority lanes under "lanes" and the number of GET
+        requests answered by an identical one already in flight under "coalesced".
+        """
+        snapshot = super().stats()
+        if self._engine is not None:
+            snapshot["lanes"] = self._engine.client.stats()["lanes"]
+            snapshot["coalesced"] = self._engine.coalesced
+        return snapshot
+
+    @staticmethod
+    def _new_http_client(config: SvgApiConfig, base_url: str) -> httpx.Client:
+        client = httpx.Client(
+            base_url=base_url,
             timeout=config.timeout,
             headers={
                 "User-Agent": USER_AGENT,
@@ -173,9 +484,50 @@ class SvgApi(_SvgApiBase):
             },
         )
         if config.api_key:
-            self._client.headers["Authorization"] = f"Bearer {config.api_key}"
+            client.headers["Authorization"] = f"Bearer {config.api_key}"
+        return client
+
+    def _http(self, endpoint: Endpoint) -> httpx.Client:
+        """Return the connection pool for an endpoint."""
+        if endpoint is self._pool.primary:
+            return self._client
+        client = self._mirror_clients.get(endpoint.url)
+        if client is None:
+            with self._mirror_lock:
+                client = self._mirror_clients.get(endpoint.url)
+                if client is None:
+                    client = self._new_http_client(self._config, endpoint.url)
+                    self._mirror_clients[endpoint.url] = client
+        return client
+
+    @contextmanager
+    def _endpoint(self, attempted: list[Endpoint]) -> Iterator[Endpoint]:
+        """
+        Pick the endpoint for one attempt and report the outcome to the pool.
 
-        super().__init__(config, self._client)
+        The endpoint of the previous attempt is avoided when another one is
+        available, so retries fail over.
+        """
+        for ejected in self._pool.due_for_probe():
+            threading.Thread(target=self._probe, args=(ejected,), daemon=True).start()
+        endpoint = self._pool.acquire(exclude=attempted[-1:])
+        attempted.append(endpoint)
+        start = time.perf_counter()
+        try:
+            yield endpoint
+        except BaseException as e:
+            self._pool.release(endpoint, time.perf_counter() - start, e)
+            raise
+        self._pool.release(endpoint, time.perf_counter() - start)
+
+    def _probe(self, endpoint: Endpoint) -> None:
+        """Check /health/ready on an ejected endpoint and re-admit it if ready."""
+        try:
+            response = self._http(endpoint).get(endpoint.health_url, timeout=PROBE_TIMEOUT)
+            ready = response.status_code == 200
+        except httpx.HTTPError:
+            ready = False
+        self._pool.probe_result(endpoint, ready)
 
     def __enter__(self) -> SvgApi:
         """Support context manager protocol."""
@@ -186,8 +538,19 @@ class SvgApi(_SvgApiBase):
         self.close()
 
     def close(self) -> None:
-        """Close the HTTP client."""
+        """
+        Close the HTTP client and the engine (if any), after a final flush of
+        reported usage, and stop background cache refreshes.
+        """
+        if self._usage is not None:
+            self._usage.close()
+        if self._refresher is not None:
+            self._refresher.shutdown(wait=False, cancel_futures=True)
+        if self._engine is not None:
+            self._engine.close()
         self._client.close()
+        for client in self._mirror_clients.values():
+            client.close()
 
     def _request(
         self,
@@ -213,52 +576,101 @@ class SvgApi(_SvgApiBase):
         Raises:
             SvgApiError: On API errors
         """
-        url = self._build_url(path)
-        request_headers = self._build_headers()
-        if headers:
-            request_headers.update(headers)
+        raw = self._send(method, path, params=params, json=json, headers=headers)[0]
+        return self._config.json_codec.loads(raw) if raw else {}
 
-        def _make_request() -> dict[str, Any]:
-            response = self._client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json,
-                headers=request_headers,
-            )
-            return self._handle_response(response)
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[bytes, Mapping[str, str]]:
+        """
+        Make an HTTP request with retry logic, keeping the response headers.
 
-        if self._config.max_retries > 0:
-            return retry_with_backoff(
-                _make_request,
-                max_attempts=self._config.max_retries + 1,
-                base_delay=self._config.retry_delay,
-            )
-        return _make_request()
+        Args:
+            method: HTTP method
+            path: API endpoint path
+            params: Query parameters
+            json: Request body (JSON-compatible object or SDK model)
+            headers: Additional headers
 
-    def _handle_response(self, response: httpx.Response) -> dict[str, Any]:
+        Returns:
+            Raw response body and the response headers
+
+        Raises:
+            SvgApiError: On API errors
+        """
+        if self._engine is not None:
+            return self._engine.send(method, path, params=params, json=json, headers=headers)
+        endpoint = endpoint_label(method, path)
+        request_headers = self._build_headers()
+        if headers:
+            request_headers.update(headers)
+        content, bytes_out = self._encode_body(json, request_headers)
+        attempted: list[Endpoint] = []
+
+        def _make_request() -> tuple[bytes, Mapping[str, str]]:
+            with self._endpoint(attempted) as base:
+                try:
+                    response = self._http(base).request(
+                        method=method,
+                        url=self._build_url(path, base),
+                        params=params,
+                        content=content,
+                        headers=request_headers,
+                        timeout=attempt_timeout(self._config.timeout),
+                    )
+                except httpx.TransportError as e:
+                    raise self._transport_error(e) from e
+                self._record_transfer(endpoint, response, bytes_out)
+                return self._handle_response(response), response.headers
+
+        start = time.perf_counter()
+        try:
+            if self._config.max_retries > 0:
+                result = retry_with_backoff(
+                    _make_request,
+                    max_attempts=self._config.max_retries + 1,
+                    base_delay=self._config.retry_delay,
+                    retryable_errors=self._retryable,
+                    on_retry=lambda *_: self._stats.record_retry(endpoint),
+                )
+            else:
+                result = _make_request()
+        except Exception as e:
+            self._stats.record_request(endpoint, time.perf_counter() - start, e)
+            raise
+        self._stats.record_request(endpoint, time.perf_counter() - start)
+        return result
+
+    def _handle_response(self, response: httpx.Response) -> bytes:
         """
         Handle API response, raising appropriate exceptions.
 
+        The body of a successful response is returned undecoded so callers
+        can parse it straight into a model.
+
         Args:
             response: HTTP response
 
         Returns:
-            Parsed JSON response
+            Raw response body
 
         Raises:
             SvgApiError: On API errors
         """
-        try:
-            data = response.json()
-        except Exception:
-            data = {}
-
         request_id = self._get_request_id(response)
 
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
+            try:
+                data = self._config.json_codec.loads(response.content)
+            except Exception:
+                data = {}
             raise raise_for_status(e.response.status_code, data, request_id)
         except httpx.TimeoutException as e:
             raise TimeoutError(
@@ -272,8 +684,9 @@ class SvgApi(_SvgApiBase):
                 request_id=request_id,
             ) from e
 
-        return data
+        return response.content
 
+    @with_deadline
     def get_icon(
         self,
         name: str,
@@ -281,6 +694,8 @@ class SvgApi(_SvgApiBase):
         size: int | None = None,
         stroke: float | None = None,
         color: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> Icon:
         """
         Get a single icon by name.
@@ -291,6 +706,7 @@ class SvgApi(_SvgApiBase):
             size: Icon size in pixels (8-512, default: 24)
             stroke: Stroke width (0.5-3, default: 2)
             color: Icon color as hex or name
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
             Icon object with SVG content and metadata
@@ -329,10 +745,66 @@ class SvgApi(_SvgApiBase):
                 details={"provided": color},
             )
 
-        params = build_query_params({"source": source, "size": size, "stroke": stroke, "color": color})
-        data = self._request("GET", f"/icons/{name}", params=params)
-        return IconResponse(**data).data
+        spec = icon_spec(name, source, size, stroke, color)
+        key = spec_key(spec)
+        self._access.record(spec)
+        cached = self._cache.lookup(key)
+        if cached is not None:
+            icon, stale = cached
+            self._stats.record_cache_hit(ICON_ENDPOINT)
+            if stale:
+                self._schedule_refresh(key, spec)
+            return icon
+        self._names.raise_if_unknown(spec["source"], name)
+        return self._fetch_icon(key, spec)
+
+    def _fetch_icon(self, key: str, spec: dict[str, Any]) -> Icon:
+        """Fetch an icon from the API and cache it per its Cache-Control headers."""
+        params = build_query_params({
+            "source": spec["source"],
+            "size": spec.get("size"),
+            "stroke": spec.get("stroke"),
+            "color": spec.get("color"),
+        })
+        try:
+            raw, headers = self._send("GET", f"/icons/{spec['name']}", params=params)
+        except NotFoundError as e:
+            self._names.remember(spec["source"], spec["name"], e)
+            raise
+        icon = optimize_icon(self._config.optimizer, self._decode(IconResponse, raw).data)
+        freshness = parse_freshness(headers, self._config.cache_ttl)
+        if freshness is not None:
+            self._cache.set(key, icon, ttl=freshness[0], stale_ttl=freshness[1])
+        return icon
+
+    def _schedule_refresh(self, key: str, spec: dict[str, Any]) -> None:
+        """Refresh a stale cache entry on a background thread, once per key."""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(
+                    max_workers=max(1, self._config.refresh_concurrency),
+                    thread_name_prefix="svg-api-refresh",
+                )
+        try:
+            self._refresher.submit(self._refresh, key, spec)
+        except RuntimeError:
+            # Executor already shut down by close()
+            with self._refresh_lock:
+                self._refreshing.discard(key)
 
+    def _refresh(self, key: str, spec: dict[str, Any]) -> None:
+        try:
+            self._fetch_icon(key, spec)
+        except SvgApiError:
+            pass  # keep serving the stale entry until it expires
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+
+    @with_deadline
     def get_icon_svg(
         self,
         name: str,
@@ -340,6 +812,8 @@ class SvgApi(_SvgApiBase):
         size: int | None = None,
         stroke: float | None = None,
         color: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> str:
         """
         Get raw SVG content for an icon.
@@ -350,6 +824,7 @@ class SvgApi(_SvgApiBase):
             size: Icon size in pixels
             stroke: Stroke width
             color: Icon color
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
             Raw SVG string
@@ -361,6 +836,7 @@ class SvgApi(_SvgApiBase):
         icon = self.get_icon(name, source, size, stroke, color)
         return icon.svg
 
+    @with_deadline
     def download_icon(
         self,
         name: str,
@@ -369,6 +845,8 @@ class SvgApi(_SvgApiBase):
         size: int | None = None,
         stroke: float | None = None,
         color: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> str:
         """
         Download an icon to a file.
@@ -380,6 +858,7 @@ class SvgApi(_SvgApiBase):
             size: Icon size in pixels
             stroke: Stroke width
             color: Icon color
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
             Absolute path to the saved file
@@ -394,6 +873,7 @@ class SvgApi(_SvgApiBase):
         path_obj.write_text(svg, encoding="utf-8")
         return str(path_obj.absolute())
 
+    @with_deadline
     def search(
         self,
         query: str,
@@ -401,6 +881,8 @@ class SvgApi(_SvgApiBase):
         category: str | None = None,
         limit: int = 20,
         offset: int = 0,
+        *,
+        deadline: float | None = None,
     ) -> SearchResponse:
         """
         Search for icons.
@@ -411,6 +893,7 @@ class SvgApi(_SvgApiBase):
             category: Filter by category
             limit: Results per page (1-100, default: 20)
             offset: Pagination offset (default: 0)
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
             SearchResponse with results and metadata
@@ -427,13 +910,71 @@ class SvgApi(_SvgApiBase):
             "limit": min(limit, 100),
             "offset": offset,
         })
-        data = self._request("GET", "/search", params=params)
-        return SearchResponse(**data)
+        raw, _ = self._send("GET", "/search", params=params)
+        return self._decode(SearchResponse, raw)
+
+    def iter_search(
+        self,
+        query: str,
+        source: str | None = None,
+        category: str | None = None,
+        page_size: int = 100,
+        max_results: int | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> Iterator[SearchResult]:
+        """
+        Iterate over all search results, fetching pages as needed.
 
+        Args:
+            query: Search query string
+            source: Filter by source
+            category: Filter by category
+            page_size: Results per request (1-100, default: 100)
+            max_results: Stop after this many results (default: all)
+            deadline: Time budget in seconds, counted from this call, for
+                fetching every page; DeadlineExceededError is raised from
+                the iterator once it expires
+
+        Returns:
+            Iterator of SearchResult objects in ranking order
+
+        Example:
+            >>> for result in client.iter_search("arrow", deadline=2.0):
+            ...     print(result.name)
+        """
+        return self._iter_search(
+            query, source, category, page_size, max_results, expires_at(deadline)
+        )
+
+    def _iter_search(
+        self,
+        query: str,
+        source: str | None,
+        category: str | None,
+        page_size: int,
+        max_results: int | None,
+        expiry: float | None,
+    ) -> Iterator[SearchResult]:
+        offset = 0
+        yielded = 0
+        while max_results is None or yielded < max_results:
+            limit = page_size if max_results is None else min(page_size, max_results - yielded)
+            with deadline_at(expiry):
+                page = self.search(query, source, category, limit=limit, offset=offset)
+            yield from page.data
+            yielded += len(page.data)
+            offset += len(page.data)
+            if not page.meta.has_more or not page.data:
+                break
+
+    @with_deadline
     def get_batch(
         self,
         icons: list[dict[str, Any]],
         defaults: dict[str, Any] | None = None,
+        *,
+        deadline: float | None = None,
     ) -> BatchResponse:
         """
         Fetch multiple icons in a single request.
@@ -441,6 +982,7 @@ class SvgApi(_SvgApiBase):
         Args:
             icons: List of icon requests, each containing at least 'name'
             defaults: Default values for size, stroke, color
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
             BatchResponse with results and any errors
@@ -453,32 +995,372 @@ class SvgApi(_SvgApiBase):
             >>> for key, icon in result.data.items():
             ...     if icon.success:
             ...         print(f"{key}: OK")
+
+        Entries known not to exist (see NameIndex) are not sent; they come
+        back as ICON_NOT_FOUND errors like the ones the API returns.
+
+        Entries that failed with a transient error (or are missing from the
+        response) are requested again on their own, with backoff, up to
+        max_retries times; their results are merged into the response.
+        Successful entries are never requested twice.
+        """
+        icons, rejected = self._names.split_batch(icons, defaults)
+        if not icons:
+            return self._names.complete_batch(None, rejected)
+        response = self._post_batch(icons, defaults)
+        for attempt in range(self._config.max_retries):
+            retry = batch_retry_entries(icons, defaults, response)
+            delay = calculate_retry_delay(attempt, self._config.retry_delay)
+            left = remaining()
+            if not retry or (left is not None and left <= delay):
+                break
+            self._stats.record_retry(BATCH_ENDPOINT)
+            time.sleep(delay)
+            try:
+                response = merge_batch_retry(response, self._post_batch(retry, defaults))
+            except SvgApiError:
+                break  # keep the results already received
+        return self._names.complete_batch(response, rejected)
+
+    def _post_batch(
+        self,
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None,
+    ) -> BatchResponse:
+        """Send one batch request and cache its successful results."""
+        raw, headers = self._send("POST", "/icons/batch", json=self._batch_request(icons, defaults))
+        response = optimize_batch(self._config.optimizer, self._decode(BatchResponse, raw))
+        cache_batch_response(
+            self._cache, icons, defaults, response, parse_freshness(headers, self._config.cache_ttl)
+        )
+        return response
+
+    @with_deadline
+    def resolve_icon(
+        self,
+        name: str,
+        sources: Sequence[str],
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> Icon:
+        """
+        Get an icon from the first of several sources that has it.
+
+        All candidate sources are probed with one batch request, so falling
+        back costs one round trip instead of one per source. The resolution,
+        including "no source has it", is cached.
+
+        Args:
+            name: Icon name
+            sources: Candidate sources, most preferred first
+            size: Icon size in pixels
+            stroke: Stroke width
+            color: Icon color
+            deadline: Time budget in seconds for the whole call, including retries
+
+        Returns:
+            The icon from the most preferred source that has it
+
+        Raises:
+            NotFoundError: If no source has the icon
+            SvgApiError: If no source returned the icon and one failed for
+                another reason
+
+        Example:
+            >>> icon = client.resolve_icon("home", ["heroicons", "lucide", "feather"])
+            >>> print(icon.source)
+        """
+        candidates = self._resolver.candidates(name, sources, size, stroke, color)
+        source = self._resolver.cached(candidates)
+        if source is not None:
+            return self.get_icon(name, source, size, stroke, color)
+        # Served from cache when the most preferred source not known to lack it is cached
+        for spec in candidates:
+            if self._names.check(spec["source"], name) is None:
+                icon = self._cache.get(spec_key(spec))
+                if icon is not None:
+                    self._stats.record_cache_hit(ICON_ENDPOINT)
+                    self._resolver.remember(candidates, spec["source"])
+                    return icon
+                break
+        return self._resolver.pick(candidates, self.get_batch(candidates))
+
+    @with_deadline
+    def sample_icons(
+        self,
+        n: int,
+        source: str | None = None,
+        category: str | None = None,
+        seed: int | str | None = None,
+        weight: Weight | None = None,
+        index: Iterable[str] | None = None,
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> list[Icon]:
         """
+        Draw ``n`` distinct random icons, fetched with batch requests.
+
+        Where get_random() costs a request per icon, the icons are drawn
+        locally and fetched in one round of batches, plus a second round
+        replacing icons that failed. The population is ``index`` if given,
+        otherwise the selection listed through search on first use and kept
+        with the metadata snapshot until the catalogue changes.
+
+        Args:
+            n: Number of icons
+            source: Only draw from this source
+            category: Only draw from this category (``index`` keys carry no
+                category, so the search listing is used instead)
+            seed: Seed making the draw reproducible for the same population
+            weight: Optional ``weight(source, name)``; icons are drawn with
+                probability proportional to it (default: uniform)
+            index: "source:name" keys of the catalogue, e.g. the mirror_keys()
+                of a CatalogueSync mirror
+            size: Icon size in pixels
+            stroke: Stroke width
+            color: Icon color
+            deadline: Time budget in seconds for the whole call, including retries
+
+        Returns:
+            Up to ``n`` icons in draw order (fewer only if the selection runs
+            out of icons that can be fetched)
+
+        Raises:
+            NotFoundError: If the selection has no icons
+
+        Example:
+            >>> icons = client.sample_icons(200, source="lucide", seed=42, size=48)
+            >>> popular = client.sample_icons(20, weight=lambda source, name: hits[name] + 1)
+        """
+        sampler = IconSampler(self._sample_population(source, category, index), seed, weight)
+        if not len(sampler):
+            raise empty_selection(source, category)
+        icons: list[Icon] = []
+        for _ in range(SAMPLE_ROUNDS):
+            specs = sampler.take(n - len(icons), size, stroke, color)
+            if not specs:
+                break
+            icons.extend(self._fetch_sample(specs))
+        return icons
+
+    def _sample_population(
+        self,
+        source: str | None,
+        category: str | None,
+        index: Iterable[str] | None,
+    ) -> list[str]:
+        """Return the "source:name" keys sample_icons() draws from."""
+        if index is not None and category is None:
+            return filter_index(index, source)
+        snapshot = self.metadata()
+        keys = snapshot.listings.get((source, category))
+        if keys is None:
+            keys = [
+                f"{result.source}:{result.name}"
+                for query in listing_queries(snapshot, source, category)
+                for result in self.iter_search(*query)
+                if selected(result, source, category)
+            ]
+            snapshot.listings[(source, category)] = keys
+        return keys
+
+    def _fetch_sample(self, specs: list[dict[str, Any]]) -> list[Icon]:
+        """Fetch drawn specs, from the cache where possible; icons that failed are left out."""
+        icons: dict[str, Icon] = {}
+        missing: list[dict[str, Any]] = []
+        for spec in specs:
+            icon = self._cache.get(spec_key(spec))
+            if icon is not None:
+                icons[spec_key(spec)] = icon
+            else:
+                missing.append(spec)
+        chunks = batch_chunks(missing)
+        if len(chunks) > 1:
+            workers = min(len(chunks), max(1, self._limiter.max_limit))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # Copy the caller's context into the workers so an enclosing deadline() applies.
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run, self._limiter.call, self.get_batch, chunk
+                    )
+                    for chunk in chunks
+                ]
+                responses = [future.result() for future in futures]
+        else:
+            responses = [self.get_batch(chunk) for chunk in chunks]
+        for chunk, response in zip(chunks, responses, strict=True):
+            for spec in chunk:
+                item = response.data.get(f"{spec['source']}:{spec['name']}")
+                icon = batch_icon(spec, item) if item is not None else None
+                if icon is not None:
+                    icons[spec_key(spec)] = icon
+        return [icons[spec_key(spec)] for spec in specs if spec_key(spec) in icons]
+
+    @staticmethod
+    def _batch_request(
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None,
+    ) -> BatchRequestOptions:
+        """Build the batch request body from icon dicts."""
         # Convert dicts to BatchIconRequest
         icon_requests = [BatchIconRequest(**icon) for icon in icons]
         defaults_obj = (
             BatchIconRequest(**defaults) if defaults else BatchIconRequest(name="")
         )
-        batch_request = BatchRequestOptions(
+        return BatchRequestOptions(
             icons=icon_requests,
-            defaults=BatchIconRequest(
-                name="",
+            defaults=BatchDefaults(
                 size=defaults_obj.size or 24,
                 stroke=defaults_obj.stroke or 2,
             ),
         )
 
-        data = self._request(
-            "POST",
-            "/icons/batch",
-            json=batch_request.model_dump(by_alias=True, exclude_none=True),
-        )
-        return BatchResponse(**data)
+    def stream_batch(
+        self,
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> BatchStream[tuple[str, BatchIconResult]]:
+        """
+        Fetch multiple icons, yielding each result as soon as it is parsed.
 
-    def get_sources(self) -> SourcesResponse:
+        Unlike get_batch(), the response is never held in memory as a whole:
+        ``(key, BatchIconResult)`` pairs are produced while the body is still
+        downloading. Results are optimized and cached like get_batch() results.
+        The request is sent when iteration starts; retries only cover
+        establishing the response, not a stream that fails midway.
+
+        Args:
+            icons: List of icon requests, each containing at least 'name'
+            defaults: Default values for size, stroke, color
+            deadline: Time budget in seconds, counted from this call, for
+                opening and reading the whole stream
+
+        Returns:
+            BatchStream of ``(key, result)`` pairs; its ``errors`` and
+            ``meta`` are complete once iteration finishes
+
+        Example:
+            >>> with client.stream_batch(icons) as stream:
+            ...     for key, result in stream:
+            ...         if result.success:
+            ...             pathlib.Path(f"{key.replace(':', '/')}.svg").write_text(result.svg)
+        """
+        parser = BatchStreamParser()
+        expiry = expires_at(deadline)
+        return BatchStream(parser, self._stream_batch(icons, defaults, parser, expiry))
+
+    def _stream_batch(
+        self,
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None,
+        parser: BatchStreamParser,
+        expiry: float | None,
+    ) -> Iterator[tuple[str, BatchIconResult]]:
+        request_headers = self._build_headers()
+        body = self._batch_request(icons, defaults)
+        content, bytes_out = self._encode_body(body, request_headers)
+        specs = batch_specs(icons, defaults)
+        attempted: list[Endpoint] = []
+
+        def _open() -> httpx.Response:
+            with self._endpoint(attempted) as base:
+                http = self._http(base)
+                request = http.build_request(
+                    "POST",
+                    self._build_url("/icons/batch", base),
+                    content=content,
+                    headers=request_headers,
+                    timeout=attempt_timeout(self._config.timeout),
+                )
+                try:
+                    response = http.send(request, stream=True)
+                except httpx.TransportError as e:
+                    raise self._transport_error(e) from e
+                if response.is_error:
+                    response.read()
+                    response.close()
+                    self._record_transfer(BATCH_ENDPOINT, response, bytes_out)
+                    self._handle_response(response)
+                return response
+
+        start = time.perf_counter()
+        try:
+            # The deadline scope must not stay set across yields, so it only wraps the open.
+            with deadline_at(expiry):
+                if self._config.max_retries > 0:
+                    response = retry_with_backoff(
+                        _open,
+                        max_attempts=self._config.max_retries + 1,
+                        base_delay=self._config.retry_delay,
+                        retryable_errors=self._retryable,
+                        on_retry=lambda *_: self._stats.record_retry(BATCH_ENDPOINT),
+                    )
+                else:
+                    response = _open()
+        except Exception as e:
+            self._stats.record_request(BATCH_ENDPOINT, time.perf_counter() - start, e)
+            raise
+
+        freshness = parse_freshness(response.headers, self._config.cache_ttl)
+        error: Exception | None = None
+        try:
+            try:
+                for chunk in response.iter_bytes():
+                    if expiry is not None and time.monotonic() >= expiry:
+                        raise DeadlineExceededError()
+                    for key, item in parser.feed(chunk):
+                        yield key, self._stream_item(key, item, specs, freshness)
+                for key, item in parser.close():
+                    yield key, self._stream_item(key, item, specs, freshness)
+            except httpx.TransportError as e:
+                with deadline_at(expiry):
+                    raise self._transport_error(e) from e
+            except ValueError as e:
+                raise ApiError(f"Malformed batch response: {e}", code="INVALID_RESPONSE") from e
+        except SvgApiError as e:
+            error = e
+            raise
+        finally:
+            response.close()
+            self._stats.record_transfer(
+                BATCH_ENDPOINT,
+                bytes_out=bytes_out,
+                bytes_in=parser.bytes_fed,
+                wire_bytes_out=len(content or b""),
+                wire_bytes_in=response.num_bytes_downloaded,
+            )
+            self._stats.record_request(BATCH_ENDPOINT, time.perf_counter() - start, error)
+
+    def _stream_item(
+        self,
+        key: str,
+        item: BatchIconResult,
+        specs: dict[str, list[dict[str, Any]]],
+        freshness: tuple[float, float] | None,
+    ) -> BatchIconResult:
+        """Optimize and cache one streamed batch result."""
+        if item.svg is not None and self._config.optimizer is not None:
+            item.svg = self._config.optimizer(item.svg)
+        for spec in specs.get(key, ()):
+            cache_batch_item(self._cache, spec, item, freshness)
+        return item
+
+    @with_deadline
+    def get_sources(self, *, deadline: float | None = None) -> SourcesResponse:
         """
         List all available icon sources.
 
+        Args:
+            deadline: Time budget in seconds for the whole call, including retries
+
         Returns:
             SourcesResponse with list of sources
 
@@ -487,15 +1369,27 @@ class SvgApi(_SvgApiBase):
             >>> for source in sources.data:
             ...     print(f"{source.name}: {source.icon_count} icons")
         """
-        data = self._request("GET", "/sources")
-        return SourcesResponse(**data)
+        if self._metadata.ttl > 0:
+            return self.metadata().sources
+        return self._fetch_sources()
 
-    def get_categories(self, source: str | None = None) -> CategoriesResponse:
+    def _fetch_sources(self) -> SourcesResponse:
+        raw, _ = self._send("GET", "/sources")
+        return self._decode(SourcesResponse, raw)
+
+    @with_deadline
+    def get_categories(
+        self,
+        source: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> CategoriesResponse:
         """
         List all icon categories.
 
         Args:
             source: Optional filter by source
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
             CategoriesResponse with list of categories
@@ -505,14 +1399,79 @@ class SvgApi(_SvgApiBase):
             >>> for cat in categories.data:
             ...     print(f"{cat.name}: {cat.icon_count} icons")
         """
+        if self._metadata.ttl <= 0:
+            return self._fetch_categories(source)
+        snapshot = self.metadata()
+        if source is None:
+            return snapshot.categories
+        categories = snapshot.filtered_categories.get(source)
+        if categories is None:
+            categories = self._fetch_categories(source)
+            snapshot.filtered_categories[source] = categories
+        return categories
+
+    def _fetch_categories(self, source: str | None = None) -> CategoriesResponse:
         params = build_query_params({"source": source})
-        data = self._request("GET", "/categories", params=params)
-        return CategoriesResponse(**data)
+        raw, _ = self._send("GET", "/categories", params=params)
+        return self._decode(CategoriesResponse, raw)
+
+    @with_deadline
+    def metadata(self, refresh: bool = False, *, deadline: float | None = None) -> MetadataSnapshot:
+        """
+        Get the snapshot of sources and categories, revalidating it when due.
 
+        The snapshot is fetched on first use. Once it is ``metadata_ttl``
+        seconds old, the next call checks /version and refetches sources and
+        categories only if the catalogue changed. Other threads keep getting
+        the current snapshot meanwhile, and if the check fails it is served
+        for another ``metadata_ttl`` seconds.
+
+        Args:
+            refresh: Refetch sources and categories even if unchanged
+            deadline: Time budget in seconds for the whole call, including retries
+
+        Returns:
+            MetadataSnapshot with lookup maps by source
+
+        Example:
+            >>> meta = client.metadata()
+            >>> meta.source("lucide").license.type, meta.icon_counts["lucide"]
+            >>> [category.name for category in meta.categories_by_source["lucide"]]
+        """
+        snapshot = self._metadata.fresh()
+        if snapshot is not None and not refresh:
+            return snapshot
+        stale = self._metadata.snapshot
+        if stale is not None and not refresh and self._metadata_lock.locked():
+            return stale
+        with self._metadata_lock:
+            snapshot = self._metadata.fresh()
+            if snapshot is not None and not refresh:
+                return snapshot
+            try:
+                try:
+                    version: str | None = catalogue_version(self._request("GET", VERSION_PATH))
+                except NotFoundError:
+                    version = None
+                snapshot = None if refresh else self._metadata.current(version)
+                if snapshot is None:
+                    sources = self._fetch_sources()
+                    snapshot = self._metadata.install(version, sources, self._fetch_categories())
+                return snapshot
+            except SvgApiError:
+                stale = self._metadata.snapshot
+                if stale is None or refresh:
+                    raise
+                self._metadata.revalidated()
+                return stale
+
+    @with_deadline
     def get_random(
         self,
         source: str | None = None,
         category: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> Icon:
         """
         Get a random icon.
@@ -520,6 +1479,7 @@ class SvgApi(_SvgApiBase):
         Args:
             source: Optional filter by source
             category: Optional filter by category
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
             Random Icon object
@@ -529,309 +1489,129 @@ class SvgApi(_SvgApiBase):
             >>> print(f"Random: {icon.name} from {icon.source}")
         """
         params = build_query_params({"source": source, "category": category})
-        data = self._request("GET", "/random", params=params)
-        return IconResponse(**data).data
-
-
-class AsyncSvgApi(_SvgApiBase):
-    """
-    Asynchronous client for the SVG API.
-
-    Example:
-        >>> client = AsyncSvgApi(api_key="sk_live_xxx")  # optional
-        >>> icon = await client.get_icon("home", source="heroicons", size=32)
-        >>> print(icon.svg)
-
-    Example with context manager:
-        >>> async with AsyncSvgApi() as client:
-        ...     icon = await client.get_icon("home", source="heroicons")
-    """
+        raw, _ = self._send("GET", "/random", params=params)
+        return optimize_icon(self._config.optimizer, self._decode(IconResponse, raw).data)
 
-    def __init__(
+    @with_deadline
+    def warm(
         self,
-        api_key: str | None = None,
-        base_url: str = DEFAULT_BASE_URL,
-        timeout: float = DEFAULT_TIMEOUT,
-        max_retries: int = 3,
-        retry_delay: float = 0.5,
-        config: SvgApiConfig | None = None,
-    ) -> None:
-        """
-        Initialize the async SVG API client.
-
-        Args:
-            api_key: Optional API key for higher rate limits
-            base_url: API base URL
-            timeout: Request timeout in seconds
-            max_retries: Maximum retry attempts
-            retry_delay: Base delay for exponential backoff
-            config: Optional SvgApiConfig object
+        top_k: int = 100,
+        hot_set: str | pathlib.Path | None = None,
+        related: int = 0,
+        *,
+        deadline: float | None = None,
+    ) -> int:
         """
-        if config is None:
-            config = SvgApiConfig(
-                base_url=base_url,
-                api_key=api_key,
-                timeout=timeout,
-                max_retries=max_retries,
-                retry_delay=retry_delay,
-            )
-
-        self._client = httpx.AsyncClient(
-            base_url=config.base_url,
-            timeout=config.timeout,
-            headers={
-                "User-Agent": USER_AGENT,
-                "Accept": "application/json",
-            },
-        )
-        if config.api_key:
-            self._client.headers["Authorization"] = f"Bearer {config.api_key}"
-
-        super().__init__(config, self._client)
+        Prefetch the most frequently requested icons into the cache.
 
-    async def __aenter__(self) -> AsyncSvgApi:
-        """Support async context manager protocol."""
-        return self
-
-    async def __aexit__(self, *args: Any) -> None:
-        """Close the HTTP client on exit."""
-        await self.close()
-
-    async def close(self) -> None:
-        """Close the HTTP client."""
-        await self._client.aclose()
-
-    async def _request(
-        self,
-        method: str,
-        path: str,
-        params: dict[str, Any] | None = None,
-        json: dict[str, Any] | None = None,
-        headers: dict[str, str] | None = None,
-    ) -> dict[str, Any]:
-        """
-        Make an async HTTP request with retry logic.
+        Icons are fetched with batch requests of up to 50 icons each. Specs
+        already in the cache are skipped.
 
         Args:
-            method: HTTP method
-            path: API endpoint path
-            params: Query parameters
-            json: Request body JSON
-            headers: Additional headers
+            top_k: Number of hottest icon variants to prefetch
+            hot_set: Optional file written by save_hot_set(); its icons are
+                prefetched too, which lets a fresh process warm up at startup
+            related: Also prefetch up to this many related icons per hot icon,
+                using the recommendations endpoint
+            deadline: Time budget in seconds for the whole call, including retries
 
         Returns:
-            Parsed JSON response
+            Number of icons added to the cache
 
-        Raises:
-            SvgApiError: On API errors
+        Example:
+            >>> client = SvgApi()
+            >>> client.warm(hot_set="hot-icons.json")
         """
-        url = self._build_url(path)
-        request_headers = self._build_headers()
-        if headers:
-            request_headers.update(headers)
-
-        async def _make_request() -> dict[str, Any]:
-            response = await self._client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json,
-                headers=request_headers,
+        specs = merge_specs(load_hot_set(hot_set) if hot_set else [], self._access.top(top_k))
+        if related > 0:
+            specs = merge_specs(specs, self._related_specs(specs[:top_k], related))
+
+        missing = [spec for spec in specs if self._cache.get(spec_key(spec)) is None]
+        warmed = 0
+        for chunk in batch_chunks(missing):
+            with priority(BULK, override=False):
+                response = self.get_batch(chunk)
+            warmed += sum(
+                1
+                for spec in chunk
+                if (item := response.data.get(f"{spec['source']}:{spec['name']}")) and item.success
             )
-            return await self._handle_response(response)
+        return warmed
 
-        if self._config.max_retries > 0:
-            return await async_retry_with_backoff(
-                _make_request,
-                max_attempts=self._config.max_retries + 1,
-                base_delay=self._config.retry_delay,
-            )
-        return await _make_request()
-
-    async def _handle_response(self, response: httpx.Response) -> dict[str, Any]:
+    def save_hot_set(self, path: str | pathlib.Path, top_k: int = 100) -> None:
         """
-        Handle API response asynchronously.
+        Persist the most frequently requested icon variants for a later warm().
 
         Args:
-            response: HTTP response
-
-        Returns:
-            Parsed JSON response
-
-        Raises:
-            SvgApiError: On API errors
+            path: Destination JSON file
+            top_k: Number of icon variants to save
         """
-        try:
-            data = response.json()
-        except Exception:
-            data = {}
-
-        request_id = self._get_request_id(response)
-
-        try:
-            response.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            raise raise_for_status(e.response.status_code, data, request_id)
-        except httpx.TimeoutException as e:
-            raise TimeoutError(
-                message="Request timed out",
-                timeout=self._config.timeout,
-                request_id=request_id,
-            ) from e
-        except httpx.NetworkError as e:
-            raise NetworkError(
-                message=f"Network error: {e}",
-                request_id=request_id,
-            ) from e
-
-        return data
-
-    async def get_icon(
-        self,
-        name: str,
-        source: str = "heroicons",
-        size: int | None = None,
-        stroke: float | None = None,
-        color: str | None = None,
-    ) -> Icon:
+        dump_hot_set(path, self._access.top(top_k))
+
+    @property
+    def usage(self) -> UsageReporter:
+        """Background reporter of track_usage() events (created on first use)."""
+        if self._usage is None:
+            with self._usage_lock:
+                if self._usage is None:
+                    self._usage = UsageReporter(
+                        self,
+                        interval=self._config.usage_interval,
+                        capacity=self._config.usage_buffer_size,
+                    )
+        return self._usage
+
+    def track_usage(self, name: str, source: str, context: str | None = None) -> bool:
         """
-        Get a single icon by name (async).
+        Report that an icon was used, without waiting for the network.
+
+        The event is buffered and sent to /recommendations/track by a
+        background thread, aggregated with other uses of the same icon;
+        see UsageReporter. Pending events are flushed by close().
 
         Args:
             name: Icon name
-            source: Icon source (default: "heroicons")
-            size: Icon size in pixels (8-512)
-            stroke: Stroke width (0.5-3)
-            color: Icon color as hex or name
+            source: Icon source
+            context: Optional context the icon was used in (e.g. "navbar")
 
         Returns:
-            Icon object with SVG content
+            False if the event was dropped because the buffer is full
 
         Example:
-            >>> icon = await client.get_icon("home", source="heroicons", size=32)
+            >>> icon = client.get_icon("home", source="lucide")
+            >>> client.track_usage(icon.name, icon.source, context="navbar")
         """
-        if size is not None and not validate_size(size):
-            from svg_api.errors import InvalidRequestError
-
-            raise InvalidRequestError(
-                message="Size must be between 8 and 512",
-                code="INVALID_SIZE",
-                details={"provided": size, "min": 8, "max": 512},
-            )
-        if stroke is not None and not validate_stroke(stroke):
-            from svg_api.errors import InvalidRequestError
-
-            raise InvalidRequestError(
-                message="Stroke width must be between 0.5 and 3",
-                code="INVALID_STROKE",
-                details={"provided": stroke, "min": 0.5, "max": 3},
-            )
-        if color is not None and not validate_color(color):
-            from svg_api.errors import InvalidRequestError
-
-            raise InvalidRequestError(
-                message="Invalid color format. Use hex (#rrggbb) or named color",
-                code="INVALID_COLOR",
-                details={"provided": color},
+        return self.usage.record(name, source, context)
+
+    def _related_specs(self, specs: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+        """Collect related-icon hints; failures are ignored since hints are optional."""
+        related: list[dict[str, Any]] = []
+        for spec in specs:
+            try:
+                data = self._request(
+                    "GET",
+                    f"/recommendations/similar/{spec['name']}",
+                    params=build_query_params({"source": spec["source"], "limit": limit}),
+                )
+            except SvgApiError:
+                continue
+            related.extend(
+                {**spec, "name": item["name"], "source": item.get("source", spec["source"])}
+                for item in data.get("data", [])[:limit]
             )
+        return related
 
-        params = build_query_params({"source": source, "size": size, "stroke": stroke, "color": color})
-        data = await self._request("GET", f"/icons/{name}", params=params)
-        return IconResponse(**data).data
 
-    async def get_icon_svg(
-        self,
-        name: str,
-        source: str = "heroicons",
-        size: int | None = None,
-        stroke: float | None = None,
-        color: str | None = None,
-    ) -> str:
-        """Get raw SVG content for an icon (async)."""
-        icon = await self.get_icon(name, source, size, stroke, color)
-        return icon.svg
-
-    async def download_icon(
-        self,
-        name: str,
-        path: str | pathlib.Path,
-        source: str = "heroicons",
-        size: int | None = None,
-        stroke: float | None = None,
-        color: str | None = None,
-    ) -> str:
-        """Download an icon to a file (async)."""
-        import aiofiles
-
-        svg = await self.get_icon_svg(name, source, size, stroke, color)
-        path_obj = pathlib.Path(path)
-        path_obj.parent.mkdir(parents=True, exist_ok=True)
-        async with aiofiles.open(path_obj, "w", encoding="utf-8") as f:
-            await f.write(svg)
-        return str(path_obj.absolute())
-
-    async def search(
-        self,
-        query: str,
-        source: str | None = None,
-        category: str | None = None,
-        limit: int = 20,
-        offset: int = 0,
-    ) -> SearchResponse:
-        """Search for icons (async)."""
-        params = build_query_params({
-            "q": query,
-            "source": source,
-            "category": category,
-            "limit": min(limit, 100),
-            "offset": offset,
-        })
-        data = await self._request("GET", "/search", params=params)
-        return SearchResponse(**data)
-
-    async def get_batch(
-        self,
-        icons: list[dict[str, Any]],
-        defaults: dict[str, Any] | None = None,
-    ) -> BatchResponse:
-        """Fetch multiple icons in a single request (async)."""
-        icon_requests = [BatchIconRequest(**icon) for icon in icons]
-        defaults_obj = (
-            BatchIconRequest(**defaults) if defaults else BatchIconRequest(name="")
-        )
-        batch_request = BatchRequestOptions(
-            icons=icon_requests,
-            defaults=BatchIconRequest(
-                name="",
-                size=defaults_obj.size or 24,
-                stroke=defaults_obj.stroke or 2,
-            ),
-        )
-
-        data = await self._request(
-            "POST",
-            "/icons/batch",
-            json=batch_request.model_dump(by_alias=True, exclude_none=True),
+def __getattr__(name: str) -> Any:
+    """Resolve the deprecated ``svg_api.client.AsyncSvgApi`` alias."""
+    if name == "AsyncSvgApi":
+        warnings.warn(
+            "svg_api.client.AsyncSvgApi is deprecated and will be removed; "
+            "import AsyncSvgApi from svg_api or svg_api.async_client instead",
+            DeprecationWarning,
+            stacklevel=2,
         )
-        return BatchResponse(**data)
-
-    async def get_sources(self) -> SourcesResponse:
-        """List all available icon sources (async)."""
-        data = await self._request("GET", "/sources")
-        return SourcesResponse(**data)
-
-    async def get_categories(self, source: str | None = None) -> CategoriesResponse:
-        """List all icon categories (async)."""
-        params = build_query_params({"source": source})
-        data = await self._request("GET", "/categories", params=params)
-        return CategoriesResponse(**data)
+        from svg_api.async_client import AsyncSvgApi
 
-    async def get_random(
-        self,
-        source: str | None = None,
-        category: str | None = None,
-    ) -> Icon:
-        """Get a random icon (async)."""
-        params = build_query_params({"source": source, "category": category})
-        data = await self._request("GET", "/random", params=params)
-        return IconResponse(**data).data
+        return AsyncSvgApi
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,127 @@
+"""
+Pluggable JSON codecs for untyped request and response bodies.
+
+``get_codec()`` picks orjson or msgspec when installed
+(``pip install svg-api[fast-json]``) and falls back to the standard library.
+
+The codec does not touch typed bodies. Responses are decoded with pydantic's
+``model_validate_json``, which parses the raw bytes straight into the SDK
+models in one pass and measures faster than decoding with orjson and
+validating the result; models are encoded with ``model_dump_json`` for the
+same reason. The codec handles everything else: error payloads, hints and
+plain dict request bodies. See ``examples/benchmark_codecs.py`` for
+measurements.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import suppress
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class JsonCodec:
+    """
+    Standard-library JSON codec, and the base class for faster codecs.
+
+    Subclasses override ``dumps`` and ``loads``; ``encode`` and ``decode``
+    handle SDK models on top of them.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize a JSON-compatible object to UTF-8 bytes."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        """Parse JSON bytes or text."""
+        return json.loads(data)
+
+    def encode(self, body: Any) -> bytes:
+        """Serialize a request body; SDK models are dumped by alias without None fields."""
+        if isinstance(body, BaseModel):
+            return body.model_dump_json(by_alias=True, exclude_none=True).encode("utf-8")
+        return self.dumps(body)
+
+    def decode(self, data: bytes, model: type[M]) -> M:
+        """Parse a response body directly into ``model``."""
+        return model.model_validate_json(data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by orjson."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        data: bytes = self._orjson.dumps(obj)
+        return data
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """JSON codec backed by msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        data: bytes = self._encoder.encode(obj)
+        return data
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._decoder.decode(data)
+
+
+_CODECS: dict[str, type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+
+
+def get_codec(codec: JsonCodec | str | None = None) -> JsonCodec:
+    """
+    Resolve a codec instance.
+
+    Args:
+        codec: A JsonCodec instance, a codec name ("orjson", "msgspec",
+            "json"), or None for the fastest installed codec
+
+    Returns:
+        JsonCodec instance
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the named codec's library is not installed
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is not None:
+        if codec not in _CODECS:
+            raise ValueError(f"Unknown JSON codec {codec!r}; expected one of {sorted(_CODECS)}")
+        return _CODECS[codec]()
+    for candidate in (OrjsonCodec, MsgspecCodec):
+        with suppress(ImportError):
+            return candidate()
+    return JsonCodec()
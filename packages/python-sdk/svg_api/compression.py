@@ -0,0 +1,173 @@
+"""
+Content-encoding negotiation and streaming decompression for the SVG API SDK.
+
+Brotli (``brotli`` or ``brotlicffi``) and Zstandard (``zstandard``) are used
+when installed (``pip install svg-api[compression]``); gzip and deflate are
+always available.
+"""
+
+from __future__ import annotations
+
+import gzip
+import importlib
+import zlib
+from contextlib import suppress
+from functools import cache
+from typing import Any, Protocol
+
+from svg_api.errors import ApiError
+
+# Request bodies smaller than this are sent uncompressed; the gzip header and
+# CPU cost outweigh the savings on tiny payloads.
+MIN_COMPRESS_SIZE = 1024
+
+
+@cache
+def _optional_module(*names: str) -> Any:
+    """Import the first available module of ``names``, or return None."""
+    for name in names:
+        with suppress(ImportError):
+            return importlib.import_module(name)
+    return None
+
+
+def _brotli() -> Any:
+    return _optional_module("brotli", "brotlicffi")
+
+
+def _zstd() -> Any:
+    return _optional_module("zstandard")
+
+
+def available_encodings() -> list[str]:
+    """Return the response encodings this process can decode, best first."""
+    encodings = []
+    if _brotli() is not None:
+        encodings.append("br")
+    if _zstd() is not None:
+        encodings.append("zstd")
+    return [*encodings, "gzip", "deflate"]
+
+
+def accept_encoding() -> str:
+    """
+    Build the ``Accept-Encoding`` header value.
+
+    SvgApi leaves decoding to httpx, which decodes zstd from 0.27.1 on (the
+    minimum version the SDK requires); AsyncSvgApi uses StreamingDecoder.
+
+    Example:
+        >>> accept_encoding()  # with brotli and zstandard installed
+        'br, zstd, gzip;q=0.8, deflate;q=0.5'
+    """
+    weights = {"gzip": ";q=0.8", "deflate": ";q=0.5"}
+    return ", ".join(f"{name}{weights.get(name, '')}" for name in available_encodings())
+
+
+def compress_body(body: bytes) -> tuple[bytes, str | None]:
+    """
+    Gzip a request body if it is large enough to benefit.
+
+    Returns:
+        (body, content encoding), where the encoding is None if the body
+        was left uncompressed
+    """
+    if len(body) < MIN_COMPRESS_SIZE:
+        return body, None
+    return gzip.compress(body, compresslevel=6, mtime=0), "gzip"
+
+
+class _Decompressor(Protocol):
+    def decompress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _ZlibDecoder:
+    """gzip or deflate (zlib-wrapped, falling back to raw deflate)."""
+
+    def __init__(self, gzip_wrapped: bool) -> None:
+        self._gzip = gzip_wrapped
+        self._obj = zlib.decompressobj(zlib.MAX_WBITS | 16 if gzip_wrapped else zlib.MAX_WBITS)
+        self._started = False
+
+    def decompress(self, data: bytes) -> bytes:
+        if not self._started and not self._gzip and data:
+            self._started = True
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self) -> None:
+        module = _brotli()
+        self._obj = module.Decompressor()
+        self._process = getattr(self._obj, "process", None) or self._obj.decompress
+
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(self._process(data))
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _ZstdDecoder:
+    def __init__(self) -> None:
+        self._obj = _zstd().ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(self._obj.decompress(data))
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _decoder(encoding: str) -> _Decompressor | None:
+    if encoding in ("gzip", "x-gzip"):
+        return _ZlibDecoder(gzip_wrapped=True)
+    if encoding == "deflate":
+        return _ZlibDecoder(gzip_wrapped=False)
+    if encoding == "br" and _brotli() is not None:
+        return _BrotliDecoder()
+    if encoding == "zstd" and _zstd() is not None:
+        return _ZstdDecoder()
+    if encoding in ("", "identity"):
+        return None
+    raise ApiError(
+        f"Unsupported response Content-Encoding: {encoding}", code="UNSUPPORTED_ENCODING"
+    )
+
+
+class StreamingDecoder:
+    """
+    Incrementally decode a response body given its ``Content-Encoding``.
+
+    Multiple encodings ("gzip, br") are undone in reverse order.
+
+    Example:
+        >>> decoder = StreamingDecoder(response.headers.get("Content-Encoding"))
+        >>> body = b"".join(decoder.decompress(chunk) for chunk in chunks) + decoder.flush()
+    """
+
+    def __init__(self, content_encoding: str | None) -> None:
+        names = [part.strip().lower() for part in (content_encoding or "").split(",")]
+        self._chain = [d for d in (_decoder(name) for name in reversed(names)) if d is not None]
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decode one chunk of the body."""
+        for decoder in self._chain:
+            data = decoder.decompress(data)
+        return data
+
+    def flush(self) -> bytes:
+        """Return any remaining decoded bytes at the end of the body."""
+        data = b""
+        for decoder in self._chain:
+            data = decoder.decompress(data) + decoder.flush() if data else decoder.flush()
+        return data
@@ -0,0 +1,178 @@
+"""
+End-to-end deadlines for SVG API calls.
+
+A deadline bounds the whole call: every attempt, every backoff sleep, every
+chunk of a batch operation and every page of a search iteration. Set one
+for a block of code with ``deadline()``, or per call with the ``deadline``
+keyword argument that client methods accept. Deadlines are stored in a
+context variable, so they follow async tasks; nested deadlines can only
+shorten the one already in effect.
+
+Example:
+    >>> with deadline(2.0):
+    ...     icon = client.get_icon("home")
+    ...     results = client.search("arrow")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from svg_api.errors import DeadlineExceededError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Iterator
+    from contextlib import AbstractContextManager
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+# Absolute expiry (time.monotonic()) of the innermost deadline, if any.
+_expires_at: ContextVar[float | None] = ContextVar("svg_api_deadline", default=None)
+
+
+def expires_at(seconds: float | None = None) -> float | None:
+    """
+    Return the absolute expiry that applies to a call starting now.
+
+    Args:
+        seconds: Deadline for the call itself, if any
+
+    Returns:
+        The earlier of the current deadline and now + ``seconds``, as a
+        ``time.monotonic()`` value, or None if neither is set
+    """
+    current = _expires_at.get()
+    if seconds is None:
+        return current
+    expiry = time.monotonic() + seconds
+    return expiry if current is None else min(current, expiry)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline (may be negative), or None without one."""
+    current = _expires_at.get()
+    return None if current is None else current - time.monotonic()
+
+
+def check_deadline() -> None:
+    """
+    Raise if the current deadline has passed.
+
+    Raises:
+        DeadlineExceededError: If the deadline has expired
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError()
+
+
+def attempt_timeout(timeout: float) -> float:
+    """
+    Clip a per-attempt timeout to the time left before the deadline.
+
+    Raises:
+        DeadlineExceededError: If the deadline has already expired
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceededError()
+    return min(timeout, left)
+
+
+def check_backoff(delay: float, error: Exception) -> None:
+    """
+    Raise instead of sleeping ``delay`` if the retry would start after the deadline.
+
+    Raises:
+        DeadlineExceededError: Chained to ``error``, the failure being retried
+    """
+    left = remaining()
+    if left is not None and left <= delay:
+        raise DeadlineExceededError() from error
+
+
+@contextmanager
+def deadline_at(expiry: float | None) -> Iterator[float | None]:
+    """Apply an absolute expiry from expires_at() to the enclosed block."""
+    current = _expires_at.get()
+    if expiry is None or (current is not None and current <= expiry):
+        yield current
+        return
+    token = _expires_at.set(expiry)
+    try:
+        yield expiry
+    finally:
+        _expires_at.reset(token)
+
+
+def deadline(seconds: float | None) -> AbstractContextManager[float | None]:
+    """
+    Context manager that bounds the enclosed calls to ``seconds`` from now.
+
+    ``None`` leaves the current deadline (if any) unchanged. Works in both
+    sync and async code.
+
+    Example:
+        >>> async with AsyncSvgApi() as client:
+        ...     with deadline(2.0):
+        ...         await client.get_batch(icons)
+    """
+    return deadline_at(expires_at(seconds))
+
+
+def with_deadline(func: F) -> F:
+    """
+    Apply a client method's ``deadline`` keyword argument for the duration of the call.
+
+    The decorated method must declare ``deadline: float | None = None`` as a
+    keyword-only parameter.
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with deadline(kwargs.get("deadline")):
+                return await func(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with deadline(kwargs.get("deadline")):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+async def gather_within_deadline(*aws: Awaitable[T]) -> list[T]:
+    """
+    Run awaitables concurrently; on the first failure cancel the rest and raise it.
+
+    Unlike ``asyncio.gather``, an expired deadline (or any other error) in
+    one chunk of a bulk operation does not leave the other chunks running.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()  # type: ignore[misc]
+        return [task.result() for task in tasks]
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        # Also collects the exceptions of chunks that failed alongside the one raised.
+        await asyncio.gather(*tasks, return_exceptions=True)
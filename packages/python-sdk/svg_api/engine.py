@@ -0,0 +1,166 @@
+"""
+Asyncio engine behind a synchronous client.
+
+With ``SvgApi(engine="asyncio")`` every request is handed to an
+``AsyncSvgApi`` running on a private event loop in a background thread.
+Any number of caller threads then share the async client's connection
+pools, priority lanes and in-flight limit instead of holding one blocking
+connection each, and identical GET requests in flight at the same time are
+sent once. The caller's deadline() and priority() carry over to the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from svg_api.deadlines import deadline_at, expires_at, remaining
+from svg_api.errors import DeadlineExceededError
+from svg_api.lanes import current_lane, priority
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine, Mapping
+
+    from svg_api.async_client import AsyncSvgApi
+    from svg_api.client import SvgApiConfig
+
+T = TypeVar("T")
+
+ENGINES = ("threads", "asyncio")
+
+# Identity of a GET request for coalescing: path, query and extra headers.
+_RequestKey = tuple[str, tuple[tuple[str, Any], ...], tuple[tuple[str, str], ...]]
+
+
+class AsyncEngine:
+    """
+    Background event loop running an AsyncSvgApi for synchronous callers.
+
+    Thread-safe: send() may be called from any thread, and blocks only the
+    calling thread until its request completes.
+    """
+
+    def __init__(self, config: SvgApiConfig) -> None:
+        """
+        Start the loop thread and create the async client.
+
+        Args:
+            config: Sync client configuration; connection, retry, codec and
+                compression settings are passed on to the async client,
+                while caching stays with the sync client
+
+        Raises:
+            ImportError: If aiohttp is not installed
+        """
+        from svg_api.async_client import AsyncSvgApi, AsyncSvgApiConfig
+
+        self.coalesced = 0
+        self._inflight: dict[_RequestKey, asyncio.Future[tuple[bytes, Mapping[str, str]]]] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="svg-api-engine", daemon=True)
+        self._thread.start()
+        async_config = AsyncSvgApiConfig(
+            base_urls=config.base_urls,
+            api_key=config.api_key,
+            timeout=config.timeout,
+            max_retries=config.max_retries,
+            retry_delay=config.retry_delay,
+            cache_size=0,
+            compress_requests=config.compress_requests,
+            json_codec=config.json_codec,
+            max_concurrency=config.max_concurrency,
+            negative_cache_ttl=0,
+        )
+
+        async def create() -> AsyncSvgApi:
+            return AsyncSvgApi(config=async_config)
+
+        self.client = self.call(create())
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def call(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run ``coro`` on the engine's loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            # Interrupted while waiting (e.g. KeyboardInterrupt): stop the request too.
+            future.cancel()
+            raise
+
+    def send(
+        self,
+        method: str,
+        path: str,
+        params: Mapping[str, Any] | None = None,
+        json: Any = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> tuple[bytes, Mapping[str, str]]:
+        """
+        Make a request through the async client, under the caller's deadline and lane.
+
+        Returns:
+            Raw response body and the response headers
+
+        Raises:
+            SvgApiError: On API errors
+        """
+        return self.call(
+            self._send(method, path, params, json, headers, expires_at(), current_lane())
+        )
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Mapping[str, Any] | None,
+        json: Any,
+        headers: Mapping[str, str] | None,
+        expiry: float | None,
+        lane: str,
+    ) -> tuple[bytes, Mapping[str, str]]:
+        with deadline_at(expiry), priority(lane):
+            if method != "GET":
+                return await self.client._send(method, path, params, json, headers)
+            key: _RequestKey = (
+                path,
+                tuple(sorted((params or {}).items())),
+                tuple(sorted((headers or {}).items())),
+            )
+            shared = self._inflight.get(key)
+            if shared is None:
+                request = self.client._send(method, path, params, None, headers)
+                shared = self._inflight[key] = asyncio.ensure_future(request)
+                shared.add_done_callback(lambda task: self._forget(key, task))
+            else:
+                self.coalesced += 1
+            try:
+                # Shielded: a caller giving up must not cancel the request for the others.
+                return await asyncio.shield(shared)
+            except DeadlineExceededError:
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise
+                # The shared request ran out of a shorter deadline than ours.
+                return await self.client._send(method, path, params, None, headers)
+
+    def _forget(self, key: _RequestKey, task: asyncio.Future[Any]) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller gave up waiting
+
+    def close(self) -> None:
+        """Close the async client and stop the loop thread."""
+        if self._loop.is_closed():
+            return
+        self.call(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __repr__(self) -> str:
+        return f"AsyncEngine(in_flight={len(self._inflight)}, coalesced={self.coalesced})"
@@ -6,7 +6,7 @@ All exceptions inherit from SvgApiError for easy exception handling.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, NoReturn
 
 
 class SvgApiError(Exception):
@@ -84,7 +84,9 @@ class RateLimitError(SvgApiError):
         retry_after: int | None = None,
         **kwargs: Any,
     ) -> None:
-        super().__init__(message, code="RATE_LIMITED", status_code=429, **kwargs)
+        kwargs.setdefault("code", "RATE_LIMITED")
+        kwargs.setdefault("status_code", 429)
+        super().__init__(message, **kwargs)
         self.retry_after = retry_after
 
     def __repr__(self) -> str:
@@ -155,6 +157,19 @@ class TimeoutError(SvgApiError):
         )
 
 
+class DeadlineExceededError(TimeoutError):
+    """
+    Raised when a call's deadline expires (see ``svg_api.deadlines``).
+
+    Unlike a plain TimeoutError this is never retried: the deadline covers
+    all attempts of the call.
+    """
+
+    def __init__(self, message: str = "Deadline exceeded", **kwargs: Any) -> None:
+        kwargs.setdefault("code", "DEADLINE_EXCEEDED")
+        super().__init__(message, **kwargs)
+
+
 class NetworkError(SvgApiError):
     """
     Raised when a network error occurs during the request.
@@ -167,7 +182,7 @@ def raise_for_status(
     status_code: int,
     data: dict[str, Any],
     request_id: str | None = None,
-) -> None:
+) -> NoReturn:
     """
     Raise an appropriate exception based on the status code.
 
@@ -217,19 +232,19 @@ def raise_for_status(
             details=details,
             request_id=request_id,
         )
-    elif status_code >= 500:
-        if status_code == 503:
-            raise ServiceUnavailableError(
-                message=message,
-                code=code,
-                status_code=status_code,
-                details=details,
-                request_id=request_id,
-            )
-        raise ApiError(
+    elif status_code == 503:
+        raise ServiceUnavailableError(
             message=message,
             code=code,
             status_code=status_code,
             details=details,
             request_id=request_id,
         )
+    # Other server errors and any other client error (403, 409, 422, ...).
+    raise ApiError(
+        message=message,
+        code=code,
+        status_code=status_code,
+        details=details,
+        request_id=request_id,
+    )
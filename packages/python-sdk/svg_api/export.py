@@ -0,0 +1,316 @@
+"""
+Resumable bulk export of icons into a directory.
+
+Layout of the export directory::
+
+    <source>/<file>.svg       # one file per icon variant (see icon_path())
+    .export-journal           # "<spec key>\\t<sha256>" per exported icon
+
+Every batch written is appended to the journal, so a job killed halfway
+resumes where it stopped: icons recorded in the journal are checked by
+hashing the file on disk and only refetched if the file is missing or
+differs. Icons that failed are not journaled and are retried by the next run.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import pathlib
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, TextIO
+
+from svg_api.batch import batch_chunks
+from svg_api.cache import spec_key
+from svg_api.errors import SvgApiError
+from svg_api.lanes import BULK, priority
+from svg_api.sync import BATCH_CHUNK_SIZE, content_hash, write_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from svg_api.client import SvgApi
+
+JOURNAL_NAME = ".export-journal"
+# Throughput (and so the ETA) is measured over this many recent seconds.
+RATE_WINDOW = 30.0
+
+
+def icon_filename(spec: dict[str, Any]) -> str:
+    """
+    Return the file name for an icon variant.
+
+    Example:
+        >>> icon_filename({"name": "home", "source": "lucide", "size": 32})
+        'home_size-32.svg'
+    """
+    suffix = "".join(
+        f"_{option}-{str(spec[option]).lstrip('#')}"
+        for option in ("size", "stroke", "color")
+        if spec.get(option) is not None
+    )
+    return f"{spec['name']}{suffix}.svg"
+
+
+def icon_path(spec: dict[str, Any], flat: bool = False) -> str:
+    """Relative output path: ``<source>/<file>``, or just ``<file>`` when flat."""
+    filename = icon_filename(spec)
+    return filename if flat else f"{spec['source']}/{filename}"
+
+
+class ExportProgress:
+    """
+    Progress of a running ExportJob, passed to its ``progress`` callback.
+
+    Attributes:
+        total: Icons in the job
+        done: Icons exported or verified so far (including earlier runs)
+        failed: Icons that failed in this run
+        rate: Icons fetched per second, over the last RATE_WINDOW seconds
+        eta: Estimated seconds until the job finishes, or None before the
+            first batch completes
+    """
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.rate = 0.0
+        self.eta: float | None = None
+        # (time, icons processed) samples within the rate window
+        self._samples: deque[tuple[float, int]] = deque([(time.monotonic(), 0)])
+        self._fetched = 0
+
+    def _record(self, fetched: int, failed: int) -> None:
+        now = time.monotonic()
+        self._fetched += fetched + failed
+        self.done += fetched
+        self.failed += failed
+        self._samples.append((now, self._fetched))
+        while len(self._samples) > 2 and now - self._samples[1][0] > RATE_WINDOW:
+            self._samples.popleft()
+        start, count = self._samples[0]
+        if now > start:
+            self.rate = (self._fetched - count) / (now - start)
+        left = self.total - self.done - self.failed
+        self.eta = left / self.rate if self.rate > 0 else None
+
+    def __repr__(self) -> str:
+        eta = f"{self.eta:.0f}s" if self.eta is not None else "?"
+        return (
+            f"ExportProgress(done={self.done}/{self.total}, failed={self.failed}, "
+            f"rate={self.rate:.1f}/s, eta={eta})"
+        )
+
+
+class ExportResult:
+    """
+    Summary of an ExportJob run.
+
+    Attributes:
+        total: Icons in the job (distinct output files)
+        verified: Icons from earlier runs whose file matched the journal
+        fetched: Icons downloaded and written in this run
+        failed: Errors keyed by cache.spec_key()
+        elapsed: Wall-clock duration in seconds
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.verified = 0
+        self.fetched = 0
+        self.failed: dict[str, str] = {}
+        self.elapsed = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """True if every icon of the job is on disk."""
+        return self.verified + self.fetched == self.total
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "verified": self.verified,
+            "fetched": self.fetched,
+            "failed": dict(self.failed),
+            "elapsed": self.elapsed,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ExportResult(total={self.total}, verified={self.verified}, "
+            f"fetched={self.fetched}, failed={len(self.failed)})"
+        )
+
+
+class ExportJob:
+    """
+    Export icon variants to SVG files, resumably.
+
+    Batches run on ``max_workers`` threads through the client's adaptive
+    limiter (``client.limiter``), and each completed batch is checkpointed
+    in the journal. Running the same job again, after a crash or to finish
+    failed icons, costs one hash check per exported file plus requests for
+    whatever is still missing. Inside a ``deadline()`` block, batches that
+    cannot finish in time are recorded as failed.
+
+    Example:
+        >>> specs = [{"name": name, "source": "material-symbols"} for name in names]
+        >>> job = ExportJob(client, specs, "export/")
+        >>> result = job.run(progress=lambda p: print(p.done, p.total, p.eta))
+        >>> result.complete
+    """
+
+    def __init__(
+        self,
+        client: SvgApi,
+        specs: Iterable[dict[str, Any]],
+        directory: str | pathlib.Path,
+        flat: bool = False,
+        max_workers: int | None = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        journal: str | pathlib.Path | None = None,
+    ) -> None:
+        """
+        Initialize the job.
+
+        Args:
+            client: Client used for all requests
+            specs: Icon specs ("name", "source" and optional size, stroke, color)
+            directory: Output directory (created if missing)
+            flat: Write files directly into ``directory`` instead of one
+                subdirectory per source
+            max_workers: Maximum batch requests in flight (default: the
+                client limiter's max_limit)
+            chunk_size: Icons per batch request (max 50)
+            journal: Journal file (default: ``directory/.export-journal``)
+        """
+        self._client = client
+        self.directory = pathlib.Path(directory)
+        self.journal_path = pathlib.Path(journal) if journal else self.directory / JOURNAL_NAME
+        self._max_workers = max(1, max_workers or client.limiter.max_limit)
+        self._chunk_size = max(1, min(chunk_size, BATCH_CHUNK_SIZE))
+        # One entry per output file; the first spec for a path wins.
+        self._paths: dict[str, dict[str, Any]] = {}
+        for spec in specs:
+            self._paths.setdefault(icon_path(spec, flat), spec)
+
+    def _read_journal(self) -> dict[str, str]:
+        digests: dict[str, str] = {}
+        if self.journal_path.exists():
+            with self.journal_path.open(encoding="utf-8") as journal:
+                for line in journal:
+                    key, _, digest = line.rstrip("\n").partition("\t")
+                    if key and digest:
+                        digests[key] = digest
+        return digests
+
+    def _verified(self, path: pathlib.Path, digest: str | None) -> bool:
+        if digest is None:
+            return False
+        try:
+            return content_hash(path.read_text(encoding="utf-8")) == digest
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def run(self, progress: Callable[[ExportProgress], None] | None = None) -> ExportResult:
+        """
+        Export every icon not already on disk.
+
+        Args:
+            progress: Called after each batch with the job's progress
+
+        Returns:
+            ExportResult summarizing the run
+        """
+        started = time.perf_counter()
+        result = ExportResult()
+        result.total = len(self._paths)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        digests = self._read_journal()
+        pending: list[tuple[str, dict[str, Any]]] = []
+        for path, spec in self._paths.items():
+            if self._verified(self.directory / path, digests.get(spec_key(spec))):
+                result.verified += 1
+            else:
+                pending.append((path, spec))
+
+        state = ExportProgress(result.total)
+        state.done = result.verified
+        if progress is not None:
+            progress(state)
+
+        paths = {spec_key(spec): path for path, spec in pending}
+        chunks = batch_chunks((spec for _, spec in pending), self._chunk_size)
+        journal = self.journal_path.open("a", encoding="utf-8")
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        with journal, executor, priority(BULK, override=False):
+            in_flight: dict[Future[dict[str, str | SvgApiError]], list[dict[str, Any]]] = {}
+            for chunk in chunks:
+                while len(in_flight) >= self._max_workers:
+                    self._drain(in_flight, paths, journal, result, state, progress)
+                # Run in a copy of the caller's context so an enclosing deadline() applies.
+                context = contextvars.copy_context()
+                in_flight[executor.submit(context.run, self._fetch_chunk, chunk)] = chunk
+            while in_flight:
+                self._drain(in_flight, paths, journal, result, state, progress)
+
+        # Drop superseded journal lines once the run has finished.
+        digests = self._read_journal()
+        write_atomic(
+            self.journal_path, "".join(f"{key}\t{digest}\n" for key, digest in digests.items())
+        )
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _fetch_chunk(self, chunk: list[dict[str, Any]]) -> dict[str, str | SvgApiError]:
+        """Fetch one batch and return SVG bodies (or errors) keyed by spec key."""
+        try:
+            response = self._client.limiter.call(self._client.get_batch, chunk)
+        except SvgApiError as e:
+            return {spec_key(spec): e for spec in chunk}
+
+        bodies: dict[str, str | SvgApiError] = {}
+        for spec in chunk:
+            key = f"{spec['source']}:{spec['name']}"
+            item = response.data.get(key)
+            if item is not None and item.success and item.svg is not None:
+                bodies[spec_key(spec)] = item.svg
+            else:
+                error = response.errors.get(key)
+                bodies[spec_key(spec)] = SvgApiError(
+                    error.message if error else "Missing from batch response",
+                    code=error.code if error else None,
+                )
+        return bodies
+
+    def _drain(
+        self,
+        in_flight: dict[Future[dict[str, str | SvgApiError]], list[dict[str, Any]]],
+        paths: dict[str, str],
+        journal: TextIO,
+        result: ExportResult,
+        state: ExportProgress,
+        progress: Callable[[ExportProgress], None] | None,
+    ) -> None:
+        """Wait for at least one batch, then write it out and checkpoint it."""
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            in_flight.pop(future)
+            lines: list[str] = []
+            failed = 0
+            for key, body in future.result().items():
+                if isinstance(body, SvgApiError):
+                    result.failed[key] = str(body)
+                    failed += 1
+                    continue
+                write_atomic(self.directory / paths[key], body)
+                lines.append(f"{key}\t{content_hash(body)}\n")
+            journal.writelines(lines)
+            journal.flush()
+            result.fetched += len(lines)
+            state._record(len(lines), failed)
+            if progress is not None:
+                progress(state)
@@ -0,0 +1,12 @@
+"""
+Template integrations built on ``svg_api.render.IconRenderer``.
+
+- ``svg_api.integrations.jinja2``: ``IconExtension`` for Jinja2 environments
+- ``svg_api.integrations.django``: ``{% icon %}`` template tags and ``IconMiddleware``
+- ``svg_api.integrations.fastapi``: ``IconPrefetch`` dependency
+
+Each page render fetches the icons it uses in at most one round of batch
+requests, and icons are shared across requests through the renderer's
+process-wide cache. Install the framework with the matching extra, e.g.
+``pip install svg-api[jinja2]``.
+"""
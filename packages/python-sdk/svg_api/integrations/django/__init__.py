@@ -0,0 +1,66 @@
+"""
+Django integration.
+
+Add ``"svg_api.integrations.django"`` to ``INSTALLED_APPS`` and
+``"svg_api.integrations.django.IconMiddleware"`` to ``MIDDLEWARE``, then::
+
+    {% load svg_api %}
+    {% icon "home" source="lucide" class="h-4 w-4" aria_label="Home" %}
+    {% icon_sprite %}
+
+The renderer is configured by the optional ``SVG_API`` setting::
+
+    SVG_API = {
+        "client": {"api_key": "sk_live_xxx"},  # SvgApi arguments
+        "source": "lucide",                    # IconRenderer arguments
+        "mode": "sprite",
+    }
+
+The middleware fetches all icons used by an HTML response in one round of
+batch requests after the view has rendered it. Outside the middleware (for
+example ``render_to_string`` in a management command) uncached icons are
+fetched on the spot.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.http import HttpRequest, HttpResponse
+
+    from svg_api.render import IconRenderer
+
+
+@functools.cache
+def get_renderer() -> IconRenderer:
+    """Return the process-wide renderer built from the ``SVG_API`` setting."""
+    from svg_api.client import SvgApi
+    from svg_api.render import IconRenderer
+
+    options: dict[str, Any] = dict(getattr(settings, "SVG_API", {}))
+    client = SvgApi(**options.pop("client", {}))
+    return IconRenderer(client, **options)
+
+
+class IconMiddleware:
+    """Render each request inside an IconRenderer page and fill in its icons."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        renderer = get_renderer()
+        with renderer.page() as page:
+            response = self.get_response(request)
+            if page.used and not response.streaming and "html" in response.get("Content-Type", ""):
+                content = page.finish(response.content.decode(response.charset))
+                response.content = content.encode(response.charset)
+                if response.has_header("Content-Length"):
+                    response["Content-Length"] = str(len(response.content))
+        return response
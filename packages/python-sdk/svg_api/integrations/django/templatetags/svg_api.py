@@ -0,0 +1,35 @@
+"""
+Icon template tags: ``{% load svg_api %}``.
+
+See ``svg_api.integrations.django`` for setup.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django import template
+from django.utils.safestring import SafeString, mark_safe
+
+from svg_api.integrations.django import get_renderer
+
+register = template.Library()
+
+
+@register.simple_tag
+def icon(
+    name: str,
+    source: str | None = None,
+    size: int | None = None,
+    stroke: float | None = None,
+    color: str | None = None,
+    **attrs: Any,
+) -> SafeString:
+    """Render an icon: ``{% icon "home" source="lucide" size=20 class="icon" %}``."""
+    return mark_safe(get_renderer().icon(name, source, size, stroke, color, **attrs))
+
+
+@register.simple_tag
+def icon_sprite() -> SafeString:
+    """Render the page's sprite sheet (sprite mode): ``{% icon_sprite %}``."""
+    return mark_safe(get_renderer().sprite())
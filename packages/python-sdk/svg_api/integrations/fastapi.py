@@ -0,0 +1,81 @@
+"""
+FastAPI integration.
+
+``IconPrefetch`` is a dependency that fetches the icons of the templates an
+endpoint renders before the endpoint runs, without blocking the event loop.
+Rendering through ``Jinja2Templates`` (whose environment has
+``IconExtension``) is then served from the renderer's cache.
+
+Example:
+    >>> renderer = IconRenderer(SvgApi(), source="lucide")
+    >>> env = Environment(loader=FileSystemLoader("templates"), extensions=[IconExtension])
+    >>> env.svg_api_renderer = renderer
+    >>> templates = Jinja2Templates(env=env)
+    >>>
+    >>> @app.get("/")
+    ... async def index(
+    ...     request: Request,
+    ...     icons: IconRenderer = Depends(IconPrefetch(renderer, "index.html", environment=env)),
+    ... ):
+    ...     return templates.TemplateResponse(request, "index.html")
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from svg_api.integrations.jinja2 import template_icons
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import jinja2
+
+    from svg_api.render import IconRenderer
+
+
+class IconPrefetch:
+    """
+    Dependency that prefetches icons and returns the renderer.
+
+    Icons come from the given templates (literal ``icon()`` calls, see
+    template_icons()) and from ``icons``, given as "name", "source:name"
+    or spec dicts. All of them are fetched in one round of batch requests;
+    once cached, the dependency costs no network I/O.
+    """
+
+    def __init__(
+        self,
+        renderer: IconRenderer,
+        *templates: str,
+        icons: Iterable[str | dict[str, Any]] = (),
+        environment: jinja2.Environment | None = None,
+    ) -> None:
+        """
+        Initialize the dependency.
+
+        Args:
+            renderer: Renderer whose cache is filled
+            *templates: Names of templates the endpoint renders
+            icons: Additional icons, e.g. ones named only at render time
+            environment: Jinja2 environment with IconExtension (required
+                when templates are given)
+        """
+        if templates and environment is None:
+            raise ValueError("IconPrefetch needs the Jinja2 environment to scan templates")
+        self.renderer = renderer
+        self.templates = templates
+        self.environment = environment
+        self.icons = [renderer.spec(icon) if isinstance(icon, str) else icon for icon in icons]
+
+    def specs(self) -> list[dict[str, Any]]:
+        """Return every icon spec this dependency prefetches."""
+        specs = list(self.icons)
+        if self.environment is not None:
+            for name in self.templates:
+                specs.extend(template_icons(self.environment, name))
+        return specs
+
+    async def __call__(self) -> IconRenderer:
+        await self.renderer.aprefetch(self.specs())
+        return self.renderer
@@ -0,0 +1,128 @@
+"""
+Jinja2 integration.
+
+Example:
+    >>> env = Environment(loader=FileSystemLoader("templates"), extensions=[IconExtension])
+    >>> env.svg_api_renderer = IconRenderer(SvgApi(), source="lucide")
+    >>> env.get_template("page.html").render()
+
+Templates call ``{{ icon("home", class_="h-4 w-4") }}`` (any IconRenderer.icon()
+arguments) and, in sprite mode, ``{{ icon_sprite() }}``. ``render()`` and
+``render_async()`` resolve all icons of the page, including those of
+included and extended templates, in one round of batch requests once the
+template has been rendered; ``generate()`` and ``stream()`` fall back to
+fetching uncached icons on the spot.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import jinja2
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+if TYPE_CHECKING:
+    from svg_api.render import IconRenderer
+
+_SPEC_ARGS = ("name", "source", "size", "stroke", "color")
+
+
+def _renderer(environment: jinja2.Environment) -> IconRenderer:
+    renderer: IconRenderer | None = getattr(environment, "svg_api_renderer", None)
+    if renderer is None:
+        raise RuntimeError("Set environment.svg_api_renderer to an IconRenderer to render icons")
+    return renderer
+
+
+class IconTemplate(jinja2.Template):
+    """Template that renders inside an IconRenderer page and fills in its icons."""
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        renderer: IconRenderer | None = getattr(self.environment, "svg_api_renderer", None)
+        if renderer is None:
+            return super().render(*args, **kwargs)
+        with renderer.page() as page:
+            return page.finish(super().render(*args, **kwargs))
+
+    async def render_async(self, *args: Any, **kwargs: Any) -> str:
+        renderer: IconRenderer | None = getattr(self.environment, "svg_api_renderer", None)
+        if renderer is None:
+            return await super().render_async(*args, **kwargs)
+        with renderer.page() as page:
+            return await page.afinish(await super().render_async(*args, **kwargs))
+
+
+class IconExtension(Extension):
+    """
+    Adds the ``icon()`` and ``icon_sprite()`` globals and page-level icon batching.
+
+    The environment's ``template_class`` is switched to a subclass of
+    IconTemplate, and ``environment.svg_api_renderer`` (None until set)
+    selects the renderer.
+    """
+
+    def __init__(self, environment: jinja2.Environment) -> None:
+        super().__init__(environment)
+        environment.extend(svg_api_renderer=None, svg_api_template_icons={})
+        environment.globals["icon"] = self._icon
+        environment.globals["icon_sprite"] = self._sprite
+        base = environment.template_class
+        if not issubclass(base, IconTemplate):
+            environment.template_class = type("IconTemplate", (IconTemplate, base), {})
+
+    def _icon(self, *args: Any, **kwargs: Any) -> Markup:
+        return Markup(_renderer(self.environment).icon(*args, **kwargs))
+
+    def _sprite(self) -> Markup:
+        return Markup(_renderer(self.environment).sprite())
+
+
+def template_icons(environment: jinja2.Environment, name: str) -> list[dict[str, Any]]:
+    """
+    Return the icon specs a template references with literal arguments.
+
+    Follows ``include``, ``extends`` and ``import`` of literal template names.
+    Icons whose name is computed at render time cannot be found this way.
+    Results are cached per environment and template name.
+
+    Example:
+        >>> await renderer.aprefetch(template_icons(env, "page.html"))
+    """
+    renderer = _renderer(environment)
+    found: dict[str, list[dict[str, Any]]] = environment.svg_api_template_icons  # type: ignore[attr-defined]
+    if name in found:
+        return found[name]
+    found[name] = []  # Guards against include cycles.
+
+    loader = environment.loader
+    if loader is None:
+        return []
+    source, _, _ = loader.get_source(environment, name)
+    tree = environment.parse(source, name)
+
+    specs: list[dict[str, Any]] = []
+    for call in tree.find_all(nodes.Call):
+        if not (isinstance(call.node, nodes.Name) and call.node.name == "icon"):
+            continue
+        values = [arg.value for arg in call.args if isinstance(arg, nodes.Const)]
+        if len(values) < len(call.args):
+            continue
+        # Calls usually pass fewer positional arguments than there are spec fields.
+        options = dict(zip(_SPEC_ARGS, values, strict=False))
+        options.update(
+            (kw.key, kw.value.value)
+            for kw in call.kwargs
+            if kw.key in _SPEC_ARGS and isinstance(kw.value, nodes.Const)
+        )
+        if isinstance(options.get("name"), str):
+            specs.append(renderer.spec(**options))
+
+    for node in tree.find_all((nodes.Include, nodes.Extends, nodes.Import, nodes.FromImport)):
+        template = getattr(node, "template", None)
+        if isinstance(template, nodes.Const) and isinstance(template.value, str):
+            specs.extend(template_icons(environment, template.value))
+
+    found[name] = specs
+    return specs
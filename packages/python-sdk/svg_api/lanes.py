@@ -0,0 +1,229 @@
+"""
+Priority lanes for traffic sharing one async client.
+
+Each request runs in the lane chosen with ``priority()``: "interactive"
+unless set, while the client's bulk operations (warm-ups, optimized
+batches, streams, sprites) pick "bulk". ``LaneScheduler`` admits at most
+``slots`` requests at once, so excess requests wait in per-lane queues
+instead of the connection pool's single FIFO. Contended slots go to lanes
+in proportion to their weights (stride scheduling), and slots reserved for
+a lane are never handed to another one, so interactive calls find a free
+connection even while a bulk job saturates the rest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from svg_api.deadlines import remaining
+from svg_api.errors import DeadlineExceededError
+from svg_api.stats import LatencyHistogram
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Iterator
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+_lane: ContextVar[str | None] = ContextVar("svg_api_lane", default=None)
+
+
+def current_lane(default: str = INTERACTIVE) -> str:
+    """Return the lane chosen by the innermost priority() block, or ``default``."""
+    lane = _lane.get()
+    return default if lane is None else lane
+
+
+@contextmanager
+def priority(lane: str, *, override: bool = True) -> Iterator[None]:
+    """
+    Send the requests made inside the block through ``lane``.
+
+    Like deadline(), the choice follows ``await`` and is inherited by tasks
+    created inside the block.
+
+    Args:
+        lane: Lane name, e.g. "interactive" or "bulk"
+        override: With False, a lane chosen by an enclosing block is kept
+            (bulk operations use this, so callers can still promote them)
+
+    Example:
+        >>> with priority("bulk"):
+        ...     await client.get_batch(chunk)
+    """
+    if not override and _lane.get() is not None:
+        yield
+        return
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+class Lane:
+    """
+    One priority class of a LaneScheduler.
+
+    Attributes:
+        name: Name passed to priority()
+        weight: Share of contended slots relative to the other lanes
+        reserved: Slots no other lane may use
+    """
+
+    def __init__(self, name: str, weight: float = 1.0, reserved: int = 0) -> None:
+        if weight <= 0:
+            raise ValueError("Lane weight must be positive")
+        self.name = name
+        self.weight = weight
+        self.reserved = max(0, reserved)
+        self.in_flight = 0
+        self.requests = 0
+        self.queue_time = LatencyHistogram()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._pass = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the lane's configuration, occupancy and queue-time percentiles."""
+        return {
+            "weight": self.weight,
+            "reserved": self.reserved,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "requests": self.requests,
+            "queue_ms": self.queue_time.summary(),
+        }
+
+    def __repr__(self) -> str:
+        return f"Lane({self.name!r}, weight={self.weight}, reserved={self.reserved})"
+
+
+def default_lanes() -> list[Lane]:
+    """Interactive (weight 4, 2 reserved slots) and bulk (weight 1) lanes."""
+    return [Lane(INTERACTIVE, weight=4.0, reserved=2), Lane(BULK)]
+
+
+class LaneScheduler:
+    """
+    Weighted fair admission of requests from several lanes to a fixed number of slots.
+
+    A lane may take a free slot only if enough remain for the unused
+    reservations of the other lanes. When a slot frees up, it goes to the
+    queued lane with the lowest virtual time, which advances by
+    ``1 / weight`` per admitted request. Bound to one event loop.
+    """
+
+    def __init__(self, slots: int, lanes: Iterable[Lane] | None = None) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            slots: Requests admitted at once across all lanes (raised if
+                needed to leave one slot beyond the reservations)
+            lanes: Lanes to schedule (default: default_lanes())
+        """
+        self._lanes = {lane.name: lane for lane in (default_lanes() if lanes is None else lanes)}
+        if not self._lanes:
+            raise ValueError("LaneScheduler needs at least one lane")
+        self.slots = max(slots, sum(lane.reserved for lane in self._lanes.values()) + 1)
+        self._in_flight = 0
+        self._vtime = 0.0
+
+    def lane(self, name: str) -> Lane:
+        """Return the lane called ``name``."""
+        try:
+            return self._lanes[name]
+        except KeyError:
+            raise ValueError(f"Unknown priority lane {name!r}") from None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return total slots and in-flight count plus a snapshot of every lane."""
+        return {
+            "slots": self.slots,
+            "in_flight": self._in_flight,
+            "lanes": {name: lane.snapshot() for name, lane in self._lanes.items()},
+        }
+
+    @asynccontextmanager
+    async def slot(self, name: str | None = None) -> AsyncIterator[Lane]:
+        """Hold a slot of lane ``name`` (default: current_lane()) for the block."""
+        lane = await self.acquire(current_lane() if name is None else name)
+        try:
+            yield lane
+        finally:
+            self.release(lane)
+
+    async def acquire(self, name: str) -> Lane:
+        """
+        Wait for a slot in lane ``name``; pair with release().
+
+        Raises:
+            ValueError: If there is no such lane
+            DeadlineExceededError: If the current deadline expires while queued
+        """
+        lane = self.lane(name)
+        start = time.perf_counter()
+        if not lane._waiters and self._admissible(lane):
+            self._take(lane)
+        else:
+            if not lane._waiters:
+                # A lane returning from idle does not get credit for the idle time.
+                lane._pass = max(lane._pass, self._vtime)
+            waiter = asyncio.get_running_loop().create_future()
+            lane._waiters.append(waiter)
+            left = remaining()
+            try:
+                await (waiter if left is None else asyncio.wait_for(waiter, max(left, 0.0)))
+            except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+                if waiter in lane._waiters:
+                    lane._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # Handed a slot but cancelled before taking it: pass it on.
+                    self.release(lane)
+                if isinstance(e, asyncio.TimeoutError):
+                    raise DeadlineExceededError() from None
+                raise
+        lane.requests += 1
+        lane.queue_time.record(int((time.perf_counter() - start) * 1_000_000))
+        return lane
+
+    def release(self, lane: Lane) -> None:
+        """Return a slot taken by acquire() and hand it to the next queued request."""
+        lane.in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _admissible(self, lane: Lane) -> bool:
+        held_back = sum(
+            max(0, other.reserved - other.in_flight)
+            for other in self._lanes.values()
+            if other is not lane
+        )
+        return self.slots - self._in_flight > held_back
+
+    def _take(self, lane: Lane) -> None:
+        self._vtime = lane._pass
+        lane._pass += 1.0 / lane.weight
+        lane.in_flight += 1
+        self._in_flight += 1
+
+    def _dispatch(self) -> None:
+        while True:
+            ready = [
+                lane for lane in self._lanes.values() if lane._waiters and self._admissible(lane)
+            ]
+            if not ready:
+                return
+            lane = min(ready, key=lambda candidate: candidate._pass)
+            waiter = lane._waiters.popleft()
+            if not waiter.done():
+                self._take(lane)
+                waiter.set_result(None)
+
+    def __repr__(self) -> str:
+        return f"LaneScheduler(slots={self.slots}, lanes={list(self._lanes.values())})"
@@ -0,0 +1,332 @@
+"""
+Adaptive concurrency limiting for bulk operations.
+
+``AdaptiveLimiter`` decides how many requests a bulk job keeps in flight.
+It grows the limit additively while latency stays near the best observed
+latency, shrinks it in proportion when latency rises (requests are queueing
+somewhere), and halves it on 429/503/timeouts. A job therefore settles just
+below the throughput the API will give it instead of relying on a guessed
+worker count.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from svg_api.deadlines import check_backoff, remaining
+from svg_api.errors import (
+    DeadlineExceededError,
+    RateLimitError,
+    ServiceUnavailableError,
+    TimeoutError,
+)
+from svg_api.utils import calculate_retry_delay
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+
+T = TypeVar("T")
+
+# Errors that mean "too much load": they shrink the limit and are retried.
+# DeadlineExceededError (a TimeoutError) is the caller's budget running out
+# and is excluded wherever these are handled.
+OVERLOAD_ERRORS: tuple[type[Exception], ...] = (
+    RateLimitError,
+    ServiceUnavailableError,
+    TimeoutError,
+)
+
+# Weight of the newest sample in the smoothed latency.
+_SMOOTHING = 0.2
+# The latency baseline may creep up by this fraction per sample, so a lasting
+# shift in server latency is eventually accepted as the new normal.
+_BASELINE_DRIFT = 0.001
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit with a latency gradient.
+
+    Each completed request is a sample. While the smoothed latency is
+    within ``tolerance`` times the baseline (the lowest recent latency) and
+    the limit is actually being used, the limit grows by about one per
+    round of ``limit`` requests. When latency exceeds that, the limit is
+    scaled down by ``tolerance * baseline / latency``; overload errors
+    multiply it by ``backoff``. Decreases happen at most once per smoothed
+    latency, so one burst of 429s counts as a single signal.
+
+    A limiter serves either threads (``slot``/``call``) or a single event
+    loop (``aslot``/``acall``). Thread-safe.
+
+    Example:
+        >>> limiter = AdaptiveLimiter(initial_limit=4, max_limit=32)
+        >>> with ThreadPoolExecutor(max_workers=32) as pool:
+        ...     results = list(pool.map(lambda c: limiter.call(client.get_batch, c), chunks))
+        >>> limiter.snapshot()["limit"]
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+        overload_retries: int = 3,
+        retry_delay: float = 0.5,
+        retry_errors: Sequence[type[Exception]] = OVERLOAD_ERRORS,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Requests allowed in flight at first
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            backoff: Factor applied to the limit on an overload error
+            tolerance: Latency inflation over the baseline that is still
+                treated as "not queueing"
+            overload_retries: Times call()/acall() retry an overloaded request
+            retry_delay: Base delay for those retries when the API sends no
+                Retry-After
+            retry_errors: Overload errors call()/acall() retry. Leave out
+                those the wrapped function already retries itself, or one
+                slow request is attempted the product of both retry counts
+                times; they still lower the limit.
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.overload_retries = overload_retries
+        self.retry_delay = retry_delay
+        self.retry_errors = tuple(retry_errors)
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._baseline = 0.0
+        self._latency = 0.0
+        self._last_decrease = 0.0
+        self._samples = 0
+        self._overloads = 0
+        self._cond = threading.Condition()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding a slot."""
+        return self._in_flight
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return the limiter state for client stats.
+
+        Returns:
+            Dictionary with the current limit, bounds, in-flight count,
+            baseline and smoothed latency (milliseconds), sample count and
+            overload count
+        """
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "baseline_ms": self._baseline * 1000.0,
+                "latency_ms": self._latency * 1000.0,
+                "samples": self._samples,
+                "overloads": self._overloads,
+            }
+
+    # -- slots -------------------------------------------------------------
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold one slot for the duration of a request, blocking while the limit is reached.
+
+        Raises:
+            DeadlineExceededError: If the current deadline expires while waiting
+        """
+        with self._cond:
+            while self._in_flight >= self.limit:
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceededError()
+                self._cond.wait(left)
+            self._in_flight += 1
+        with self._measure():
+            yield
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        """Async counterpart of slot()."""
+        while True:
+            with self._cond:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    break
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            left = remaining()
+            try:
+                await (waiter if left is None else asyncio.wait_for(waiter, max(left, 0.0)))
+            except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+                with self._cond:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    elif not waiter.cancelled():
+                        # Woken but cancelled before taking the slot: pass it on.
+                        self._wake()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise DeadlineExceededError() from None
+                raise
+        with self._measure():
+            yield
+
+    @contextmanager
+    def _measure(self) -> Iterator[None]:
+        start = time.perf_counter()
+        overloaded = False
+        sampled = False
+        try:
+            yield
+            sampled = True
+        except DeadlineExceededError:
+            raise
+        except OVERLOAD_ERRORS:
+            overloaded = sampled = True
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            with self._cond:
+                self._in_flight -= 1
+                if sampled:
+                    self._update(latency, overloaded)
+                self._cond.notify_all()
+                self._wake()
+
+    def _wake(self) -> None:
+        """Wake as many async waiters as there are free slots (lock held)."""
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    # -- algorithm ---------------------------------------------------------
+
+    def _update(self, latency: float, overloaded: bool) -> None:
+        """Adjust the limit for one completed request (lock held)."""
+        now = time.monotonic()
+        self._samples += 1
+        if overloaded:
+            self._overloads += 1
+            self._decrease(now, self.backoff)
+            return
+
+        if self._baseline == 0.0 or latency < self._baseline:
+            self._baseline = latency
+        else:
+            self._baseline *= 1.0 + _BASELINE_DRIFT
+        if self._latency == 0.0:
+            self._latency = latency
+        else:
+            self._latency += _SMOOTHING * (latency - self._latency)
+
+        threshold = self._baseline * self.tolerance
+        if self._latency > threshold > 0.0:
+            self._decrease(now, max(self.backoff, threshold / self._latency))
+        elif self._in_flight + 1 >= self._limit / 2:
+            # Additive increase, only while the limit is actually in use.
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _decrease(self, now: float, factor: float) -> None:
+        if now - self._last_decrease < self._latency:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+    # -- helpers -----------------------------------------------------------
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call ``func`` inside a slot, retrying the overload errors in ``retry_errors``.
+
+        The slot is released while waiting to retry (``retry_after`` from a
+        RateLimitError, else exponential backoff), and by then the limit
+        has already been lowered.
+
+        Raises:
+            The last retried error once ``overload_retries`` are used up,
+            or any other error from ``func`` immediately
+        """
+        for attempt in range(self.overload_retries + 1):
+            outcome = self._attempt(attempt, func, *args, **kwargs)
+            if isinstance(outcome, tuple):
+                return outcome[0]
+            time.sleep(outcome)
+        raise AssertionError("unreachable")
+
+    async def acall(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Async counterpart of call()."""
+        for attempt in range(self.overload_retries + 1):
+            outcome = await self._aattempt(attempt, func, *args, **kwargs)
+            if isinstance(outcome, tuple):
+                return outcome[0]
+            await asyncio.sleep(outcome)
+        raise AssertionError("unreachable")
+
+    def _attempt(
+        self, attempt: int, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> tuple[T] | float:
+        """Make one call() attempt; return ``(result,)`` or the delay before the next."""
+        try:
+            with self.slot():
+                return (func(*args, **kwargs),)
+        except DeadlineExceededError:
+            raise
+        except OVERLOAD_ERRORS as e:
+            if attempt >= self.overload_retries or not isinstance(e, self.retry_errors):
+                raise
+            delay = self._retry_delay(attempt, e)
+            check_backoff(delay, e)
+            return delay
+
+    async def _aattempt(
+        self, attempt: int, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> tuple[T] | float:
+        """Async counterpart of _attempt()."""
+        try:
+            async with self.aslot():
+                return (await func(*args, **kwargs),)
+        except DeadlineExceededError:
+            raise
+        except OVERLOAD_ERRORS as e:
+            if attempt >= self.overload_retries or not isinstance(e, self.retry_errors):
+                raise
+            delay = self._retry_delay(attempt, e)
+            check_backoff(delay, e)
+            return delay
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            return float(retry_after)
+        return calculate_retry_delay(attempt, self.retry_delay)
+
+    def __repr__(self) -> str:
+        return (
+            f"AdaptiveLimiter(limit={self.limit}, in_flight={self._in_flight}, "
+            f"max_limit={self.max_limit})"
+        )
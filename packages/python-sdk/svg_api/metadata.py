@@ -0,0 +1,142 @@
+"""
+Snapshot of the catalogue's sources and categories.
+
+Sources and categories only change when the catalogue is rebuilt, so the
+clients keep one parsed ``MetadataSnapshot`` and serve ``get_sources()`` and
+``get_categories()`` from it. Every ``metadata_ttl`` seconds a call checks
+``GET /version``; the snapshot is reloaded only if that reports something new.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from svg_api.types import CategoriesResponse, Category, Source, SourcesResponse
+
+DEFAULT_METADATA_TTL = 300.0
+VERSION_PATH = "/version"
+
+
+def catalogue_version(body: dict[str, Any]) -> str:
+    """
+    Return a token that changes whenever a /version response does.
+
+    The response's ``meta`` (request id and timestamp) is ignored.
+    """
+    data = json.dumps(body.get("data", body), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+class MetadataSnapshot:
+    """
+    Sources and categories of one catalogue version, with lookup maps.
+
+    Attributes:
+        version: Token of the /version response the snapshot belongs to
+            (None if the server has no /version endpoint)
+        sources: The /sources response
+        categories: The /categories response
+        source_by_id: Sources keyed by id
+        categories_by_source: Categories having icons in each source, by source id
+        icon_counts: Number of icons per source id
+        total_icons: Number of icons across all sources
+        loaded_at: When the snapshot was fetched (``time.time()``)
+    """
+
+    def __init__(
+        self,
+        version: str | None,
+        sources: SourcesResponse,
+        categories: CategoriesResponse,
+    ) -> None:
+        self.version = version
+        self.sources = sources
+        self.categories = categories
+        self.source_by_id: dict[str, Source] = {source.id: source for source in sources.data}
+        self.categories_by_source: dict[str, list[Category]] = {
+            source_id: [] for source_id in self.source_by_id
+        }
+        for category in categories.data:
+            for source_id in category.sources:
+                self.categories_by_source.setdefault(source_id, []).append(category)
+        self.icon_counts = {source.id: source.icon_count for source in sources.data}
+        self.total_icons = sum(self.icon_counts.values())
+        self.loaded_at = time.time()
+        # get_categories(source=...) responses fetched for this version
+        self.filtered_categories: dict[str, CategoriesResponse] = {}
+        # "source:name" keys listed for sample_icons(), by (source, category)
+        self.listings: dict[tuple[str | None, str | None], list[str]] = {}
+
+    def source(self, source_id: str) -> Source | None:
+        """Return the source with id ``source_id``, or None."""
+        return self.source_by_id.get(source_id)
+
+    def __repr__(self) -> str:
+        return (
+            f"MetadataSnapshot(version={self.version!r}, sources={len(self.source_by_id)}, "
+            f"categories={len(self.categories.data)}, icons={self.total_icons})"
+        )
+
+
+class MetadataCache:
+    """
+    Holds the current MetadataSnapshot and when it was last revalidated.
+
+    The clients serialize refreshes with their own lock; reading
+    ``snapshot`` is safe from any thread.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_METADATA_TTL) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a snapshot is served before /version is checked
+                again (0 checks on every call)
+        """
+        self.ttl = ttl
+        self.snapshot: MetadataSnapshot | None = None
+        self._checked_at = 0.0
+
+    def fresh(self) -> MetadataSnapshot | None:
+        """Return the snapshot if it was revalidated within the last ``ttl`` seconds."""
+        if self.snapshot is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self.snapshot
+        return None
+
+    def current(self, version: str | None) -> MetadataSnapshot | None:
+        """
+        Return the snapshot if it belongs to ``version``, marking it revalidated.
+
+        A None version (no /version endpoint) never matches, so the
+        snapshot is then reloaded every ``ttl`` seconds.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or version is None or snapshot.version != version:
+            return None
+        self.revalidated()
+        return snapshot
+
+    def revalidated(self) -> None:
+        """Serve the current snapshot for another ``ttl`` seconds."""
+        self._checked_at = time.monotonic()
+
+    def install(
+        self,
+        version: str | None,
+        sources: SourcesResponse,
+        categories: CategoriesResponse,
+    ) -> MetadataSnapshot:
+        """Replace the snapshot with freshly fetched metadata."""
+        self.snapshot = MetadataSnapshot(version, sources, categories)
+        self.revalidated()
+        return self.snapshot
+
+    def clear(self) -> None:
+        """Drop the snapshot; the next call fetches it again."""
+        self.snapshot = None
+        self._checked_at = 0.0
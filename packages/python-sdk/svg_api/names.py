@@ -0,0 +1,271 @@
+"""
+Local answers for icon names that do not exist.
+
+``NameIndex`` is a Bloom filter over known "source:name" keys, built from a
+catalogue mirror or any list of names: a key it does not contain is
+certainly unknown, while a key it contains may still be missing (about
+``error_rate`` of the time). ``NameFilter`` combines an optional index with
+a TTL cache of names the API recently answered 404 for, so clients can
+reject unknown names without a round trip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import pathlib
+import struct
+from typing import TYPE_CHECKING, Any
+
+from svg_api.cache import IconCache, batch_spec
+from svg_api.errors import NotFoundError
+from svg_api.sync import mirror_keys, write_atomic
+from svg_api.types import BatchError, BatchIconResult, BatchMeta, BatchResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+DEFAULT_NEGATIVE_CACHE_TTL = 300.0
+DEFAULT_NEGATIVE_CACHE_SIZE = 2000
+# Error codes that say the icon (or its whole source) does not exist.
+NOT_FOUND_CODES = frozenset({"ICON_NOT_FOUND", "SOURCE_NOT_FOUND"})
+
+_MAGIC = b"SVGAPI-NAMES\x01"
+_HEADER = struct.Struct(">I")
+
+
+class NameIndex:
+    """
+    Bloom filter over "source:name" keys.
+
+    Only sources passed to the index are covered: names from any other
+    source are never rejected. Memory is about 1.2 bytes per name at a 1%
+    error rate.
+
+    Example:
+        >>> index = NameIndex.build(["lucide:home", "lucide:star"])
+        >>> index.might_exist("lucide", "home"), index.might_exist("lucide", "hoem")
+        (True, False)
+        >>> index.might_exist("heroicons", "anything")  # source not covered
+        True
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, sources: Iterable[str]) -> None:
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, num_hashes)
+        self.sources = frozenset(sources)
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @classmethod
+    def build(cls, keys: Iterable[str], error_rate: float = 0.01) -> NameIndex:
+        """
+        Build an index sized for ``keys`` ("source:name").
+
+        Args:
+            keys: Every icon key of the covered sources
+            error_rate: Target rate of unknown names that still pass
+        """
+        keys = list(dict.fromkeys(keys))
+        n = max(1, len(keys))
+        num_bits = math.ceil(-n * math.log(error_rate) / math.log(2) ** 2)
+        num_hashes = round(num_bits / n * math.log(2))
+        index = cls(num_bits, num_hashes, (key.partition(":")[0] for key in keys))
+        for key in keys:
+            index.add(key)
+        return index
+
+    @classmethod
+    def from_mirror(cls, directory: str | pathlib.Path, error_rate: float = 0.01) -> NameIndex:
+        """
+        Build an index from a CatalogueSync mirror directory.
+
+        Only sources whose last sync completed are covered. The mirror must
+        list every icon of those sources (see CatalogueSync's ``lister``),
+        otherwise existing icons it missed would be rejected.
+        """
+        return cls.build(mirror_keys(directory), error_rate)
+
+    def _positions(self, key: str) -> list[int]:
+        # Stable across processes (unlike hash()), so a saved index stays valid.
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack(">QQ", digest)
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        """Add a "source:name" key; its source must be covered by the index."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key)
+        )
+
+    def might_exist(self, source: str, name: str) -> bool:
+        """False only if ``source`` is covered and ``name`` is certainly not in it."""
+        return source not in self.sources or f"{source}:{name}" in self
+
+    def save(self, path: str | pathlib.Path) -> None:
+        """Write the index to a file."""
+        header = json.dumps(
+            {
+                "num_bits": self.num_bits,
+                "num_hashes": self.num_hashes,
+                "count": self.count,
+                "sources": sorted(self.sources),
+            }
+        ).encode("utf-8")
+        write_atomic(
+            pathlib.Path(path), _MAGIC + _HEADER.pack(len(header)) + header + bytes(self._bits)
+        )
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> NameIndex:
+        """Read an index written by save()."""
+        data = pathlib.Path(path).read_bytes()
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"{path} is not a name index file")
+        offset = len(_MAGIC)
+        (length,) = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        header = json.loads(data[offset : offset + length])
+        index = cls(header["num_bits"], header["num_hashes"], header["sources"])
+        bits = data[offset + length :]
+        if len(bits) != len(index._bits):
+            raise ValueError(f"{path} is truncated")
+        index._bits[:] = bits
+        index.count = header["count"]
+        return index
+
+    def __repr__(self) -> str:
+        return (
+            f"NameIndex(count={self.count}, sources={len(self.sources)}, "
+            f"bytes={len(self._bits)})"
+        )
+
+
+class NameFilter:
+    """
+    Rejects icon names known not to exist, before a request is sent.
+
+    Consults the recent 404 cache first, then the optional NameIndex.
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        index: NameIndex | None = None,
+        ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+        max_entries: int = DEFAULT_NEGATIVE_CACHE_SIZE,
+    ) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            index: Membership index over known names, if any
+            ttl: Seconds a 404 is remembered (0 disables the negative cache)
+            max_entries: Maximum names remembered
+        """
+        self.index = index
+        self._missing: IconCache[BatchError] = IconCache(max_entries if ttl > 0 else 0, ttl)
+
+    def check(self, source: str, name: str) -> BatchError | None:
+        """Return the reason ``source:name`` is known not to exist, or None."""
+        error = self._missing.get(f"{source}:{name}")
+        if error is not None:
+            return error
+        if self.index is not None and not self.index.might_exist(source, name):
+            return BatchError(
+                code="ICON_NOT_FOUND",
+                message=f"Icon '{name}' not found in source '{source}' (local index)",
+            )
+        return None
+
+    def raise_if_unknown(self, source: str, name: str) -> None:
+        """
+        Raise NotFoundError for a name known not to exist.
+
+        Raises:
+            NotFoundError: With ``details={"local": True}``
+        """
+        error = self.check(source, name)
+        if error is not None:
+            raise NotFoundError(
+                error.message, code=error.code, status_code=404, details={"local": True}
+            )
+
+    def remember(self, source: str, name: str, error: NotFoundError | BatchError) -> None:
+        """Cache a not-found answer from the API."""
+        if error.code in NOT_FOUND_CODES:
+            reason = BatchError(code=error.code, message=error.message)
+            self._missing.set(f"{source}:{name}", reason)
+
+    def split_batch(
+        self,
+        icons: list[dict[str, Any]],
+        defaults: dict[str, Any] | None,
+    ) -> tuple[list[dict[str, Any]], dict[str, BatchError]]:
+        """
+        Drop entries known not to exist from a batch request.
+
+        Entries without an explicit source are always kept, since the
+        server picks their source.
+
+        Returns:
+            (entries to send, errors keyed by "source:name" for the dropped ones)
+        """
+        kept: list[dict[str, Any]] = []
+        rejected: dict[str, BatchError] = {}
+        for icon in icons:
+            spec = batch_spec(icon, defaults)
+            error = None if spec is None else self.check(spec["source"], spec["name"])
+            if spec is None or error is None:
+                kept.append(icon)
+            else:
+                rejected[f"{spec['source']}:{spec['name']}"] = error
+        return kept, rejected
+
+    def complete_batch(
+        self,
+        response: BatchResponse | None,
+        rejected: dict[str, BatchError],
+    ) -> BatchResponse:
+        """
+        Remember the 404s in a batch response and add the locally rejected entries.
+
+        Args:
+            response: Response for the entries that were sent (None if none were)
+            rejected: Errors from split_batch()
+        """
+        if response is not None:
+            for key, error in response.errors.items():
+                source, _, name = key.partition(":")
+                self.remember(source, name, error)
+            if not rejected:
+                return response
+            data = dict(response.data)
+            errors = dict(response.errors)
+            meta = response.meta
+        else:
+            data, errors, meta = {}, {}, BatchMeta(requested=0, successful=0, failed=0)
+        for key, error in rejected.items():
+            source, _, name = key.partition(":")
+            data.setdefault(key, BatchIconResult(success=False, name=name, source=source))
+            errors.setdefault(key, error)
+        return BatchResponse(
+            data=data,
+            errors=errors,
+            meta=meta.model_copy(
+                update={
+                    "requested": meta.requested + len(rejected),
+                    "failed": meta.failed + len(rejected),
+                }
+            ),
+        )
+
+    def clear(self) -> None:
+        """Forget all remembered 404s."""
+        self._missing.clear()
@@ -0,0 +1,344 @@
+"""
+Icon rendering for server-side templates.
+
+``IconRenderer`` turns ``icon("home", source="lucide", class_="h-4")`` calls
+into inline ``<svg>`` markup (or ``<use>`` references to a sprite sheet)
+from a process-wide cache shared by all requests. Template integrations
+(``svg_api.integrations``) render each page inside ``renderer.page()``:
+an icon that is not cached yet renders as a placeholder, and
+``page.finish(html)`` fetches every missing icon of the page in one round
+of concurrent batch requests before filling the placeholders in. Template
+rendering itself therefore never waits on the network, and a page costs at
+most one round trip (none once its icons are cached).
+
+Example:
+    >>> renderer = IconRenderer(SvgApi())
+    >>> with renderer.page() as page:
+    ...     html = f"<nav>{renderer.icon('home')} {renderer.icon('lucide:star')}</nav>"
+    ...     html = page.finish(html)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import html
+import re
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Literal
+
+from svg_api.batch import batch_chunks
+from svg_api.cache import DEFAULT_CACHE_TTL, IconCache, icon_spec, spec_key
+from svg_api.errors import SvgApiError
+from svg_api.sprite import SpriteBuilder, symbol_id
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from svg_api.client import SvgApi
+
+DEFAULT_RENDER_CACHE_SIZE = 2048
+# Icons the API does not have are remembered this long, so a page that
+# references one does not pay a round trip on every render.
+MISSING_TTL = 60.0
+# Size of <use> references in sprite mode when the icon sets none.
+DEFAULT_SPRITE_SIZE = 24
+
+RenderMode = Literal["inline", "sprite"]
+
+_current_page: ContextVar[RenderPage | None] = ContextVar("svg_api_render_page", default=None)
+_SVG_TAG = re.compile(r"<svg\b", re.IGNORECASE)
+
+
+def html_attrs(attrs: dict[str, Any]) -> str:
+    """
+    Format template keyword arguments as HTML attributes.
+
+    Underscores become hyphens and a trailing underscore is dropped, so
+    ``class_="x"`` and ``aria_label="Home"`` work as Python keywords.
+    ``None`` and ``False`` values are omitted, ``True`` renders a bare
+    attribute.
+
+    Example:
+        >>> html_attrs({"class_": "icon", "aria_label": "Home", "hidden": False})
+        ' class="icon" aria-label="Home"'
+    """
+    parts: list[str] = []
+    for key, value in attrs.items():
+        if value is None or value is False:
+            continue
+        name = key.rstrip("_").replace("_", "-")
+        parts.append(f" {name}" if value is True else f' {name}="{html.escape(str(value))}"')
+    return "".join(parts)
+
+
+def _accessibility(attrs: dict[str, Any]) -> dict[str, Any]:
+    """Hide decorative icons from screen readers; label the others as images."""
+    if any(key in attrs for key in ("aria_label", "aria_labelledby", "title")):
+        return {"role": "img", **attrs}
+    return {"aria_hidden": "true", "focusable": "false", **attrs}
+
+
+class RenderPage:
+    """
+    Icons referenced while rendering one page.
+
+    Created by IconRenderer.page(); ``finish()`` (or ``afinish()``) must be
+    called on the rendered output.
+    """
+
+    def __init__(self, renderer: IconRenderer) -> None:
+        self._renderer = renderer
+        self._token = secrets.token_hex(4)
+        self._placeholder = re.compile(rf"<!--svg-api:{self._token}:(\d+|sprite)-->")
+        self._deferred: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        self.used: dict[str, dict[str, Any]] = {}
+
+    def defer(self, spec: dict[str, Any], attrs: dict[str, Any]) -> str:
+        """Return a placeholder for an icon that is not cached yet."""
+        self._deferred.append((spec, attrs))
+        return f"<!--svg-api:{self._token}:{len(self._deferred) - 1}-->"
+
+    def sprite_placeholder(self) -> str:
+        return f"<!--svg-api:{self._token}:sprite-->"
+
+    @property
+    def pending(self) -> list[dict[str, Any]]:
+        """Icons of this page that must be fetched before ``finish()`` can fill them in."""
+        return [spec for spec in self.used.values() if self._renderer.cached(spec) is None]
+
+    def finish(self, markup: str) -> str:
+        """Fetch the page's missing icons in one round of batch requests and fill them in."""
+        self._renderer.prefetch(self.pending)
+        return self._substitute(markup)
+
+    async def afinish(self, markup: str) -> str:
+        """Async counterpart of finish(); the fetch runs in a worker thread."""
+        await self._renderer.aprefetch(self.pending)
+        return self._substitute(markup)
+
+    def _substitute(self, markup: str) -> str:
+        if "<!--svg-api:" not in markup:
+            return markup
+
+        def _replace(match: re.Match[str]) -> str:
+            if match.group(1) == "sprite":
+                return self._renderer.sprite_sheet(self.used.values())
+            spec, attrs = self._deferred[int(match.group(1))]
+            return self._renderer.markup(spec, attrs)
+
+        return self._placeholder.sub(_replace, markup)
+
+
+class IconRenderer:
+    """
+    Render icons into HTML from a shared, process-wide cache.
+
+    In ``inline`` mode each icon is its full ``<svg>`` markup. In ``sprite``
+    mode each icon is a small ``<svg><use href="#id"/></svg>`` reference and
+    ``sprite()`` emits one hidden ``<symbol>`` sheet with every icon the page
+    used, so repeated icons are sent once. Thread-safe; share one renderer
+    per process.
+
+    Example:
+        >>> renderer = IconRenderer(SvgApi(), source="lucide", mode="sprite")
+        >>> renderer.prefetch([{"name": "home", "source": "lucide"}])
+        >>> renderer.icon("home", class_="h-4 w-4")
+        '<svg class="h-4 w-4" ...><use href="#lucide-home"/></svg>'
+    """
+
+    def __init__(
+        self,
+        client: SvgApi,
+        source: str = "heroicons",
+        mode: RenderMode = "inline",
+        cache_size: int = DEFAULT_RENDER_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        """
+        Initialize the renderer.
+
+        Args:
+            client: Synchronous client used to fetch icons
+            source: Source for icons named without one
+            mode: "inline" for full SVG markup, "sprite" for <use> references
+            cache_size: Maximum icon variants kept in the process cache
+            cache_ttl: Seconds a cached icon is served before it is refetched
+        """
+        if mode not in ("inline", "sprite"):
+            raise ValueError(f"Unknown render mode {mode!r}; expected 'inline' or 'sprite'")
+        self.client = client
+        self.source = source
+        self.mode = mode
+        self._cache: IconCache[str] = IconCache(cache_size, cache_ttl)
+        self._sprites = SpriteBuilder(client)
+
+    # -- specs and cache ---------------------------------------------------
+
+    def spec(
+        self,
+        name: str,
+        source: str | None = None,
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+    ) -> dict[str, Any]:
+        """Build an icon spec; ``name`` may be given as "source:name"."""
+        prefix, sep, bare = name.rpartition(":")
+        return icon_spec(bare, source or (prefix if sep else self.source), size, stroke, color)
+
+    def cached(self, spec: dict[str, Any]) -> str | None:
+        """Return the cached SVG for a spec ("" if the API has no such icon), or None."""
+        return self._cache.get(spec_key(spec))
+
+    def prefetch(self, icons: Iterable[dict[str, Any]]) -> int:
+        """
+        Fetch icons that are not cached yet, with concurrent batch requests.
+
+        Batches go through the client's adaptive limiter. A batch that fails
+        outright (network error, deadline) leaves its icons uncached, so they
+        render empty this time and are retried on the next page.
+
+        Returns:
+            Number of icons fetched
+        """
+        missing = {spec_key(spec): spec for spec in icons if self.cached(spec) is None}
+        chunks = batch_chunks(
+            {k: v for k, v in spec.items() if k != "id"} for spec in missing.values()
+        )
+        if not chunks:
+            return 0
+        if len(chunks) == 1:
+            return self._fetch(chunks[0])
+        workers = min(len(chunks), max(1, self.client.limiter.max_limit))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Copy the caller's context into the workers so an enclosing deadline() applies.
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._fetch, chunk)
+                for chunk in chunks
+            ]
+            return sum(future.result() for future in futures)
+
+    async def aprefetch(self, icons: Iterable[dict[str, Any]]) -> int:
+        """Async counterpart of prefetch(), run in a worker thread."""
+        missing = [spec for spec in icons if self.cached(spec) is None]
+        if not missing:
+            return 0
+        return await asyncio.to_thread(self.prefetch, missing)
+
+    def _fetch(self, chunk: list[dict[str, Any]]) -> int:
+        try:
+            response = self.client.limiter.call(self.client.get_batch, chunk)
+        except SvgApiError:
+            return 0
+        fetched = 0
+        for spec in chunk:
+            item = response.data.get(f"{spec['source']}:{spec['name']}")
+            if item is not None and item.success and item.svg is not None:
+                self._cache.set(spec_key(spec), item.svg)
+                fetched += 1
+            else:
+                self._cache.set(spec_key(spec), "", ttl=MISSING_TTL)
+        return fetched
+
+    # -- rendering ---------------------------------------------------------
+
+    @contextmanager
+    def page(self) -> Iterator[RenderPage]:
+        """
+        Collect the icons of one page render.
+
+        Inside the block, icons that are not cached render as placeholders
+        instead of being fetched; pass the output to ``page.finish()``.
+        """
+        page = RenderPage(self)
+        token = _current_page.set(page)
+        try:
+            yield page
+        finally:
+            _current_page.reset(token)
+
+    def icon(
+        self,
+        name: str,
+        source: str | None = None,
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+        **attrs: Any,
+    ) -> str:
+        """
+        Render one icon.
+
+        Args:
+            name: Icon name, or "source:name"
+            source: Icon source (default: the renderer's source)
+            size: Icon size in pixels
+            stroke: Stroke width
+            color: Icon color
+            **attrs: HTML attributes for the <svg> element (see html_attrs())
+
+        Returns:
+            HTML markup. Outside a page() block an uncached icon is fetched
+            on the spot; prefer rendering through a template integration.
+        """
+        spec = self.spec(name, source, size, stroke, color)
+        page = _current_page.get()
+        if page is not None:
+            page.used.setdefault(spec_key(spec), spec)
+        if self.mode == "sprite":
+            if page is None:
+                self.prefetch([spec])
+            return self.markup(spec, attrs)
+        if self.cached(spec) is None:
+            if page is not None:
+                return page.defer(spec, attrs)
+            self.prefetch([spec])
+        return self.markup(spec, attrs)
+
+    def sprite(self) -> str:
+        """
+        Render the hidden sprite sheet for the current page (sprite mode).
+
+        May appear anywhere in the page, even before the icons it contains.
+        """
+        page = _current_page.get()
+        if page is None:
+            raise RuntimeError("sprite() must be rendered inside IconRenderer.page()")
+        return page.sprite_placeholder()
+
+    def markup(self, spec: dict[str, Any], attrs: dict[str, Any]) -> str:
+        """Render markup for a spec from the cache ("" if it is not available)."""
+        attributes = html_attrs(_accessibility(attrs))
+        if self.mode == "sprite":
+            size = spec.get("size") or DEFAULT_SPRITE_SIZE
+            return (
+                f'<svg width="{size}" height="{size}"{attributes}>'
+                f'<use href="#{html.escape(symbol_id(spec))}"/></svg>'
+            )
+        svg = self.cached(spec)
+        if not svg:
+            return ""
+        # Attributes are inserted first, so they take precedence over the icon's own.
+        return _SVG_TAG.sub(lambda m: m.group(0) + attributes, svg, count=1)
+
+    def sprite_sheet(self, icons: Iterable[dict[str, Any]]) -> str:
+        """Assemble the hidden ``<symbol>`` sheet for cached icons."""
+        specs = list(icons)
+        svgs = {spec_key(spec): svg for spec in specs if (svg := self.cached(spec))}
+        if not svgs:
+            return ""
+        return self._sprites.assemble(specs, svgs).svg
+
+    def clear(self) -> None:
+        """Drop all cached icons."""
+        self._cache.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"IconRenderer(mode={self.mode!r}, source={self.source!r}, "
+            f"cached={len(self._cache)})"
+        )
@@ -0,0 +1,124 @@
+"""
+Resolving an icon name against several sources in preference order.
+
+``SourceResolver`` holds the shared part of ``resolve_icon()``: candidate
+specs, the cache of past resolutions (including misses) and picking the
+most preferred hit from a batch response that probed every candidate.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from svg_api.cache import IconCache, batch_icon, icon_spec, spec_key
+from svg_api.errors import NotFoundError, SvgApiError
+from svg_api.names import NOT_FOUND_CODES
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from svg_api.types import BatchResponse, Icon
+
+# Cached value for "no candidate source has this icon".
+_MISS = ""
+
+
+class SourceResolver:
+    """
+    Cache of which source an icon name resolves to.
+
+    A resolution is keyed by the name, the ordered candidate sources and the
+    variant options. Hits are kept for ``ttl`` seconds and misses for
+    ``miss_ttl`` seconds (0 disables caching misses). Thread-safe.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, miss_ttl: float) -> None:
+        self.miss_ttl = miss_ttl
+        self._resolved: IconCache[str] = IconCache(max_entries, ttl)
+
+    @staticmethod
+    def candidates(
+        name: str,
+        sources: Iterable[str],
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return one icon spec per distinct source, most preferred first.
+
+        Raises:
+            ValueError: If no source is given
+        """
+        specs = [icon_spec(name, source, size, stroke, color) for source in dict.fromkeys(sources)]
+        if not specs:
+            raise ValueError("resolve_icon() needs at least one source")
+        return specs
+
+    @staticmethod
+    def _key(candidates: list[dict[str, Any]]) -> str:
+        sources = ",".join(spec["source"] for spec in candidates)
+        return spec_key({**candidates[0], "source": sources})
+
+    def cached(self, candidates: list[dict[str, Any]]) -> str | None:
+        """
+        Return the source a previous resolution found, or None if unknown.
+
+        Raises:
+            NotFoundError: If a previous resolution found no source
+        """
+        source = self._resolved.get(self._key(candidates))
+        if source == _MISS:
+            raise self._not_found(candidates, local=True)
+        return source
+
+    def remember(self, candidates: list[dict[str, Any]], source: str) -> None:
+        """Cache ``source`` as the resolution of ``candidates``."""
+        self._resolved.set(self._key(candidates), source)
+
+    def pick(self, candidates: list[dict[str, Any]], response: BatchResponse) -> Icon:
+        """
+        Return the most preferred hit of a batch response over ``candidates``.
+
+        The resolution is cached unless a more preferred source failed for a
+        reason other than not-found (it might have the icon after all).
+
+        Raises:
+            NotFoundError: If every source answered not-found
+            SvgApiError: If no source had the icon and some failed otherwise
+        """
+        failure: SvgApiError | None = None
+        for spec in candidates:
+            key = f"{spec['source']}:{spec['name']}"
+            item = response.data.get(key)
+            icon = batch_icon(spec, item) if item is not None else None
+            if icon is not None:
+                if failure is None:
+                    self.remember(candidates, spec["source"])
+                return icon
+            error = response.errors.get(key)
+            if failure is None and (error is None or error.code not in NOT_FOUND_CODES):
+                failure = SvgApiError(
+                    message=error.message if error else f"No result for '{key}' in batch response",
+                    code=error.code if error else None,
+                    details={"source": spec["source"]},
+                )
+        if failure is not None:
+            raise failure
+        if self.miss_ttl > 0:
+            self._resolved.set(self._key(candidates), _MISS, ttl=self.miss_ttl)
+        raise self._not_found(candidates)
+
+    @staticmethod
+    def _not_found(candidates: list[dict[str, Any]], local: bool = False) -> NotFoundError:
+        sources = [spec["source"] for spec in candidates]
+        return NotFoundError(
+            message=f"Icon '{candidates[0]['name']}' not found in sources {', '.join(sources)}",
+            code="ICON_NOT_FOUND",
+            status_code=404,
+            details={"sources": sources, **({"local": True} if local else {})},
+        )
+
+    def clear(self) -> None:
+        """Forget all cached resolutions."""
+        self._resolved.clear()
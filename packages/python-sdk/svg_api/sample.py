@@ -0,0 +1,136 @@
+"""
+Drawing random icons locally, for ``sample_icons()``.
+
+The API's /random endpoint returns one icon per request. ``sample_icons()``
+instead draws distinct "source:name" keys from a population and fetches
+them with batch requests. The population comes from a local index of the
+catalogue, e.g. a CatalogueSync mirror (see ``mirror_keys()``), or is
+listed once through search and kept with the metadata snapshot.
+``IconSampler`` turns a population into a reproducible draw order.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from svg_api.cache import icon_spec
+from svg_api.errors import NotFoundError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from svg_api.metadata import MetadataSnapshot
+    from svg_api.types import SearchResult
+
+# Batch rounds per sample: the draw, then replacements for icons that failed.
+SAMPLE_ROUNDS = 2
+
+Weight = Callable[[str, str], float]
+
+
+def listing_queries(
+    snapshot: MetadataSnapshot,
+    source: str | None,
+    category: str | None,
+) -> list[tuple[str, str | None, str | None]]:
+    """
+    Return the (query, source, category) searches that list a selection.
+
+    The API has no listing endpoint, so a category is listed by searching
+    for its name and a source by searching each of its categories (like
+    CatalogueSync's default lister).
+    """
+    if category is not None:
+        return [(category, source, category)]
+    sources = [source] if source is not None else list(snapshot.source_by_id)
+    queries: list[tuple[str, str | None, str | None]] = []
+    for source_id in sources:
+        known = snapshot.source(source_id)
+        categories = known.categories if known is not None else []
+        if categories:
+            queries.extend((name, source_id, name) for name in categories)
+        else:
+            queries.append((source_id, source_id, None))
+    return queries
+
+
+def selected(result: SearchResult, source: str | None, category: str | None) -> bool:
+    """True if a listing search result belongs to the selection."""
+    return (source is None or result.source == source) and (
+        category is None or result.category == category
+    )
+
+
+def filter_index(keys: Iterable[str], source: str | None) -> list[str]:
+    """Return the "source:name" keys of a local index that are in ``source``."""
+    return [key for key in keys if source is None or key.partition(":")[0] == source]
+
+
+class IconSampler:
+    """
+    Reproducible draw order over a population of "source:name" keys.
+
+    Keys are drawn without replacement: uniformly, or with probability
+    proportional to ``weight(source, name)`` (keys weighted 0 or less are
+    never drawn). The same population and seed give the same order.
+
+    Example:
+        >>> sampler = IconSampler(["lucide:home", "lucide:star", "heroicons:bell"], seed=7)
+        >>> sampler.take(2, size=32)  # the same two specs on every run
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str],
+        seed: int | str | None = None,
+        weight: Weight | None = None,
+    ) -> None:
+        rng = random.Random(seed)
+        # Sorted first, so the order depends only on the population and the seed.
+        population = sorted(set(keys))
+        if weight is None:
+            rng.shuffle(population)
+            self._order = population
+        else:
+            # Efraimidis-Spirakis: sort by u ** (1 / w), largest first.
+            scored: list[tuple[float, str]] = []
+            for key in population:
+                source, _, name = key.partition(":")
+                w = weight(source, name)
+                if w > 0:
+                    scored.append((rng.random() ** (1.0 / w), key))
+            scored.sort(reverse=True)
+            self._order = [key for _, key in scored]
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Number of keys not drawn yet."""
+        return len(self._order) - self._next
+
+    def take(
+        self,
+        n: int,
+        size: int | None = None,
+        stroke: float | None = None,
+        color: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Draw the next ``n`` keys (fewer if the population runs out) as icon specs."""
+        keys = self._order[self._next : self._next + max(0, n)]
+        self._next += len(keys)
+        specs = []
+        for key in keys:
+            source, _, name = key.partition(":")
+            specs.append(icon_spec(name, source, size, stroke, color))
+        return specs
+
+
+def empty_selection(source: str | None, category: str | None) -> NotFoundError:
+    """Error for a selection without icons, matching the /random endpoint's."""
+    return NotFoundError(
+        "No icons found for selection",
+        code="CATEGORY_NOT_FOUND",
+        status_code=404,
+        details={"source": source, "category": category, "local": True},
+    )
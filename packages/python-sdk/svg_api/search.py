@@ -0,0 +1,247 @@
+"""
+Search-as-you-type over an async client.
+
+An icon picker searches on every keystroke. ``SearchSession`` answers as
+many of them as it can without a request:
+
+* A query extending one whose results were complete (``has_more`` false)
+  is answered by filtering those results locally, as long as it adds no
+  search token (see ``can_narrow()``).
+* Input is debounced: a call waits ``debounce`` seconds and gives up if
+  newer input arrived meanwhile.
+* A request made obsolete by newer input is cancelled, so a slow response
+  for an old prefix can never overwrite the results for the current one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import TYPE_CHECKING
+
+from svg_api.cache import IconCache
+from svg_api.types import SearchMeta, SearchResponse, SearchResult
+
+if TYPE_CHECKING:
+    from svg_api.async_client import AsyncSvgApi
+
+# The API rejects shorter queries.
+MIN_QUERY_LENGTH = 2
+DEFAULT_DEBOUNCE = 0.1
+# The API splits queries into tokens on anything but [a-z0-9] and ignores
+# 1-character tokens.
+_TOKEN_SEPARATOR = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query the way the API does (trimmed, lowercase)."""
+    return query.strip().lower()
+
+
+def tokenize(query: str) -> list[str]:
+    """Split a normalized query into search tokens the way the API does."""
+    return [token for token in _TOKEN_SEPARATOR.split(query) if len(token) > 1]
+
+
+def can_narrow(previous: str, query: str) -> bool:
+    """
+    True if the results of ``query`` can be filtered from those of ``previous``.
+
+    The API returns icons matching any of a query's tokens, so a query
+    that adds a token ("arrow" -> "arrow right") can match icons the
+    previous one did not. Narrowing is only sound when ``query`` extends
+    ``previous`` and each of its tokens extends the corresponding one.
+    """
+    if not query.startswith(previous):
+        return False
+    tokens, previous_tokens = tokenize(query), tokenize(previous)
+    return len(tokens) == len(previous_tokens) and all(
+        token.startswith(old) for token, old in zip(tokens, previous_tokens, strict=True)
+    )
+
+
+def is_complete(response: SearchResponse) -> bool:
+    """True if a response holds every result of its query."""
+    return not response.meta.offset and response.meta.has_more is False
+
+
+def matches_query(result: SearchResult, query: str) -> bool:
+    """
+    True if the API would still return ``result`` for ``query``.
+
+    That is when its name contains the query or one of its tokens, or one
+    of the tags it matched on contains the query or equals a token.
+    """
+    name = result.name.lower()
+    tokens = tokenize(query)
+    if query in name or any(token in name for token in tokens):
+        return True
+    tags = [str(tag).lower() for tag in result.matches.get("tags", ())]
+    return any(query in tag or tag in tokens for tag in tags)
+
+
+def narrow(response: SearchResponse, query: str) -> SearchResponse:
+    """
+    Answer ``query`` from the complete results of a query it extends.
+
+    Results the API would no longer return (see ``matches_query()``) are
+    dropped. Exact name matches move first, then other name matches; the
+    order is otherwise kept. Unlike the API, synonyms of the new query are
+    not matched.
+    """
+    data = [result for result in response.data if matches_query(result, query)]
+    data.sort(key=lambda result: (result.name.lower() != query, query not in result.name.lower()))
+    meta = response.meta.model_copy(
+        update={"query": query, "total": len(data), "has_more": False, "search_time_ms": 0}
+    )
+    return SearchResponse(data=data, meta=meta)
+
+
+class SearchSession:
+    """
+    Debounced search-as-you-type with local narrowing of complete results.
+
+    Call search() with the input's text on every change; it returns None
+    for input that was superseded before its answer was ready, which the
+    caller simply ignores. One session serves one input field.
+
+    Example:
+        >>> session = SearchSession(client, source="lucide")
+        >>> async def on_input(text):
+        ...     response = await session.search(text)
+        ...     if response is not None:
+        ...         render(response.data)
+    """
+
+    def __init__(
+        self,
+        client: AsyncSvgApi,
+        source: str | None = None,
+        category: str | None = None,
+        limit: int = 100,
+        debounce: float = DEFAULT_DEBOUNCE,
+        max_entries: int = 64,
+        ttl: float = 300.0,
+    ) -> None:
+        """
+        Initialize the session.
+
+        Args:
+            client: Async client the searches are sent with
+            source: Filter every search by source
+            category: Filter every search by category
+            limit: Results per request (1-100); a query with at most this
+                many results is complete and can be narrowed locally
+            debounce: Seconds input must stay unchanged before a request is sent
+            max_entries: Responses kept for reuse
+            ttl: Seconds a response is reused
+        """
+        self._client = client
+        self.source = source
+        self.category = category
+        self.limit = limit
+        self.debounce = debounce
+        self._responses: IconCache[SearchResponse] = IconCache(max_entries, ttl)
+        self._generation = 0
+        self._inflight: asyncio.Task[SearchResponse] | None = None
+        self.requests = 0
+        self.local = 0
+        self.superseded = 0
+
+    def cached(self, query: str) -> SearchResponse | None:
+        """
+        Return the answer to ``query`` available without a request, or None.
+
+        That is a response for the query itself, or the narrowed results of
+        the longest complete query it extends without adding a token.
+        """
+        query = normalize_query(query)
+        response = self._responses.get(query)
+        if response is not None:
+            return response
+        for end in range(len(query) - 1, MIN_QUERY_LENGTH - 1, -1):
+            if not can_narrow(query[:end], query):
+                continue
+            previous = self._responses.get(query[:end])
+            if previous is not None and is_complete(previous):
+                response = narrow(previous, query)
+                self._responses.set(query, response)
+                return response
+        return None
+
+    async def search(self, query: str) -> SearchResponse | None:
+        """
+        Search for the current input.
+
+        Args:
+            query: The input's full text
+
+        Returns:
+            The response for ``query``, or None if newer input superseded it
+
+        Raises:
+            SvgApiError: If the request for the current input fails
+        """
+        self._generation += 1
+        generation = self._generation
+        query = normalize_query(query)
+        if len(query) < MIN_QUERY_LENGTH:
+            self._cancel_inflight()
+            meta = SearchMeta(query=query, total=0, limit=self.limit, offset=0, has_more=False)
+            return SearchResponse(data=[], meta=meta)
+
+        response = self.cached(query)
+        if response is not None:
+            self._cancel_inflight()
+            self.local += 1
+            return response
+
+        if self.debounce > 0:
+            await asyncio.sleep(self.debounce)
+        if generation != self._generation:
+            self.superseded += 1
+            return None
+
+        self._cancel_inflight()
+        task = asyncio.ensure_future(
+            self._client.search(query, self.source, self.category, limit=self.limit)
+        )
+        self._inflight = task
+        self.requests += 1
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            if self._inflight is task:
+                self._inflight = None
+        if task.cancelled():
+            # Cancelled by newer input.
+            self.superseded += 1
+            return None
+        if generation != self._generation:
+            # Superseded while in flight: keep a success for reuse, but an
+            # error for input that is gone is not the caller's concern.
+            self.superseded += 1
+            if task.exception() is None:
+                self._responses.set(query, task.result())
+            return None
+        response = task.result()
+        self._responses.set(query, response)
+        return response
+
+    def _cancel_inflight(self) -> None:
+        if self._inflight is not None:
+            self._inflight.cancel()
+            self._inflight = None
+
+    def clear(self) -> None:
+        """Forget all reusable responses."""
+        self._responses.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchSession(requests={self.requests}, local={self.local}, "
+            f"superseded={self.superseded})"
+        )
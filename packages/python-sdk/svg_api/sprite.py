@@ -0,0 +1,378 @@
+"""
+Sprite-sheet builder for the SVG API SDK.
+
+Combines many icons into one ``<svg>`` of ``<symbol>`` elements (use with
+``<svg><use href="#heroicons-home"/></svg>``) plus a JSON sprite in the same
+format as the server's ``POST /bulk?format=json-sprite`` response.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, cast
+
+from svg_api.batch import batch_chunks
+from svg_api.cache import spec_key
+from svg_api.deadlines import gather_within_deadline
+from svg_api.lanes import BULK, priority
+from svg_api.sync import write_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from svg_api.async_client import AsyncSvgApi
+    from svg_api.client import SvgApi
+    from svg_api.types import BatchResponse
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+_SYMBOL_ATTRIBUTES = (
+    "viewBox",
+    "fill",
+    "stroke",
+    "stroke-width",
+    "stroke-linecap",
+    "stroke-linejoin",
+)
+_URL_REF = re.compile(r"url\(\s*#([^)\s]+)\s*\)")
+_UNSAFE_ID_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def symbol_id(spec: dict[str, Any]) -> str:
+    """
+    Return the ``<symbol>`` id for an icon spec.
+
+    Uses ``spec["id"]`` when given, otherwise "source-name" (as in the
+    server's svg-bundle format) with stroke/color options appended.
+    """
+    if spec.get("id"):
+        return str(spec["id"])
+    parts = [spec["source"], spec["name"]]
+    parts.extend(
+        f"{option}{_UNSAFE_ID_CHARS.sub('', str(spec[option]))}"
+        for option in ("stroke", "color")
+        if spec.get(option) is not None
+    )
+    return _UNSAFE_ID_CHARS.sub("-", "-".join(parts))
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _strip_namespaces(element: ET.Element) -> None:
+    """Drop the SVG namespace from tags and spell xlink attributes as xlink:*."""
+    for node in element.iter():
+        if isinstance(node.tag, str):
+            node.tag = _local(node.tag)
+        for name in [name for name in node.attrib if name.startswith("{")]:
+            value = node.attrib.pop(name)
+            prefix = "xlink:" if name.startswith(f"{{{XLINK_NS}}}") else ""
+            node.attrib[f"{prefix}{_local(name)}"] = value
+
+
+def _rewrite_refs(element: ET.Element, renames: dict[str, str]) -> None:
+    """Point url(#id) and href="#id" references at renamed ids."""
+    if not renames:
+        return
+
+    def _sub(match: re.Match[str]) -> str:
+        return f"url(#{renames.get(match.group(1), match.group(1))})"
+
+    for node in element.iter():
+        for name, value in node.attrib.items():
+            if name in ("href", "xlink:href") and value.startswith("#"):
+                node.attrib[name] = f"#{renames.get(value[1:], value[1:])}"
+            elif "url(" in value:
+                node.attrib[name] = _URL_REF.sub(_sub, value)
+        if node.tag == "style" and node.text:
+            node.text = _URL_REF.sub(_sub, node.text)
+
+
+def _serialize(element: ET.Element) -> str:
+    return ET.tostring(element, encoding="unicode", short_empty_elements=True)
+
+
+class _Fragment:
+    """Rendered symbol plus the shared definitions it references."""
+
+    __slots__ = ("defs", "input_hash", "markup")
+
+    def __init__(self, input_hash: str, markup: str, defs: dict[str, str]) -> None:
+        self.input_hash = input_hash
+        self.markup = markup
+        self.defs = defs
+
+
+def render_symbol(sid: str, svg: str) -> tuple[str, dict[str, str]]:
+    """
+    Convert one icon's SVG into a ``<symbol>`` and its hoisted definitions.
+
+    Children of ``<defs>`` are renamed after a hash of their content, so the
+    same gradient or clip path used by several icons is emitted only once.
+    Other ids are prefixed with the symbol id to avoid collisions.
+
+    Returns:
+        (symbol markup, {def id: def markup})
+    """
+    try:
+        root = ET.fromstring(svg)
+    except ET.ParseError:
+        inner = re.search(r"<svg[^>]*>([\s\S]*)</svg>", svg, re.IGNORECASE)
+        view_box = re.search(r'viewBox="([^"]*)"', svg)
+        return (
+            f'<symbol id="{sid}" viewBox="{view_box.group(1) if view_box else "0 0 24 24"}">'
+            f"{inner.group(1) if inner else svg}</symbol>",
+            {},
+        )
+
+    _strip_namespaces(root)
+    renames: dict[str, str] = {}
+    hoisted: list[ET.Element] = []
+
+    for defs in [node for node in root.iter() if node.tag == "defs"]:
+        for child in list(defs):
+            old_id = child.attrib.pop("id", None)
+            digest = hashlib.sha1(_serialize(child).encode("utf-8")).hexdigest()[:10]
+            if old_id is not None:
+                renames[old_id] = f"d{digest}"
+            child.attrib["id"] = f"d{digest}"
+            hoisted.append(child)
+            defs.remove(child)
+
+    for node in root.iter():
+        node_id = node.attrib.get("id")
+        if node_id is not None:
+            renames[node_id] = f"{sid}-{node_id}"
+            node.attrib["id"] = renames[node_id]
+
+    _rewrite_refs(root, renames)
+    defs_markup: dict[str, str] = {}
+    for child in hoisted:
+        _rewrite_refs(child, renames)
+        defs_markup[child.attrib["id"]] = _serialize(child)
+
+    symbol = ET.Element("symbol", {"id": sid})
+    for attribute in _SYMBOL_ATTRIBUTES:
+        if attribute in root.attrib:
+            symbol.attrib[attribute] = root.attrib[attribute]
+    symbol.attrib.setdefault("viewBox", "0 0 24 24")
+    for child in root:
+        if child.tag not in ("defs", "title", "desc", "metadata"):
+            symbol.append(child)
+    return _serialize(symbol), defs_markup
+
+
+class Sprite:
+    """
+    Result of SpriteBuilder.build().
+
+    Attributes:
+        svg: Sprite sheet with one ``<symbol>`` per icon
+        json_sprite: JSON sprite dict (server ``json-sprite`` format)
+        symbols: Symbol ids in build order
+        rebuilt: Symbol ids re-rendered in this build
+        missing: Keys ("source:name") that could not be fetched
+    """
+
+    def __init__(
+        self,
+        svg: str,
+        json_sprite: dict[str, Any],
+        symbols: list[str],
+        rebuilt: list[str],
+        missing: list[str],
+    ) -> None:
+        self.svg = svg
+        self.json_sprite = json_sprite
+        self.symbols = symbols
+        self.rebuilt = rebuilt
+        self.missing = missing
+
+    def write(
+        self,
+        svg_path: str | pathlib.Path,
+        json_path: str | pathlib.Path | None = None,
+    ) -> None:
+        """Write the sprite sheet and, optionally, the JSON sprite to disk."""
+        write_atomic(pathlib.Path(svg_path), self.svg)
+        if json_path is not None:
+            write_atomic(pathlib.Path(json_path), json.dumps(self.json_sprite, indent=2))
+
+    def __repr__(self) -> str:
+        return (
+            f"Sprite(symbols={len(self.symbols)}, rebuilt={len(self.rebuilt)}, "
+            f"missing={len(self.missing)})"
+        )
+
+
+class SpriteBuilder:
+    """
+    Build ``<symbol>`` sprite sheets and JSON sprites from icon specs.
+
+    Icons are read from the client cache when present and fetched with
+    batch requests (50 icons each) otherwise. Rendered symbols are kept per
+    builder (and in ``state_path`` if given), so a rebuild only re-renders
+    symbols whose SVG input changed.
+
+    Example:
+        >>> builder = SpriteBuilder(client, state_path=".sprite-state.json")
+        >>> sprite = builder.build([
+        ...     {"name": "home", "source": "heroicons"},
+        ...     {"name": "search", "source": "lucide", "stroke": 1.5},
+        ... ])
+        >>> sprite.write("static/icons.svg", "static/icons.json")
+    """
+
+    def __init__(
+        self,
+        client: SvgApi | AsyncSvgApi,
+        state_path: str | pathlib.Path | None = None,
+    ) -> None:
+        self._client = client
+        self._state_path = pathlib.Path(state_path) if state_path else None
+        self._fragments: dict[str, _Fragment] = {}
+        if self._state_path is not None and self._state_path.exists():
+            state = json.loads(self._state_path.read_text(encoding="utf-8"))
+            for sid, entry in state.get("symbols", {}).items():
+                self._fragments[sid] = _Fragment(entry["input"], entry["markup"], entry["defs"])
+
+    def build(self, icons: Iterable[dict[str, Any]]) -> Sprite:
+        """
+        Fetch icons with a synchronous client and assemble the sprite.
+
+        Args:
+            icons: Icon specs (name, source and optional size, stroke,
+                color, id)
+
+        Returns:
+            Sprite with the sheet, JSON sprite and rebuild information
+        """
+        client = cast("SvgApi", self._client)
+        specs = list(icons)
+        svgs: dict[str, str] = {}
+        missing = self._from_cache(specs, svgs)
+        for chunk in batch_chunks(missing):
+            with priority(BULK, override=False):
+                response = client.limiter.call(client.get_batch, chunk)
+            self._collect(chunk, response, svgs)
+        return self.assemble(specs, svgs)
+
+    async def abuild(self, icons: Iterable[dict[str, Any]]) -> Sprite:
+        """Fetch icons with an AsyncSvgApi client and assemble the sprite."""
+        client = cast("AsyncSvgApi", self._client)
+        specs = list(icons)
+        svgs: dict[str, str] = {}
+        missing = self._from_cache(specs, svgs)
+        chunks = batch_chunks(missing)
+        with priority(BULK, override=False):
+            responses = await gather_within_deadline(
+                *[client.limiter.acall(client.get_batch, chunk) for chunk in chunks]
+            )
+        for chunk, response in zip(chunks, responses, strict=True):
+            self._collect(chunk, response, svgs)
+        return self.assemble(specs, svgs)
+
+    def _from_cache(
+        self,
+        specs: list[dict[str, Any]],
+        svgs: dict[str, str],
+    ) -> list[dict[str, Any]]:
+        missing: dict[str, dict[str, Any]] = {}
+        for spec in specs:
+            key = spec_key(spec)
+            icon = self._client._cache.get(key)
+            if icon is not None:
+                svgs[key] = icon.svg
+            elif key not in missing:
+                missing[key] = {k: v for k, v in spec.items() if k != "id"}
+        return list(missing.values())
+
+    @staticmethod
+    def _collect(
+        chunk: list[dict[str, Any]],
+        response: BatchResponse,
+        svgs: dict[str, str],
+    ) -> None:
+        for spec in chunk:
+            item = response.data.get(f"{spec['source']}:{spec['name']}")
+            if item is not None and item.success and item.svg is not None:
+                svgs[spec_key(spec)] = item.svg
+
+    def assemble(self, specs: Iterable[dict[str, Any]], svgs: dict[str, str]) -> Sprite:
+        """
+        Assemble a sprite from already fetched SVG bodies.
+
+        Args:
+            specs: Icon specs in output order
+            svgs: SVG bodies keyed by cache.spec_key(spec)
+
+        Returns:
+            Sprite; specs without a body are listed in ``missing``
+        """
+        markup: list[str] = []
+        symbols: list[str] = []
+        rebuilt: list[str] = []
+        missing: list[str] = []
+        defs: dict[str, str] = {}
+        json_icons: list[dict[str, Any]] = []
+        seen: set[str] = set()
+
+        for spec in specs:
+            sid = symbol_id(spec)
+            if sid in seen:
+                continue
+            svg = svgs.get(spec_key(spec))
+            if svg is None:
+                missing.append(f"{spec['source']}:{spec['name']}")
+                continue
+            seen.add(sid)
+            symbols.append(sid)
+
+            input_hash = hashlib.sha1(svg.encode("utf-8")).hexdigest()
+            fragment = self._fragments.get(sid)
+            if fragment is None or fragment.input_hash != input_hash:
+                fragment = self._fragments[sid] = _Fragment(input_hash, *render_symbol(sid, svg))
+                rebuilt.append(sid)
+
+            markup.append(fragment.markup)
+            defs.update(fragment.defs)
+            json_icons.append(
+                {
+                    "id": f"{spec['source']}:{spec['name']}",
+                    "source": spec["source"],
+                    "name": spec["name"],
+                    "svg": svg,
+                }
+            )
+
+        defs_block = f"<defs>{''.join(defs[key] for key in sorted(defs))}</defs>" if defs else ""
+        sheet = (
+            f'<svg xmlns="{SVG_NS}" xmlns:xlink="{XLINK_NS}" style="display:none">'
+            f"{defs_block}{''.join(markup)}</svg>"
+        )
+        sprite_json = {
+            "format": "json-sprite",
+            "version": "1.0",
+            "generated": datetime.now(timezone.utc).isoformat(),
+            "icons": json_icons,
+        }
+        self._save_state()
+        return Sprite(sheet, sprite_json, symbols, rebuilt, missing)
+
+    def _save_state(self) -> None:
+        if self._state_path is None:
+            return
+        state = {
+            "symbols": {
+                sid: {"input": f.input_hash, "markup": f.markup, "defs": f.defs}
+                for sid, f in self._fragments.items()
+            }
+        }
+        write_atomic(self._state_path, json.dumps(state, separators=(",", ":")))
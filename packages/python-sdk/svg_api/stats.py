@@ -0,0 +1,363 @@
+"""
+Client-side request statistics for the SVG API SDK.
+
+Every client keeps per-endpoint counters and latency histograms in memory.
+Read them with ``client.stats()`` and clear them with ``client.reset_stats()``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from typing import Any
+
+# Number of linear sub-buckets per power of two (2**6). Relative error of a
+# recorded latency is bounded by 1/32, i.e. about 3%.
+_SUB_BUCKET_BITS = 6
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """
+    Collapse a request path into a low-cardinality endpoint label.
+
+    Args:
+        method: HTTP method
+        path: API endpoint path (e.g. "/icons/home")
+
+    Returns:
+        Label such as "GET /icons/{name}"
+    """
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    if parts[0] == "icons" and len(parts) > 1 and parts[1] != "batch":
+        parts = ["icons", "{source}", "{name}"] if len(parts) > 2 else ["icons", "{name}"]
+    elif parts[:2] == ["recommendations", "similar"] and len(parts) > 2:
+        parts = ["recommendations", "similar", "{name}"]
+    return f"{method.upper()} /{'/'.join(parts)}"
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies in microseconds.
+
+    Values below 64us get an exact bucket; above that, each power of two is
+    split into 32 linear sub-buckets. Buckets are stored sparsely, so the
+    histogram has no upper bound and stays small in practice.
+    """
+
+    __slots__ = ("_counts", "count", "max", "min", "total")
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - _SUB_BUCKET_BITS
+        bucket = (shift - 1) * _SUB_BUCKET_HALF + (value >> shift) - _SUB_BUCKET_HALF
+        return _SUB_BUCKET_COUNT + bucket
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        if index < _SUB_BUCKET_COUNT:
+            return index
+        shift, offset = divmod(index - _SUB_BUCKET_COUNT, _SUB_BUCKET_HALF)
+        return ((offset + _SUB_BUCKET_HALF + 1) << (shift + 1)) - 1
+
+    def record(self, micros: int) -> None:
+        """Record a single latency value in microseconds."""
+        micros = max(micros, 0)
+        index = self._index(micros)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        if self.count == 0 or micros < self.min:
+            self.min = micros
+        if micros > self.max:
+            self.max = micros
+        self.count += 1
+        self.total += micros
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add all values recorded in ``other`` to this histogram."""
+        if other.count == 0:
+            return
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        if self.count == 0 or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Return the value at the given percentile (0-100) in microseconds.
+
+        The result is the upper bound of the bucket that holds the
+        percentile, capped at the largest recorded value.
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, round(self.count * percentile / 100.0))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Summarize the histogram in milliseconds."""
+        result: dict[str, float] = {
+            "count": self.count,
+            "min": self.min / 1000.0,
+            "mean": (self.total / self.count / 1000.0) if self.count else 0.0,
+            "max": self.max / 1000.0,
+        }
+        for percentile in PERCENTILES:
+            result[f"p{percentile:g}"] = self.percentile(percentile) / 1000.0
+        return result
+
+
+class _EndpointCounters:
+    """Counters for one endpoint within one shard."""
+
+    __slots__ = (
+        "bytes_in",
+        "bytes_out",
+        "cache_hits",
+        "errors",
+        "latency",
+        "requests",
+        "retries",
+        "wire_bytes_in",
+        "wire_bytes_out",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.cache_hits = 0
+        self.errors: dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.wire_bytes_in = 0
+        self.wire_bytes_out = 0
+        self.retries = 0
+        self.latency = LatencyHistogram()
+
+    def merge(self, other: _EndpointCounters) -> None:
+        self.requests += other.requests
+        self.cache_hits += other.cache_hits
+        for name, count in other.errors.items():
+            self.errors[name] = self.errors.get(name, 0) + count
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.wire_bytes_in += other.wire_bytes_in
+        self.wire_bytes_out += other.wire_bytes_out
+        self.retries += other.retries
+        self.latency.merge(other.latency)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "errors": dict(self.errors),
+            "error_count": sum(self.errors.values()),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "wire_bytes_in": self.wire_bytes_in,
+            "wire_bytes_out": self.wire_bytes_out,
+            "retries": self.retries,
+            "latency_ms": self.latency.summary(),
+        }
+
+
+class _Shard:
+    """
+    Per-thread set of endpoint counters, written only by its owner thread.
+
+    The owner holds ``lock`` while recording and a snapshot holds it while
+    reading, so it is only ever contended during snapshots.
+    """
+
+    __slots__ = ("endpoints", "generation", "lock", "owner")
+
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+        self.endpoints: dict[str, _EndpointCounters] = {}
+        self.lock = threading.Lock()
+        self.owner = weakref.ref(threading.current_thread())
+
+    def retired(self) -> bool:
+        """True once the owner thread has finished; the shard is then never written again."""
+        owner = self.owner()
+        return owner is None or not owner.is_alive()
+
+    def endpoint(self, label: str) -> _EndpointCounters:
+        counters = self.endpoints.get(label)
+        if counters is None:
+            counters = self.endpoints[label] = _EndpointCounters()
+        return counters
+
+
+def _merge_into(target: dict[str, _EndpointCounters], source: dict[str, _EndpointCounters]) -> None:
+    """Add every endpoint's counters in ``source`` to ``target``."""
+    for label, counters in source.items():
+        merged = target.get(label)
+        if merged is None:
+            merged = target[label] = _EndpointCounters()
+        merged.merge(counters)
+
+
+class ClientStats:
+    """
+    Per-client request statistics.
+
+    Writes go to a shard owned by the calling thread, so recording only takes
+    that shard's own lock, which a snapshot holds briefly while it reads the
+    shard. The client-wide lock is only used when a thread registers its
+    first shard and when a snapshot or reset walks all shards. Shards of
+    finished threads are folded into one retired set of counters, so the
+    number of shards follows the number of live threads.
+
+    Example:
+        >>> client = SvgApi()
+        >>> client.get_icon("home")
+        >>> client.stats()["endpoints"]["GET /icons/{name}"]["latency_ms"]["p99"]
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        # Counters of shards whose threads have finished.
+        self._retired: dict[str, _EndpointCounters] = {}
+        self._generation = 0
+        self._since = time.time()
+
+    def _shard(self) -> _Shard:
+        shard: _Shard | None = getattr(self._local, "shard", None)
+        if shard is None or shard.generation != self._generation:
+            with self._lock:
+                self._retire()
+                shard = _Shard(self._generation)
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _retire(self) -> None:
+        """Fold the shards of finished threads into the retired counters (under _lock)."""
+        live = []
+        for shard in self._shards:
+            if shard.retired():
+                _merge_into(self._retired, shard.endpoints)
+            else:
+                live.append(shard)
+        self._shards = live
+
+    def record_request(
+        self,
+        endpoint: str,
+        seconds: float,
+        error: BaseException | None = None,
+    ) -> None:
+        """
+        Record a completed request (including all of its retries).
+
+        Args:
+            endpoint: Endpoint label from endpoint_label()
+            seconds: End-to-end latency in seconds
+            error: Exception raised by the request, if any
+        """
+        shard = self._shard()
+        with shard.lock:
+            counters = shard.endpoint(endpoint)
+            counters.requests += 1
+            counters.latency.record(int(seconds * 1_000_000))
+            if error is not None:
+                name = type(error).__name__
+                counters.errors[name] = counters.errors.get(name, 0) + 1
+
+    def record_transfer(
+        self,
+        endpoint: str,
+        bytes_out: int,
+        bytes_in: int,
+        wire_bytes_out: int | None = None,
+        wire_bytes_in: int | None = None,
+    ) -> None:
+        """
+        Record bytes sent and received by a single attempt.
+
+        Args:
+            endpoint: Endpoint label from endpoint_label()
+            bytes_out: Uncompressed request body size
+            bytes_in: Decoded response body size
+            wire_bytes_out: Request body size as sent (default: bytes_out)
+            wire_bytes_in: Response body size as received, before
+                decompression (default: bytes_in)
+        """
+        shard = self._shard()
+        with shard.lock:
+            counters = shard.endpoint(endpoint)
+            counters.bytes_out += bytes_out
+            counters.bytes_in += bytes_in
+            counters.wire_bytes_out += bytes_out if wire_bytes_out is None else wire_bytes_out
+            counters.wire_bytes_in += bytes_in if wire_bytes_in is None else wire_bytes_in
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record a retry attempt."""
+        shard = self._shard()
+        with shard.lock:
+            shard.endpoint(endpoint).retries += 1
+
+    def record_cache_hit(self, endpoint: str) -> None:
+        """Record a call answered from the client cache without a request."""
+        shard = self._shard()
+        with shard.lock:
+            shard.endpoint(endpoint).cache_hits += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return a point-in-time copy of all statistics.
+
+        Returns:
+            Dictionary with "since" (epoch seconds of the last reset),
+            "endpoints" (per-endpoint counters) and "totals"
+        """
+        merged: dict[str, _EndpointCounters] = {}
+        with self._lock:
+            self._retire()
+            shards = list(self._shards)
+            since = self._since
+            _merge_into(merged, self._retired)
+
+        for shard in shards:
+            with shard.lock:
+                _merge_into(merged, shard.endpoints)
+
+        totals = _EndpointCounters()
+        for counters in merged.values():
+            totals.merge(counters)
+
+        return {
+            "since": since,
+            "endpoints": {label: merged[label].to_dict() for label in sorted(merged)},
+            "totals": totals.to_dict(),
+        }
+
+    def reset(self) -> None:
+        """Discard all recorded statistics."""
+        with self._lock:
+            self._generation += 1
+            self._shards = []
+            self._retired = {}
+            self._since = time.time()
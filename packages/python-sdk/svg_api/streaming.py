@@ -0,0 +1,298 @@
+"""
+Incremental parsing of batch responses.
+
+``BatchStreamParser`` consumes a batch response body chunk by chunk and
+returns each ``data`` entry as soon as its closing brace has arrived, so
+results can be used (e.g. written to disk) while the rest of the response
+is still downloading. Only the entry being parsed is buffered.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from svg_api.types import BatchError, BatchIconResult
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+T = TypeVar("T")
+
+_WHITESPACE = " \t\n\r"
+# Consumed input is dropped from the buffer once it exceeds this many characters.
+_COMPACT_AFTER = 64 * 1024
+
+_START, _TOP, _DATA_MAP, _DATA_LIST, _DONE = range(5)
+
+
+class BatchStreamParser:
+    """
+    Push parser for ``{"data": ..., "errors": ..., "meta": ...}`` bodies.
+
+    ``data`` may be a map of "source:name" to results (the SDK's
+    BatchResponse shape) or a list of results carrying ``name``, ``source``
+    and an optional ``error``; both are yielded as ``(key, BatchIconResult)``.
+    Errors and metadata are collected in ``errors`` and ``meta``.
+
+    Example:
+        >>> parser = BatchStreamParser()
+        >>> for chunk in chunks:
+        ...     for key, result in parser.feed(chunk):
+        ...         print(key, result.success)
+        >>> parser.close()
+    """
+
+    def __init__(self) -> None:
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self.bytes_fed = 0
+        self.errors: dict[str, BatchError] = {}
+        self.meta: dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the body has been parsed."""
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes) -> list[tuple[str, BatchIconResult]]:
+        """
+        Add a chunk of the (decoded) response body.
+
+        Returns:
+            Results completed by this chunk, in response order
+        """
+        self.bytes_fed += len(chunk)
+        self._buffer += self._text.decode(chunk)
+        results = self._parse()
+        if self._pos > _COMPACT_AFTER:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        return results
+
+    def close(self) -> list[tuple[str, BatchIconResult]]:
+        """
+        Signal the end of the body.
+
+        Returns:
+            Any results completed by the final bytes
+
+        Raises:
+            ValueError: If the body was truncated or malformed
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        results = self._parse()
+        if not self.done:
+            raise ValueError(
+                f"Incomplete batch response: stopped at offset {self._pos} of the buffered body"
+            )
+        return results
+
+    def _skip(self, separators: str = "") -> str | None:
+        """Skip whitespace (and separators); return the next char or None at buffer end."""
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and (buffer[pos] in _WHITESPACE or buffer[pos] in separators):
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _value(self) -> tuple[Any, int] | None:
+        """Decode a complete JSON value at the cursor, or None if it is not complete yet."""
+        try:
+            return self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return None
+
+    def _member(self) -> tuple[str, Any, int] | None:
+        """Decode a complete ``"key": value`` pair at the cursor."""
+        key = self._value()
+        if key is None:
+            return None
+        name, pos = key
+        saved, self._pos = self._pos, pos
+        if self._skip() != ":":
+            if self._pos < len(self._buffer):
+                raise ValueError(f"Expected ':' after key {name!r}")
+            self._pos = saved
+            return None
+        self._pos += 1
+        if self._skip() is None:
+            self._pos = saved
+            return None
+        value = self._value()
+        if value is None:
+            self._pos = saved
+            return None
+        return name, value[0], value[1]
+
+    def _parse(self) -> list[tuple[str, BatchIconResult]]:
+        results: list[tuple[str, BatchIconResult]] = []
+        while True:
+            if self._state == _START:
+                char = self._skip()
+                if char is None:
+                    return results
+                if char != "{":
+                    raise ValueError("Batch response body is not a JSON object")
+                self._pos += 1
+                self._state = _TOP
+
+            elif self._state == _TOP:
+                char = self._skip(",")
+                if char is None:
+                    return results
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                if self._enter_data():
+                    continue
+                member = self._member()
+                if member is None:
+                    return results
+                name, value, self._pos = member
+                if name == "errors" and isinstance(value, dict):
+                    self.errors.update(
+                        {key: BatchError.model_validate(error) for key, error in value.items()}
+                    )
+                elif name == "meta" and isinstance(value, dict):
+                    self.meta = value
+
+            elif self._state == _DATA_MAP:
+                char = self._skip(",")
+                if char is None:
+                    return results
+                if char == "}":
+                    self._pos += 1
+                    self._state = _TOP
+                    continue
+                member = self._member()
+                if member is None:
+                    return results
+                key, value, self._pos = member
+                results.append((key, BatchIconResult.model_validate(value)))
+
+            elif self._state == _DATA_LIST:
+                char = self._skip(",")
+                if char is None:
+                    return results
+                if char == "]":
+                    self._pos += 1
+                    self._state = _TOP
+                    continue
+                value = self._value()
+                if value is None:
+                    return results
+                item, self._pos = value
+                results.append(self._list_item(item))
+
+            else:
+                if self._skip() is not None:
+                    raise ValueError("Unexpected data after the batch response body")
+                return results
+
+    def _enter_data(self) -> bool:
+        """If the cursor is at ``"data": {`` or ``"data": [``, step inside it."""
+        buffer, start = self._buffer, self._pos
+        if not buffer.startswith('"data"', start):
+            return False
+        self._pos = start + len('"data"')
+        char = self._skip()
+        if char == ":":
+            self._pos += 1
+            char = self._skip()
+            if char in ("{", "["):
+                self._pos += 1
+                self._state = _DATA_MAP if char == "{" else _DATA_LIST
+                return True
+        # Incomplete (or not a container): retry from the key later.
+        self._pos = start
+        return False
+
+    def _list_item(self, item: dict[str, Any]) -> tuple[str, BatchIconResult]:
+        key = f"{item.get('source')}:{item.get('name')}"
+        error = item.get("error")
+        if error:
+            self.errors[key] = BatchError.model_validate(error)
+        result = BatchIconResult(
+            success=not error and item.get("svg") is not None,
+            name=item.get("name"),
+            source=item.get("source"),
+            svg=item.get("svg"),
+            category=item.get("category"),
+        )
+        return key, result
+
+
+class BatchStream(Generic[T]):
+    """
+    Iterator over ``(key, BatchIconResult)`` pairs from ``SvgApi.stream_batch``.
+
+    ``errors`` and ``meta`` are filled in as the response is parsed and are
+    complete once iteration finishes. Closing the stream (or leaving the
+    ``with`` block) releases the connection early.
+    """
+
+    def __init__(self, parser: BatchStreamParser, results: Iterator[T]) -> None:
+        self._parser = parser
+        self._results = results
+
+    @property
+    def errors(self) -> dict[str, BatchError]:
+        return self._parser.errors
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self._parser.meta
+
+    def __iter__(self) -> Iterator[T]:
+        return self._results
+
+    def __next__(self) -> T:
+        return next(self._results)
+
+    def __enter__(self) -> BatchStream[T]:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop reading and release the underlying response."""
+        self._results.close()  # type: ignore[attr-defined]
+
+
+class AsyncBatchStream(Generic[T]):
+    """Async counterpart of BatchStream returned by ``AsyncSvgApi.stream_batch``."""
+
+    def __init__(self, parser: BatchStreamParser, results: AsyncIterator[T]) -> None:
+        self._parser = parser
+        self._results = results
+
+    @property
+    def errors(self) -> dict[str, BatchError]:
+        return self._parser.errors
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self._parser.meta
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self._results
+
+    async def __anext__(self) -> T:
+        return await self._results.__anext__()
+
+    async def __aenter__(self) -> AsyncBatchStream[T]:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop reading and release the underlying response."""
+        await self._results.aclose()  # type: ignore[attr-defined]
@@ -0,0 +1,391 @@
+"""
+Incremental mirroring of the icon catalogue into a local directory.
+
+Layout of the mirror directory::
+
+    sources.json              # last SourcesResponse payload
+    categories.json           # last CategoriesResponse payload
+    <source>/<name>.svg       # one file per icon
+    .sync/<source>.json       # per-source state (version, icon hashes)
+    .sync/<source>.journal    # append-only checkpoint of the current run
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import pathlib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any
+
+from svg_api.errors import SvgApiError
+from svg_api.lanes import BULK, priority
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from svg_api.client import SvgApi
+    from svg_api.types import Source
+
+STATE_DIR = ".sync"
+BATCH_CHUNK_SIZE = 50
+SEARCH_PAGE_SIZE = 100
+
+
+def content_hash(svg: str) -> str:
+    """Return the SHA-256 hex digest of an SVG body."""
+    return hashlib.sha256(svg.encode("utf-8")).hexdigest()
+
+
+def write_atomic(path: pathlib.Path, data: str | bytes) -> None:
+    """Write a text (or binary) file by renaming a temporary file over the destination."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    if isinstance(data, bytes):
+        tmp.write_bytes(data)
+    else:
+        tmp.write_text(data, encoding="utf-8")
+    tmp.replace(path)
+
+
+def search_lister(client: SvgApi) -> Callable[[Source], Iterator[str]]:
+    """
+    Build the default icon lister, which pages through ``search`` once per
+    category of a source.
+
+    The API has no "list all icons" endpoint, so pass a custom ``lister`` to
+    CatalogueSync if a complete manifest is available from elsewhere.
+    """
+
+    def _list(source: Source) -> Iterator[str]:
+        seen: set[str] = set()
+        for category in source.categories or [source.id]:
+            offset = 0
+            while True:
+                page = client.search(
+                    category,
+                    source=source.id,
+                    category=category if source.categories else None,
+                    limit=SEARCH_PAGE_SIZE,
+                    offset=offset,
+                )
+                for result in page.data:
+                    if result.source == source.id and result.name not in seen:
+                        seen.add(result.name)
+                        yield result.name
+                if not page.meta.has_more or not page.data:
+                    break
+                offset += len(page.data)
+
+    return _list
+
+
+def mirror_keys(directory: str | pathlib.Path) -> list[str]:
+    """
+    Return the "source:name" keys of a CatalogueSync mirror.
+
+    Only sources whose last sync completed are included.
+    """
+    keys: list[str] = []
+    for path in sorted((pathlib.Path(directory) / STATE_DIR).glob("*.json")):
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("complete"):
+            keys.extend(f"{path.stem}:{name}" for name in state.get("icons", {}))
+    return keys
+
+
+class SyncResult:
+    """
+    Summary of a CatalogueSync run.
+
+    Attributes:
+        sources_checked: Sources compared against the local state
+        sources_skipped: Sources whose version was unchanged
+        fetched: Icons downloaded in this run
+        updated: Downloaded icons whose content changed (or were new)
+        deleted: Icons removed because they left the catalogue
+        failed: Errors keyed by "source:name"
+        elapsed: Wall-clock duration in seconds
+    """
+
+    def __init__(self) -> None:
+        self.sources_checked = 0
+        self.sources_skipped = 0
+        self.fetched = 0
+        self.updated = 0
+        self.deleted = 0
+        self.failed: dict[str, str] = {}
+        self.elapsed = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sources_checked": self.sources_checked,
+            "sources_skipped": self.sources_skipped,
+            "fetched": self.fetched,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "failed": dict(self.failed),
+            "elapsed": self.elapsed,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"SyncResult(fetched={self.fetched}, updated={self.updated}, "
+            f"deleted={self.deleted}, failed={len(self.failed)}, "
+            f"skipped_sources={self.sources_skipped}/{self.sources_checked})"
+        )
+
+
+class _SourceState:
+    """Persisted sync state for one source."""
+
+    def __init__(self, root: pathlib.Path, source_id: str) -> None:
+        self.path = root / STATE_DIR / f"{source_id}.json"
+        self.journal_path = root / STATE_DIR / f"{source_id}.journal"
+        self.version: str | None = None
+        self.complete = False
+        self.listed: list[str] | None = None
+        self.hashes: dict[str, str] = {}
+        self.done: set[str] = set()
+
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.version = data.get("version")
+            self.complete = data.get("complete", False)
+            self.listed = data.get("listed")
+            self.hashes = data.get("icons", {})
+
+        # Replay a checkpoint journal left behind by an interrupted run.
+        if self.journal_path.exists():
+            with self.journal_path.open(encoding="utf-8") as journal:
+                for line in journal:
+                    name, _, digest = line.rstrip("\n").partition("\t")
+                    if name and digest:
+                        self.hashes[name] = digest
+                        self.done.add(name)
+
+    def begin(self, version: str, listed: list[str]) -> None:
+        self.version = version
+        self.complete = False
+        self.listed = listed
+        self.save()
+
+    def checkpoint(self, entries: Iterable[tuple[str, str]]) -> None:
+        lines = []
+        for name, digest in entries:
+            self.hashes[name] = digest
+            self.done.add(name)
+            lines.append(f"{name}\t{digest}\n")
+        with self.journal_path.open("a", encoding="utf-8") as journal:
+            journal.writelines(lines)
+
+    def finish(self) -> None:
+        self.complete = True
+        self.listed = None
+        self.done.clear()
+        self.save()
+        self.journal_path.unlink(missing_ok=True)
+
+    def save(self) -> None:
+        write_atomic(
+            self.path,
+            json.dumps(
+                {
+                    "version": self.version,
+                    "complete": self.complete,
+                    "listed": self.listed,
+                    "icons": self.hashes,
+                },
+                separators=(",", ":"),
+            ),
+        )
+
+
+class CatalogueSync:
+    """
+    Mirror the icon catalogue into a local directory, fetching only changes.
+
+    The first run downloads every icon. Later runs compare each source's
+    ``version`` with the stored state and skip unchanged sources entirely;
+    changed sources are re-listed, re-fetched through batch requests, and
+    only icons whose content hash changed are rewritten. Icons that left
+    the catalogue are deleted. Progress is journaled per batch so an
+    interrupted run resumes where it stopped.
+
+    Batch requests run on ``max_workers`` threads, but how many are in flight
+    at once is decided by the client's adaptive limiter (``client.limiter``),
+    which backs off on 429/503 responses and rising latency; overloaded
+    batches are retried. Memory use is bounded by ``max_workers`` pending
+    batches; only icon names and hashes are kept for the whole run. Inside a
+    ``deadline()`` block, batches that cannot finish in time are recorded as
+    failed and the next run resumes from the journal.
+
+    Example:
+        >>> with SvgApi() as client:
+        ...     result = CatalogueSync(client, "icons/").run()
+        ...     print(result)
+    """
+
+    def __init__(
+        self,
+        client: SvgApi,
+        directory: str | pathlib.Path,
+        sources: Iterable[str] | None = None,
+        max_workers: int | None = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        lister: Callable[[Source], Iterable[str]] | None = None,
+    ) -> None:
+        """
+        Initialize the sync engine.
+
+        Args:
+            client: Client used for all requests
+            directory: Mirror directory (created if missing)
+            sources: Only sync these source ids (default: all sources)
+            max_workers: Maximum batch requests in flight (default: the
+                client limiter's max_limit); the adaptive limit stays below it
+            chunk_size: Icons per batch request (max 50)
+            lister: Callable returning the icon names of a source
+                (default: search_lister(client))
+        """
+        self._client = client
+        self.directory = pathlib.Path(directory)
+        self._only = set(sources) if sources is not None else None
+        self._max_workers = max(1, max_workers or client.limiter.max_limit)
+        self._chunk_size = max(1, min(chunk_size, BATCH_CHUNK_SIZE))
+        self._lister = lister or search_lister(client)
+
+    def run(self, force: bool = False) -> SyncResult:
+        """
+        Run one sync pass.
+
+        Args:
+            force: Re-fetch sources even if their version is unchanged
+
+        Returns:
+            SyncResult summarizing the run
+        """
+        started = time.perf_counter()
+        result = SyncResult()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Source versions decide what to resync, so never trust a cached snapshot here.
+        metadata = self._client.metadata(refresh=True)
+        sources = metadata.sources
+        write_atomic(self.directory / "sources.json", sources.model_dump_json())
+        write_atomic(self.directory / "categories.json", metadata.categories.model_dump_json())
+
+        with priority(BULK, override=False), ThreadPoolExecutor(self._max_workers) as executor:
+            for source in sources.data:
+                if self._only is not None and source.id not in self._only:
+                    continue
+                result.sources_checked += 1
+                self._sync_source(executor, source, force, result)
+
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _sync_source(
+        self,
+        executor: ThreadPoolExecutor,
+        source: Source,
+        force: bool,
+        result: SyncResult,
+    ) -> None:
+        state = _SourceState(self.directory, source.id)
+        resuming = (
+            not state.complete and state.version == source.version and state.listed is not None
+        )
+
+        if state.complete and state.version == source.version and not force:
+            result.sources_skipped += 1
+            return
+
+        if resuming:
+            listed = state.listed or []
+        else:
+            listed = list(dict.fromkeys(self._lister(source)))
+            state.done.clear()
+            state.journal_path.unlink(missing_ok=True)
+            state.begin(source.version, listed)
+
+        source_dir = self.directory / source.id
+        source_dir.mkdir(parents=True, exist_ok=True)
+
+        pending = [name for name in listed if name not in state.done]
+        chunks = (
+            pending[i : i + self._chunk_size] for i in range(0, len(pending), self._chunk_size)
+        )
+
+        in_flight: dict[Future[Any], list[str]] = {}
+        for chunk in chunks:
+            if len(in_flight) >= self._max_workers:
+                self._drain(in_flight, source, state, result)
+            # Run in a copy of the caller's context so an enclosing deadline() applies.
+            context = contextvars.copy_context()
+            in_flight[executor.submit(context.run, self._fetch_chunk, source.id, chunk)] = chunk
+        while in_flight:
+            self._drain(in_flight, source, state, result)
+
+        # Manifest diff: anything we knew about that is no longer listed is gone.
+        listed_set = set(listed)
+        for name in [name for name in state.hashes if name not in listed_set]:
+            (source_dir / f"{name}.svg").unlink(missing_ok=True)
+            del state.hashes[name]
+            result.deleted += 1
+
+        if not any(key.startswith(f"{source.id}:") for key in result.failed):
+            state.finish()
+        else:
+            state.save()
+
+    def _fetch_chunk(self, source_id: str, names: list[str]) -> dict[str, str | SvgApiError]:
+        """Fetch one batch and return SVG bodies (or errors) keyed by name."""
+        try:
+            response = self._client.limiter.call(
+                self._client.get_batch, [{"name": name, "source": source_id} for name in names]
+            )
+        except SvgApiError as e:
+            return dict.fromkeys(names, e)
+
+        bodies: dict[str, str | SvgApiError] = {}
+        for name in names:
+            key = f"{source_id}:{name}"
+            item = response.data.get(key)
+            if item is not None and item.success and item.svg is not None:
+                bodies[name] = item.svg
+            else:
+                error = response.errors.get(key)
+                bodies[name] = SvgApiError(
+                    error.message if error else "Missing from batch response",
+                    code=error.code if error else None,
+                )
+        return bodies
+
+    def _drain(
+        self,
+        in_flight: dict[Future[Any], list[str]],
+        source: Source,
+        state: _SourceState,
+        result: SyncResult,
+    ) -> None:
+        """Wait for at least one batch, then write it out and checkpoint it."""
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        source_dir = self.directory / source.id
+        for future in done:
+            in_flight.pop(future)
+            completed: list[tuple[str, str]] = []
+            for name, body in future.result().items():
+                if isinstance(body, SvgApiError):
+                    result.failed[f"{source.id}:{name}"] = str(body)
+                    continue
+                digest = content_hash(body)
+                result.fetched += 1
+                path = source_dir / f"{name}.svg"
+                if state.hashes.get(name) != digest or not path.exists():
+                    write_atomic(path, body)
+                    result.updated += 1
+                completed.append((name, digest))
+            state.checkpoint(completed)
@@ -1,17 +1,27 @@
 """
 Type definitions for the SVG API SDK.
 
-Uses Pydantic for runtime validation and serialization.
+Uses Pydantic for runtime validation and serialization. Validators are built
+on first use rather than at import time to keep ``import svg_api`` fast.
 """
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
-class License(BaseModel):
+
+class _Model(BaseModel):
+    """Base model that defers building validators until first use."""
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class License(_Model):
     """
     License information for an icon source.
 
@@ -24,7 +34,7 @@ class License(BaseModel):
     url: HttpUrl = Field(..., description="URL to the license text")
 
 
-class Source(BaseModel):
+class Source(_Model):
     """
     Metadata for an icon source/library.
 
@@ -55,7 +65,7 @@ class Source(BaseModel):
     categories: list[str] = Field(default_factory=list, description="Available categories")
 
 
-class Category(BaseModel):
+class Category(_Model):
     """
     Metadata for an icon category.
 
@@ -74,7 +84,7 @@ class Category(BaseModel):
     sources: list[str] = Field(default_factory=list, description="Sources with this category")
 
 
-class Icon(BaseModel):
+class Icon(_Model):
     """
     Icon data with SVG content and metadata.
 
@@ -100,7 +110,7 @@ class Icon(BaseModel):
         return f"{self.source}:{self.name}"
 
 
-class SearchResult(BaseModel):
+class SearchResult(_Model):
     """
     A single search result.
 
@@ -124,7 +134,7 @@ class SearchResult(BaseModel):
         return f"{self.source}:{self.name} ({self.score:.2f})"
 
 
-class Meta(BaseModel):
+class Meta(_Model):
     """
     Response metadata.
 
@@ -171,7 +181,7 @@ class SearchMeta(PaginationMeta):
     search_time_ms: int | None = Field(None, description="Search time (ms)")
 
 
-class ApiResponse(BaseModel):
+class ApiResponse(_Model):
     """
     Base API response wrapper.
 
@@ -206,14 +216,14 @@ class SearchResponse(ApiResponse):
     data: list[SearchResult] = Field(default_factory=list, description="Search results")
     meta: SearchMeta = Field(default_factory=SearchMeta, description="Search metadata")
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator[SearchResult]:  # type: ignore[override]
         return iter(self.data)
 
     def __len__(self) -> int:
         return len(self.data)
 
 
-class BatchIconResult(BaseModel):
+class BatchIconResult(_Model):
     """
     Result for a single icon in a batch request.
 
@@ -232,7 +242,7 @@ class BatchIconResult(BaseModel):
     category: str | None = Field(None, description="Icon category")
 
 
-class BatchError(BaseModel):
+class BatchError(_Model):
     """
     Error information for a failed batch item.
 
@@ -260,7 +270,7 @@ class BatchMeta(Meta):
     failed: int = Field(..., ge=0, description="Failed fetches")
 
 
-class BatchResponse(BaseModel):
+class BatchResponse(_Model):
     """
     Response for batch icon requests.
 
@@ -270,13 +280,11 @@ class BatchResponse(BaseModel):
         meta: Batch metadata
     """
 
-    data: dict[str, BatchIconResult] = Field(
-        default_factory=dict, description="Batch results"
-    )
+    data: dict[str, BatchIconResult] = Field(default_factory=dict, description="Batch results")
     errors: dict[str, BatchError] = Field(default_factory=dict, description="Batch errors")
     meta: BatchMeta = Field(..., description="Batch metadata")
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator[tuple[str, BatchIconResult]]:  # type: ignore[override]
         return iter(self.data.items())
 
     def __len__(self) -> int:
@@ -295,7 +303,7 @@ class SourcesResponse(ApiResponse):
     data: list[Source] = Field(default_factory=list, description="Icon sources")
     meta: Meta = Field(..., description="Response metadata")
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator[Source]:  # type: ignore[override]
         return iter(self.data)
 
     def __len__(self) -> int:
@@ -314,7 +322,7 @@ class CategoriesResponse(ApiResponse):
     data: list[Category] = Field(default_factory=list, description="Categories")
     meta: Meta = Field(..., description="Response metadata")
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator[Category]:  # type: ignore[override]
         return iter(self.data)
 
     def __len__(self) -> int:
@@ -324,7 +332,7 @@ class CategoriesResponse(ApiResponse):
 # Request models
 
 
-class IconOptions(BaseModel):
+class IconOptions(_Model):
     """
     Options for fetching an icon.
 
@@ -341,7 +349,7 @@ class IconOptions(BaseModel):
     color: str | None = Field(None, description="Icon color (hex or name)")
 
 
-class SearchOptions(BaseModel):
+class SearchOptions(_Model):
     """
     Options for searching icons.
 
@@ -358,7 +366,7 @@ class SearchOptions(BaseModel):
     offset: int | None = Field(None, ge=0, description="Pagination offset")
 
 
-class BatchIconRequest(BaseModel):
+class BatchIconRequest(_Model):
     """
     Request for a single icon in a batch.
 
@@ -377,7 +385,7 @@ class BatchIconRequest(BaseModel):
     color: str | None = Field(None, description="Icon color")
 
 
-class BatchDefaults(BaseModel):
+class BatchDefaults(_Model):
     """
     Default values for batch request.
 
@@ -390,7 +398,7 @@ class BatchDefaults(BaseModel):
     stroke: float = Field(default=2.0, ge=0.5, le=3, description="Default stroke width")
 
 
-class BatchRequestOptions(BaseModel):
+class BatchRequestOptions(_Model):
     """
     Options for batch icon request.
 
@@ -399,10 +407,10 @@ class BatchRequestOptions(BaseModel):
         defaults: Default values for all icons
     """
 
-    icons: list[BatchIconRequest] = Field(..., min_length=1, max_length=50, description="Icon requests")
-    defaults: BatchDefaults = Field(
-        default_factory=BatchDefaults, description="Default values"
+    icons: list[BatchIconRequest] = Field(
+        ..., min_length=1, max_length=50, description="Icon requests"
     )
+    defaults: BatchDefaults = Field(default_factory=BatchDefaults, description="Default values")
 
     @field_validator("icons")
     @classmethod
@@ -414,7 +422,7 @@ class BatchRequestOptions(BaseModel):
         return v
 
 
-class RandomIconOptions(BaseModel):
+class RandomIconOptions(_Model):
     """
     Options for getting a random icon.
 
@@ -0,0 +1,335 @@
+"""
+Background reporting of icon usage to ``POST /recommendations/track``.
+
+Reporting a render inline would cost a request per render. Instead,
+``record()`` adds the event to a bounded ``UsageBuffer`` and returns at
+once. Events are aggregated into counts per (source, icon, context) and
+flushed in the background every ``interval`` seconds, or sooner once
+``flush_size`` events are pending: by a daemon thread for ``SvgApi``
+(``UsageReporter``), by a task for ``AsyncSvgApi`` (``AsyncUsageReporter``).
+When ``capacity`` events are pending, new ones are dropped, never blocking
+the caller. Usage is best-effort: a report that fails is dropped too.
+
+The endpoint takes one event per request, so a flush sends one request per
+distinct (source, icon, context) with the aggregated ``count`` in the body.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from svg_api.deadlines import deadline_at, gather_within_deadline
+from svg_api.errors import SvgApiError
+from svg_api.lanes import BULK, priority
+
+if TYPE_CHECKING:
+    from svg_api.async_client import AsyncSvgApi
+    from svg_api.client import SvgApi
+
+TRACK_PATH = "/recommendations/track"
+DEFAULT_INTERVAL = 10.0
+DEFAULT_FLUSH_SIZE = 500
+DEFAULT_CAPACITY = 10_000
+# Seconds close() waits for the final flush.
+CLOSE_TIMEOUT = 5.0
+
+logger = logging.getLogger(__name__)
+
+_UsageKey = tuple[str, str, "str | None"]
+
+
+def track_body(key: _UsageKey, count: int) -> dict[str, Any]:
+    """Request body reporting ``count`` uses of one icon."""
+    source, name, context = key
+    body: dict[str, Any] = {"icon": name, "source": source, "count": count}
+    if context is not None:
+        body["context"] = context
+    return body
+
+
+class UsageBuffer:
+    """
+    Usage counts pending a flush, bounded by the number of events.
+
+    Thread-safe.
+
+    Attributes:
+        recorded: Events accepted
+        dropped: Events rejected because the buffer was full
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = max(1, capacity)
+        self.recorded = 0
+        self.dropped = 0
+        self._counts: dict[_UsageKey, int] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Events pending a flush."""
+        return self._pending
+
+    def add(self, source: str, name: str, context: str | None = None) -> bool:
+        """Count one use; returns False (and drops it) if the buffer is full."""
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.dropped += 1
+                return False
+            key = (source, name, context)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._pending += 1
+            self.recorded += 1
+            return True
+
+    def drain(self) -> dict[_UsageKey, int]:
+        """Take every pending count, leaving the buffer empty."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            self._pending = 0
+            return counts
+
+
+class _Reporter:
+    """Shared state of the sync and async reporters."""
+
+    def __init__(self, interval: float, flush_size: int, capacity: int) -> None:
+        self.interval = interval
+        self.flush_size = max(1, flush_size)
+        self.buffer = UsageBuffer(capacity)
+        self.sent = 0
+        self.failed = 0
+        self.requests = 0
+
+    def snapshot(self) -> dict[str, int]:
+        """Return event counters: recorded, dropped, pending, sent, failed, requests."""
+        return {
+            "recorded": self.buffer.recorded,
+            "dropped": self.buffer.dropped,
+            "pending": len(self.buffer),
+            "sent": self.sent,
+            "failed": self.failed,
+            "requests": self.requests,
+        }
+
+    def _result(self, count: int, error: BaseException | None) -> None:
+        self.requests += 1
+        if error is None:
+            self.sent += count
+        else:
+            self.failed += count
+
+    def __repr__(self) -> str:
+        stats = self.snapshot()
+        return (
+            f"{type(self).__name__}(pending={stats['pending']}, sent={stats['sent']}, "
+            f"dropped={stats['dropped']}, failed={stats['failed']})"
+        )
+
+
+class UsageReporter(_Reporter):
+    """
+    Reports usage for a SvgApi client from a background thread.
+
+    Example:
+        >>> client.track_usage("home", "lucide", context="navbar")  # returns at once
+        >>> client.usage.snapshot()["sent"]
+    """
+
+    def __init__(
+        self,
+        client: SvgApi,
+        interval: float = DEFAULT_INTERVAL,
+        flush_size: int = DEFAULT_FLUSH_SIZE,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        """
+        Initialize the reporter; its thread starts with the first event.
+
+        Args:
+            client: Client the reports are sent with
+            interval: Seconds between flushes
+            flush_size: Pending events that trigger an early flush
+            capacity: Pending events beyond which new ones are dropped
+        """
+        super().__init__(interval, flush_size, capacity)
+        self._client = client
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record(self, name: str, source: str, context: str | None = None) -> bool:
+        """
+        Count one use of an icon without blocking.
+
+        Returns:
+            False if the event was dropped (buffer full or reporter closed)
+        """
+        if self._stopped.is_set() or not self.buffer.add(source, name, context):
+            return False
+        if self._thread is None:
+            self._start()
+        if len(self.buffer) >= self.flush_size:
+            self._wake.set()
+        return True
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(target=self._run, name="svg-api-usage", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stopped.is_set():
+                try:
+                    self.flush()
+                except Exception:
+                    # A bug must not stop reporting for the life of the client.
+                    logger.exception("Usage flush failed")
+
+    def flush(self) -> int:
+        """
+        Send the pending counts now, on the calling thread.
+
+        Returns:
+            Number of events reported successfully
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        sent = self.sent
+        with priority(BULK, override=False):
+            for key, count in self.buffer.drain().items():
+                self._track(key, count)
+        return self.sent - sent
+
+    def _track(self, key: _UsageKey, count: int) -> None:
+        try:
+            self._client._send("POST", TRACK_PATH, json=track_body(key, count))
+        except SvgApiError as e:
+            self._result(count, e)
+        else:
+            self._result(count, None)
+
+    def close(self) -> None:
+        """
+        Stop the thread after a final flush of the pending counts.
+
+        Waits at most CLOSE_TIMEOUT seconds in all; counts not reported by
+        then are dropped.
+        """
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        expiry = time.monotonic() + CLOSE_TIMEOUT
+        if self._thread is not None:
+            self._thread.join(CLOSE_TIMEOUT)
+        # The thread may still be sending; don't queue up behind it.
+        if not self._flush_lock.acquire(timeout=max(expiry - time.monotonic(), 0.0)):
+            return
+        try:
+            with deadline_at(expiry):
+                self._flush()
+        finally:
+            self._flush_lock.release()
+
+
+class AsyncUsageReporter(_Reporter):
+    """
+    Reports usage for an AsyncSvgApi client from a background task.
+
+    record() must be called on the client's event loop.
+    """
+
+    def __init__(
+        self,
+        client: AsyncSvgApi,
+        interval: float = DEFAULT_INTERVAL,
+        flush_size: int = DEFAULT_FLUSH_SIZE,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        """Initialize the reporter; see UsageReporter for the arguments."""
+        super().__init__(interval, flush_size, capacity)
+        self._client = client
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    def record(self, name: str, source: str, context: str | None = None) -> bool:
+        """
+        Count one use of an icon without blocking.
+
+        Returns:
+            False if the event was dropped (buffer full or reporter closed)
+        """
+        if self._closed or not self.buffer.add(source, name, context):
+            return False
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        if len(self.buffer) >= self.flush_size and self._wake is not None:
+            self._wake.set()
+        return True
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # A bug must not stop reporting for the life of the client.
+                logger.exception("Usage flush failed")
+
+    async def flush(self) -> int:
+        """
+        Send the pending counts now.
+
+        Returns:
+            Number of events reported successfully
+        """
+        counts = list(self.buffer.drain().items())
+        if not counts:
+            return 0
+        with priority(BULK, override=False):
+            results = await gather_within_deadline(
+                *[self._track(key, count) for key, count in counts]
+            )
+        return sum(results)
+
+    async def _track(self, key: _UsageKey, count: int) -> int:
+        try:
+            await self._client.limiter.acall(
+                self._client._send, "POST", TRACK_PATH, json=track_body(key, count)
+            )
+        except SvgApiError as e:
+            self._result(count, e)
+            return 0
+        self._result(count, None)
+        return count
+
+    async def close(self) -> None:
+        """Stop the task after a final flush of the pending counts."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.flush(), CLOSE_TIMEOUT)
@@ -4,7 +4,6 @@ Utility functions for the SVG API SDK.
 
 from __future__ import annotations
 
-import asyncio
 import time
 from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
@@ -69,6 +68,7 @@ async def async_retry_with_backoff(
     base_delay: float = 0.5,
     max_delay: float = 30.0,
     retryable_errors: tuple[type[Exception], ...] | None = None,
+    on_retry: Callable[[int, Exception], None] | None = None,
 ) -> T:
     """
     Retry an async callable with exponential backoff.
@@ -79,13 +79,18 @@ async def async_retry_with_backoff(
         base_delay: Base delay in seconds
         max_delay: Maximum delay in seconds
         retryable_errors: Tuple of error types that are retryable
+        on_retry: Optional hook called with (attempt, error) before each retry
 
     Returns:
         Result of the callable
 
     Raises:
+        DeadlineExceededError: If the current deadline expires before a retry
         Exception: The last exception if all retries fail
     """
+    import asyncio
+
+    from svg_api.deadlines import check_backoff
     from svg_api.errors import NetworkError, TimeoutError
 
     if retryable_errors is None:
@@ -101,6 +106,9 @@ async def async_retry_with_backoff(
             if attempt == max_attempts - 1:
                 break
             delay = calculate_retry_delay(attempt, base_delay, max_delay)
+            check_backoff(delay, e)
+            if on_retry is not None:
+                on_retry(attempt, e)
             await asyncio.sleep(delay)
         except Exception:
             # Don't retry non-retryable errors
@@ -117,6 +125,7 @@ def retry_with_backoff(
     base_delay: float = 0.5,
     max_delay: float = 30.0,
     retryable_errors: tuple[type[Exception], ...] | None = None,
+    on_retry: Callable[[int, Exception], None] | None = None,
 ) -> T:
     """
     Retry a callable with exponential backoff.
@@ -127,15 +136,17 @@ def retry_with_backoff(
         base_delay: Base delay in seconds
         max_delay: Maximum delay in seconds
         retryable_errors: Tuple of error types that are retryable
+        on_retry: Optional hook called with (attempt, error) before each retry
 
     Returns:
         Result of the callable
 
     Raises:
+        DeadlineExceededError: If the current deadline expires before a retry
         Exception: The last exception if all retries fail
     """
+    from svg_api.deadlines import check_backoff
     from svg_api.errors import NetworkError, TimeoutError
-    import time
 
     if retryable_errors is None:
         retryable_errors = (NetworkError, TimeoutError)
@@ -150,6 +161,9 @@ def retry_with_backoff(
             if attempt == max_attempts - 1:
                 break
             delay = calculate_retry_delay(attempt, base_delay, max_delay)
+            check_backoff(delay, e)
+            if on_retry is not None:
+                on_retry(attempt, e)
             time.sleep(delay)
         except Exception:
             # Don't retry non-retryable errors
@@ -0,0 +1,212 @@
+"""Shared fixtures: SvgApi over httpx.MockTransport, AsyncSvgApi against a local aiohttp server."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+from aiohttp import web
+
+from svg_api.client import SvgApi
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+
+BASE_URL = "https://api.test/v1"
+
+
+def batch_body(
+    data: dict[str, dict[str, Any]],
+    errors: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Body of a POST /icons/batch response."""
+    errors = errors or {}
+    successful = sum(1 for item in data.values() if item.get("success"))
+    return {
+        "data": data,
+        "errors": errors,
+        "meta": {
+            "requested": len(data) + len(errors),
+            "successful": successful,
+            "failed": len(data) + len(errors) - successful,
+        },
+    }
+
+
+def icon_item(name: str, source: str = "lucide") -> dict[str, Any]:
+    """A successful batch result."""
+    return {"success": True, "name": name, "source": source, "svg": f"<svg>{name}</svg>"}
+
+
+def icon_body(name: str, source: str = "lucide") -> dict[str, Any]:
+    """Body of a GET /icons/{source}/{name} response."""
+    return {
+        "data": {
+            "name": name,
+            "source": source,
+            "category": "general",
+            "svg": f"<svg>{name}</svg>",
+        },
+        "meta": {},
+    }
+
+
+def error_body(code: str, message: str = "error") -> dict[str, Any]:
+    """Body of an API error response."""
+    return {"error": {"code": code, "message": message}}
+
+
+def requested_icons(request: httpx.Request) -> list[dict[str, Any]]:
+    """Entries of a batch request sent over httpx."""
+    icons: list[dict[str, Any]] = json.loads(request.content)["icons"]
+    return icons
+
+
+class FakeCatalogue:
+    """
+    In-memory API serving /version, /sources, /categories, /icons and /icons/batch.
+
+    Use an instance as the handler of ``mock_client`` or, through
+    ``aiohttp_handler``, of ``api_server``. Keys ("source:name") in
+    ``fail`` get a transient batch error, or a 500 on GET /icons.
+
+    Attributes:
+        sources: Icons keyed by source id, then by name
+        versions: Version of each source
+        requests: (method, path, params, body) of every request received
+    """
+
+    def __init__(self, sources: dict[str, dict[str, str]] | None = None) -> None:
+        self.sources = sources if sources is not None else {}
+        self.versions = dict.fromkeys(self.sources, "1")
+        self.fail: set[str] = set()
+        self.requests: list[tuple[str, str, dict[str, str], Any]] = []
+
+    def batches(self) -> list[list[str]]:
+        """Keys requested by each batch request, in order."""
+        return [
+            [f"{icon.get('source') or 'heroicons'}:{icon['name']}" for icon in body["icons"]]
+            for method, path, _, body in self.requests
+            if path.endswith("/icons/batch")
+        ]
+
+    def respond(
+        self, method: str, path: str, params: dict[str, str], body: Any
+    ) -> tuple[int, dict[str, Any]]:
+        self.requests.append((method, path, params, body))
+        path = path.split("/v1", 1)[-1]
+        if path == "/version":
+            return 200, {"data": dict(self.versions)}
+        if path == "/sources":
+            return 200, {
+                "data": [
+                    {
+                        "id": source,
+                        "name": source.title(),
+                        "version": self.versions[source],
+                        "icon_count": len(icons),
+                        "license": {"type": "MIT", "url": "https://example.com/license"},
+                    }
+                    for source, icons in self.sources.items()
+                ],
+                "meta": {},
+            }
+        if path == "/categories":
+            return 200, {"data": [], "meta": {}}
+        if path == "/icons/batch":
+            return 200, self._batch(body)
+        if path.startswith("/icons/"):
+            name = path.rsplit("/", 1)[-1]
+            source = params.get("source", "heroicons")
+            if f"{source}:{name}" in self.fail:
+                return 500, error_body("INTERNAL_ERROR")
+            svg = self.sources.get(source, {}).get(name)
+            if svg is None:
+                return 404, error_body("ICON_NOT_FOUND")
+            body = icon_body(name, source)
+            body["data"]["svg"] = svg
+            return 200, body
+        return 404, error_body("NOT_FOUND")
+
+    def _batch(self, body: dict[str, Any]) -> dict[str, Any]:
+        defaults = body.get("defaults") or {}
+        data: dict[str, dict[str, Any]] = {}
+        errors: dict[str, dict[str, Any]] = {}
+        for icon in body["icons"]:
+            source = icon.get("source") or defaults.get("source") or "heroicons"
+            key = f"{source}:{icon['name']}"
+            svg = self.sources.get(source, {}).get(icon["name"])
+            if key in self.fail:
+                errors[key] = {"code": "INTERNAL_ERROR", "message": "try again"}
+            elif svg is None:
+                errors[key] = {"code": "ICON_NOT_FOUND", "message": "not found"}
+            else:
+                data[key] = {"success": True, "name": icon["name"], "source": source, "svg": svg}
+        return batch_body(data, errors)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else None
+        status, payload = self.respond(
+            request.method, request.url.path, dict(request.url.params), body
+        )
+        return httpx.Response(status, json=payload)
+
+    async def aiohttp_handler(self, request: web.Request) -> web.Response:
+        body = await request.json() if request.can_read_body else None
+        status, payload = self.respond(request.method, request.path, dict(request.query), body)
+        return web.json_response(payload, status=status)
+
+
+@pytest.fixture
+def mock_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[..., SvgApi]]:
+    """
+    Return a factory for SvgApi clients whose requests go to ``handler``.
+
+    The handler takes an httpx.Request and returns an httpx.Response. Retry
+    delays default to 0.
+    """
+    clients: list[SvgApi] = []
+
+    def factory(handler: Callable[[httpx.Request], httpx.Response], **kwargs: Any) -> SvgApi:
+        transport = httpx.MockTransport(handler)
+
+        def new_http_client(config: Any, base_url: str) -> httpx.Client:
+            return httpx.Client(base_url=base_url, timeout=config.timeout, transport=transport)
+
+        monkeypatch.setattr(SvgApi, "_new_http_client", staticmethod(new_http_client))
+        kwargs.setdefault("base_url", BASE_URL)
+        kwargs.setdefault("retry_delay", 0)
+        client = SvgApi(**kwargs)
+        clients.append(client)
+        return client
+
+    yield factory
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+async def api_server() -> AsyncIterator[Callable[..., Awaitable[str]]]:
+    """
+    Return an async factory starting a local aiohttp server for ``handler``.
+
+    Every path is routed to the handler; the factory returns the base URL.
+    """
+    runners: list[web.AppRunner] = []
+
+    async def start(handler: Callable[[web.Request], Awaitable[web.StreamResponse]]) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        host, port = runner.addresses[0][:2]
+        return f"http://{host}:{port}/v1"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
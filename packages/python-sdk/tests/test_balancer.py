@@ -0,0 +1,133 @@
+"""Tests for endpoint balancing, ejection and re-admission."""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from svg_api.balancer import EndpointPool, health_url, is_endpoint_failure
+from svg_api.errors import (
+    DeadlineExceededError,
+    NetworkError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
+from tests.conftest import FakeCatalogue, error_body
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+EU = "https://eu.api.test/v1"
+US = "https://us.api.test/v1"
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the balancer's monotonic clock with one advanced by hand."""
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr("svg_api.balancer.time", fake)
+    return fake
+
+
+def test_health_url_is_served_from_the_origin_root() -> None:
+    assert health_url("https://eu.svg-api.org/v1/") == "https://eu.svg-api.org/health/ready"
+
+
+def test_only_endpoint_failures_count() -> None:
+    assert is_endpoint_failure(NetworkError("reset"))
+    assert is_endpoint_failure(ServiceUnavailableError("down"))
+    assert not is_endpoint_failure(NotFoundError("missing"))
+    assert not is_endpoint_failure(DeadlineExceededError())
+
+
+class TestEndpointPool:
+    def test_ejection_and_readmission(self, clock: SimpleNamespace) -> None:
+        pool = EndpointPool([EU, US], eject_after=2, eject_for=10.0)
+        eu, us = pool.endpoints
+        for _ in range(2):
+            pool.release(pool.acquire(exclude=[us]), 0.1, NetworkError("reset"))
+        assert not eu.available
+        assert all(pool.acquire() is us for _ in range(20))
+
+        assert pool.due_for_probe() == []
+        clock.now += 10.0
+        assert pool.due_for_probe() == [eu]
+        assert pool.due_for_probe() == []  # already being probed
+        pool.probe_result(eu, ready=True)
+        assert eu.available
+        assert (eu.failures, eu.latency, eu.ejections) == (0, 0.0, 1)
+
+    def test_failed_probe_doubles_the_cooldown(self, clock: SimpleNamespace) -> None:
+        pool = EndpointPool([EU, US], eject_after=1, eject_for=10.0, max_eject_for=25.0)
+        eu = pool.endpoints[0]
+        pool.release(pool.acquire(exclude=pool.endpoints[1:]), 0.1, NetworkError("reset"))
+        for cooldown in (20.0, 25.0, 25.0):
+            clock.now = eu.ejected_until or 0.0
+            assert pool.due_for_probe() == [eu]
+            pool.probe_result(eu, ready=False)
+            assert eu.ejected_until == clock.now + cooldown
+
+    def test_request_errors_do_not_eject(self) -> None:
+        pool = EndpointPool([EU, US], eject_after=1)
+        pool.release(pool.acquire(), 0.1, NotFoundError("missing"))
+        assert all(endpoint.available for endpoint in pool.endpoints)
+
+    def test_single_endpoint_is_never_ejected(self) -> None:
+        pool = EndpointPool([EU], eject_after=1)
+        pool.release(pool.acquire(), 0.1, NetworkError("reset"))
+        assert pool.primary.available
+
+    def test_everything_ejected_falls_back_to_the_first_to_recover(
+        self, clock: SimpleNamespace
+    ) -> None:
+        pool = EndpointPool([EU, US], eject_after=1, eject_for=10.0)
+        eu, us = pool.endpoints
+        pool.release(pool.acquire(exclude=[us]), 0.1, NetworkError("reset"))
+        clock.now += 5.0
+        pool.release(pool.acquire(), 0.1, NetworkError("reset"))
+        assert not eu.available and not us.available
+        assert pool.acquire() is eu
+
+
+def test_client_fails_over_ejects_and_readmits(
+    mock_client: Callable[..., SvgApi], clock: SimpleNamespace
+) -> None:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg>home</svg>"}})
+    eu_up = False
+    probes: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "eu.api.test":
+            if request.url.path == "/health/ready":
+                probes.append(str(request.url))
+                return httpx.Response(200 if eu_up else 503)
+            if not eu_up:
+                return httpx.Response(503, json=error_body("SERVICE_UNAVAILABLE"))
+        return catalogue(request)
+
+    client = mock_client(handler, base_url=EU, base_urls=[EU, US], cache_size=0)
+    eu = client._pool.primary
+    # The balancer picks EU about half the time; each pick fails over to US.
+    for _ in range(100):
+        assert client.get_icon("home", "lucide").svg == "<svg>home</svg>"
+        if not eu.available:
+            break
+    assert not eu.available
+    assert eu.ejections == 1
+
+    eu_up = True
+    clock.now += client._pool.eject_for
+    client.get_icon("home", "lucide")
+    deadline = time.monotonic() + 5.0
+    while not eu.available and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert probes == ["https://eu.api.test/health/ready"]
+    assert eu.available
+    assert client.stats()["base_urls"][0]["ejections"] == 1
@@ -0,0 +1,124 @@
+"""Tests for batch requests and their partial retries."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from svg_api.async_client import AsyncSvgApi
+from svg_api.batch import batch_chunks, batch_retry_entries, merge_batch_retry
+from svg_api.client import BATCH_ENDPOINT
+from svg_api.types import BatchResponse
+from tests.conftest import FakeCatalogue, batch_body, icon_item
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    import httpx
+    from aiohttp import web
+
+    from svg_api.client import SvgApi
+
+ICONS = [
+    {"name": "home", "source": "lucide"},
+    {"name": "star", "source": "lucide"},
+    {"name": "gone", "source": "lucide"},
+]
+
+
+def _catalogue() -> FakeCatalogue:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg>home</svg>", "star": "<svg>star</svg>"}})
+    catalogue.fail = {"lucide:star"}
+    return catalogue
+
+
+def _recovering(catalogue: FakeCatalogue) -> Callable[[httpx.Request], httpx.Response]:
+    """Handler whose transient failures clear after the first request."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = catalogue(request)
+        catalogue.fail.clear()
+        return response
+
+    return handler
+
+
+def test_batch_chunks_keep_variants_apart() -> None:
+    specs = [
+        {"name": "home", "source": "lucide"},
+        {"name": "home", "source": "lucide", "size": 32},
+        {"name": "star", "source": "lucide"},
+    ]
+    assert batch_chunks(specs, size=5) == [[specs[0], specs[2]], [specs[1]]]
+
+
+class TestRetryEntries:
+    def test_only_transient_and_unanswered_entries_are_retried(self) -> None:
+        response = BatchResponse.model_validate(
+            batch_body(
+                {"lucide:home": icon_item("home")},
+                {
+                    "lucide:star": {"code": "INTERNAL_ERROR", "message": "try again"},
+                    "lucide:gone": {"code": "ICON_NOT_FOUND", "message": "not found"},
+                },
+            )
+        )
+        icons = [*ICONS, {"name": "sun", "source": "lucide"}, {"name": "moon"}]
+        assert batch_retry_entries(icons, None, response) == [
+            {"name": "star", "source": "lucide"},
+            {"name": "sun", "source": "lucide"},
+        ]
+
+    def test_merge_prefers_the_retry(self) -> None:
+        first = BatchResponse.model_validate(
+            batch_body(
+                {"lucide:home": icon_item("home")},
+                {"lucide:star": {"code": "INTERNAL_ERROR", "message": "try again"}},
+            )
+        )
+        retry = BatchResponse.model_validate(batch_body({"lucide:star": icon_item("star")}))
+        merged = merge_batch_retry(first, retry)
+        assert set(merged.data) == {"lucide:home", "lucide:star"}
+        assert merged.errors == {}
+        assert (merged.meta.successful, merged.meta.failed) == (2, 0)
+
+
+def test_partial_retry_resends_only_the_failed_keys(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    client = mock_client(_recovering(catalogue), cache_size=0)
+    response = client.get_batch(ICONS)
+    assert catalogue.batches() == [
+        ["lucide:home", "lucide:star", "lucide:gone"],
+        ["lucide:star"],
+    ]
+    assert response.data["lucide:star"].svg == "<svg>star</svg>"
+    assert set(response.errors) == {"lucide:gone"}
+    assert (response.meta.successful, response.meta.failed) == (2, 1)
+    assert client.stats()["endpoints"][BATCH_ENDPOINT]["retries"] == 1
+
+
+def test_persistent_failures_stop_after_max_retries(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    client = mock_client(catalogue, max_retries=2, cache_size=0)
+    response = client.get_batch(ICONS)
+    assert catalogue.batches()[1:] == [["lucide:star"], ["lucide:star"]]
+    assert response.errors["lucide:star"].code == "INTERNAL_ERROR"
+    assert response.data["lucide:home"].success
+
+
+async def test_async_partial_retry(api_server: Callable[..., Awaitable[str]]) -> None:
+    catalogue = _catalogue()
+
+    async def handler(request: web.Request) -> web.Response:
+        response = await catalogue.aiohttp_handler(request)
+        catalogue.fail.clear()
+        return response
+
+    base_url = await api_server(handler)
+    async with AsyncSvgApi(base_url=base_url, retry_delay=0, cache_size=0) as client:
+        response = await client.get_batch(ICONS)
+    assert catalogue.batches() == [
+        ["lucide:home", "lucide:star", "lucide:gone"],
+        ["lucide:star"],
+    ]
+    assert response.data["lucide:star"].success
+    assert set(response.errors) == {"lucide:gone"}
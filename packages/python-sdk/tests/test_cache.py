@@ -0,0 +1,317 @@
+"""Tests for the icon cache and its use by the clients."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+from aiohttp import web
+
+from svg_api.async_client import AsyncSvgApi
+from svg_api.cache import (
+    AccessTracker,
+    FrequencySketch,
+    IconCache,
+    parse_freshness,
+    spec_key,
+)
+from svg_api.deadlines import deadline
+from svg_api.lanes import BULK, INTERACTIVE
+from tests.conftest import FakeCatalogue, batch_body, icon_body, requested_icons
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Awaitable, Callable
+
+    from svg_api.client import SvgApi
+
+STALE = {"Cache-Control": "max-age=0, stale-while-revalidate=60"}
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.005)
+
+
+class TestParseFreshness:
+    @pytest.mark.parametrize(
+        ("headers", "expected"),
+        [
+            ({}, (3600.0, 0.0)),
+            ({"Cache-Control": "max-age=60"}, (60.0, 0.0)),
+            ({"Cache-Control": "public, s-maxage=30, max-age=60"}, (30.0, 0.0)),
+            ({"Cache-Control": "max-age=60, stale-while-revalidate=30"}, (60.0, 30.0)),
+            ({"Cache-Control": "max-age=60, stale-while-revalidate=30", "Age": "70"}, (0.0, 20.0)),
+            ({"Cache-Control": "no-cache, stale-while-revalidate=30"}, (0.0, 30.0)),
+            ({"Cache-Control": "no-store"}, None),
+        ],
+    )
+    def test_lifetimes(self, headers: dict[str, str], expected: tuple[float, float] | None) -> None:
+        assert parse_freshness(httpx.Headers(headers), 3600.0) == expected
+
+
+class TestIconCache:
+    def test_entry_is_stale_then_expires(self) -> None:
+        cache: IconCache[str] = IconCache(10, 60)
+        cache.set("a", "icon", ttl=0.05, stale_ttl=0.05)
+        assert cache.lookup("a") == ("icon", False)
+        time.sleep(0.06)
+        assert cache.lookup("a") == ("icon", True)
+        time.sleep(0.06)
+        assert cache.lookup("a") is None
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache: IconCache[str] = IconCache(2, 60)
+        cache.set("a", "a")
+        cache.set("b", "b")
+        assert cache.get("a") == "a"
+        cache.set("c", "c")
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == ("a", "c")
+
+
+class TestAccessTracking:
+    def test_spec_key(self) -> None:
+        assert spec_key({"name": "home", "source": "lucide"}) == "lucide:home"
+        assert spec_key({"name": "home", "source": "lucide", "size": 32, "color": "red"}) == (
+            "lucide:home?size=32&color=red"
+        )
+
+    def test_sketch_ages_counts(self) -> None:
+        sketch = FrequencySketch(width=64, sample_size=8)
+        for _ in range(7):
+            sketch.add("hot")
+        assert sketch.estimate("hot") == 7
+        sketch.add("cold")
+        assert sketch.estimate("hot") == 3
+
+    def test_top_ranks_by_frequency_within_capacity(self) -> None:
+        tracker = AccessTracker(capacity=2)
+        for name, count in (("a", 3), ("b", 1), ("c", 5)):
+            for _ in range(count):
+                tracker.record({"name": name, "source": "lucide"})
+        assert [spec["name"] for spec in tracker.top(5)] == ["c", "a"]
+
+
+def _catalogue() -> FakeCatalogue:
+    return FakeCatalogue(
+        {"lucide": {"a": "<svg>a</svg>", "b": "<svg>b</svg>", "c": "<svg>c</svg>"}}
+    )
+
+
+def _sized(icons: list[dict[str, Any]]) -> dict[str, Any]:
+    """Batch body whose SVGs record the size they were requested at."""
+    return batch_body(
+        {
+            f"{icon['source']}:{icon['name']}": {
+                "success": True,
+                "name": icon["name"],
+                "source": icon["source"],
+                "svg": f"<svg size='{icon.get('size')}'/>",
+            }
+            for icon in icons
+        }
+    )
+
+
+HOT_VARIANTS = (
+    '{"icons": [{"name": "home", "source": "lucide", "size": 16},'
+    ' {"name": "home", "source": "lucide", "size": 48}]}'
+)
+
+
+class TestWarm:
+    def test_hot_set_warms_a_new_client(
+        self, mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+    ) -> None:
+        catalogue = _catalogue()
+        client = mock_client(catalogue)
+        for name, count in (("a", 3), ("b", 1)):
+            for _ in range(count):
+                client.get_icon(name, "lucide")
+        client.save_hot_set(tmp_path / "hot.json", top_k=1)
+
+        fresh = mock_client(catalogue)
+        assert fresh.warm(top_k=0, hot_set=tmp_path / "hot.json") == 1
+        assert catalogue.batches()[-1] == ["lucide:a"]
+        requests = len(catalogue.requests)
+        assert fresh.get_icon("a", "lucide").svg == "<svg>a</svg>"
+        assert len(catalogue.requests) == requests
+
+    def test_cached_and_missing_icons_are_not_counted(
+        self, mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+    ) -> None:
+        catalogue = _catalogue()
+        client = mock_client(catalogue)
+        client.get_icon("a", "lucide")
+        (tmp_path / "hot.json").write_text(
+            '{"icons": [{"name": "a", "source": "lucide"}, {"name": "b", "source": "lucide"},'
+            ' {"name": "gone", "source": "lucide"}]}'
+        )
+        assert client.warm(hot_set=tmp_path / "hot.json") == 1
+        assert catalogue.batches() == [["lucide:b", "lucide:gone"]]
+
+    async def test_async_warm(
+        self,
+        api_server: Callable[..., Awaitable[str]],
+        tmp_path: pathlib.Path,
+    ) -> None:
+        catalogue = _catalogue()
+        base_url = await api_server(catalogue.aiohttp_handler)
+        (tmp_path / "hot.json").write_text(
+            '{"icons": [{"name": "a", "source": "lucide"}, {"name": "c", "source": "lucide"}]}'
+        )
+        async with AsyncSvgApi(base_url=base_url) as client:
+            assert await client.warm(hot_set=tmp_path / "hot.json") == 2
+            requests = len(catalogue.requests)
+            assert (await client.get_icon("c", "lucide")).svg == "<svg>c</svg>"
+            assert len(catalogue.requests) == requests
+
+    def test_variants_of_one_icon_are_cached_apart(
+        self, mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+    ) -> None:
+        batches: list[list[int | None]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            icons = requested_icons(request)
+            batches.append([icon.get("size") for icon in icons])
+            return httpx.Response(200, json=_sized(icons))
+
+        (tmp_path / "hot.json").write_text(HOT_VARIANTS)
+        client = mock_client(handler)
+        assert client.warm(hot_set=tmp_path / "hot.json") == 2
+        assert batches == [[16], [48]]
+        assert client.get_icon("home", "lucide", size=16).svg == "<svg size='16'/>"
+        assert client.get_icon("home", "lucide", size=48).svg == "<svg size='48'/>"
+        assert len(batches) == 2
+
+    async def test_async_variants_of_one_icon_are_cached_apart(
+        self,
+        api_server: Callable[..., Awaitable[str]],
+        tmp_path: pathlib.Path,
+    ) -> None:
+        requests: list[list[int | None]] = []
+
+        async def handler(request: web.Request) -> web.Response:
+            icons = (await request.json())["icons"]
+            requests.append([icon.get("size") for icon in icons])
+            return web.json_response(_sized(icons))
+
+        base_url = await api_server(handler)
+        (tmp_path / "hot.json").write_text(HOT_VARIANTS)
+        async with AsyncSvgApi(base_url=base_url) as client:
+            assert await client.warm(hot_set=tmp_path / "hot.json") == 2
+            assert sorted(requests) == [[16], [48]]
+            assert (await client.get_icon("home", "lucide", size=16)).svg == "<svg size='16'/>"
+            assert (await client.get_icon("home", "lucide", size=48)).svg == "<svg size='48'/>"
+            assert len(requests) == 2
+
+
+class TestStaleWhileRevalidate:
+    def test_stale_icon_is_served_and_refreshed(self, mock_client: Callable[..., SvgApi]) -> None:
+        version = [0]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            version[0] += 1
+            body = icon_body("home")
+            body["data"]["svg"] = f"<svg>v{version[0]}</svg>"
+            return httpx.Response(200, json=body, headers=STALE)
+
+        client = mock_client(handler)
+        assert client.get_icon("home", "lucide").svg == "<svg>v1</svg>"
+        # Stale: answered from the cache, refreshed in the background.
+        assert client.get_icon("home", "lucide").svg == "<svg>v1</svg>"
+        _wait_for(lambda: client.get_icon("home", "lucide").svg == "<svg>v2</svg>")
+
+    def test_refreshes_are_limited_to_refresh_concurrency(
+        self, mock_client: Callable[..., SvgApi]
+    ) -> None:
+        lock = threading.Lock()
+        release = threading.Event()
+        block = [False]
+        active = [0]
+        peak = [0]
+        served = [0]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            name = request.url.path.rsplit("/", 1)[-1]
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            if block[0]:
+                release.wait(2)
+            with lock:
+                active[0] -= 1
+                served[0] += 1
+            return httpx.Response(200, json=icon_body(name), headers=STALE)
+
+        client = mock_client(handler, refresh_concurrency=2)
+        names = [f"icon-{i}" for i in range(6)]
+        for name in names:
+            client.get_icon(name, "lucide")
+        block[0] = True
+        peak[0] = 0
+        for name in names:
+            client.get_icon(name, "lucide")
+        _wait_for(lambda: active[0] == 2)
+        time.sleep(0.05)
+        release.set()
+        _wait_for(lambda: served[0] == 12)
+        assert peak[0] == 2
+
+
+async def test_async_stale_icon_is_served_and_refreshed(
+    api_server: Callable[..., Awaitable[str]],
+) -> None:
+    version = [0]
+
+    async def handler(request: web.Request) -> web.Response:
+        version[0] += 1
+        body = icon_body("home")
+        body["data"]["svg"] = f"<svg>v{version[0]}</svg>"
+        return web.json_response(body, headers=STALE)
+
+    base_url = await api_server(handler)
+    async with AsyncSvgApi(base_url=base_url, refresh_concurrency=1) as client:
+        assert (await client.get_icon("home", "lucide")).svg == "<svg>v1</svg>"
+        assert (await client.get_icon("home", "lucide")).svg == "<svg>v1</svg>"
+        for _ in range(200):
+            if not client._refresh_tasks:
+                break
+            await asyncio.sleep(0.005)
+        assert (await client.get_icon("home", "lucide")).svg == "<svg>v2</svg>"
+        assert client._config.refresh_concurrency == 1
+
+
+async def test_async_refresh_ignores_the_callers_deadline_and_lane(
+    api_server: Callable[..., Awaitable[str]],
+) -> None:
+    version = [0]
+    release = asyncio.Event()
+
+    async def handler(request: web.Request) -> web.Response:
+        version[0] += 1
+        if version[0] > 1:
+            await release.wait()
+        body = icon_body("home")
+        body["data"]["svg"] = f"<svg>v{version[0]}</svg>"
+        return web.json_response(body, headers=STALE)
+
+    base_url = await api_server(handler)
+    async with AsyncSvgApi(base_url=base_url) as client:
+        await client.get_icon("home", "lucide")
+        with deadline(0.05):
+            assert (await client.get_icon("home", "lucide")).svg == "<svg>v1</svg>"
+        await asyncio.sleep(0.15)  # well past the caller's deadline
+        lanes = client.stats()["lanes"]["lanes"]
+        assert (lanes[BULK]["in_flight"], lanes[INTERACTIVE]["in_flight"]) == (1, 0)
+
+        release.set()
+        await asyncio.gather(*client._refresh_tasks.values())
+        assert (await client.get_icon("home", "lucide")).svg == "<svg>v2</svg>"
@@ -0,0 +1,104 @@
+"""Tests for the svg-api command-line interface."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from typing import TYPE_CHECKING
+
+import pytest
+
+from svg_api.cli import EXIT_FAILURES, EXIT_OK, EXIT_USAGE, DiskCache, load_manifest, main
+from tests.conftest import BASE_URL, FakeCatalogue
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+
+@pytest.fixture
+def catalogue(mock_client: Callable[..., SvgApi]) -> FakeCatalogue:
+    """A catalogue that clients created by main() talk to."""
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg>home</svg>", "star": "<svg>star</svg>"}})
+    mock_client(catalogue)  # installs the transport for every SvgApi
+    return catalogue
+
+
+def _run(tmp_path: pathlib.Path, *argv: str) -> int:
+    return main(["-b", BASE_URL, "-q", "--cache-dir", str(tmp_path / "cache"), *argv])
+
+
+class TestManifests:
+    def test_text_manifest(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "icons.txt"
+        path.write_text("home  # the house\n\nheroicons:star\n")
+        assert load_manifest(str(path), "lucide", {"size": 32}) == [
+            {"name": "home", "source": "lucide", "size": 32},
+            {"name": "star", "source": "heroicons", "size": 32},
+        ]
+
+    def test_json_manifest(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "icons.json"
+        path.write_text(json.dumps({"icons": ["home", {"name": "star", "size": 16}]}))
+        assert load_manifest(str(path), "lucide", {"size": 32}) == [
+            {"name": "home", "source": "lucide", "size": 32},
+            {"name": "star", "source": "lucide", "size": 16},
+        ]
+
+    def test_invalid_entry(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "icons.json"
+        path.write_text("[42]")
+        with pytest.raises(ValueError, match="Invalid manifest entry"):
+            load_manifest(str(path), "lucide", {})
+
+
+def test_disk_cache_expires(tmp_path: pathlib.Path) -> None:
+    cache = DiskCache(tmp_path, ttl=60)
+    cache.set("lucide:home", "<svg/>")
+    assert cache.get("lucide:home") == "<svg/>"
+    assert DiskCache(tmp_path, ttl=-1).get("lucide:home") is None
+    assert cache.get("lucide:star") is None
+
+
+def test_fetch_writes_icons_and_reports_failures(
+    catalogue: FakeCatalogue, tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out = tmp_path / "out"
+    code = _run(tmp_path, "--json", "fetch", "lucide:home", "lucide:gone", "-o", str(out))
+    assert code == EXIT_FAILURES
+    assert (out / "lucide" / "home.svg").read_text() == "<svg>home</svg>"
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["fetched"], summary["written"]) == (1, 1)
+    assert list(summary["failed"]) == ["lucide:gone"]
+
+
+def test_fetch_uses_the_disk_cache(
+    catalogue: FakeCatalogue, tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out = str(tmp_path / "out")
+    assert _run(tmp_path, "fetch", "lucide:home", "-o", out) == EXIT_OK
+    requests = len(catalogue.batches())
+    assert _run(tmp_path, "--json", "fetch", "lucide:home", "lucide:star", "-o", out) == EXIT_OK
+    assert catalogue.batches()[requests:] == [["lucide:star"]]
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["cached"], summary["fetched"]) == (1, 1)
+
+
+def test_export_zip(catalogue: FakeCatalogue, tmp_path: pathlib.Path) -> None:
+    manifest = tmp_path / "icons.txt"
+    manifest.write_text("home\nstar\n")
+    archive = tmp_path / "icons.zip"
+    assert _run(tmp_path, "--no-cache", "export", str(manifest), str(archive), "-s", "lucide") == 0
+    with zipfile.ZipFile(archive) as zf:
+        assert sorted(zf.namelist()) == ["lucide/home.svg", "lucide/star.svg"]
+        assert zf.read("lucide/star.svg") == b"<svg>star</svg>"
+
+
+def test_fetch_without_icons_is_a_usage_error(
+    catalogue: FakeCatalogue, tmp_path: pathlib.Path
+) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        _run(tmp_path, "fetch")
+    assert excinfo.value.code == EXIT_USAGE
@@ -0,0 +1,114 @@
+"""Tests for the pluggable JSON codecs and error mapping."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from svg_api.codec import JsonCodec, get_codec
+from svg_api.errors import (
+    ApiError,
+    NotFoundError,
+    RateLimitError,
+    ServiceUnavailableError,
+    raise_for_status,
+)
+from svg_api.types import BatchIconRequest, IconResponse
+from tests.conftest import error_body, icon_body
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+CODECS = ["json", "orjson", "msgspec"]
+
+
+def _codec(name: str) -> JsonCodec:
+    try:
+        return get_codec(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+
+class TestGetCodec:
+    def test_instance_is_returned_as_is(self) -> None:
+        codec = JsonCodec()
+        assert get_codec(codec) is codec
+
+    def test_unknown_name(self) -> None:
+        with pytest.raises(ValueError, match="Unknown JSON codec"):
+            get_codec("yaml")
+
+    def test_default_is_the_fastest_installed(self) -> None:
+        names = []
+        for name in ("orjson", "msgspec"):
+            try:
+                get_codec(name)
+            except ImportError:
+                continue
+            names.append(name)
+        assert get_codec().name == (names[0] if names else "json")
+
+
+@pytest.mark.parametrize("name", CODECS)
+class TestCodecs:
+    def test_round_trip(self, name: str) -> None:
+        codec = _codec(name)
+        obj = {"name": "home", "tags": ["a", "ü"], "size": 24, "stroke": 1.5, "svg": None}
+        data = codec.dumps(obj)
+        assert isinstance(data, bytes)
+        assert codec.loads(data) == obj
+        assert json.loads(data) == obj
+
+    def test_models_are_encoded_without_none_fields(self, name: str) -> None:
+        codec = _codec(name)
+        body = codec.encode(BatchIconRequest(name="home", source="lucide"))
+        assert json.loads(body) == {"name": "home", "source": "lucide"}
+
+    def test_decode_into_a_model(self, name: str) -> None:
+        codec = _codec(name)
+        response = codec.decode(json.dumps(icon_body("home")).encode(), IconResponse)
+        assert response.data.name == "home"
+
+
+class TestRaiseForStatus:
+    @pytest.mark.parametrize(
+        ("status", "error"),
+        [
+            (404, NotFoundError),
+            (429, RateLimitError),
+            (503, ServiceUnavailableError),
+            (500, ApiError),
+            (403, ApiError),
+            (409, ApiError),
+        ],
+    )
+    def test_every_error_status_raises(self, status: int, error: type[Exception]) -> None:
+        with pytest.raises(error) as excinfo:
+            raise_for_status(status, error_body("SOME_CODE", "message"), "req-1")
+        assert type(excinfo.value) is error
+        assert excinfo.value.request_id == "req-1"  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize("name", CODECS)
+def test_client_decodes_errors_with_its_codec(
+    mock_client: Callable[..., SvgApi], name: str
+) -> None:
+    _codec(name)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404, json=error_body("ICON_NOT_FOUND", "no such icon"))
+        return httpx.Response(403, json=error_body("FORBIDDEN", "not allowed"))
+
+    client = mock_client(handler, json_codec=name, negative_cache_ttl=0)
+    with pytest.raises(NotFoundError) as not_found:
+        client.get_icon("missing", "lucide")
+    assert not_found.value.code == "ICON_NOT_FOUND"
+    with pytest.raises(ApiError) as forbidden:
+        client.get_icon("home", "lucide")
+    assert (forbidden.value.status_code, forbidden.value.code) == (403, "FORBIDDEN")
@@ -0,0 +1,107 @@
+"""Tests for content-encoding negotiation, decoding and request compression."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+
+from svg_api import compression
+from svg_api.compression import (
+    MIN_COMPRESS_SIZE,
+    StreamingDecoder,
+    accept_encoding,
+    compress_body,
+)
+from svg_api.errors import ApiError
+from tests.conftest import batch_body, icon_body, icon_item
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+
+def _decode_in_chunks(encoding: str, body: bytes, size: int = 3) -> bytes:
+    decoder = StreamingDecoder(encoding)
+    chunks = [decoder.decompress(body[i : i + size]) for i in range(0, len(body), size)]
+    return b"".join(chunks) + decoder.flush()
+
+
+class TestAcceptEncoding:
+    def test_without_optional_codecs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(compression, "_brotli", lambda: None)
+        monkeypatch.setattr(compression, "_zstd", lambda: None)
+        assert accept_encoding() == "gzip;q=0.8, deflate;q=0.5"
+
+    def test_with_optional_codecs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(compression, "_brotli", object)
+        monkeypatch.setattr(compression, "_zstd", object)
+        assert accept_encoding() == "br, zstd, gzip;q=0.8, deflate;q=0.5"
+
+
+class TestStreamingDecoder:
+    BODY = json.dumps(icon_body("home")).encode() * 20
+
+    def test_gzip_in_small_chunks(self) -> None:
+        assert _decode_in_chunks("gzip", gzip.compress(self.BODY)) == self.BODY
+
+    @pytest.mark.parametrize("wbits", [zlib.MAX_WBITS, -zlib.MAX_WBITS])
+    def test_zlib_and_raw_deflate(self, wbits: int) -> None:
+        compressor = zlib.compressobj(wbits=wbits)
+        body = compressor.compress(self.BODY) + compressor.flush()
+        assert _decode_in_chunks("deflate", body) == self.BODY
+
+    def test_stacked_encodings_are_undone_in_reverse(self) -> None:
+        body = zlib.compress(gzip.compress(self.BODY))
+        assert _decode_in_chunks("gzip, deflate", body) == self.BODY
+
+    def test_identity(self) -> None:
+        assert _decode_in_chunks("identity", self.BODY) == self.BODY
+
+    def test_unsupported_encoding(self) -> None:
+        with pytest.raises(ApiError) as excinfo:
+            StreamingDecoder("compress")
+        assert excinfo.value.code == "UNSUPPORTED_ENCODING"
+
+
+class TestCompressBody:
+    def test_small_bodies_are_left_alone(self) -> None:
+        body = b"x" * (MIN_COMPRESS_SIZE - 1)
+        assert compress_body(body) == (body, None)
+
+    def test_large_bodies_are_gzipped(self) -> None:
+        body = b"x" * MIN_COMPRESS_SIZE
+        compressed, encoding = compress_body(body)
+        assert encoding == "gzip"
+        assert gzip.decompress(compressed) == body
+
+
+class TestClient:
+    def test_compressed_request_and_response(self, mock_client: Callable[..., SvgApi]) -> None:
+        seen: dict[str, Any] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["encoding"] = request.headers.get("Content-Encoding")
+            seen["accept"] = request.headers.get("Accept-Encoding")
+            icons = json.loads(gzip.decompress(request.content))["icons"]
+            body = json.dumps(
+                batch_body({f"lucide:{i['name']}": icon_item(i["name"]) for i in icons})
+            )
+            return httpx.Response(
+                200, content=gzip.compress(body.encode()), headers={"Content-Encoding": "gzip"}
+            )
+
+        client = mock_client(handler, compress_requests=True)
+        names = [f"icon-{i}" for i in range(50)]
+        response = client.get_batch([{"name": name, "source": "lucide"} for name in names])
+        assert len(response.data) == 50
+        assert seen["encoding"] == "gzip"
+        assert seen["accept"] == accept_encoding()
+        totals = client.stats()["totals"]
+        assert totals["wire_bytes_out"] < totals["bytes_out"]
+        assert totals["wire_bytes_in"] < totals["bytes_in"]
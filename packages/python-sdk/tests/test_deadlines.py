@@ -0,0 +1,109 @@
+"""Tests for end-to-end deadlines."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+from aiohttp import web
+
+from svg_api.async_client import AsyncSvgApi
+from svg_api.deadlines import (
+    attempt_timeout,
+    deadline,
+    expires_at,
+    gather_within_deadline,
+    remaining,
+)
+from svg_api.errors import DeadlineExceededError, NetworkError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from svg_api.client import SvgApi
+
+
+class TestScopes:
+    def test_nested_deadlines_only_shorten(self) -> None:
+        assert expires_at() is None
+        with deadline(10.0):
+            outer = remaining()
+            with deadline(60.0):
+                assert remaining() is not None
+                assert remaining() <= outer  # type: ignore[operator]
+            with deadline(0.5):
+                assert remaining() <= 0.5  # type: ignore[operator]
+        assert remaining() is None
+
+    def test_attempt_timeout_is_clipped(self) -> None:
+        assert attempt_timeout(30.0) == 30.0
+        with deadline(1.0):
+            assert attempt_timeout(30.0) <= 1.0
+        with deadline(-1.0), pytest.raises(DeadlineExceededError):
+            attempt_timeout(30.0)
+
+    async def test_gather_cancels_the_other_chunks(self) -> None:
+        cancelled = asyncio.Event()
+
+        async def slow() -> None:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                cancelled.set()
+
+        async def expired() -> None:
+            raise DeadlineExceededError()
+
+        with pytest.raises(DeadlineExceededError):
+            await gather_within_deadline(slow(), expired())
+        assert cancelled.is_set()
+
+
+def test_deadline_stops_retries(mock_client: Callable[..., SvgApi]) -> None:
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = mock_client(handler, max_retries=10, retry_delay=0.1, cache_size=0)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError) as excinfo:
+        client.get_icon("home", "lucide", deadline=0.5)
+    assert time.monotonic() - start < 0.5
+    # Backoff: 0.1, 0.2, then 0.4 would overrun the deadline.
+    assert attempts == 3
+    assert isinstance(excinfo.value.__cause__, NetworkError)
+
+
+def test_without_a_deadline_every_retry_runs(mock_client: Callable[..., SvgApi]) -> None:
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = mock_client(handler, max_retries=3, cache_size=0)
+    with pytest.raises(NetworkError):
+        client.get_icon("home", "lucide")
+    assert attempts == 4
+
+
+async def test_async_deadline_bounds_a_slow_response(
+    api_server: Callable[..., Awaitable[str]],
+) -> None:
+    async def handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    base_url = await api_server(handler)
+    async with AsyncSvgApi(base_url=base_url, max_retries=5, retry_delay=0) as client:
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            await client.get_icon("home", "lucide", deadline=0.2)
+        assert time.monotonic() - start < 0.8
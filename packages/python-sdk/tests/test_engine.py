@@ -0,0 +1,87 @@
+"""Tests for the asyncio engine behind SvgApi(engine="asyncio")."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from svg_api.client import SvgApi
+from svg_api.errors import DeadlineExceededError, NotFoundError
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from aiohttp import web
+
+
+def _slow(catalogue: FakeCatalogue, delay: float) -> Callable[..., Awaitable[web.Response]]:
+    async def handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return await catalogue.aiohttp_handler(request)
+
+    return handler
+
+
+def test_unknown_engine() -> None:
+    with pytest.raises(ValueError, match="Unknown engine"):
+        SvgApi(engine="processes")  # type: ignore[arg-type]
+
+
+async def test_requests_run_on_the_engine_loop(api_server: Callable[..., Awaitable[str]]) -> None:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg/>"}})
+    base_url = await api_server(catalogue.aiohttp_handler)
+
+    def run() -> None:
+        with SvgApi(base_url=base_url, engine="asyncio", retry_delay=0) as client:
+            assert client.get_icon("home", "lucide").svg == "<svg/>"
+            with pytest.raises(NotFoundError):
+                client.get_icon("gone", "lucide")
+            assert client.get_batch([{"name": "home", "source": "lucide"}]).meta.successful == 1
+            stats = client.stats()
+            assert stats["totals"]["requests"] == 3
+            assert "interactive" in stats["lanes"]["lanes"]
+        assert not any(t.name == "svg-api-engine" for t in threading.enumerate())
+
+    await asyncio.to_thread(run)
+
+
+async def test_identical_gets_in_flight_are_sent_once(
+    api_server: Callable[..., Awaitable[str]],
+) -> None:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg/>"}})
+    base_url = await api_server(_slow(catalogue, 0.2))
+
+    def run() -> int:
+        with SvgApi(base_url=base_url, engine="asyncio", cache_size=0) as client:
+            barrier = threading.Barrier(8)
+
+            def fetch() -> str | None:
+                barrier.wait()
+                return client.get_icon("home", "lucide").svg
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                assert set(executor.map(lambda _: fetch(), range(8))) == {"<svg/>"}
+            return int(client.stats()["coalesced"])
+
+    coalesced = await asyncio.to_thread(run)
+    icon_requests = [path for _, path, _, _ in catalogue.requests if "/icons/home" in path]
+    assert (len(icon_requests), coalesced) == (1, 7)
+
+
+async def test_caller_deadline_applies_on_the_loop(
+    api_server: Callable[..., Awaitable[str]],
+) -> None:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg/>"}})
+    base_url = await api_server(_slow(catalogue, 0.5))
+
+    def run() -> None:
+        client = SvgApi(base_url=base_url, engine="asyncio", cache_size=0)
+        with client, pytest.raises(DeadlineExceededError):
+            client.get_icon("home", "lucide", deadline=0.1)
+
+    await asyncio.wait_for(asyncio.to_thread(run), 2.0)
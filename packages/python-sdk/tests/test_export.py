@@ -0,0 +1,113 @@
+"""Tests for resumable bulk exports."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from svg_api.export import JOURNAL_NAME, ExportJob, ExportProgress, icon_filename
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+NAMES = [f"icon-{i}" for i in range(5)]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _catalogue() -> FakeCatalogue:
+    return FakeCatalogue({"lucide": {name: f"<svg>{name}</svg>" for name in NAMES}})
+
+
+def _job(client: SvgApi, directory: pathlib.Path) -> ExportJob:
+    specs = [{"name": name, "source": "lucide"} for name in NAMES]
+    return ExportJob(client, specs, directory, max_workers=1, chunk_size=2)
+
+
+def _journal(directory: pathlib.Path) -> list[str]:
+    return [line.split("\t")[0] for line in (directory / JOURNAL_NAME).read_text().splitlines()]
+
+
+def test_icon_filename() -> None:
+    spec = {"name": "home", "source": "lucide", "size": 32, "color": "#ff0000"}
+    assert icon_filename(spec) == "home_size-32_color-ff0000.svg"
+
+
+def test_export_writes_every_icon_and_journals_it(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    updates: list[tuple[int, int]] = []
+    result = _job(mock_client(catalogue), tmp_path).run(
+        lambda state: updates.append((state.done, state.total))
+    )
+    assert (result.total, result.fetched, result.verified, result.complete) == (5, 5, 0, True)
+    assert (tmp_path / "lucide" / "icon-3.svg").read_text() == "<svg>icon-3</svg>"
+    assert sorted(_journal(tmp_path)) == [f"lucide:{name}" for name in NAMES]
+    assert updates == [(0, 5), (2, 5), (4, 5), (5, 5)]
+
+
+def test_interrupted_export_resumes_from_the_checkpoint(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    client = mock_client(catalogue)
+
+    def crash_after_first_batch(state: ExportProgress) -> None:
+        if state.done:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        _job(client, tmp_path).run(crash_after_first_batch)
+    assert _journal(tmp_path) == ["lucide:icon-0", "lucide:icon-1"]
+
+    requested = len(catalogue.batches())
+    result = _job(client, tmp_path).run()
+    assert (result.verified, result.fetched, result.complete) == (2, 3, True)
+    assert catalogue.batches()[requested:] == [
+        ["lucide:icon-2", "lucide:icon-3"],
+        ["lucide:icon-4"],
+    ]
+
+
+def test_changed_or_missing_files_are_refetched(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    client = mock_client(catalogue, cache_size=0)
+    _job(client, tmp_path).run()
+    (tmp_path / "lucide" / "icon-0.svg").write_text("<svg>edited</svg>")
+    (tmp_path / "lucide" / "icon-4.svg").unlink()
+
+    requested = len(catalogue.batches())
+    result = _job(client, tmp_path).run()
+    assert (result.verified, result.fetched) == (3, 2)
+    assert catalogue.batches()[requested:] == [["lucide:icon-0", "lucide:icon-4"]]
+    assert (tmp_path / "lucide" / "icon-0.svg").read_text() == "<svg>icon-0</svg>"
+    # Superseded journal lines are compacted away.
+    assert sorted(_journal(tmp_path)) == [f"lucide:{name}" for name in NAMES]
+
+
+def test_failed_icons_are_retried_by_the_next_run(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    catalogue.fail = {"lucide:icon-2"}
+    client = mock_client(catalogue, max_retries=0)
+    result = _job(client, tmp_path).run()
+    assert list(result.failed) == ["lucide:icon-2"]
+    assert not result.complete
+    assert "lucide:icon-2" not in _journal(tmp_path)
+
+    catalogue.fail.clear()
+    requested = len(catalogue.batches())
+    result = _job(client, tmp_path).run()
+    assert (result.verified, result.fetched, result.complete) == (4, 1, True)
+    assert catalogue.batches()[requested:] == [["lucide:icon-2"]]
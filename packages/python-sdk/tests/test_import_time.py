@@ -0,0 +1,85 @@
+"""Startup cost of importing the package, measured in fresh interpreters."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Seconds "import svg_api" may take; it only loads the error classes.
+IMPORT_BUDGET = 0.05
+RUNS = 3
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run(code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=PACKAGE_ROOT,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_within_budget() -> None:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import svg_api\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+    runs = [run(code) for _ in range(RUNS)]
+    best = min(result["elapsed"] for result in runs)
+    assert best < IMPORT_BUDGET, f"import svg_api took {best * 1000:.1f} ms"
+    loaded = set(runs[0]["modules"])
+    assert not loaded & {"httpx", "aiohttp", "pydantic", "svg_api.types"}
+
+
+def test_sync_client_import_is_lazy() -> None:
+    code = (
+        "import json, sys\n"
+        "from pydantic import BaseModel\n"
+        "from svg_api import SvgApi\n"
+        "import svg_api.types as types\n"
+        "built = sorted(\n"
+        "    name for name, value in vars(types).items()\n"
+        "    if isinstance(value, type) and issubclass(value, BaseModel)\n"
+        "    and value.__module__ == types.__name__ and value.__pydantic_complete__\n"
+        ")\n"
+        "print(json.dumps({'aiohttp': 'aiohttp' in sys.modules, 'built': built}))\n"
+    )
+    result = run(code)
+    assert result == {"aiohttp": False, "built": []}
+
+
+def test_async_client_loads_on_access() -> None:
+    code = (
+        "import json, sys\n"
+        "import svg_api\n"
+        "before = 'aiohttp' in sys.modules\n"
+        "svg_api.AsyncSvgApi\n"
+        "print(json.dumps({'before': before, 'after': 'aiohttp' in sys.modules}))\n"
+    )
+    assert run(code) == {"before": False, "after": True}
+
+
+def test_client_module_keeps_a_deprecated_async_alias() -> None:
+    code = (
+        "import json, sys, warnings\n"
+        "import svg_api.client\n"
+        "loaded = 'aiohttp' in sys.modules\n"
+        "with warnings.catch_warnings(record=True) as caught:\n"
+        "    warnings.simplefilter('always')\n"
+        "    from svg_api.client import AsyncSvgApi\n"
+        "from svg_api.async_client import AsyncSvgApi as current\n"
+        "print(json.dumps({\n"
+        "    'loaded': loaded,\n"
+        "    'same': AsyncSvgApi is current,\n"
+        "    'warnings': [w.category.__name__ for w in caught],\n"
+        "}))\n"
+    )
+    result = run(code)
+    assert result == {"loaded": False, "same": True, "warnings": ["DeprecationWarning"]}
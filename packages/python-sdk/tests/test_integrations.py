@@ -0,0 +1,152 @@
+"""Tests for the template integrations (skipped when the framework is missing)."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from svg_api.render import IconRenderer
+from tests.conftest import BASE_URL, FakeCatalogue
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from svg_api.client import SvgApi
+
+TEMPLATES = {
+    "base.html": "<body>{% block content %}{% endblock %}{{ icon('lucide:home') }}</body>",
+    "page.html": (
+        "{% extends 'base.html' %}{% block content %}"
+        "{{ icon('star', class_='h-4') }}{% include 'footer.html' %}"
+        "{{ icon(name) }}{% endblock %}"
+    ),
+    "footer.html": "{{ icon('sun', size=16) }}",
+}
+
+
+def _catalogue() -> FakeCatalogue:
+    return FakeCatalogue(
+        {"lucide": {name: f"<svg>{name}</svg>" for name in ("home", "star", "sun", "moon")}}
+    )
+
+
+class TestJinja2:
+    @pytest.fixture
+    def environment(self, mock_client: Callable[..., SvgApi]) -> Any:
+        jinja2 = pytest.importorskip("jinja2")
+        from svg_api.integrations.jinja2 import IconExtension
+
+        self.catalogue = _catalogue()
+        env = jinja2.Environment(
+            loader=jinja2.DictLoader(TEMPLATES), extensions=[IconExtension], autoescape=True
+        )
+        env.svg_api_renderer = IconRenderer(mock_client(self.catalogue), source="lucide")
+        return env
+
+    def test_render_fetches_the_page_in_one_batch(self, environment: Any) -> None:
+        html = environment.get_template("page.html").render(name="moon")
+        assert html == (
+            '<body><svg aria-hidden="true" focusable="false" class="h-4">star</svg>'
+            '<svg aria-hidden="true" focusable="false">sun</svg>'
+            '<svg aria-hidden="true" focusable="false">moon</svg>'
+            '<svg aria-hidden="true" focusable="false">home</svg></body>'
+        )
+        assert len(self.catalogue.batches()) == 1
+        assert sorted(self.catalogue.batches()[0]) == [
+            "lucide:home",
+            "lucide:moon",
+            "lucide:star",
+            "lucide:sun",
+        ]
+
+    async def test_render_async(self, mock_client: Callable[..., SvgApi]) -> None:
+        jinja2 = pytest.importorskip("jinja2")
+        from svg_api.integrations.jinja2 import IconExtension
+
+        catalogue = _catalogue()
+        env = jinja2.Environment(
+            loader=jinja2.DictLoader(TEMPLATES), extensions=[IconExtension], enable_async=True
+        )
+        env.svg_api_renderer = IconRenderer(mock_client(catalogue), source="lucide")
+        html = await env.get_template("page.html").render_async(name="moon")
+        assert '<svg aria-hidden="true" focusable="false">moon</svg>' in html
+        assert len(catalogue.batches()) == 1
+
+    def test_template_icons_follows_includes_and_extends(self, environment: Any) -> None:
+        from svg_api.integrations.jinja2 import template_icons
+
+        assert template_icons(environment, "page.html") == [
+            {"name": "star", "source": "lucide"},
+            {"name": "home", "source": "lucide"},
+            {"name": "sun", "source": "lucide", "size": 16},
+        ]
+
+    async def test_fastapi_prefetch(self, environment: Any) -> None:
+        from svg_api.integrations.fastapi import IconPrefetch
+
+        renderer = environment.svg_api_renderer
+        prefetch = IconPrefetch(renderer, "page.html", icons=["moon"], environment=environment)
+        assert await prefetch() is renderer
+        assert sorted(self.catalogue.batches()[0]) == [
+            "lucide:home",
+            "lucide:moon",
+            "lucide:star",
+            "lucide:sun",
+        ]
+        environment.get_template("page.html").render(name="moon")
+        assert len(self.catalogue.batches()) == 1
+
+    def test_prefetch_needs_the_environment(self, environment: Any) -> None:
+        from svg_api.integrations.fastapi import IconPrefetch
+
+        with pytest.raises(ValueError, match="Jinja2 environment"):
+            IconPrefetch(environment.svg_api_renderer, "page.html")
+
+
+class TestDjango:
+    @pytest.fixture
+    def django_settings(self, mock_client: Callable[..., SvgApi]) -> Iterator[FakeCatalogue]:
+        pytest.importorskip("django")
+        import django
+        from django.conf import settings
+
+        from svg_api.integrations.django import get_renderer
+
+        catalogue = _catalogue()
+        mock_client(catalogue)  # installs the transport for the renderer's client
+        options = {"client": {"base_url": BASE_URL, "retry_delay": 0}, "source": "lucide"}
+        if not settings.configured:
+            settings.configure(
+                INSTALLED_APPS=["svg_api.integrations.django"],
+                TEMPLATES=[{"BACKEND": "django.template.backends.django.DjangoTemplates"}],
+            )
+            django.setup()
+        settings.SVG_API = options
+        get_renderer.cache_clear()
+        yield catalogue
+        get_renderer().client.close()
+        get_renderer.cache_clear()
+
+    def test_middleware_fills_in_the_page(self, django_settings: FakeCatalogue) -> None:
+        from django.http import HttpRequest, HttpResponse
+        from django.template import engines
+
+        from svg_api.integrations.django import IconMiddleware
+
+        template = engines["django"].from_string(
+            '{% load svg_api %}<p>{% icon "home" class="x" %}{% icon "lucide:star" %}</p>'
+        )
+
+        def view(request: HttpRequest) -> HttpResponse:
+            response = HttpResponse(template.render({}))
+            response["Content-Length"] = "0"  # stale; the middleware must update it
+            return response
+
+        response = IconMiddleware(view)(HttpRequest())
+        assert response.content.decode() == (
+            '<p><svg aria-hidden="true" focusable="false" class="x">home</svg>'
+            '<svg aria-hidden="true" focusable="false">star</svg></p>'
+        )
+        assert response["Content-Length"] == str(len(response.content))
+        assert django_settings.batches() == [["lucide:home", "lucide:star"]]
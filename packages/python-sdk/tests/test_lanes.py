@@ -0,0 +1,137 @@
+"""Tests for priority lanes."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from svg_api.async_client import AsyncSvgApi, AsyncSvgApiConfig
+from svg_api.deadlines import deadline
+from svg_api.errors import DeadlineExceededError
+from svg_api.lanes import BULK, INTERACTIVE, Lane, LaneScheduler, current_lane, priority
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from aiohttp import web
+
+
+async def _queue(scheduler: LaneScheduler, name: str) -> asyncio.Task[Lane]:
+    """Start acquiring a slot and let the request reach its queue."""
+    task = asyncio.create_task(scheduler.acquire(name))
+    await asyncio.sleep(0)
+    return task
+
+
+def test_priority_follows_the_innermost_block() -> None:
+    assert current_lane() == INTERACTIVE
+    with priority(BULK):
+        assert current_lane() == BULK
+        with priority(INTERACTIVE, override=False):
+            assert current_lane() == BULK
+        with priority(INTERACTIVE):
+            assert current_lane() == INTERACTIVE
+    assert current_lane(BULK) == BULK
+
+
+def test_slots_leave_room_beyond_the_reservations() -> None:
+    assert LaneScheduler(1).slots == 3
+    with pytest.raises(ValueError, match="Unknown priority lane"):
+        LaneScheduler(4).lane("batch")
+    with pytest.raises(ValueError, match="weight"):
+        Lane("x", weight=0)
+
+
+async def test_reserved_slots_are_kept_for_their_lane() -> None:
+    scheduler = LaneScheduler(4)
+    bulk = [await scheduler.acquire(BULK) for _ in range(2)]
+    waiting = await _queue(scheduler, BULK)
+    assert not waiting.done()
+
+    # Both reserved slots are free for interactive requests despite the bulk queue.
+    interactive = [await scheduler.acquire(INTERACTIVE) for _ in range(2)]
+    snapshot = scheduler.snapshot()
+    assert snapshot["in_flight"] == 4
+    assert snapshot["lanes"][BULK]["queued"] == 1
+
+    scheduler.release(interactive[0])
+    await asyncio.sleep(0)
+    assert not waiting.done()  # a freed reserved slot stays with interactive
+    scheduler.release(bulk[0])
+    assert (await waiting).name == BULK
+
+
+async def test_contended_slots_follow_the_weights() -> None:
+    scheduler = LaneScheduler(1, [Lane(INTERACTIVE, weight=3.0), Lane(BULK)])
+    held = [await scheduler.acquire(BULK) for _ in range(scheduler.slots)]
+    order: list[str] = []
+
+    async def request(name: str) -> None:
+        lane = await scheduler.acquire(name)
+        order.append(name)
+        await asyncio.sleep(0)
+        scheduler.release(lane)
+
+    tasks = [asyncio.create_task(request(BULK)) for _ in range(4)]
+    tasks += [asyncio.create_task(request(INTERACTIVE)) for _ in range(12)]
+    await asyncio.sleep(0)
+    for lane in held:
+        scheduler.release(lane)
+    await asyncio.gather(*tasks)
+    # Three interactive admissions per bulk one; the slot bulk already held
+    # counts as its first share, so interactive goes first.
+    i, b = INTERACTIVE, BULK
+    assert order == [i, i, i, i, b, i, i, i, b, i, i, i, b, i, i, b]
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+async def test_deadline_expires_while_queued() -> None:
+    scheduler = LaneScheduler(1, [Lane(BULK)])
+    held = await scheduler.acquire(BULK)
+    with deadline(0.01), pytest.raises(DeadlineExceededError):
+        await scheduler.acquire(BULK)
+    assert scheduler.snapshot()["lanes"][BULK]["queued"] == 0
+    scheduler.release(held)
+    assert (await scheduler.acquire(BULK)).name == BULK
+
+
+async def test_slot_handed_to_a_cancelled_request_is_passed_on() -> None:
+    scheduler = LaneScheduler(1, [Lane(BULK)])
+    held = await scheduler.acquire(BULK)
+    cancelled = await _queue(scheduler, BULK)
+    waiting = await _queue(scheduler, BULK)
+    scheduler.release(held)  # hands the slot to the first waiter...
+    cancelled.cancel()  # ...which is cancelled before it runs
+    assert (await waiting).name == BULK
+    assert scheduler.snapshot()["in_flight"] == 1
+
+
+async def test_interactive_calls_overtake_a_bulk_backlog(
+    api_server: Callable[..., Awaitable[str]],
+) -> None:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg/>"}})
+    release = asyncio.Event()
+
+    async def handler(request: web.Request) -> web.Response:
+        if request.path.endswith("/icons/batch"):
+            await release.wait()
+        return await catalogue.aiohttp_handler(request)
+
+    base_url = await api_server(handler)
+    async with AsyncSvgApi(config=AsyncSvgApiConfig(base_url, max_in_flight=3)) as client:
+        with priority(BULK):
+            bulk = [
+                asyncio.create_task(client.get_batch([{"name": "home", "source": "lucide"}]))
+                for _ in range(3)
+            ]
+        await asyncio.sleep(0.1)
+        lanes = client.stats()["lanes"]["lanes"]
+        assert (lanes[BULK]["in_flight"], lanes[BULK]["queued"]) == (1, 2)
+
+        icon = await asyncio.wait_for(client.get_icon("home", "lucide"), 2.0)
+        assert icon.svg == "<svg/>"
+        release.set()
+        await asyncio.gather(*bulk)
@@ -0,0 +1,168 @@
+"""Tests for the adaptive concurrency limiter and the client's use of it."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+from aiohttp import web
+
+from svg_api.async_client import AsyncSvgApi
+from svg_api.errors import (
+    RateLimitError,
+    ServiceUnavailableError,
+    TimeoutError,
+)
+from svg_api.limiter import AdaptiveLimiter
+from tests.conftest import BASE_URL, batch_body, error_body, icon_item
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from svg_api.client import SvgApi
+
+
+def _failing(error: Exception) -> tuple[Callable[[], None], list[int]]:
+    calls: list[int] = []
+
+    def func() -> None:
+        calls.append(1)
+        raise error
+
+    return func, calls
+
+
+class TestAimd:
+    def test_rate_limit_halves_the_limit(self) -> None:
+        limiter = AdaptiveLimiter(initial_limit=8, overload_retries=0)
+        func, _ = _failing(RateLimitError("slow down", status_code=429))
+        with pytest.raises(RateLimitError):
+            limiter.call(func)
+        assert limiter.limit == 4
+        assert limiter.snapshot()["overloads"] == 1
+
+    def test_limit_never_drops_below_min_limit(self) -> None:
+        limiter = AdaptiveLimiter(initial_limit=2, min_limit=2, overload_retries=0)
+        func, _ = _failing(RateLimitError("slow down", status_code=429))
+        for _ in range(3):
+            with pytest.raises(RateLimitError):
+                limiter.call(func)
+        assert limiter.limit == 2
+
+    def test_successes_grow_the_limit_while_it_is_used(self) -> None:
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=4, tolerance=1e9)
+        for _ in range(10):
+            limiter.call(lambda: None)
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+
+    def test_unused_limit_does_not_grow(self) -> None:
+        limiter = AdaptiveLimiter(initial_limit=8, max_limit=16, tolerance=1e9)
+        for _ in range(50):
+            limiter.call(lambda: None)
+        assert limiter.limit == 8
+
+    def test_other_errors_do_not_lower_the_limit(self) -> None:
+        limiter = AdaptiveLimiter(initial_limit=8)
+        func, calls = _failing(ValueError("bad"))
+        with pytest.raises(ValueError):
+            limiter.call(func)
+        assert limiter.limit == 8
+        assert len(calls) == 1
+
+
+class TestRetryErrors:
+    def test_retries_listed_errors(self) -> None:
+        limiter = AdaptiveLimiter(overload_retries=2, retry_delay=0)
+        func, calls = _failing(RateLimitError("slow down", status_code=429))
+        with pytest.raises(RateLimitError):
+            limiter.call(func)
+        assert len(calls) == 3
+
+    def test_does_not_retry_unlisted_overload_errors(self) -> None:
+        limiter = AdaptiveLimiter(initial_limit=8, retry_errors=[RateLimitError], retry_delay=0)
+        func, calls = _failing(TimeoutError("timed out"))
+        with pytest.raises(TimeoutError):
+            limiter.call(func)
+        assert len(calls) == 1
+        # Still an overload signal.
+        assert limiter.limit == 4
+
+    async def test_acall_does_not_retry_unlisted_overload_errors(self) -> None:
+        limiter = AdaptiveLimiter(retry_errors=[RateLimitError], retry_delay=0)
+        calls: list[int] = []
+
+        async def func() -> None:
+            calls.append(1)
+            raise TimeoutError("timed out")
+
+        with pytest.raises(TimeoutError):
+            await limiter.acall(func)
+        assert len(calls) == 1
+
+    def test_client_limiter_leaves_client_retries_alone(
+        self, mock_client: Callable[..., SvgApi]
+    ) -> None:
+        handler = lambda *_: httpx.Response(200)  # noqa: E731
+        client = mock_client(handler)
+        assert client.limiter.retry_errors == (RateLimitError, ServiceUnavailableError)
+        # With mirrors the client fails a 503 over itself.
+        mirrored = mock_client(handler, base_urls=[BASE_URL, "https://mirror.test/v1"])
+        assert mirrored.limiter.retry_errors == (RateLimitError,)
+
+    def test_timeout_is_attempted_once_per_client_retry(
+        self, mock_client: Callable[..., SvgApi]
+    ) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        client = mock_client(handler, max_retries=2)
+        with pytest.raises(TimeoutError):
+            client.limiter.call(client.get_icon, "home", "lucide")
+        assert len(requests) == 3
+
+    def test_rate_limit_is_retried_by_the_limiter(self, mock_client: Callable[..., SvgApi]) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                429, json=error_body("RATE_LIMITED"), headers={"Retry-After": "0"}
+            )
+
+        client = mock_client(handler, max_retries=2)
+        client.limiter.retry_delay = 0
+        with pytest.raises(RateLimitError):
+            client.limiter.call(client.get_icon, "home", "lucide")
+        assert len(requests) == client.limiter.overload_retries + 1
+
+
+async def test_get_batch_optimized_returns_icons(
+    api_server: Callable[..., Awaitable[str]],
+) -> None:
+    batches: list[list[dict[str, Any]]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        icons = (await request.json())["icons"]
+        batches.append(icons)
+        return web.Response(
+            text=json.dumps(
+                batch_body({f"lucide:{i['name']}": icon_item(i["name"]) for i in icons})
+            ),
+            content_type="application/json",
+        )
+
+    base_url = await api_server(handler)
+    names = [f"icon-{i}" for i in range(5)]
+    async with AsyncSvgApi(base_url=base_url) as client:
+        icons = await client.get_batch_optimized(
+            [{"name": name, "source": "lucide"} for name in names], chunk_size=2
+        )
+    assert sorted(icon.name for icon in icons) == names
+    assert all(icon.source == "lucide" and icon.svg for icon in icons)
+    assert sorted(len(batch) for batch in batches) == [1, 2, 2]
@@ -0,0 +1,118 @@
+"""Tests for the catalogue metadata snapshot."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from svg_api.errors import ApiError
+from svg_api.metadata import catalogue_version
+from tests.conftest import FakeCatalogue, error_body
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+CATEGORIES = [
+    {"id": "arrows", "name": "Arrows", "icon_count": 3, "sources": ["lucide", "feather"]},
+    {"id": "weather", "name": "Weather", "icon_count": 1, "sources": ["lucide"]},
+]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the metadata cache's monotonic clock with one advanced by hand."""
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    fake.time = lambda: fake.now
+    monkeypatch.setattr("svg_api.metadata.time", fake)
+    return fake
+
+
+class Server:
+    """FakeCatalogue with categories and a switch to fail every request."""
+
+    def __init__(self) -> None:
+        self.catalogue = FakeCatalogue(
+            {"lucide": {"home": "<svg/>", "sun": "<svg/>"}, "feather": {"home": "<svg/>"}}
+        )
+        self.down = False
+
+    def paths(self) -> list[str]:
+        return [path.split("/v1", 1)[-1] for _, path, _, _ in self.catalogue.requests]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.down:
+            return httpx.Response(500, json=error_body("INTERNAL_ERROR"))
+        if request.url.path.endswith("/categories"):
+            self.catalogue.requests.append(("GET", request.url.path, {}, None))
+            return httpx.Response(200, json={"data": CATEGORIES, "meta": {}})
+        return self.catalogue(request)
+
+
+def test_catalogue_version_ignores_meta() -> None:
+    first = catalogue_version({"data": {"lucide": "1"}, "meta": {"request_id": "a"}})
+    assert first == catalogue_version({"data": {"lucide": "1"}, "meta": {"request_id": "b"}})
+    assert first != catalogue_version({"data": {"lucide": "2"}})
+
+
+def test_snapshot_lookup_maps(mock_client: Callable[..., SvgApi]) -> None:
+    snapshot = mock_client(Server()).metadata()
+    assert snapshot.icon_counts == {"lucide": 2, "feather": 1}
+    assert snapshot.total_icons == 3
+    assert snapshot.source("lucide").name == "Lucide"  # type: ignore[union-attr]
+    assert snapshot.source("heroicons") is None
+    assert [c.id for c in snapshot.categories_by_source["lucide"]] == ["arrows", "weather"]
+    assert [c.id for c in snapshot.categories_by_source["feather"]] == ["arrows"]
+
+
+def test_snapshot_is_revalidated_after_the_ttl(
+    mock_client: Callable[..., SvgApi], clock: SimpleNamespace
+) -> None:
+    server = Server()
+    client = mock_client(server, metadata_ttl=60.0)
+    first = client.get_sources()
+    client.get_categories()
+    assert server.paths() == ["/version", "/sources", "/categories"]
+
+    clock.now += 60.0
+    assert client.get_sources() is first  # unchanged version: no refetch
+    assert server.paths()[3:] == ["/version"]
+
+    server.catalogue.versions["lucide"] = "2"
+    clock.now += 60.0
+    assert client.get_sources() is not first
+    assert server.paths()[4:] == ["/version", "/sources", "/categories"]
+
+
+def test_stale_snapshot_is_served_when_the_check_fails(
+    mock_client: Callable[..., SvgApi], clock: SimpleNamespace
+) -> None:
+    server = Server()
+    client = mock_client(server, metadata_ttl=60.0, max_retries=0)
+    snapshot = client.metadata()
+    server.down = True
+    clock.now += 60.0
+    assert client.metadata() is snapshot
+    with pytest.raises(ApiError):
+        client.metadata(refresh=True)
+
+
+def test_zero_ttl_always_fetches(mock_client: Callable[..., SvgApi]) -> None:
+    server = Server()
+    client = mock_client(server, metadata_ttl=0)
+    client.get_sources()
+    client.get_sources()
+    assert server.paths() == ["/sources", "/sources"]
+
+
+def test_filtered_categories_are_cached_per_snapshot(mock_client: Callable[..., SvgApi]) -> None:
+    server = Server()
+    client = mock_client(server)
+    client.get_categories(source="lucide")
+    client.get_categories(source="lucide")
+    assert server.paths().count("/categories") == 2  # snapshot load plus one filtered fetch
@@ -0,0 +1,113 @@
+"""Tests for the name index and the negative cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from svg_api.errors import NotFoundError
+from svg_api.names import NameFilter, NameIndex
+from svg_api.types import BatchError
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+NOT_FOUND = BatchError(code="ICON_NOT_FOUND", message="not found")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the cache's monotonic clock with one advanced by hand."""
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr("svg_api.cache.time", fake)
+    return fake
+
+
+def _requests(catalogue: FakeCatalogue, name: str) -> int:
+    return sum(1 for _, path, _, _ in catalogue.requests if path.endswith(f"/icons/{name}"))
+
+
+class TestNameIndex:
+    def test_membership_and_error_rate(self) -> None:
+        keys = [f"lucide:icon-{i}" for i in range(2000)]
+        index = NameIndex.build(keys, error_rate=0.01)
+        assert all(index.might_exist("lucide", f"icon-{i}") for i in range(2000))
+        false_positives = sum(index.might_exist("lucide", f"other-{i}") for i in range(10000))
+        assert false_positives < 200
+        assert index.might_exist("heroicons", "anything")
+
+    def test_save_and_load(self, tmp_path: pathlib.Path) -> None:
+        index = NameIndex.build(["lucide:home", "lucide:star"])
+        index.save(tmp_path / "names.idx")
+        loaded = NameIndex.load(tmp_path / "names.idx")
+        assert (loaded.count, loaded.sources) == (2, frozenset({"lucide"}))
+        assert loaded.might_exist("lucide", "home")
+        assert not loaded.might_exist("lucide", "hoem")
+
+    def test_load_rejects_other_files(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / "names.idx").write_bytes(b"not an index")
+        with pytest.raises(ValueError, match="not a name index"):
+            NameIndex.load(tmp_path / "names.idx")
+
+
+class TestNameFilter:
+    def test_not_found_is_remembered_for_the_ttl(self, clock: SimpleNamespace) -> None:
+        names = NameFilter(ttl=60.0)
+        names.remember("lucide", "gone", NOT_FOUND)
+        assert names.check("lucide", "gone") == NOT_FOUND
+        clock.now += 59.0
+        assert names.check("lucide", "gone") is not None
+        clock.now += 1.0
+        assert names.check("lucide", "gone") is None
+
+    def test_other_errors_are_not_remembered(self) -> None:
+        names = NameFilter()
+        names.remember("lucide", "home", BatchError(code="INTERNAL_ERROR", message="oops"))
+        assert names.check("lucide", "home") is None
+
+    def test_zero_ttl_disables_the_cache(self) -> None:
+        names = NameFilter(ttl=0)
+        names.remember("lucide", "gone", NOT_FOUND)
+        assert names.check("lucide", "gone") is None
+
+
+def test_client_answers_repeated_404s_locally_until_the_ttl_expires(
+    mock_client: Callable[..., SvgApi], clock: SimpleNamespace
+) -> None:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg/>"}})
+    client = mock_client(catalogue, negative_cache_ttl=30.0)
+    with pytest.raises(NotFoundError):
+        client.get_icon("gone", "lucide")
+    with pytest.raises(NotFoundError) as excinfo:
+        client.get_icon("gone", "lucide")
+    assert excinfo.value.details == {"local": True}
+    assert _requests(catalogue, "gone") == 1
+
+    clock.now += 30.0
+    catalogue.sources["lucide"]["gone"] = "<svg/>"
+    assert client.get_icon("gone", "lucide").svg == "<svg/>"
+    assert _requests(catalogue, "gone") == 2
+
+
+def test_batches_skip_names_known_to_be_missing(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = FakeCatalogue({"lucide": {"home": "<svg/>"}})
+    index = NameIndex.build(["lucide:home", "lucide:star"])
+    client = mock_client(catalogue, name_index=index, cache_size=0)
+    response = client.get_batch(
+        [
+            {"name": "home", "source": "lucide"},
+            {"name": "hoem", "source": "lucide"},
+            {"name": "x", "source": "heroicons"},
+        ]
+    )
+    assert catalogue.batches() == [["lucide:home", "heroicons:x"]]
+    assert response.data["lucide:hoem"].success is False
+    assert response.errors["lucide:hoem"].code == "ICON_NOT_FOUND"
+    assert set(response.data) == {"lucide:home", "lucide:hoem"}
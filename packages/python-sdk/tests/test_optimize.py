@@ -0,0 +1,71 @@
+"""Tests for the SVG optimizer."""
+
+import pytest
+
+from svg_api.optimize import SvgOptimizer
+
+
+def path(d: str) -> str:
+    return f'<svg viewBox="0 0 24 24"><path d="{d}"/></svg>'
+
+
+@pytest.mark.parametrize(
+    ("d", "expected"),
+    [
+        # A rounded number must not merge with the number before it.
+        ("M1.5.0001 2 3", "M1.5 0 2 3"),
+        ("M10.5-.0001z", "M10.5 0z"),
+        ("l.9999.5", "l1 0.5"),
+        ("M1.23456-2.5e-3.5", "M1.235-0.003 0.5"),
+        ("M1.5.5", "M1.5 0.5"),
+        ("M1.23456.5", "M1.235 0.5"),
+        # Separators that are still needed are kept as written.
+        ("M1.5,2.25L3.125 4", "M1.5,2.25L3.125 4"),
+        ("m3 9 9-7 9 7v11a2 2 0 0 1-2 2H5z", "m3 9 9-7 9 7v11a2 2 0 0 1-2 2H5z"),
+        # Packed arc flags are not read as one number.
+        ("a1 1 0 011.5.5", "a1 1 0 011.5 0.5"),
+    ],
+)
+def test_rounding_keeps_numbers_apart(d: str, expected: str) -> None:
+    assert SvgOptimizer().optimize(path(d)) == path(expected)
+
+
+def test_rounds_points_transform_and_view_box() -> None:
+    svg = (
+        '<svg viewBox="0 0 24.00001 24"><polyline points="1.11111,2.22222 3.33333.44444"/>'
+        '<g transform="translate(1.00049 -0.00001)"><path d="M0 0"/></g></svg>'
+    )
+    assert SvgOptimizer().optimize(svg) == (
+        '<svg viewBox="0 0 24 24"><polyline points="1.111,2.222 3.333 0.444"/>'
+        '<g transform="translate(1 0)"><path d="M0 0"/></g></svg>'
+    )
+
+
+def test_precision_none_leaves_numbers_untouched() -> None:
+    svg = path("M1.5.0001 2 3")
+    assert SvgOptimizer(precision=None).optimize(svg) == svg
+
+
+def test_strips_comments_metadata_and_empty_groups() -> None:
+    svg = (
+        '<?xml version="1.0"?><!-- drawn by hand --><svg inkscape:version="1.0">'
+        '<metadata><rdf/></metadata><g><g>  <path d="M0 0"/></g></g></svg>'
+    )
+    assert SvgOptimizer().optimize(svg) == '<svg><path d="M0 0"/></svg>'
+
+
+def test_shorten_ids_rewrites_references() -> None:
+    svg = (
+        '<svg><linearGradient id="gradient-one"/><path fill="url(#gradient-one)"/>'
+        '<use href="#gradient-one"/></svg>'
+    )
+    optimized = SvgOptimizer(shorten_ids=True, id_prefix="i-").optimize(svg)
+    assert optimized == (
+        '<svg><linearGradient id="i-a"/><path fill="url(#i-a)"/><use href="#i-a"/></svg>'
+    )
+
+
+def test_is_idempotent() -> None:
+    optimizer = SvgOptimizer()
+    svg = path("M1.23456 7.891011c.5.5 1 1 1.5 1.5")
+    assert optimizer.optimize(svg) == optimizer.optimize(optimizer.optimize(svg))
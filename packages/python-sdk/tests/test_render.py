@@ -0,0 +1,84 @@
+"""Tests for server-side icon rendering."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from svg_api.render import IconRenderer, html_attrs
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+
+
+def _catalogue() -> FakeCatalogue:
+    return FakeCatalogue(
+        {
+            "lucide": {
+                "home": '<svg viewBox="0 0 24 24"><path d="M1 1"/></svg>',
+                "star": '<svg viewBox="0 0 24 24"><path d="M2 2"/></svg>',
+            }
+        }
+    )
+
+
+def test_html_attrs() -> None:
+    assert html_attrs({"class_": "icon", "aria_label": "<Home>", "hidden": False}) == (
+        ' class="icon" aria-label="&lt;Home&gt;"'
+    )
+    assert html_attrs({"data_x": True, "title": None}) == " data-x"
+
+
+def test_unknown_mode() -> None:
+    with pytest.raises(ValueError, match="Unknown render mode"):
+        IconRenderer(None, mode="png")  # type: ignore[arg-type]
+
+
+def test_page_fetches_its_icons_in_one_batch(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    renderer = IconRenderer(mock_client(catalogue), source="lucide")
+
+    def render() -> str:
+        with renderer.page() as page:
+            markup = (
+                f"<nav>{renderer.icon('home', class_='h-4')}"
+                f"{renderer.icon('lucide:star', aria_label='Star')}"
+                f"{renderer.icon('gone')}</nav>"
+            )
+            return page.finish(markup)
+
+    html = render()
+    assert catalogue.batches() == [["lucide:home", "lucide:star", "lucide:gone"]]
+    assert html == (
+        '<nav><svg aria-hidden="true" focusable="false" class="h-4" viewBox="0 0 24 24">'
+        '<path d="M1 1"/></svg>'
+        '<svg role="img" aria-label="Star" viewBox="0 0 24 24"><path d="M2 2"/></svg></nav>'
+    )
+    # Everything, including the missing icon, is cached for the next render.
+    requests = len(catalogue.requests)
+    assert render() == html
+    assert len(catalogue.requests) == requests
+
+
+def test_sprite_mode(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    renderer = IconRenderer(mock_client(catalogue), source="lucide", mode="sprite")
+    with renderer.page() as page:
+        markup = f"{renderer.sprite()}{renderer.icon('home', size=16)}{renderer.icon('star')}"
+        html = page.finish(markup)
+    assert catalogue.batches() == [["lucide:home", "lucide:star"]]
+    assert html.count("<symbol ") == 2
+    assert '<symbol id="lucide-home" viewBox="0 0 24 24">' in html
+    assert '<svg width="16" height="16" aria-hidden="true" focusable="false">' in html
+    assert '<use href="#lucide-star"/>' in html
+
+
+def test_icon_outside_a_page_is_fetched_on_the_spot(mock_client: Callable[..., SvgApi]) -> None:
+    renderer = IconRenderer(mock_client(_catalogue()), source="lucide")
+    assert 'd="M1 1"' in renderer.icon("home")
+    with pytest.raises(RuntimeError, match="inside IconRenderer.page"):
+        renderer.sprite()
@@ -0,0 +1,95 @@
+"""Tests for multi-source icon resolution."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from svg_api.async_client import AsyncSvgApi
+from svg_api.errors import NotFoundError, SvgApiError
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from svg_api.client import SvgApi
+
+SOURCES = ["heroicons", "lucide", "feather"]
+
+
+def _catalogue() -> FakeCatalogue:
+    return FakeCatalogue(
+        {
+            "heroicons": {"star": "<svg>hero-star</svg>"},
+            "lucide": {"home": "<svg>lucide-home</svg>", "star": "<svg>lucide-star</svg>"},
+            "feather": {"home": "<svg>feather-home</svg>"},
+        }
+    )
+
+
+def test_most_preferred_source_wins(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    client = mock_client(catalogue)
+    icon = client.resolve_icon("home", SOURCES)
+    assert (icon.source, icon.svg) == ("lucide", "<svg>lucide-home</svg>")
+    assert catalogue.batches() == [["heroicons:home", "lucide:home", "feather:home"]]
+
+    requests = len(catalogue.requests)
+    assert client.resolve_icon("home", SOURCES).source == "lucide"
+    assert len(catalogue.requests) == requests
+
+
+def test_resolution_depends_on_the_order_of_sources(mock_client: Callable[..., SvgApi]) -> None:
+    client = mock_client(_catalogue())
+    assert client.resolve_icon("star", SOURCES).source == "heroicons"
+    assert client.resolve_icon("star", ["lucide", "heroicons"]).source == "lucide"
+
+
+def test_misses_are_cached(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    client = mock_client(catalogue)
+    with pytest.raises(NotFoundError) as first:
+        client.resolve_icon("gone", SOURCES)
+    assert first.value.details == {"sources": SOURCES}
+    requests = len(catalogue.requests)
+    with pytest.raises(NotFoundError) as second:
+        client.resolve_icon("gone", SOURCES)
+    assert second.value.details == {"sources": SOURCES, "local": True}
+    assert len(catalogue.requests) == requests
+
+
+def test_failed_preferred_source_is_not_cached(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    catalogue.fail = {"heroicons:home"}
+    client = mock_client(catalogue, max_retries=0)
+    assert client.resolve_icon("home", SOURCES).source == "lucide"
+
+    catalogue.fail.clear()
+    catalogue.sources["heroicons"]["home"] = "<svg>hero-home</svg>"
+    assert client.resolve_icon("home", SOURCES).source == "heroicons"
+
+
+def test_failure_without_a_hit_is_raised(mock_client: Callable[..., SvgApi]) -> None:
+    catalogue = _catalogue()
+    catalogue.fail = {"heroicons:gone"}
+    client = mock_client(catalogue, max_retries=0)
+    with pytest.raises(SvgApiError) as excinfo:
+        client.resolve_icon("gone", SOURCES)
+    assert not isinstance(excinfo.value, NotFoundError)
+    assert excinfo.value.details == {"source": "heroicons"}
+
+
+def test_sources_are_required(mock_client: Callable[..., SvgApi]) -> None:
+    with pytest.raises(ValueError, match="at least one source"):
+        mock_client(_catalogue()).resolve_icon("home", [])
+
+
+async def test_async_resolve(api_server: Callable[..., Awaitable[str]]) -> None:
+    catalogue = _catalogue()
+    base_url = await api_server(catalogue.aiohttp_handler)
+    async with AsyncSvgApi(base_url=base_url, retry_delay=0) as client:
+        icon = await client.resolve_icon("home", SOURCES)
+        assert icon.source == "lucide"
+        assert (await client.resolve_icon("home", SOURCES)).source == "lucide"
+    assert len(catalogue.requests) == 1
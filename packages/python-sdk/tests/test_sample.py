@@ -0,0 +1,131 @@
+"""Tests for local random draws and sample_icons()."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from svg_api.errors import NotFoundError
+from svg_api.sample import IconSampler, filter_index
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import httpx
+
+    from svg_api.client import SvgApi
+
+ICONS = {f"icon-{i}": "<svg/>" for i in range(10)}
+INDEX = [f"lucide:{name}" for name in ICONS] + ["feather:home"]
+# Category of each lucide icon, for the search listing.
+CATEGORY = {name: "arrows" if i < 4 else "shapes" for i, name in enumerate(ICONS)}
+
+
+def keys(specs: list[dict[str, Any]]) -> list[str]:
+    return [f"{spec['source']}:{spec['name']}" for spec in specs]
+
+
+class Server(FakeCatalogue):
+    """FakeCatalogue that also answers /search, one result per page."""
+
+    def respond(
+        self, method: str, path: str, params: dict[str, str], body: Any
+    ) -> tuple[int, dict[str, Any]]:
+        if not path.endswith("/search"):
+            return super().respond(method, path, params, body)
+        self.requests.append((method, path, params, body))
+        matches = [name for name, category in CATEGORY.items() if category == params["q"]]
+        offset = int(params.get("offset", 0))
+        data = [
+            {"name": name, "source": "lucide", "category": CATEGORY[name], "score": 1.0}
+            for name in matches[offset : offset + 1]
+        ]
+        meta = {"total": len(matches), "has_more": offset + 1 < len(matches)}
+        return 200, {"data": data, "meta": meta}
+
+    def searches(self) -> int:
+        return sum(path.endswith("/search") for _, path, _, _ in self.requests)
+
+
+def test_sampler_order_depends_only_on_population_and_seed() -> None:
+    first = IconSampler(INDEX, seed=7)
+    second = IconSampler(list(reversed(INDEX)) + INDEX[:3], seed=7)
+    assert keys(first.take(11)) == keys(second.take(11))
+    assert sorted(keys(IconSampler(INDEX, seed=7).take(11))) == sorted(INDEX)
+    assert keys(IconSampler(INDEX, seed=7).take(5)) != keys(IconSampler(INDEX, seed=8).take(5))
+
+
+def test_sampler_draws_without_replacement() -> None:
+    sampler = IconSampler(INDEX, seed=1)
+    drawn = keys(sampler.take(4, size=32)) + keys(sampler.take(20))
+    assert len(drawn) == len(set(drawn)) == len(INDEX)
+    assert len(sampler) == 0
+    assert sampler.take(3) == []
+    assert IconSampler(["lucide:home"]).take(1, size=32)[0]["size"] == 32
+
+
+def test_weighted_sampler_skips_zero_weights() -> None:
+    weights = {"icon-0": 100.0, "icon-1": 0.0, "icon-2": -1.0}
+    sampler = IconSampler(INDEX, seed=3, weight=lambda _, name: weights.get(name, 1.0))
+    drawn = keys(sampler.take(20))
+    assert "lucide:icon-1" not in drawn
+    assert "lucide:icon-2" not in drawn
+    assert len(drawn) == len(INDEX) - 2
+
+
+def test_weighted_sampler_favours_heavy_keys() -> None:
+    def weight(_: str, name: str) -> float:
+        return 1000.0 if name == "icon-0" else 1.0
+
+    first = [keys(IconSampler(INDEX, seed=seed, weight=weight).take(1)) for seed in range(50)]
+    assert sum(draw == ["lucide:icon-0"] for draw in first) > 40
+
+
+def test_filter_index() -> None:
+    assert filter_index(INDEX, "feather") == ["feather:home"]
+    assert filter_index(INDEX, None) == INDEX
+
+
+def test_sample_from_an_index_uses_one_batch(mock_client: Callable[..., SvgApi]) -> None:
+    server = Server({"lucide": ICONS, "feather": {"home": "<svg/>"}})
+    client = mock_client(server)
+    icons = client.sample_icons(5, source="lucide", seed=42, index=INDEX)
+    drawn = keys(IconSampler(filter_index(INDEX, "lucide"), seed=42).take(5))
+    assert [f"{icon.source}:{icon.name}" for icon in icons] == drawn
+    assert server.batches() == [drawn]
+
+
+def test_failed_icons_are_replaced(mock_client: Callable[..., SvgApi]) -> None:
+    server = Server({"lucide": ICONS})
+    order = keys(IconSampler(INDEX, seed=5).take(len(INDEX)))
+    server.fail.add(order[0])
+    client = mock_client(server, max_retries=0)
+    icons = client.sample_icons(3, seed=5, index=INDEX)
+    # feather:home is not in the catalogue, so it is replaced as well.
+    expected = [key for key in order[:3] if key not in (order[0], "feather:home")]
+    replacements = [key for key in order[3:] if key != "feather:home"]
+    expected += replacements[: 3 - len(expected)]
+    assert [f"{icon.source}:{icon.name}" for icon in icons] == expected
+    assert len(server.batches()) >= 2
+
+
+def test_category_listing_is_kept_with_the_snapshot(mock_client: Callable[..., SvgApi]) -> None:
+    server = Server({"lucide": ICONS})
+    client = mock_client(server)
+    icons = client.sample_icons(10, category="arrows", seed=1)
+    assert sorted(icon.name for icon in icons) == ["icon-0", "icon-1", "icon-2", "icon-3"]
+    assert server.searches() == 4
+    client.sample_icons(2, category="arrows", seed=2)
+    assert server.searches() == 4
+
+
+def test_empty_selection_raises(mock_client: Callable[..., SvgApi]) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError(f"unexpected request to {request.url}")
+
+    client = mock_client(handler)
+    with pytest.raises(NotFoundError) as excinfo:
+        client.sample_icons(3, source="heroicons", index=INDEX)
+    assert excinfo.value.code == "CATEGORY_NOT_FOUND"
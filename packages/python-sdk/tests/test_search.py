@@ -0,0 +1,174 @@
+"""Tests for search-as-you-type sessions."""
+
+import asyncio
+
+import pytest
+
+from svg_api.errors import ApiError
+from svg_api.search import SearchSession, can_narrow, matches_query, tokenize
+from svg_api.types import SearchMeta, SearchResponse, SearchResult
+
+CATALOGUE = {
+    "arrow": [],
+    "arrow-right": ["direction"],
+    "arrow-left": ["direction"],
+    "chevron-right": ["arrow", "next"],
+    "move-right": ["right"],
+    "star": ["favorite"],
+}
+
+
+def api_search(query: str) -> list[SearchResult]:
+    """Search the way the API does: icons matching any token of the query."""
+    tokens = tokenize(query)
+    results = []
+    for name, tags in CATALOGUE.items():
+        if query in name or any(t in name for t in tokens) or any(t in tags for t in tokens):
+            matched = [tag for tag in tags if query in tag]
+            results.append(
+                SearchResult(
+                    name=name,
+                    source="lucide",
+                    score=0.5,
+                    matches={"name": query in name, "tags": matched},
+                )
+            )
+    return results
+
+
+class FakeClient:
+    def __init__(self, delays: dict[str, float] | None = None) -> None:
+        self.queries: list[str] = []
+        self.delays = delays or {}
+        self.fail: set[str] = set()
+
+    async def search(self, query, source=None, category=None, limit=20):
+        self.queries.append(query)
+        await asyncio.sleep(self.delays.get(query, 0))
+        if query in self.fail:
+            raise ApiError("boom", code="INTERNAL_ERROR", status_code=500)
+        data = api_search(query)
+        meta = SearchMeta(
+            query=query, total=len(data), limit=limit, offset=0, has_more=len(data) > limit
+        )
+        return SearchResponse(data=data[:limit], meta=meta)
+
+
+def names(response: SearchResponse | None) -> list[str]:
+    assert response is not None
+    return sorted(result.name for result in response.data)
+
+
+def test_tokenize_matches_api() -> None:
+    assert tokenize("arrow right") == ["arrow", "right"]
+    assert tokenize("arrow-r") == ["arrow"]
+    assert tokenize("a b") == []
+
+
+@pytest.mark.parametrize(
+    ("previous", "query", "expected"),
+    [
+        ("arr", "arrow", True),
+        ("arrow", "arrow-", True),
+        ("arrow", "arrow r", True),
+        ("arrow", "arrow right", False),
+        ("arrow r", "arrow ri", False),
+        ("arrow rig", "arrow righ", True),
+        ("star", "arrow", False),
+    ],
+)
+def test_can_narrow(previous: str, query: str, expected: bool) -> None:
+    assert can_narrow(previous, query) is expected
+
+
+def test_matches_query_by_token() -> None:
+    result = SearchResult(name="arrow", source="lucide", score=0.5)
+    assert matches_query(result, "arrow-")
+    tagged = SearchResult(
+        name="chevron-right", source="lucide", score=0.5, matches={"tags": ["arrow"]}
+    )
+    assert matches_query(tagged, "arrow")
+    assert not matches_query(SearchResult(name="star", source="lucide", score=0.5), "arrow")
+
+
+async def test_narrows_locally_without_new_tokens() -> None:
+    client = FakeClient()
+    session = SearchSession(client, debounce=0)
+    assert names(await session.search("arrow")) == [
+        "arrow",
+        "arrow-left",
+        "arrow-right",
+        "chevron-right",
+    ]
+    assert names(await session.search("arrow-")) == names(await session.search("arrow"))
+    assert client.queries == ["arrow"]
+    assert session.local == 2
+
+
+async def test_new_token_goes_to_the_api() -> None:
+    client = FakeClient()
+    session = SearchSession(client, debounce=0)
+    await session.search("arrow")
+    response = await session.search("arrow right")
+    assert client.queries == ["arrow", "arrow right"]
+    assert "arrow-right" in names(response)
+    assert "move-right" in names(response)
+
+
+async def test_incomplete_results_go_to_the_api() -> None:
+    client = FakeClient()
+    session = SearchSession(client, limit=2, debounce=0)
+    await session.search("arro")
+    await session.search("arrow")
+    assert client.queries == ["arro", "arrow"]
+
+
+async def test_short_query_answers_empty() -> None:
+    client = FakeClient()
+    session = SearchSession(client, debounce=0)
+    response = await session.search(" a ")
+    assert response is not None
+    assert response.data == []
+    assert client.queries == []
+
+
+async def test_debounce_sends_only_the_last_input() -> None:
+    client = FakeClient()
+    session = SearchSession(client, debounce=0.05)
+    results = await asyncio.gather(*(session.search(text) for text in ("st", "sta", "star")))
+    assert results[:2] == [None, None]
+    assert names(results[2]) == ["star"]
+    assert client.queries == ["star"]
+    assert session.superseded == 2
+
+
+async def test_newer_input_cancels_slow_request() -> None:
+    client = FakeClient(delays={"ar": 1.0})
+    session = SearchSession(client, debounce=0)
+    slow = asyncio.ensure_future(session.search("ar"))
+    await asyncio.sleep(0.01)
+    current = await session.search("arr")
+    assert await slow is None
+    assert "arrow" in names(current)
+    assert session.superseded == 1
+
+
+async def test_superseded_error_returns_none() -> None:
+    client = FakeClient(delays={"st": 0.02})
+    client.fail.add("st")
+    session = SearchSession(client, debounce=0.05)
+    first = asyncio.ensure_future(session.search("st"))
+    # Newer input arrives after the request went out; its own debounce keeps
+    # the request in flight, so it fails while superseded.
+    await asyncio.sleep(0.06)
+    second = asyncio.ensure_future(session.search("sta"))
+    assert await first is None
+    assert names(await second) == ["star"]
+
+
+async def test_current_error_is_raised() -> None:
+    client = FakeClient()
+    client.fail.add("star")
+    session = SearchSession(client, debounce=0)
+    with pytest.raises(ApiError):
+        await session.search("star")
@@ -0,0 +1,147 @@
+"""Tests for the sprite-sheet builder."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from aiohttp import web
+
+from svg_api.async_client import AsyncSvgApi
+from svg_api.sprite import SpriteBuilder, render_symbol, symbol_id
+from tests.conftest import FakeCatalogue, batch_body, requested_icons
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Awaitable, Callable
+
+    from svg_api.client import SvgApi
+
+GRADIENT = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">'
+    '<defs><linearGradient id="g"><stop offset="0"/></linearGradient></defs>'
+    '<path id="p" fill="url(#g)" d="M0 0h24v24H0z"/><use href="#p"/></svg>'
+)
+
+
+def _catalogue() -> FakeCatalogue:
+    return FakeCatalogue(
+        {
+            "lucide": {
+                "home": '<svg viewBox="0 0 24 24"><path d="M1 1"/></svg>',
+                "star": GRADIENT,
+                "sun": GRADIENT,
+            }
+        }
+    )
+
+
+STROKES = [{"name": "home", "source": "lucide", "stroke": width} for width in (1, 2)]
+
+
+def _stroked(icons: list[dict[str, Any]]) -> dict[str, Any]:
+    """Batch body whose SVGs record the stroke width they were requested at."""
+    return batch_body(
+        {
+            f"{icon['source']}:{icon['name']}": {
+                "success": True,
+                "name": icon["name"],
+                "source": icon["source"],
+                "svg": f'<svg viewBox="0 0 24 24" stroke-width="{icon["stroke"]}"/>',
+            }
+            for icon in icons
+        }
+    )
+
+
+class TestRenderSymbol:
+    def test_symbol_id(self) -> None:
+        assert symbol_id({"name": "home", "source": "lucide"}) == "lucide-home"
+        assert symbol_id({"name": "home", "source": "lucide", "stroke": 1.5}) == (
+            "lucide-home-stroke15"
+        )
+        assert symbol_id({"name": "home", "source": "lucide", "id": "nav"}) == "nav"
+
+    def test_defs_are_hoisted_and_ids_rewritten(self) -> None:
+        markup, defs = render_symbol("lucide-star", GRADIENT)
+        (def_id,) = defs
+        assert def_id.startswith("d")
+        assert f'fill="url(#{def_id})"' in markup
+        assert 'id="lucide-star-p"' in markup
+        assert 'href="#lucide-star-p"' in markup
+        assert markup.startswith('<symbol id="lucide-star" viewBox="0 0 24 24">')
+
+    def test_unparsable_svg_is_wrapped(self) -> None:
+        markup, defs = render_symbol("x", '<svg viewBox="0 0 16 16"><path d="M1 1"></svg>')
+        assert markup == '<symbol id="x" viewBox="0 0 16 16"><path d="M1 1"></symbol>'
+        assert defs == {}
+
+
+class TestSpriteBuilder:
+    def test_build_shares_defs_and_reports_missing(
+        self, mock_client: Callable[..., SvgApi]
+    ) -> None:
+        catalogue = _catalogue()
+        sprite = SpriteBuilder(mock_client(catalogue)).build(
+            [{"name": name, "source": "lucide"} for name in ("home", "star", "sun", "gone")]
+        )
+        assert sprite.symbols == ["lucide-home", "lucide-star", "lucide-sun"]
+        assert sprite.missing == ["lucide:gone"]
+        assert sprite.svg.count("<linearGradient") == 1
+        assert [icon["id"] for icon in sprite.json_sprite["icons"]] == [
+            "lucide:home",
+            "lucide:star",
+            "lucide:sun",
+        ]
+
+    def test_rebuild_renders_only_changed_symbols(
+        self, mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+    ) -> None:
+        catalogue = _catalogue()
+        specs = [{"name": name, "source": "lucide"} for name in ("home", "star")]
+        state = tmp_path / "sprite-state.json"
+        first = SpriteBuilder(mock_client(catalogue), state_path=state).build(specs)
+        assert first.rebuilt == ["lucide-home", "lucide-star"]
+
+        catalogue.sources["lucide"]["home"] = '<svg viewBox="0 0 24 24"><path d="M2 2"/></svg>'
+        second = SpriteBuilder(mock_client(catalogue), state_path=state).build(specs)
+        assert second.rebuilt == ["lucide-home"]
+        assert 'd="M2 2"' in second.svg
+
+    async def test_abuild(self, api_server: Callable[..., Awaitable[str]]) -> None:
+        catalogue = _catalogue()
+        base_url = await api_server(catalogue.aiohttp_handler)
+        async with AsyncSvgApi(base_url=base_url) as client:
+            sprite = await SpriteBuilder(client).abuild(
+                [{"name": name, "source": "lucide"} for name in ("home", "star")]
+            )
+        assert sprite.symbols == ["lucide-home", "lucide-star"]
+        assert sprite.missing == []
+
+    def test_variants_of_one_icon_get_their_own_svg(
+        self, mock_client: Callable[..., SvgApi]
+    ) -> None:
+        batches: list[list[float]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            icons = requested_icons(request)
+            batches.append([icon["stroke"] for icon in icons])
+            return httpx.Response(200, json=_stroked(icons))
+
+        sprite = SpriteBuilder(mock_client(handler)).build(STROKES)
+        assert batches == [[1], [2]]
+        assert sprite.symbols == ["lucide-home-stroke1", "lucide-home-stroke2"]
+        assert 'stroke-width="1.0"' in sprite.svg
+        assert 'stroke-width="2.0"' in sprite.svg
+
+    async def test_abuild_variants_of_one_icon_get_their_own_svg(
+        self, api_server: Callable[..., Awaitable[str]]
+    ) -> None:
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response(_stroked((await request.json())["icons"]))
+
+        base_url = await api_server(handler)
+        async with AsyncSvgApi(base_url=base_url) as client:
+            sprite = await SpriteBuilder(client).abuild(STROKES)
+        assert 'stroke-width="1.0"' in sprite.svg
+        assert 'stroke-width="2.0"' in sprite.svg
@@ -0,0 +1,124 @@
+"""Tests for client request statistics."""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from svg_api.stats import ClientStats, LatencyHistogram, endpoint_label
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "label"),
+    [
+        ("get", "/icons/home", "GET /icons/{name}"),
+        ("GET", "/icons/lucide/home?size=24", "GET /icons/{source}/{name}"),
+        ("POST", "/icons/batch", "POST /icons/batch"),
+        ("GET", "/recommendations/similar/home", "GET /recommendations/similar/{name}"),
+        ("GET", "/search", "GET /search"),
+    ],
+)
+def test_endpoint_label(method: str, path: str, label: str) -> None:
+    assert endpoint_label(method, path) == label
+
+
+def test_histogram_percentiles_within_bucket_error() -> None:
+    histogram = LatencyHistogram()
+    for micros in range(1, 10_001):
+        histogram.record(micros)
+    assert histogram.count == 10_000
+    assert histogram.min == 1
+    assert histogram.max == 10_000
+    for percentile in (50.0, 90.0, 99.0):
+        expected = 10_000 * percentile / 100
+        assert abs(histogram.percentile(percentile) - expected) <= expected / 32
+
+
+def test_histogram_merge() -> None:
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(100)
+    second.record(5)
+    second.record(900)
+    first.merge(second)
+    assert (first.count, first.min, first.max, first.total) == (3, 5, 900, 1005)
+
+
+def test_snapshot_aggregates_threads() -> None:
+    stats = ClientStats()
+    stats.record_request("GET /search", 0.010)
+
+    def worker() -> None:
+        stats.record_request("GET /search", 0.020, KeyError())
+        stats.record_retry("GET /search")
+        stats.record_transfer("GET /search", 10, 100, wire_bytes_in=40)
+        stats.record_cache_hit("GET /icons/{name}")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    snapshot = stats.snapshot()
+    search = snapshot["endpoints"]["GET /search"]
+    assert search["requests"] == 2
+    assert search["errors"] == {"KeyError": 1}
+    assert search["retries"] == 1
+    assert (search["bytes_in"], search["wire_bytes_in"], search["bytes_out"]) == (100, 40, 10)
+    assert snapshot["endpoints"]["GET /icons/{name}"]["cache_hits"] == 1
+    assert snapshot["totals"]["requests"] == 2
+
+
+def test_snapshot_while_recording() -> None:
+    stats = ClientStats()
+    # Switch threads often, so snapshots interleave with writes to the shard.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    stop = threading.Event()
+    errors = (KeyError(), ValueError(), TimeoutError())
+
+    def record() -> None:
+        i = 0
+        while not stop.is_set():
+            # New endpoints, latency buckets and error names keep adding keys.
+            seconds = (i * 7919 % 1_000_000) / 1_000_000
+            stats.record_request(f"GET /e{i % 500}", seconds, errors[i % 3])
+            i += 1
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    try:
+        end = time.monotonic() + 0.5
+        while time.monotonic() < end:
+            stats.snapshot()
+    finally:
+        stop.set()
+        thread.join()
+        sys.setswitchinterval(interval)
+    snapshot = stats.snapshot()
+    assert snapshot["totals"]["requests"] == sum(
+        counters["requests"] for counters in snapshot["endpoints"].values()
+    )
+
+
+def test_finished_threads_are_retired() -> None:
+    stats = ClientStats()
+    threads = [
+        threading.Thread(target=stats.record_request, args=("GET /search", 0.001))
+        for _ in range(200)
+    ]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+    snapshot = stats.snapshot()
+    assert snapshot["endpoints"]["GET /search"]["requests"] == 200
+    assert len(stats._shards) == 0
+
+
+def test_reset() -> None:
+    stats = ClientStats()
+    stats.record_request("GET /search", 0.001)
+    stats.reset()
+    assert stats.snapshot()["endpoints"] == {}
+    stats.record_request("GET /search", 0.001)
+    assert stats.snapshot()["totals"]["requests"] == 1
@@ -0,0 +1,99 @@
+"""Tests for incremental batch response parsing."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from svg_api.streaming import BatchStreamParser
+from tests.conftest import batch_body, error_body, icon_item
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+    from svg_api.types import BatchIconResult
+
+BODY = json.dumps(
+    batch_body(
+        {
+            "lucide:home": icon_item("home"),
+            "lucide:café": {**icon_item("café"), "svg": "<svg>☕</svg>"},
+        },
+        {"lucide:gone": error_body("ICON_NOT_FOUND", "no such icon")["error"]},
+    ),
+    ensure_ascii=False,
+).encode()
+
+
+def _feed(parser: BatchStreamParser, chunks: list[bytes]) -> list[tuple[str, BatchIconResult]]:
+    results = []
+    for chunk in chunks:
+        results.extend(parser.feed(chunk))
+    results.extend(parser.close())
+    return results
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, len(BODY)])
+def test_results_survive_any_chunk_split(size: int) -> None:
+    parser = BatchStreamParser()
+    chunks = [BODY[i : i + size] for i in range(0, len(BODY), size)]
+    results = _feed(parser, chunks)
+    assert [key for key, _ in results] == ["lucide:home", "lucide:café"]
+    assert results[1][1].svg == "<svg>☕</svg>"
+    assert list(parser.errors) == ["lucide:gone"]
+    assert parser.errors["lucide:gone"].code == "ICON_NOT_FOUND"
+    assert parser.bytes_fed == len(BODY)
+
+
+def test_entries_are_yielded_as_soon_as_they_are_complete() -> None:
+    parser = BatchStreamParser()
+    first_end = BODY.index(b"}", BODY.index(b'"lucide:home"')) + 1
+    assert parser.feed(BODY[: first_end - 1]) == []
+    assert [key for key, _ in parser.feed(BODY[first_end - 1 : first_end])] == ["lucide:home"]
+    assert not parser.done
+
+
+def test_list_shaped_data() -> None:
+    body = json.dumps(
+        {
+            "data": [
+                {"name": "home", "source": "lucide", "svg": "<svg/>"},
+                {
+                    "name": "gone",
+                    "source": "lucide",
+                    "error": error_body("ICON_NOT_FOUND")["error"],
+                },
+            ],
+            "meta": {"total": 2},
+        }
+    ).encode()
+    parser = BatchStreamParser()
+    results = _feed(parser, [body[i : i + 5] for i in range(0, len(body), 5)])
+    assert [(key, result.success) for key, result in results] == [
+        ("lucide:home", True),
+        ("lucide:gone", False),
+    ]
+    assert list(parser.errors) == ["lucide:gone"]
+    assert parser.meta == {"total": 2}
+
+
+def test_truncated_body_raises_on_close() -> None:
+    parser = BatchStreamParser()
+    parser.feed(BODY[:-10])
+    with pytest.raises(ValueError, match="Incomplete batch response"):
+        parser.close()
+
+
+def test_client_streams_a_chunked_response(mock_client: Callable[..., SvgApi]) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=iter([BODY[i : i + 3] for i in range(0, len(BODY), 3)]))
+
+    client = mock_client(handler)
+    with client.stream_batch([{"name": "home"}, {"name": "café"}, {"name": "gone"}]) as stream:
+        keys = [key for key, _ in stream]
+    assert keys == ["lucide:home", "lucide:café"]
+    assert list(stream.errors) == ["lucide:gone"]
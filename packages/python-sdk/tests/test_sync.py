@@ -0,0 +1,87 @@
+"""Tests for incremental catalogue mirroring."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from svg_api.sync import CatalogueSync, content_hash, mirror_keys
+from tests.conftest import FakeCatalogue
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Callable
+
+    from svg_api.client import SvgApi
+    from svg_api.types import Source
+
+
+def _catalogue() -> FakeCatalogue:
+    return FakeCatalogue({"lucide": {f"icon-{i}": f"<svg>{i}</svg>" for i in range(7)}})
+
+
+def _sync(client: SvgApi, catalogue: FakeCatalogue, directory: pathlib.Path) -> CatalogueSync:
+    def lister(source: Source) -> list[str]:
+        return sorted(catalogue.sources[source.id])
+
+    return CatalogueSync(client, directory, max_workers=1, chunk_size=3, lister=lister)
+
+
+def test_first_run_mirrors_every_icon(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    result = _sync(mock_client(catalogue), catalogue, tmp_path).run()
+    assert (result.fetched, result.updated, result.failed) == (7, 7, {})
+    assert (tmp_path / "lucide" / "icon-3.svg").read_text() == "<svg>3</svg>"
+    assert sorted(mirror_keys(tmp_path)) == sorted(f"lucide:icon-{i}" for i in range(7))
+    assert [len(batch) for batch in catalogue.batches()] == [3, 3, 1]
+
+
+def test_unchanged_source_is_skipped(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    sync = _sync(mock_client(catalogue), catalogue, tmp_path)
+    sync.run()
+    batches = len(catalogue.batches())
+    result = sync.run()
+    assert result.sources_skipped == 1
+    assert result.fetched == 0
+    assert len(catalogue.batches()) == batches
+
+
+def test_new_version_rewrites_changed_icons_and_deletes_removed_ones(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    sync = _sync(mock_client(catalogue), catalogue, tmp_path)
+    sync.run()
+    catalogue.versions["lucide"] = "2"
+    catalogue.sources["lucide"]["icon-0"] = "<svg>changed</svg>"
+    del catalogue.sources["lucide"]["icon-6"]
+    result = sync.run()
+    assert (result.fetched, result.updated, result.deleted) == (6, 1, 1)
+    assert not (tmp_path / "lucide" / "icon-6.svg").exists()
+    state = json.loads((tmp_path / ".sync" / "lucide.json").read_text())
+    assert state["icons"]["icon-0"] == content_hash("<svg>changed</svg>")
+    assert state["complete"]
+
+
+def test_interrupted_run_resumes_from_the_journal(
+    mock_client: Callable[..., SvgApi], tmp_path: pathlib.Path
+) -> None:
+    catalogue = _catalogue()
+    catalogue.fail = {"lucide:icon-4"}
+    sync = _sync(mock_client(catalogue, max_retries=0), catalogue, tmp_path)
+    result = sync.run()
+    assert list(result.failed) == ["lucide:icon-4"]
+    assert mirror_keys(tmp_path) == []  # incomplete sources are not listed
+
+    catalogue.fail.clear()
+    requested = len(catalogue.batches())
+    result = sync.run()
+    assert result.failed == {}
+    assert catalogue.batches()[requested:] == [["lucide:icon-4"]]
+    assert len(mirror_keys(tmp_path)) == 7
+    assert not (tmp_path / ".sync" / "lucide.journal").exists()
@@ -0,0 +1,185 @@
+"""Tests for background usage reporting."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from svg_api import usage
+from svg_api.errors import ApiError
+from svg_api.limiter import AdaptiveLimiter
+from svg_api.usage import AsyncUsageReporter, UsageBuffer, UsageReporter
+from tests.conftest import error_body
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import pytest
+
+    from svg_api.client import SvgApi
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.005)
+
+
+class TestUsageBuffer:
+    def test_aggregates_and_drops_when_full(self) -> None:
+        buffer = UsageBuffer(capacity=3)
+        assert buffer.add("lucide", "home")
+        assert buffer.add("lucide", "home")
+        assert buffer.add("lucide", "home", "navbar")
+        assert not buffer.add("lucide", "star")
+        assert (buffer.recorded, buffer.dropped, len(buffer)) == (3, 1, 3)
+        assert buffer.drain() == {("lucide", "home", None): 2, ("lucide", "home", "navbar"): 1}
+        assert len(buffer) == 0
+
+
+class TestUsageReporter:
+    def test_flush_sends_one_request_per_icon(self, mock_client: Callable[..., SvgApi]) -> None:
+        bodies: list[dict[str, Any]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return httpx.Response(200, json={"success": True})
+
+        client = mock_client(handler)
+        reporter = UsageReporter(client, interval=60)
+        for _ in range(3):
+            reporter.record("home", "lucide", context="navbar")
+        reporter.record("star", "lucide")
+        assert reporter.flush() == 4
+        assert sorted(bodies, key=lambda body: body["icon"]) == [
+            {"icon": "home", "source": "lucide", "count": 3, "context": "navbar"},
+            {"icon": "star", "source": "lucide", "count": 1},
+        ]
+        reporter.close()
+
+    def test_failed_reports_are_counted_and_dropped(
+        self, mock_client: Callable[..., SvgApi]
+    ) -> None:
+        client = mock_client(
+            lambda *_: httpx.Response(400, json=error_body("INVALID_REQUEST")), max_retries=0
+        )
+        reporter = UsageReporter(client, interval=60)
+        reporter.record("home", "lucide")
+        assert reporter.flush() == 0
+        assert reporter.snapshot()["failed"] == 1
+        assert reporter.snapshot()["pending"] == 0
+        reporter.close()
+
+    def test_close_is_bounded_by_close_timeout(
+        self, mock_client: Callable[..., SvgApi], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(usage, "CLOSE_TIMEOUT", 0.3)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            time.sleep(0.1)
+            return httpx.Response(200, json={"success": True})
+
+        client = mock_client(handler)
+        reporter = UsageReporter(client, interval=60)
+        for i in range(20):
+            reporter.record(f"icon-{i}", "lucide")
+        start = time.monotonic()
+        reporter.close()
+        assert time.monotonic() - start < 1.0
+        stats = reporter.snapshot()
+        assert 0 < stats["sent"] < 20
+        assert stats["sent"] + stats["failed"] == 20
+
+    def test_close_does_not_wait_for_a_stuck_flush(
+        self, mock_client: Callable[..., SvgApi], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(usage, "CLOSE_TIMEOUT", 0.2)
+        release = threading.Event()
+        started = threading.Event()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            started.set()
+            release.wait(5)
+            return httpx.Response(200, json={"success": True})
+
+        client = mock_client(handler)
+        reporter = UsageReporter(client, interval=60, flush_size=1)
+        reporter.record("home", "lucide")
+        assert started.wait(2)
+        start = time.monotonic()
+        try:
+            reporter.close()
+            assert time.monotonic() - start < 1.0
+        finally:
+            release.set()
+
+    def test_thread_survives_unexpected_errors(
+        self, mock_client: Callable[..., SvgApi], caplog: pytest.LogCaptureFixture
+    ) -> None:
+        client = mock_client(lambda *_: httpx.Response(200, json={"success": True}))
+        send = client._send
+        calls: list[int] = []
+
+        def flaky_send(*args: Any, **kwargs: Any) -> Any:
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("bug")
+            return send(*args, **kwargs)
+
+        client._send = flaky_send  # type: ignore[method-assign]
+        reporter = UsageReporter(client, interval=60, flush_size=1)
+        reporter.record("home", "lucide")
+        _wait_for(lambda: len(calls) == 1)
+        reporter.record("star", "lucide")
+        _wait_for(lambda: reporter.snapshot()["sent"] == 1)
+        assert "Usage flush failed" in caplog.text
+        reporter.close()
+
+
+class _AsyncClient:
+    """Stand-in for AsyncSvgApi with a scripted _send."""
+
+    def __init__(self, fail_first: BaseException | None = None) -> None:
+        self.limiter = AdaptiveLimiter()
+        self.sent: list[dict[str, Any]] = []
+        self._fail_first = fail_first
+
+    async def _send(self, method: str, path: str, json: dict[str, Any]) -> None:
+        if self._fail_first is not None:
+            error, self._fail_first = self._fail_first, None
+            raise error
+        self.sent.append(json)
+
+
+class TestAsyncUsageReporter:
+    async def test_flush_reports_failures(self) -> None:
+        client = _AsyncClient(ApiError("boom", code="INTERNAL_ERROR", status_code=500))
+        reporter = AsyncUsageReporter(client, interval=60)  # type: ignore[arg-type]
+        reporter.record("home", "lucide")
+        reporter.record("star", "lucide")
+        assert await reporter.flush() == 1
+        assert reporter.snapshot()["failed"] == 1
+        await reporter.close()
+
+    async def test_task_survives_unexpected_errors(self, caplog: pytest.LogCaptureFixture) -> None:
+        client = _AsyncClient(RuntimeError("bug"))
+        reporter = AsyncUsageReporter(client, interval=60, flush_size=1)  # type: ignore[arg-type]
+        reporter.record("home", "lucide")
+        for _ in range(100):
+            if "Usage flush failed" in caplog.text:
+                break
+            await asyncio.sleep(0.005)
+        assert "Usage flush failed" in caplog.text
+        reporter.record("star", "lucide")
+        for _ in range(100):
+            if client.sent:
+                break
+            await asyncio.sleep(0.005)
+        assert client.sent == [{"icon": "star", "source": "lucide", "count": 1}]
+        await reporter.close()